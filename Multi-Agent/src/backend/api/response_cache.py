@@ -0,0 +1,132 @@
+"""Conditional GET (ETag / If-None-Match) and a cache of serialized JSON responses."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+from common.config.app_config import config
+from common.database.serialization import to_json_bytes
+from fastapi import Request, Response
+
+# Cache-Control of each conditional route. Bodies depend on the signed-in
+# user, so only the browser may keep them, and it must revalidate every time.
+CACHE_CONTROL = {
+    "team_configs": "private, no-cache",
+    "plans": "private, no-cache",
+}
+
+
+def response_key(route: str, user_id: Optional[str] = None, team_id: Optional[str] = None) -> Tuple:
+    return (route, user_id, team_id)
+
+
+def strong_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches ``etag`` (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """TTL + LRU cache of serialized GET responses, keyed by route, user and team.
+
+    Every entry records the ETag it was rendered for and a lookup with any
+    other ETag misses, so a body is never served after its documents changed,
+    even when the write happened on another replica or in an orchestration
+    worker. Uploading, deleting or selecting a team invalidates entries early.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, str, bytes]]" = OrderedDict()
+
+    @classmethod
+    def from_config(cls) -> "ResponseCache":
+        return cls(config.RESPONSE_CACHE_TTL_SECONDS, config.RESPONSE_CACHE_MAX_ENTRIES)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: Hashable, etag: str) -> Optional[bytes]:
+        """Cached body of ``key`` if it was rendered for ``etag``."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == etag:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, etag: str, body: bytes) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, etag, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(
+        self,
+        route: Optional[str] = None,
+        user_id: Optional[str] = None,
+        team_id: Optional[str] = None,
+    ) -> None:
+        """Drop the entries matching every given part of the key."""
+        wanted = (route, user_id, team_id)
+        for key in [
+            k
+            for k in self._entries
+            if all(part is None or part == k[i] for i, part in enumerate(wanted))
+        ]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def respond(
+        self,
+        request: Request,
+        route: str,
+        key: Hashable,
+        version: str,
+        render: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """Respond to a conditional GET.
+
+        Args:
+            request: The request, read for If-None-Match
+            route: Route name, selecting the Cache-Control policy
+            key: Cache key from :func:`response_key`
+            version: Version of the documents the body is built from
+            render: Loads the body's content; only called on a cache miss
+
+        Returns:
+            304 if the client's copy is current, else the (cached) JSON body,
+            with ETag and Cache-Control headers either way
+        """
+        etag = strong_etag(version)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL[route]}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        body = self.get(key, etag)
+        if body is None:
+            body = to_json_bytes(await render())
+            self.put(key, etag, body)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache.from_config()
@@ -0,0 +1,51 @@
+"""Response classes encoding with orjson and the models' compiled serializers."""
+
+from typing import Any, AsyncIterable, AsyncIterator
+
+from common.database.serialization import to_json_bytes
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``to_json_bytes``.
+
+    It is the default response class of the API. Handlers that return
+    Pydantic models in an instance of it skip FastAPI's ``jsonable_encoder``
+    pass as well; handlers returning plain values still go through it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json_bytes(content)
+
+
+class NDJSONResponse(StreamingResponse):
+    """Streams the items of an async iterable as newline-delimited JSON.
+
+    Each item is encoded as soon as it is produced, so the client can process
+    a long history before the last item has been read.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(self, items: AsyncIterable[Any], **kwargs: Any):
+        super().__init__(_ndjson_lines(items), media_type=self.media_type, **kwargs)
+
+
+async def _ndjson_lines(items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    async for item in items:
+        yield to_json_bytes(item) + b"\n"
+
+
+class EventStreamResponse(StreamingResponse):
+    """Streams already encoded Server-Sent Events frames.
+
+    Proxies are told not to cache or buffer the stream, so each frame reaches
+    the client as soon as it is written.
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(self, frames: AsyncIterable[bytes], **kwargs: Any):
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        headers.update(kwargs.pop("headers", None) or {})
+        super().__init__(frames, media_type=self.media_type, headers=headers, **kwargs)
@@ -2,22 +2,33 @@ import asyncio
 import json
 import logging
 import uuid
-from typing import Optional
+from typing import Any, AsyncIterator, Optional, Set, Tuple
 
 import models.messages as messages
-from auth.auth_utils import get_authenticated_user_details
+from api.response_cache import response_cache, response_key
+from api.responses import EventStreamResponse, FastJSONResponse, NDJSONResponse
+from auth.user_context import UserContext, get_user_context
+from common.database.database_base import DatabaseBase
 from common.database.database_factory import DatabaseFactory
+from common.database.serialization import to_json_bytes
+from common.jobs.job_pool import IdempotencyConflictError, JobQueueFullError, job_pool
 from common.models.messages_kernel import (
+    AgentMessageData,
+    BatchOperationType,
+    BatchRequest,
     InputTask,
+    OrchestrationJob,
     Plan,
     PlanStatus,
     TeamSelectionRequest,
 )
+from common.utils.event_stream import event_stream
 from common.utils.event_utils import track_event_if_configured
-from common.utils.utils_kernel import rai_success, rai_validate_team_config
+from common.utils.rate_limiter import RateLimitExceededError, admission_controller
+from common.utils.utils_kernel import RAI_FAILED_DETAIL, rai_success
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
+    Depends,
     File,
     HTTPException,
     Query,
@@ -26,13 +37,17 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
+from fastapi.responses import StreamingResponse
+from common.services.batch_service import BatchService
 from common.services.plan_service import PlanService
 from common.services.team_service import TeamService
+from common.services.team_validation import TeamConfigValidator
 from config.settings import (
     connection_config,
     orchestration_config,
     team_config,
 )
+from orchestration.job_transport import job_transport
 from orchestration.orchestration_manager import OrchestrationManager
 
 router = APIRouter()
@@ -44,19 +59,69 @@ from common.services.case_service import CaseService
 app_v3 = APIRouter(
     prefix="/api/v3",
     responses={404: {"description": "Not found"}},
+    default_response_class=FastJSONResponse,
 )
 
-@app_v3.post("/hr/chat")
+# Page size bounds for GET /api/v3/plans when the caller asks for paging
+DEFAULT_PLANS_PAGE_SIZE = 50
+MAX_PLANS_PAGE_SIZE = 500
+
+# Most operations accepted in one POST /api/v3/batch
+MAX_BATCH_SIZE = 100
+
+# Parts of GET /api/v3/plan a client can select with include=
+PLAN_INCLUDES = ("team", "messages")
+
+
+def _too_many_requests(user_id: str, route: str, e: RateLimitExceededError) -> HTTPException:
+    track_event_if_configured(
+        "RequestThrottled",
+        {"user_id": user_id, "route": route, "retry_after": e.retry_after, "detail": str(e)},
+    )
+    return HTTPException(
+        status_code=429,
+        detail=f"Too many requests: {e}",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def admission(route: str):
+    """Dependency admitting a request to an LLM-backed route, or refusing it with a 429.
+
+    It runs before the handler, so a refused request never reaches the RAI
+    check or the model. Requests without a user are left to the handler.
+    """
+
+    async def admit(user: UserContext = Depends(get_user_context)) -> AsyncIterator[None]:
+        user_id = user.user_principal_id
+        if not user_id:
+            yield
+            return
+        try:
+            await admission_controller.acquire(user_id, route)
+        except RateLimitExceededError as e:
+            raise _too_many_requests(user_id, route, e) from e
+        try:
+            yield
+        finally:
+            admission_controller.release()
+
+    return admit
+
+
+@app_v3.post("/hr/chat", dependencies=[Depends(admission("hr_chat"))])
 async def hr_chat(
     request: Request,
     input_data: dict, # Expecting {"message": "..."}
+    user: UserContext = Depends(get_user_context),
 ):
     """
     HR Service Desk Chat Endpoint.
     Uses ConversationalAgent to interact with user and determine if case creation is needed.
+    Admission-controlled: answers 429 with Retry-After when the user's hr_chat
+    rate limit is exceeded or too many model requests are in progress.
     """
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     
     if not user_id:
         raise HTTPException(status_code=401, detail="Missing or invalid user information")
@@ -147,10 +212,63 @@ async def start_comms(
         await connection_config.close_connection(process_id=process_id)
 
 
+@app_v3.get("/events")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[str] = Query(None),
+    user: UserContext = Depends(get_user_context),
+):
+    """
+    Server-Sent Events stream of the signed-in user's status updates.
+
+    Carries the same messages as the ``/socket`` WebSocket, for clients that
+    cannot keep one open (e.g. behind proxies that drop upgrades). Each event
+    is named after the message type and its data is the ``{"type", "data"}``
+    message sent over the socket.
+
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: user_principal_id
+        in: header
+        type: string
+        required: true
+        description: User ID extracted from the authentication header
+      - name: Last-Event-ID
+        in: header
+        type: string
+        required: false
+        description: Id of the last event received; missed events still in the replay buffer are sent first
+      - name: last_event_id
+        in: query
+        type: string
+        required: false
+        description: Same as the Last-Event-ID header, for the first connection of an EventSource
+    responses:
+      200:
+        description: text/event-stream of status updates, with heartbeat comments while idle
+      401:
+        description: Missing or invalid user information
+    """
+    user_id = user.user_principal_id
+    if not user_id:
+        raise HTTPException(
+            status_code=401, detail="Missing or invalid user information"
+        )
+
+    resume_from = request.headers.get("last-event-id") or last_event_id
+    track_event_if_configured(
+        "EventStreamConnected", {"user_id": user_id, "resumed": bool(resume_from)}
+    )
+    return EventStreamResponse(event_stream.subscribe(user_id, resume_from))
+
+
 @app_v3.get("/init_team")
 async def init_team(
     request: Request,
     team_switched: bool = Query(False),
+    user: UserContext = Depends(get_user_context),
 ):  # add team_switched: bool parameter
     """Initialize the user's current team of agents"""
 
@@ -161,10 +279,7 @@ async def init_team(
     init_team_id = "00000000-0000-0000-0000-000000000001"
     print(f"Init team called, team_switched={team_switched}")
     try:
-        authenticated_user = get_authenticated_user_details(
-            request_headers=request.headers
-        )
-        user_id = authenticated_user["user_principal_id"]
+        user_id = user.user_principal_id
         if not user_id:
             track_event_if_configured(
                 "UserIdNotFound", {"status_code": 400, "detail": "no user"}
@@ -199,10 +314,12 @@ async def init_team(
             user_id=user_id, team_configuration=team_configuration
         )
 
-        # Initialize agent team for this user session
-        await OrchestrationManager.get_current_or_new_orchestration(
-            user_id=user_id, team_config=team_configuration, team_switched=team_switched
-        )
+        # Initialize agent team for this user session; orchestration workers
+        # build it themselves when they pick up the user's first job
+        if job_transport.local:
+            await OrchestrationManager.get_current_or_new_orchestration(
+                user_id=user_id, team_config=team_configuration, team_switched=team_switched
+            )
 
         return {
             "status": "Request started successfully",
@@ -222,10 +339,8 @@ async def init_team(
         ) from e
 
 
-@app_v3.post("/process_request")
-async def process_request(
-    background_tasks: BackgroundTasks, input_task: InputTask, request: Request
-):
+@app_v3.post("/process_request", dependencies=[Depends(admission("process_request"))])
+async def process_request(input_task: InputTask, request: Request, user: UserContext = Depends(get_user_context)):
     """
     Create a new plan without full processing.
 
@@ -250,9 +365,13 @@ async def process_request(
             description:
               type: string
               description: The task description to validate and create plan for
+            idempotency_key:
+              type: string
+              description: Client-chosen key; a retried request with the same key
+                returns the job it started instead of starting another
     responses:
       200:
-        description: Plan created successfully
+        description: Plan created and its orchestration queued
         schema:
           type: object
           properties:
@@ -265,6 +384,12 @@ async def process_request(
             session_id:
               type: string
               description: Session ID associated with the plan
+            job_id:
+              type: string
+              description: ID to poll at /api/v3/jobs/{job_id}
+            job_status:
+              type: string
+              description: queued, running, completed, failed or cancelled
       400:
         description: RAI check failed or invalid input
         schema:
@@ -273,8 +398,97 @@ async def process_request(
             detail:
               type: string
               description: Error message
+      409:
+        description: A request with the same idempotency key is in progress
+      429:
+        description: Too many orchestrations are queued, the rate limit is
+          exceeded or too many model requests are in progress; retry after
+          the number of seconds in the Retry-After header
     """
 
+    user_id = user.user_principal_id
+
+    if not user_id:
+        track_event_if_configured(
+            "UserIdNotFound", {"status_code": 400, "detail": "no user"}
+        )
+        raise HTTPException(status_code=400, detail="no user found")
+
+    try:
+        existing_job = job_pool.claim(user_id, input_task.idempotency_key)
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    if existing_job:
+        return _job_started_response(existing_job)
+
+    try:
+        return await _start_request(input_task, user_id)
+    finally:
+        job_pool.release(user_id, input_task.idempotency_key)
+
+
+def _queue_full(user_id: str, e: JobQueueFullError) -> HTTPException:
+    track_event_if_configured(
+        "RequestThrottled",
+        {"user_id": user_id, "retry_after": e.retry_after, "detail": str(e)},
+    )
+    return HTTPException(
+        status_code=429,
+        detail=f"Too many requests in progress: {e}",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+async def _start_request(input_task: InputTask, user_id: str) -> dict:
+    """Create the plan for ``input_task`` and queue its orchestration."""
+    # The queue slot is held while the plan is created, so requests arriving
+    # together cannot all pass the capacity check
+    try:
+        job_pool.reserve(user_id)
+    except JobQueueFullError as e:
+        raise _queue_full(user_id, e) from e
+    try:
+        memory_store, plan_id = await _create_plan(input_task, user_id)
+    except BaseException:
+        job_pool.unreserve(user_id)
+        raise
+
+    async def run_orchestration_task():
+        await job_transport.run(user_id, input_task)
+
+    try:
+        job = job_pool.submit(
+            user_id,
+            run_orchestration_task,
+            plan_id=plan_id,
+            session_id=input_task.session_id,
+            idempotency_key=input_task.idempotency_key,
+            reserved=True,
+        )
+    except Exception as e:
+        track_event_if_configured(
+            "RequestStartFailed",
+            {
+                "session_id": input_task.session_id,
+                "description": input_task.description,
+                "error": str(e),
+            },
+        )
+        # No orchestration will ever run for the plan
+        try:
+            await memory_store.delete_plan_by_plan_id(plan_id)
+        except Exception as delete_error:
+            logger.error("Failed to delete plan %s of a refused job: %s", plan_id, delete_error)
+        if isinstance(e, JobQueueFullError):
+            raise _queue_full(user_id, e) from e
+        raise HTTPException(
+            status_code=400, detail=f"Error starting request: {e}"
+        ) from e
+    return _job_started_response(job)
+
+
+async def _create_plan(input_task: InputTask, user_id: str) -> Tuple[DatabaseBase, str]:
+    """RAI-check ``input_task`` and add its plan; returns the user's store and the plan id."""
     if not await rai_success(input_task.description):
         track_event_if_configured(
             "RAI failed",
@@ -289,15 +503,6 @@ async def process_request(
             detail="Request contains content that doesn't meet our safety guidelines, try again.",
         )
 
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
-
-    if not user_id:
-        track_event_if_configured(
-            "UserIdNotFound", {"status_code": 400, "detail": "no user"}
-        )
-        raise HTTPException(status_code=400, detail="no user found")
-
     # if not input_task.team_id:
     #     track_event_if_configured(
     #         "TeamIDNofound", {"status_code": 400, "detail": "no team id"}
@@ -355,40 +560,53 @@ async def process_request(
             },
         )
         raise HTTPException(status_code=500, detail="Failed to create plan")
+    return memory_store, plan_id
 
-    try:
-        # background_tasks.add_task(
-        #     lambda: current_context.run(lambda:OrchestrationManager().run_orchestration, user_id, input_task)
-        # )
 
-        async def run_orchestration_task():
-            await OrchestrationManager().run_orchestration(user_id, input_task)
+def _job_started_response(job: OrchestrationJob) -> dict:
+    return {
+        "status": "Request started successfully",
+        "session_id": job.session_id,
+        "plan_id": job.plan_id,
+        "job_id": job.job_id,
+        "job_status": job.status,
+    }
 
-        background_tasks.add_task(run_orchestration_task)
 
-        return {
-            "status": "Request started successfully",
-            "session_id": input_task.session_id,
-            "plan_id": plan_id,
-        }
+@app_v3.get("/jobs/{job_id}")
+async def get_job(job_id: str, request: Request, user: UserContext = Depends(get_user_context)):
+    """
+    Get the status of an orchestration job started by /process_request.
 
-    except Exception as e:
-        track_event_if_configured(
-            "RequestStartFailed",
-            {
-                "session_id": input_task.session_id,
-                "description": input_task.description,
-                "error": str(e),
-            },
-        )
-        raise HTTPException(
-            status_code=400, detail=f"Error starting request: {e}"
-        ) from e
+    ---
+    tags:
+      - Plans
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+        description: Job ID returned by /process_request
+    responses:
+      200:
+        description: The job, with queue_position while it is queued
+      404:
+        description: Unknown job, or the job of another user
+    """
+    user_id = user.user_principal_id
+    if not user_id:
+        raise HTTPException(status_code=400, detail="no user found")
+
+    job = job_pool.get(job_id)
+    if not job or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return {**job.model_dump(mode="json"), "queue_position": job_pool.queue_position(job_id)}
 
 
 @app_v3.post("/plan_approval")
 async def plan_approval(
-    human_feedback: messages.PlanApprovalResponse, request: Request
+    human_feedback: messages.PlanApprovalResponse, request: Request,
+    user: UserContext = Depends(get_user_context),
 ):
     """
     Endpoint to receive plan approval or rejection from the user.
@@ -440,8 +658,7 @@ async def plan_approval(
         description: Internal server error
     """
 
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         raise HTTPException(
             status_code=401, detail="Missing or invalid user information"
@@ -497,9 +714,10 @@ async def plan_approval(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@app_v3.post("/user_clarification")
+@app_v3.post("/user_clarification", dependencies=[Depends(admission("user_clarification"))])
 async def user_clarification(
-    human_feedback: messages.UserClarificationResponse, request: Request
+    human_feedback: messages.UserClarificationResponse, request: Request,
+    user: UserContext = Depends(get_user_context),
 ):
     """
     Endpoint to receive user clarification responses for clarification requests sent by the system.
@@ -542,12 +760,14 @@ async def user_clarification(
         description: Missing or invalid user information
       404:
         description: No active plan found for clarification
+      429:
+        description: Rate limit exceeded or too many model requests in
+          progress; retry after the number of seconds in the Retry-After header
       500:
         description: Internal server error
     """
 
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         raise HTTPException(
             status_code=401, detail="Missing or invalid user information"
@@ -565,21 +785,7 @@ async def user_clarification(
                         "request_id": human_feedback.request_id,
                     },
                 )
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "error_type": "RAI_VALIDATION_FAILED",
-                        "message": "Content Safety Check Failed",
-                        "description": "Your request contains content that doesn't meet our safety guidelines. Please modify your request to ensure it's appropriate and try again.",
-                        "suggestions": [
-                            "Remove any potentially harmful, inappropriate, or unsafe content",
-                            "Use more professional and constructive language",
-                            "Focus on legitimate business or educational objectives",
-                            "Ensure your request complies with content policies",
-                        ],
-                        "user_action": "Please revise your request and try again",
-                    },
-                )
+                raise HTTPException(status_code=400, detail=RAI_FAILED_DETAIL)
 
         if (
             orchestration_config
@@ -620,7 +826,8 @@ async def user_clarification(
 
 @app_v3.post("/agent_message")
 async def agent_message_user(
-    agent_message: messages.AgentMessageResponse, request: Request
+    agent_message: messages.AgentMessageResponse, request: Request,
+    user: UserContext = Depends(get_user_context),
 ):
     """
     Endpoint to receive messages from agents (agent -> user communication).
@@ -669,8 +876,7 @@ async def agent_message_user(
         description: Missing or invalid user information
     """
 
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         raise HTTPException(
             status_code=401, detail="Missing or invalid user information"
@@ -699,11 +905,124 @@ async def agent_message_user(
     }
 
 
-@app_v3.post("/upload_team_config")
+@app_v3.post("/batch")
+async def batch(
+    batch_request: BatchRequest, request: Request,
+    user: UserContext = Depends(get_user_context),
+):
+    """
+    Apply plan approvals, user clarifications and agent messages in one request.
+
+    Operations are applied in order with the effects of their own endpoints;
+    one that fails does not stop the others.
+
+    ---
+    tags:
+      - Plans
+    parameters:
+      - name: user_principal_id
+        in: header
+        type: string
+        required: true
+        description: User ID extracted from the authentication header
+    requestBody:
+      description: Operations to apply, in order
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              operations:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    type:
+                      type: string
+                      description: plan_approval, user_clarification or agent_message
+                    payload:
+                      type: object
+                      description: The body the operation's own endpoint takes
+    responses:
+      200:
+        description: One result per operation, in order
+        schema:
+          type: object
+          properties:
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                  type:
+                    type: string
+                  status_code:
+                    type: integer
+                    description: The status the operation's own endpoint would return
+                  body:
+                    type: object
+                    description: The endpoint's response (status_code < 400)
+                  detail:
+                    type: object
+                    description: The error detail (status_code >= 400)
+      400:
+        description: No operations, more than the batch size limit, or more
+          clarifications than the user_clarification rate limit allows at once
+      401:
+        description: Missing or invalid user information
+      429:
+        description: The batch's clarifications exceed the user_clarification
+          rate limit; retry after the number of seconds in the Retry-After header
+    """
+    user_id = user.user_principal_id
+    if not user_id:
+        raise HTTPException(
+            status_code=401, detail="Missing or invalid user information"
+        )
+    operations = batch_request.operations
+    if not operations or len(operations) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch takes between 1 and {MAX_BATCH_SIZE} operations",
+        )
+
+    # Each clarification takes a token of the user_clarification limit
+    clarifications = sum(
+        operation.type == BatchOperationType.user_clarification for operation in operations
+    )
+    if clarifications:
+        try:
+            await admission_controller.acquire(user_id, "user_clarification", clarifications)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        except RateLimitExceededError as e:
+            raise _too_many_requests(user_id, "user_clarification", e) from e
+    try:
+        memory_store = await DatabaseFactory.get_database(user_id=user_id)
+        results = await BatchService(memory_store, user_id).apply(operations)
+    finally:
+        if clarifications:
+            admission_controller.release()
+    return {"results": [result.to_dict() for result in results]}
+
+
+# Telemetry event label of each upload_team_config validation check
+_TEAM_CHECK_EVENT_LABELS = {
+    "rai": "RAI",
+    "models": "model",
+    "search_indexes": "search",
+}
+
+
+@app_v3.post("/upload_team_config", dependencies=[Depends(admission("upload_team_config"))])
 async def upload_team_config(
     request: Request,
     file: UploadFile = File(...),
     team_id: Optional[str] = Query(None),
+    user: UserContext = Depends(get_user_context),
 ):
     """
     Upload and save a team configuration JSON file.
@@ -729,12 +1048,14 @@ async def upload_team_config(
         description: Invalid request or file format
       401:
         description: Missing or invalid user information
+      429:
+        description: Rate limit exceeded or too many model requests in
+          progress; retry after the number of seconds in the Retry-After header
       500:
         description: Internal server error
     """
     # Validate user authentication
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         raise HTTPException(
             status_code=401, detail="Missing or invalid user information"
@@ -757,86 +1078,33 @@ async def upload_team_config(
                 status_code=400, detail=f"Invalid JSON format: {str(e)}"
             )
 
-        # Validate content with RAI before processing
-        if not team_id:
-            rai_valid, rai_error = await rai_validate_team_config(json_data)
-            if not rai_valid:
-                track_event_if_configured(
-                    "Team configuration RAI validation failed",
-                    {
-                        "status": "failed",
-                        "user_id": user_id,
-                        "filename": file.filename,
-                        "reason": rai_error,
-                    },
-                )
-                raise HTTPException(status_code=400, detail=rai_error)
-
-        track_event_if_configured(
-            "Team configuration RAI validation passed",
-            {"status": "passed", "user_id": user_id, "filename": file.filename},
-        )
         # Initialize memory store and service
         memory_store = await DatabaseFactory.get_database(user_id=user_id)
         team_service = TeamService(memory_store)
 
-        # Validate model deployments
-        models_valid, missing_models = await team_service.validate_team_models(
-            json_data
+        # Parse, then run the RAI (new teams only), model and search index
+        # checks concurrently; the first failure cancels the rest
+        validation = await TeamConfigValidator(team_service).validate(
+            json_data, user_id, check_rai=not team_id
         )
-        if not models_valid:
-            error_message = (
-                f"The following required models are not deployed in your Azure AI project: {', '.join(missing_models)}. "
-                f"Please deploy these models in Azure AI Foundry before uploading this team configuration."
-            )
-            track_event_if_configured(
-                "Team configuration model validation failed",
-                {
-                    "status": "failed",
-                    "user_id": user_id,
-                    "filename": file.filename,
-                    "missing_models": missing_models,
-                },
-            )
-            raise HTTPException(status_code=400, detail=error_message)
-
-        track_event_if_configured(
-            "Team configuration model validation passed",
-            {"status": "passed", "user_id": user_id, "filename": file.filename},
-        )
-
-        # Validate search indexes
-        search_valid, search_errors = await team_service.validate_team_search_indexes(
-            json_data
-        )
-        if not search_valid:
-            error_message = (
-                f"Search index validation failed:\n\n{chr(10).join([f'• {error}' for error in search_errors])}\n\n"
-                f"Please ensure all referenced search indexes exist in your Azure AI Search service."
-            )
-            track_event_if_configured(
-                "Team configuration search validation failed",
-                {
-                    "status": "failed",
+        for check in validation.checks:
+            label = _TEAM_CHECK_EVENT_LABELS.get(check.name)
+            if label and check.status in ("passed", "failed"):
+                properties = {
+                    "status": check.status,
                     "user_id": user_id,
                     "filename": file.filename,
-                    "search_errors": search_errors,
-                },
-            )
-            raise HTTPException(status_code=400, detail=error_message)
-
-        track_event_if_configured(
-            "Team configuration search validation passed",
-            {"status": "passed", "user_id": user_id, "filename": file.filename},
-        )
-
-        # Validate and parse the team configuration
-        try:
-            team_config = await team_service.validate_and_parse_team_config(
-                json_data, user_id
-            )
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+                    "duration_ms": check.duration_ms,
+                }
+                if check.status == "failed":
+                    properties.update(check.details or {"reason": check.error})
+                track_event_if_configured(
+                    f"Team configuration {label} validation {check.status}", properties
+                )
+        failure = validation.failure
+        if failure:
+            raise HTTPException(status_code=400, detail=failure.error)
+        team_config = validation.team_config
 
         # Save the configuration
         try:
@@ -845,6 +1113,7 @@ async def upload_team_config(
                 team_config.team_id = team_id
                 team_config.id = team_id  # Ensure id is also set for updates
             team_id = await team_service.save_team_configuration(team_config)
+            response_cache.invalidate("team_configs")
         except ValueError as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to save configuration: {str(e)}"
@@ -867,6 +1136,7 @@ async def upload_team_config(
             "name": team_config.name,
             "message": "Team configuration uploaded and saved successfully",
             "team": team_config.model_dump(),  # Return the full team configuration
+            "validation": validation.timings(),
         }
 
     except HTTPException:
@@ -877,7 +1147,7 @@ async def upload_team_config(
 
 
 @app_v3.get("/team_configs")
-async def get_team_configs(request: Request):
+async def get_team_configs(request: Request, user: UserContext = Depends(get_user_context)):
     """
     Retrieve all team configurations for the current user.
 
@@ -924,8 +1194,7 @@ async def get_team_configs(request: Request):
         description: Missing or invalid user information
     """
     # Validate user authentication
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         raise HTTPException(
             status_code=401, detail="Missing or invalid user information"
@@ -936,13 +1205,18 @@ async def get_team_configs(request: Request):
         memory_store = await DatabaseFactory.get_database(user_id=user_id)
         team_service = TeamService(memory_store)
 
-        # Retrieve all team configurations
-        team_configs = await team_service.get_all_team_configurations()
-
-        # Convert to dictionaries for response
-        configs_dict = [config.model_dump() for config in team_configs]
-
-        return configs_dict
+        async def render():
+            # Retrieve all team configurations
+            return await team_service.get_all_team_configurations()
+
+        # Team configurations are shared by all users, so is their response
+        return await response_cache.respond(
+            request,
+            "team_configs",
+            response_key("team_configs"),
+            await memory_store.get_teams_version(),
+            render,
+        )
 
     except Exception as e:
         logging.error(f"Error retrieving team configurations: {str(e)}")
@@ -950,7 +1224,7 @@ async def get_team_configs(request: Request):
 
 
 @app_v3.get("/team_configs/{team_id}")
-async def get_team_config_by_id(team_id: str, request: Request):
+async def get_team_config_by_id(team_id: str, request: Request, user: UserContext = Depends(get_user_context)):
     """
     Retrieve a specific team configuration by ID.
 
@@ -1002,8 +1276,7 @@ async def get_team_config_by_id(team_id: str, request: Request):
         description: Team configuration not found
     """
     # Validate user authentication
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         raise HTTPException(
             status_code=401, detail="Missing or invalid user information"
@@ -1032,7 +1305,7 @@ async def get_team_config_by_id(team_id: str, request: Request):
 
 
 @app_v3.delete("/team_configs/{team_id}")
-async def delete_team_config(team_id: str, request: Request):
+async def delete_team_config(team_id: str, request: Request, user: UserContext = Depends(get_user_context)):
     """
     Delete a team configuration by ID.
 
@@ -1068,8 +1341,7 @@ async def delete_team_config(team_id: str, request: Request):
         description: Team configuration not found
     """
     # Validate user authentication
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         raise HTTPException(
             status_code=401, detail="Missing or invalid user information"
@@ -1088,6 +1360,8 @@ async def delete_team_config(team_id: str, request: Request):
 
         if not deleted:
             raise HTTPException(status_code=404, detail="Team configuration not found")
+        response_cache.invalidate("team_configs")
+        response_cache.invalidate("plans", team_id=team_id)
 
         # Track the event
         track_event_if_configured(
@@ -1110,13 +1384,12 @@ async def delete_team_config(team_id: str, request: Request):
 
 
 @app_v3.post("/select_team")
-async def select_team(selection: TeamSelectionRequest, request: Request):
+async def select_team(selection: TeamSelectionRequest, request: Request, user: UserContext = Depends(get_user_context)):
     """
     Select the current team for the user session.
     """
     # Validate user authentication
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         raise HTTPException(
             status_code=401, detail="Missing or invalid user information"
@@ -1161,6 +1434,7 @@ async def select_team(selection: TeamSelectionRequest, request: Request):
         team_config.set_current_team(
             user_id=user_id, team_configuration=team_configuration
         )
+        response_cache.invalidate("plans", user_id)
 
         # Track the team selection event
         track_event_if_configured(
@@ -1201,10 +1475,23 @@ async def select_team(selection: TeamSelectionRequest, request: Request):
 
 # Get plans is called in the initial side rendering of the frontend
 @app_v3.get("/plans")
-async def get_plans(request: Request):
+async def get_plans(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PLANS_PAGE_SIZE),
+    continuation_token: Optional[str] = Query(None),
+    user: UserContext = Depends(get_user_context),
+):
     """
     Retrieve plans for the current user.
 
+    Plans are returned as summaries (ids, initial_goal, overall_status and
+    timestamp); ``/api/v3/plan`` returns the full plan.
+
+    Without ``limit`` or ``continuation_token`` every completed plan is
+    returned as an array. With either of them the response is a single page,
+    ``{"plans": [...], "continuation_token": "..."}``; pass the token back to
+    get the next page (it is null on the last one).
+
     ---
     tags:
       - Plans
@@ -1214,6 +1501,16 @@ async def get_plans(request: Request):
         type: string
         required: false
         description: Optional session ID to retrieve plans for a specific session
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-500); enables the paged response
+      - name: continuation_token
+        in: query
+        type: string
+        required: false
+        description: Token from the previous page; enables the paged response
     responses:
       200:
         description: List of plans with steps for the user
@@ -1260,8 +1557,7 @@ async def get_plans(request: Request):
         description: Plan not found
     """
 
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         track_event_if_configured(
             "UserIdNotFound", {"status_code": 400, "detail": "no user"}
@@ -1273,15 +1569,47 @@ async def get_plans(request: Request):
     # Initialize memory context
     memory_store = await DatabaseFactory.get_database(user_id=user_id)
 
+    paged = limit is not None or continuation_token is not None
+
     current_team = await memory_store.get_current_team(user_id=user_id)
     if not current_team:
-        return []
+        return {"plans": [], "continuation_token": None} if paged else []
 
-    all_plans = await memory_store.get_all_plans_by_team_id_status(
-        user_id=user_id, team_id=current_team.team_id, status=PlanStatus.completed
-    )
+    if paged:
+        try:
+            page = await memory_store.get_plan_summaries_page_by_team_id_status(
+                user_id=user_id,
+                team_id=current_team.team_id,
+                status=PlanStatus.completed,
+                limit=limit or DEFAULT_PLANS_PAGE_SIZE,
+                continuation_token=continuation_token,
+            )
+        except Exception as e:
+            logging.error(f"Error retrieving plans page: {str(e)}")
+            # Cosmos rejects malformed or expired tokens with a 400
+            if continuation_token and (
+                isinstance(e, ValueError) or getattr(e, "status_code", None) == 400
+            ):
+                raise HTTPException(status_code=400, detail="Invalid continuation token")
+            raise HTTPException(status_code=500, detail="Internal server error occurred")
+        return {"plans": page.items, "continuation_token": page.continuation_token}
+
+    # The list only needs summaries; /api/v3/plan loads the full document
+    async def render():
+        return await memory_store.get_plan_summaries_by_team_id_status(
+            user_id=user_id, team_id=current_team.team_id, status=PlanStatus.completed
+        )
 
-    return all_plans
+    # Answered with 304 or the cached body unless a listed plan changed
+    return await response_cache.respond(
+        request,
+        "plans",
+        response_key("plans", user_id, current_team.team_id),
+        await memory_store.get_plans_version(
+            user_id=user_id, team_id=current_team.team_id, status=PlanStatus.completed
+        ),
+        render,
+    )
 
 
 # Get plans is called in the initial side rendering of the frontend
@@ -1289,6 +1617,8 @@ async def get_plans(request: Request):
 async def get_plan_by_id(
     request: Request,
     plan_id: Optional[str] = Query(None),
+    include: Optional[str] = Query(None),
+    user: UserContext = Depends(get_user_context),
 ):
     """
     Retrieve plans for the current user.
@@ -1302,6 +1632,11 @@ async def get_plan_by_id(
         type: string
         required: false
         description: Optional session ID to retrieve plans for a specific session
+      - name: include
+        in: query
+        type: string
+        required: false
+        description: Comma separated parts to return besides the plan (team, messages); all by default
     responses:
       200:
         description: List of plans with steps for the user
@@ -1346,50 +1681,187 @@ async def get_plan_by_id(
         description: Missing or invalid user information
       404:
         description: Plan not found
+      500:
+        description: The plan, its team or its first agent messages could not be read
     """
 
-    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
-    user_id = authenticated_user["user_principal_id"]
+    user_id = user.user_principal_id
     if not user_id:
         track_event_if_configured(
             "UserIdNotFound", {"status_code": 400, "detail": "no user"}
         )
         raise HTTPException(status_code=400, detail="no user")
 
-    # <To do: Francia> Replace the following with code to get plan run history from the database
+    parts = _parse_plan_include(include)
+    if not plan_id:
+        track_event_if_configured(
+            "GetPlanId", {"status_code": 400, "detail": "no plan id"}
+        )
+        raise HTTPException(status_code=400, detail="no plan id")
 
     # Initialize memory context
     memory_store = await DatabaseFactory.get_database(user_id=user_id)
     try:
-        if plan_id:
-            plan = await memory_store.get_plan_by_plan_id(plan_id=plan_id)
-            if not plan:
-                track_event_if_configured(
-                    "GetPlanBySessionNotFound",
-                    {"status_code": 400, "detail": "Plan not found"},
-                )
-                raise HTTPException(status_code=404, detail="Plan not found")
+        plan = await memory_store.get_plan_by_plan_id(plan_id=plan_id)
+    except Exception as e:
+        logging.error(f"Error retrieving plan: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error occurred")
+    if not plan:
+        track_event_if_configured(
+            "GetPlanBySessionNotFound",
+            {"status_code": 400, "detail": "Plan not found"},
+        )
+        raise HTTPException(status_code=404, detail="Plan not found")
 
-            # Use get_steps_by_plan to match the original implementation
+    # Read the team and the first page of messages, concurrently, before the
+    # 200 is sent, so that their failures still get an error response
+    message_stream = (
+        memory_store.stream_agent_messages(plan.plan_id) if "messages" in parts else None
+    )
+    reads = [
+        asyncio.ensure_future(_read_team(memory_store, plan) if "team" in parts else _nothing()),
+        asyncio.ensure_future(
+            _first_message(message_stream) if message_stream is not None else _nothing()
+        ),
+    ]
+    try:
+        team, first_message = await asyncio.gather(*reads)
+    except Exception as e:
+        logging.error(f"Error retrieving plan {plan.plan_id}: {str(e)}")
+        for read in reads:
+            read.cancel()
+        await asyncio.gather(*reads, return_exceptions=True)
+        if message_stream is not None:
+            await message_stream.aclose()
+        raise HTTPException(status_code=500, detail="Internal server error occurred")
 
-            team = await memory_store.get_team_by_id(team_id=plan.team_id)
-            agent_messages = await memory_store.get_agent_messages(plan_id=plan.plan_id)
-            mplan = plan.m_plan if plan.m_plan else None
-            streaming_message = plan.streaming_message if plan.streaming_message else ""
-            plan.streaming_message = ""  # clear streaming message after retrieval
-            plan.m_plan = None  # remove m_plan from plan object for response
-            return {
-                "plan": plan,
-                "team": team if team else None,
-                "messages": agent_messages,
-                "m_plan": mplan,
-                "streaming_message": streaming_message,
-            }
-        else:
-            track_event_if_configured(
-                "GetPlanId", {"status_code": 400, "detail": "no plan id"}
-            )
-            raise HTTPException(status_code=400, detail="no plan id")
+    return StreamingResponse(
+        _plan_response_body(plan, parts, team, message_stream, first_message),
+        media_type="application/json",
+    )
+
+
+@app_v3.get("/plan/messages")
+async def get_plan_messages(
+    request: Request,
+    plan_id: Optional[str] = Query(None),
+    user: UserContext = Depends(get_user_context),
+):
+    """
+    Stream a plan's agent messages as newline-delimited JSON, oldest first.
+
+    One AgentMessageData object per line, written as the messages are read,
+    for clients that process long histories incrementally.
+
+    ---
+    tags:
+      - Plans
+    parameters:
+      - name: plan_id
+        in: query
+        type: string
+        required: true
+        description: The plan whose agent messages to return
+    responses:
+      200:
+        description: application/x-ndjson stream of agent messages
+      400:
+        description: Missing user or plan id
+      404:
+        description: Plan not found
+    """
+    user_id = user.user_principal_id
+    if not user_id:
+        track_event_if_configured(
+            "UserIdNotFound", {"status_code": 400, "detail": "no user"}
+        )
+        raise HTTPException(status_code=400, detail="no user")
+    if not plan_id:
+        raise HTTPException(status_code=400, detail="no plan id")
+
+    memory_store = await DatabaseFactory.get_database(user_id=user_id)
+    try:
+        plan = await memory_store.get_plan_by_plan_id(plan_id=plan_id)
     except Exception as e:
         logging.error(f"Error retrieving plan: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error occurred")
+    if not plan:
+        raise HTTPException(status_code=404, detail="Plan not found")
+
+    return NDJSONResponse(memory_store.stream_agent_messages(plan.plan_id))
+
+
+def _parse_plan_include(include: Optional[str]) -> Set[str]:
+    """Parse the include= selector of GET /api/v3/plan (everything by default)."""
+    if include is None:
+        return set(PLAN_INCLUDES)
+    parts = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = parts.difference(PLAN_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include value(s): {', '.join(sorted(unknown))}",
+        )
+    return parts
+
+
+# Marks a plan without agent messages
+_NO_MESSAGES = object()
+
+
+async def _nothing() -> None:
+    return None
+
+
+async def _read_team(memory_store, plan: Plan) -> Any:
+    return await memory_store.get_team_by_id(team_id=plan.team_id)
+
+
+async def _first_message(message_stream: AsyncIterator[AgentMessageData]) -> Any:
+    """The first agent message (reading the first page), or _NO_MESSAGES."""
+    try:
+        return await message_stream.__anext__()
+    except StopAsyncIteration:
+        return _NO_MESSAGES
+
+
+async def _plan_response_body(
+    plan: Plan,
+    parts: Set[str],
+    team: Any,
+    message_stream: Optional[AsyncIterator[AgentMessageData]],
+    first_message: Any,
+) -> AsyncIterator[bytes]:
+    """Write the plan, then its agent messages as they are read, then its team.
+
+    The team and the first message were read before the response started.
+    If reading a later page of messages fails, the status and part of the
+    body are already sent: the response is aborted, so the client gets a
+    truncated body (invalid JSON) rather than a complete-looking one.
+    """
+    try:
+        mplan = plan.m_plan if plan.m_plan else None
+        streaming_message = plan.streaming_message if plan.streaming_message else ""
+        plan.streaming_message = ""  # clear streaming message after retrieval
+        plan.m_plan = None  # remove m_plan from plan object for response
+        yield (
+            b'{"plan":' + to_json_bytes(plan)
+            + b',"m_plan":' + to_json_bytes(mplan)
+            + b',"streaming_message":' + to_json_bytes(streaming_message)
+        )
+        if message_stream is not None:
+            yield b',"messages":['
+            if first_message is not _NO_MESSAGES:
+                yield to_json_bytes(first_message)
+                async for message in message_stream:
+                    yield b"," + to_json_bytes(message)
+            yield b"]"
+        if "team" in parts:
+            yield b',"team":' + to_json_bytes(team if team else None)
+        yield b"}"
+    except Exception as e:
+        logging.error(f"Error streaming plan {plan.plan_id}: {str(e)}")
+        raise
+    finally:
+        if message_stream is not None:
+            await message_stream.aclose()
@@ -6,7 +6,14 @@ from contextlib import asynccontextmanager
 
 from azure.monitor.opentelemetry import configure_azure_monitor
 from common.config.app_config import config
+from common.database.database_factory import DatabaseFactory
+from common.jobs.job_pool import job_pool
 from common.models.messages_kernel import UserLanguage
+from common.services.rai_service import rai_service
+from common.utils.credential_broker import credential_broker
+from common.utils.rate_limiter import admission_controller
+from magentic_agents.agent_pool import agent_pool
+from magentic_agents.common.agent_index import agent_index
 
 # FastAPI imports
 from fastapi import FastAPI, Request
@@ -14,7 +21,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 # Local imports
 from middleware.health_check import HealthCheckMiddleware
+from auth.user_context import UserContextMiddleware
 from api.router import app_v3
+from api.responses import FastJSONResponse
+from orchestration.job_transport import job_transport
 
 # Azure monitoring
 
@@ -29,10 +39,44 @@ async def lifespan(app: FastAPI):
 
     # Startup
     logger.info("🚀 Starting MACAE application...")
+    await job_transport.start()
+    credential_broker.start()
+    agent_index.start()
+    try:
+        rai_service.open()
+    except Exception as e:
+        # Opened again on the first check
+        logger.error(f"❌ Error opening RAI service: {e}")
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down MACAE application...")
+    try:
+        # Let running orchestrations finish before their agents are removed
+        await job_pool.shutdown()
+    except Exception as e:
+        logger.error(f"❌ Error stopping orchestration jobs: {e}")
+
+    try:
+        await job_transport.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing orchestration job transport: {e}")
+
+    try:
+        await admission_controller.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing rate limit store: {e}")
+
+    try:
+        await agent_pool.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing pooled agents: {e}")
+
+    try:
+        await agent_index.close()
+    except Exception as e:
+        logger.error(f"❌ Error stopping agent index refresh: {e}")
+
     try:
         # Clean up all agents from Azure AI Foundry when container stops
         await agent_registry.cleanup_all_agents()
@@ -43,6 +87,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Error during shutdown cleanup: {e}")
 
+    try:
+        await rai_service.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing RAI service: {e}")
+
+    try:
+        # After the agents, which delete their definitions through its client
+        await credential_broker.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing shared Azure clients: {e}")
+
+    try:
+        # Release the shared Cosmos connection pool
+        await DatabaseFactory.close_all()
+    except Exception as e:
+        logger.error(f"❌ Error closing database connections: {e}")
+
     logger.info("👋 MACAE application shutdown complete")
 
 
@@ -75,7 +136,7 @@ logging.getLogger("azure.monitor.opentelemetry.exporter.export._base").setLevel(
 )
 
 # Initialize the FastAPI app
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 frontend_url = config.FRONTEND_SITE_NAME
 
@@ -90,6 +151,8 @@ app.add_middleware(
 
 # Configure health check
 app.add_middleware(HealthCheckMiddleware, password="", checks={})
+# Resolve the signed-in user once per request for the v3 handlers
+app.add_middleware(UserContextMiddleware)
 # v3 endpoints
 app.include_router(app_v3)
 logging.info("Added health check middleware")
@@ -1,6 +1,12 @@
 import base64
 import json
 import logging
+from functools import lru_cache
+
+from . import sample_user
+
+# Distinct x-ms-client-principal payloads whose tenant id is kept
+TENANT_ID_CACHE_SIZE = 1024
 
 
 def get_authenticated_user_details(request_headers):
@@ -10,8 +16,6 @@ def get_authenticated_user_details(request_headers):
     if "x-ms-client-principal-id" not in request_headers:
         logging.info("No user principal found in headers")
         # if it's not, assume we're in development mode and return a default user
-        from . import sample_user
-
         raw_user_object = sample_user.sample_user
     else:
         # if it is, get the user details from the EasyAuth headers
@@ -32,18 +36,21 @@ def get_authenticated_user_details(request_headers):
     return user_object
 
 
+@lru_cache(maxsize=TENANT_ID_CACHE_SIZE)
+def _decode_tenant_id(client_principal_b64: str) -> str:
+    # Decode the base64 header to get the JSON string
+    decoded_string = base64.b64decode(client_principal_b64).decode("utf-8")
+    # 'tid' typically holds the tenant ID
+    return json.loads(decoded_string).get("tid")
+
+
 def get_tenantid(client_principal_b64):
+    """Tenant id from the x-ms-client-principal header; decoded once per distinct payload."""
     logger = logging.getLogger(__name__)
     tenant_id = ""
     if client_principal_b64:
         try:
-            # Decode the base64 header to get the JSON string
-            decoded_bytes = base64.b64decode(client_principal_b64)
-            decoded_string = decoded_bytes.decode("utf-8")
-            # Convert the JSON string1into a Python dictionary
-            user_info = json.loads(decoded_string)
-            # Extract the tenant ID
-            tenant_id = user_info.get("tid")  # 'tid' typically holds the tenant ID
+            tenant_id = _decode_tenant_id(client_principal_b64)
         except Exception as ex:
             logger.exception(ex)
     return tenant_id
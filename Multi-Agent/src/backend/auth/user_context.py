@@ -0,0 +1,109 @@
+"""The signed-in user of the current request, resolved once by UserContextMiddleware."""
+
+import logging
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .auth_utils import get_tenantid
+from .sample_user import sample_user
+
+# EasyAuth header of each UserContext field
+_HEADERS = {
+    "user_principal_id": "x-ms-client-principal-id",
+    "user_name": "x-ms-client-principal-name",
+    "auth_provider": "x-ms-client-principal-idp",
+    "auth_token": "x-ms-token-aad-id-token",
+    "client_principal_b64": "x-ms-client-principal",
+    "aad_id_token": "x-ms-token-aad-id-token",
+}
+_HEADER_BYTES = {name.encode("latin-1"): name for name in set(_HEADERS.values())}
+
+
+@dataclass(frozen=True)
+class UserContext:
+    """User details from the App Service authentication (EasyAuth) headers."""
+
+    user_principal_id: Optional[str] = None
+    user_name: Optional[str] = None
+    auth_provider: Optional[str] = None
+    auth_token: Optional[str] = None
+    client_principal_b64: Optional[str] = None
+    aad_id_token: Optional[str] = None
+
+    @property
+    def tenant_id(self) -> str:
+        return get_tenantid(self.client_principal_b64)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The dict ``get_authenticated_user_details`` returns."""
+        return asdict(self)
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "UserContext":
+        """Build from lower-cased header names, as EasyAuth sends them."""
+        return cls(**{field: headers.get(name) for field, name in _HEADERS.items()})
+
+
+# Without EasyAuth (local development) every request acts as the sample user
+DEVELOPMENT_USER = UserContext.from_headers({k.lower(): v for k, v in sample_user.items()})
+
+_current_user: ContextVar[Optional[UserContext]] = ContextVar("current_user", default=None)
+
+
+def user_context_from_raw_headers(raw_headers: Iterable[Tuple[bytes, bytes]]) -> UserContext:
+    """Resolve the user from ASGI headers, which arrive with lower-cased names."""
+    values: Dict[str, str] = {}
+    for name, value in raw_headers:
+        header = _HEADER_BYTES.get(name)
+        if header is not None:
+            values[header] = value.decode("latin-1")
+    if _HEADERS["user_principal_id"] not in values:
+        return DEVELOPMENT_USER
+    return UserContext.from_headers(values)
+
+
+def current_user() -> Optional[UserContext]:
+    """The user of the request being handled, if UserContextMiddleware resolved one."""
+    return _current_user.get()
+
+
+async def get_user_context(request: Request) -> UserContext:
+    """FastAPI dependency returning the user of the request.
+
+    Falls back to reading the headers when the app runs without
+    UserContextMiddleware (routers mounted on a bare app in tests).
+    """
+    user = request.scope.get("user_context") or _current_user.get()
+    if user is None:
+        user = user_context_from_raw_headers(request.scope.get("headers", ()))
+    return user
+
+
+class UserContextMiddleware:
+    """ASGI middleware resolving the user once per HTTP request or WebSocket.
+
+    The user is stored in the ASGI scope (``scope["user_context"]``) and in a
+    context variable for code that has no access to the request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.logger = logging.getLogger(__name__)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        user = user_context_from_raw_headers(scope.get("headers", ()))
+        if user is DEVELOPMENT_USER:
+            self.logger.debug("No user principal found in headers")
+        scope["user_context"] = user
+        token = _current_user.set(user)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_user.reset(token)
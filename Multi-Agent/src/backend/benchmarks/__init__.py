@@ -0,0 +1 @@
+"""Local performance benchmarks for the backend (run from src/backend with ``python -m benchmarks.<name>``)."""
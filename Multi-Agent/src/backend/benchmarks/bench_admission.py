@@ -0,0 +1,164 @@
+"""Model calls and latency under a noisy user, without and with admission control.
+
+One noisy user fires ``--requests`` bursts of ``--noisy`` concurrent
+``POST /api/v3/user_clarification`` requests while ``--users`` other users
+send ``--requests`` each, one after the other. The RAI check is replaced by
+a fake model call of ``--llm-ms`` that counts calls and their peak
+concurrency:
+
+* ``off``: no rate limits and no concurrency bound (the handlers as they were)
+* ``memory`` / ``sqlite``: 10 clarifications per user per minute and at most
+  ``--max-concurrent`` model requests, with the bucket store named
+
+then times how long refusing one over-limit request takes with each store.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_admission --noisy 200 --users 6 --requests 3
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from common.utils.rate_limiter import (  # noqa: E402
+    AdmissionController,
+    MemoryTokenBucketStore,
+    RateLimit,
+    RateLimitExceededError,
+    SqliteTokenBucketStore,
+)
+
+LIMITS = {"user_clarification": RateLimit(10, 60)}
+
+
+class FakeModel:
+    """Stands in for the RAI model call."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, text: str) -> bool:
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.seconds)
+        finally:
+            self.active -= 1
+        return True
+
+
+def controller_for(mode: str, max_concurrent: int, directory: str) -> AdmissionController:
+    if mode == "off":
+        return AdmissionController(MemoryTokenBucketStore(), {})
+    if mode == "sqlite":
+        store = SqliteTokenBucketStore(os.path.join(directory, f"buckets-{time.time_ns()}.sqlite3"))
+    else:
+        store = MemoryTokenBucketStore()
+    return AdmissionController(store, LIMITS, max_concurrent=max_concurrent, request_seconds=1)
+
+
+async def run_mode(mode: str, args, directory: str) -> dict:
+    from api.router import app_v3
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    model = FakeModel(args.llm_ms / 1000)
+    controller = controller_for(mode, args.max_concurrent, directory)
+    normal_latencies, statuses = [], {"noisy": [], "normal": []}
+
+    async def send(client, user_id, kind):
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/v3/user_clarification",
+            json={"request_id": "req-none", "answer": "Yes"},
+            headers={"x-ms-client-principal-id": user_id},
+        )
+        if kind == "normal":
+            normal_latencies.append((time.perf_counter() - started) * 1000)
+        statuses[kind].append(response.status_code)
+
+    limits = httpx.Limits(max_connections=None)
+    with patch("api.router.admission_controller", controller), patch("api.router.rai_success", model):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", limits=limits
+        ) as client:
+            started = time.perf_counter()
+
+            async def noisy_waves():
+                # The burst is repeated while the other users are active
+                for _ in range(args.requests):
+                    await asyncio.gather(*(send(client, "user-noisy", "noisy") for _ in range(args.noisy)))
+
+            async def normal_user(user_id):
+                # One request per model call time, the first while the first burst runs
+                for _ in range(args.requests):
+                    await asyncio.sleep(model.seconds / 2)
+                    await send(client, user_id, "normal")
+
+            await asyncio.gather(noisy_waves(), *(normal_user(f"user-{u}") for u in range(args.users)))
+            elapsed = time.perf_counter() - started
+    await controller.close()
+    summary = latency_summary(normal_latencies)
+    return {
+        "mode": mode,
+        "model_calls": model.calls,
+        "peak_model_concurrency": model.peak,
+        "noisy_refused": statuses["noisy"].count(429),
+        "normal_refused": statuses["normal"].count(429),
+        "normal_p50_ms": summary["p50_ms"],
+        "normal_p99_ms": summary["p99_ms"],
+        "elapsed_s": round(elapsed, 2),
+    }
+
+
+async def refusal_cost(mode: str, directory: str, repeat: int) -> dict:
+    controller = controller_for(mode, 0, directory)
+    for _ in range(10):
+        await controller.acquire("user-bench", "user_clarification")
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        try:
+            await controller.acquire("user-bench", "user_clarification")
+        except RateLimitExceededError:
+            pass
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    await controller.close()
+    return {"store": mode, "refusal_p50_us": latency_summary(samples)["p50_ms"]}
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        rows = [await run_mode(mode, args, directory) for mode in ("off", "memory", "sqlite")]
+        costs = [await refusal_cost(mode, directory, 1000) for mode in ("memory", "sqlite")]
+    print_table(
+        f"{args.requests}x{args.noisy} noisy + {args.users}x{args.requests} normal clarifications, "
+        f"{args.llm_ms}ms model call, max {args.max_concurrent} concurrent",
+        rows,
+    )
+    print_table("Cost of refusing one over-limit request", costs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--noisy", type=int, default=200)
+    parser.add_argument("--users", type=int, default=6)
+    parser.add_argument("--requests", type=int, default=3)
+    parser.add_argument("--llm-ms", type=float, default=200)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
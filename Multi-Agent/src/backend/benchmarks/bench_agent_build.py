@@ -0,0 +1,101 @@
+"""Time to build a team's agents in ``MagenticAgentFactory.get_agents``, one at a time vs concurrently.
+
+Every ``FoundryAgentTemplate.open()`` is replaced by a stand-in that waits as
+long as agent ``i``'s credential setup, MCP handshake, ``list_agents`` and
+``create_agent`` calls take: ``--open-ms`` plus ``--spread-ms`` per position
+in the team, so the last agent is the slowest. ``get_agents`` then builds a
+team of ``--agents`` agents ``--repeat`` times with:
+
+* ``serial``: ``AGENT_BUILD_CONCURRENCY=1`` (one agent at a time, as before)
+* ``concurrent``: ``AGENT_BUILD_CONCURRENCY`` agents at a time
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_agent_build --agents 6 --repeat 5
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+from common.config.app_config import config  # noqa: E402
+from common.models.messages_kernel import TeamAgent, TeamConfiguration  # noqa: E402
+from magentic_agents.agent_pool import AgentPool  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+from magentic_agents.magentic_agent_factory import MagenticAgentFactory  # noqa: E402
+
+
+def team(agents: int, run: int) -> TeamConfiguration:
+    team_id = f"team-bench-{run}"
+    return TeamConfiguration(
+        id=team_id,
+        team_id=team_id,
+        session_id=team_id,
+        name="Human Resources Team",
+        status="visible",
+        created="2024-01-01T00:00:00Z",
+        created_by="admin",
+        user_id="admin",
+        agents=[
+            TeamAgent(
+                input_key=f"agent-{i}",
+                type="ai",
+                name=f"Agent{i}",
+                deployment_name="gpt-4.1",
+                icon="Person",
+                system_message="You are a helpful agent.",
+                description="Handles part of the onboarding process.",
+            )
+            for i in range(agents)
+        ],
+    )
+
+
+async def run_mode(mode: str, args) -> dict:
+    open_seconds = {f"Agent{i}": (args.open_ms + i * args.spread_ms) / 1000 for i in range(args.agents)}
+
+    async def open_template(template):
+        await asyncio.sleep(open_seconds[template.agent_name])
+        template._agent = SimpleNamespace(name=template.agent_name)
+        return template
+
+    concurrency = 1 if mode == "serial" else args.concurrency
+    latencies = []
+    with patch.object(FoundryAgentTemplate, "open", open_template), patch.object(
+        config, "AGENT_BUILD_CONCURRENCY", concurrency
+    ), patch("magentic_agents.magentic_agent_factory.agent_pool", AgentPool()):
+        for run in range(args.repeat):
+            started = time.perf_counter()
+            agents = await MagenticAgentFactory().get_agents("user-bench", team(args.agents, run))
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert [agent.agent_name for agent in agents] == list(open_seconds)
+    summary = latency_summary(latencies)
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "p50_ms": summary["p50_ms"],
+        "p99_ms": summary["p99_ms"],
+        "slowest_agent_ms": max(open_seconds.values()) * 1000,
+        "sum_of_agents_ms": sum(open_seconds.values()) * 1000,
+    }
+
+
+async def main(args) -> None:
+    rows = [await run_mode(mode, args) for mode in ("serial", "concurrent")]
+    print_table(f"get_agents for a team of {args.agents} Foundry agents", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--open-ms", type=float, default=300)
+    parser.add_argument("--spread-ms", type=float, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,153 @@
+"""Agent definition lookup time in ``FoundryAgentTemplate`` with a ``list_agents`` scan per open vs the agent index.
+
+A stand-in project client holds ``--project-agents`` agent definitions and
+pages ``list_agents`` ``--page-size`` at a time, each page taking
+``--page-ms``; ``get_agent`` and ``connections.get`` take ``--call-ms``.
+``--opens`` templates (one per agent of a team, the team's agents listed
+last) then look up their definition and search connection:
+
+* ``scan``: the lookups as they were (``list_agents`` scan, uncached connection)
+* ``cold``: the agent index on the first open of a process (one scan,
+  shared by every template)
+* ``warm``: the agent index on later opens
+* ``saved``: an agent index loaded from the file an earlier process saved
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_agent_index --project-agents 2000 --opens 6
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+from magentic_agents.common.agent_index import AgentDefinitionIndex  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+from magentic_agents.models.agent_models import SearchConfig  # noqa: E402
+
+ENDPOINT = "https://agents.bench/"
+
+
+class ProjectStandIn:
+    """``AIProjectClient`` of a project with many agent definitions."""
+
+    def __init__(self, agents: int, page_size: int, page_ms: float, call_ms: float):
+        self.definitions = [SimpleNamespace(id=f"asst_{i:05d}", name=f"Agent{i}") for i in range(agents)]
+        self.by_id = {d.id: d for d in self.definitions}
+        self.page_size = page_size
+        self.page_seconds = page_ms / 1000
+        self.call_seconds = call_ms / 1000
+        self.calls = 0
+        self.agents = SimpleNamespace(list_agents=self.list_agents, get_agent=self.get_agent)
+        self.connections = SimpleNamespace(get=self.get_connection)
+
+    async def list_agents(self):
+        for start in range(0, len(self.definitions), self.page_size):
+            self.calls += 1
+            await asyncio.sleep(self.page_seconds)
+            for definition in self.definitions[start:start + self.page_size]:
+                yield definition
+
+    async def get_agent(self, agent_id):
+        self.calls += 1
+        await asyncio.sleep(self.call_seconds)
+        return self.by_id[agent_id]
+
+    async def get_connection(self, name):
+        self.calls += 1
+        await asyncio.sleep(self.call_seconds)
+        return SimpleNamespace(id=f"conn-{name}")
+
+
+async def scan_lookup(self, agent_name):
+    """The lookup as it was before the index."""
+    async for agent in self.client.agents.list_agents():
+        if agent.name == agent_name:
+            return await self.client.agents.get_agent(agent.id)
+    return None
+
+
+async def scan_connection(self, client, connection_name):
+    return await client.connections.get(name=connection_name)
+
+
+async def run_mode(mode: str, args, path: str) -> dict:
+    project = ProjectStandIn(args.project_agents, args.page_size, args.page_ms, args.call_ms)
+    if mode == "saved":
+        saved = AgentDefinitionIndex(ENDPOINT, path=path)
+        await saved.refresh(project)
+    index = AgentDefinitionIndex(ENDPOINT, path=path if mode == "saved" else None)
+    if mode == "warm":
+        await index.refresh(project)
+    project.calls = 0
+
+    patches = [patch("magentic_agents.foundry_agent.agent_index", index)]
+    if mode == "scan":
+        patches += [
+            patch.object(FoundryAgentTemplate, "_get_azure_ai_agent_definition", scan_lookup),
+            patch.object(AgentDefinitionIndex, "get_connection", scan_connection),
+        ]
+    names = [f"Agent{args.project_agents - 1 - i}" for i in range(args.opens)]
+    latencies = []
+
+    async def open_one(name):
+        template = FoundryAgentTemplate(
+            agent_name=name,
+            agent_description="",
+            agent_instructions="",
+            model_deployment_name="gpt-4.1",
+            search_config=SearchConfig(connection_name="search", endpoint="https://s", index_name="docs"),
+        )
+        template.client = project
+        started = time.perf_counter()
+        definition = await template._get_azure_ai_agent_definition(name)
+        await template._make_azure_search_tool()
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert definition.name == name
+
+    for p in patches:
+        p.start()
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(open_one(name) for name in names))
+        elapsed = time.perf_counter() - started
+    finally:
+        for p in reversed(patches):
+            p.stop()
+    summary = latency_summary(latencies)
+    return {
+        "mode": mode,
+        "p50_ms": summary["p50_ms"],
+        "max_ms": round(max(latencies), 2),
+        "total_ms": round(elapsed * 1000, 2),
+        "foundry_calls": project.calls,
+    }
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "agent_index.json")
+        rows = [await run_mode(mode, args, path) for mode in ("scan", "cold", "warm", "saved")]
+    print_table(
+        f"Definition + connection lookup for {args.opens} templates in a project of "
+        f"{args.project_agents} agents ({args.page_size} per page, {args.page_ms:g}ms per page)",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-agents", type=int, default=2000)
+    parser.add_argument("--opens", type=int, default=6)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--page-ms", type=float, default=80)
+    parser.add_argument("--call-ms", type=float, default=40)
+    asyncio.run(main(parser.parse_args()))
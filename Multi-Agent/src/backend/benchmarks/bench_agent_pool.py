@@ -0,0 +1,187 @@
+"""``GET /api/v3/init_team`` latency for many users of the same team, with and without the agent pool.
+
+Every ``FoundryAgentTemplate.open()`` is replaced by a stand-in that waits as
+long as the Foundry calls it makes: ``--client-ms`` for the credential and
+project client, ``--list-ms`` to list the project's agents and
+``--definition-ms`` to fetch the agent definition. ``--users`` users then call
+``init_team`` one after the other (``sequential``) and all at once
+(``burst``):
+
+* ``per_user``: every user opens their own templates (the factory as it was)
+* ``pooled``: users get handles on the team's pooled templates
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_agent_pool --users 100 --agents 4
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    TeamAgent,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+from config.settings import orchestration_config  # noqa: E402
+from magentic_agents.agent_pool import AgentPool  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+from magentic_agents.magentic_agent_factory import MagenticAgentFactory  # noqa: E402
+
+TEAM_ID = "team-bench"
+# Foundry calls made by one open(): client, list_agents, get_agent
+CALLS_PER_OPEN = 3
+
+
+class FoundryStandIn:
+    """Counts template opens and sleeps for their Foundry round trips."""
+
+    def __init__(self, client_ms: float, list_ms: float, definition_ms: float):
+        self.seconds = (client_ms + list_ms + definition_ms) / 1000
+        self.opens = 0
+
+    def patch(self):
+        stand_in = self
+
+        async def open_template(template):
+            stand_in.opens += 1
+            await asyncio.sleep(stand_in.seconds)
+            template._agent = SimpleNamespace(
+                name=template.agent_name,
+                description=template.agent_description,
+                definition=SimpleNamespace(id=f"asst_{template.agent_name}"),
+            )
+            return template
+
+        async def close_template(template):
+            template._agent = None
+
+        return (
+            patch.object(FoundryAgentTemplate, "open", open_template),
+            patch.object(FoundryAgentTemplate, "close", close_template),
+        )
+
+
+def team(agents: int) -> TeamConfiguration:
+    return TeamConfiguration(
+        id=TEAM_ID,
+        team_id=TEAM_ID,
+        session_id=TEAM_ID,
+        name="Human Resources Team",
+        status="visible",
+        created="2024-01-01T00:00:00Z",
+        created_by="admin",
+        user_id="admin",
+        agents=[
+            TeamAgent(
+                input_key=f"agent-{i}",
+                type="ai",
+                name=f"Agent{i}",
+                deployment_name="gpt-4.1",
+                icon="Person",
+                system_message="You are a helpful agent.",
+                description="Handles part of the onboarding process.",
+            )
+            for i in range(agents)
+        ]
+        + [TeamAgent(input_key="proxy", type="proxy", name="ProxyAgent", deployment_name="", icon="Person")],
+    )
+
+
+async def run_mode(mode: str, arrival: str, args) -> dict:
+    from api.router import app_v3
+
+    db = MemoryDatabase()
+    await db.add_team(team(args.agents))
+    users = [f"user-{arrival}-{u:04d}" for u in range(args.users)]
+    for user_id in users:
+        await db.set_current_team(UserCurrentTeam(user_id=user_id, team_id=TEAM_ID))
+
+    async def get_database(user_id: str = "", force_new: bool = False):
+        return db.for_user(user_id)
+
+    create = MagenticAgentFactory.create_agent_from_config
+
+    async def create_per_user(self, user_id, agent_obj, team_id=None):
+        return await create(self, user_id, agent_obj)
+
+    stand_in = FoundryStandIn(args.client_ms, args.list_ms, args.definition_ms)
+    patches = [
+        patch("api.router.DatabaseFactory.get_database", get_database),
+        patch("magentic_agents.magentic_agent_factory.agent_pool", AgentPool(idle_seconds=900)),
+        *stand_in.patch(),
+    ]
+    if mode == "per_user":
+        patches.append(patch.object(MagenticAgentFactory, "create_agent_from_config", create_per_user))
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    latencies = []
+
+    async def init_team(client, user_id):
+        started = time.perf_counter()
+        response = await client.get("/api/v3/init_team", headers={"x-ms-client-principal-id": user_id})
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+
+    for p in patches:
+        p.start()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            started = time.perf_counter()
+            if arrival == "sequential":
+                for user_id in users:
+                    await init_team(client, user_id)
+            else:
+                await asyncio.gather(*(init_team(client, user_id) for user_id in users))
+            elapsed = time.perf_counter() - started
+    finally:
+        for p in reversed(patches):
+            p.stop()
+        for user_id in users:
+            orchestration_config.orchestrations.pop(user_id, None)
+    await db.close()
+    summary = latency_summary(latencies)
+    return {
+        "arrival": arrival,
+        "mode": mode,
+        "p50_ms": summary["p50_ms"],
+        "p99_ms": summary["p99_ms"],
+        "total_s": round(elapsed, 2),
+        "template_opens": stand_in.opens,
+        "foundry_calls": stand_in.opens * CALLS_PER_OPEN,
+    }
+
+
+async def main(args) -> None:
+    rows = [
+        await run_mode(mode, arrival, args)
+        for arrival in ("sequential", "burst")
+        for mode in ("per_user", "pooled")
+    ]
+    print_table(
+        f"init_team for {args.users} users of one team with {args.agents} Foundry agents, "
+        f"{args.client_ms + args.list_ms + args.definition_ms:g}ms per template open",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--client-ms", type=float, default=50)
+    parser.add_argument("--list-ms", type=float, default=150)
+    parser.add_argument("--definition-ms", type=float, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,124 @@
+"""Cost of sending a burst of agent messages one request each vs through ``/api/v3/batch``.
+
+Seeds a plan in the Cosmos stand-in, then records ``--messages`` agent
+messages for it (the last one final, completing the plan):
+
+* ``single``: one ``POST /api/v3/agent_message`` per message
+* ``batch``: one ``POST /api/v3/batch`` carrying every message, written as
+  transactional batches to the plan's partition
+
+Write-behind is off so every write reaches Cosmos before the response.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_batch --messages 50 --repeat 10 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import Plan  # noqa: E402
+
+USER_ID = "user-bench"
+HEADERS = {"x-ms-client-principal-id": USER_ID}
+
+
+def agent_messages(plan_id: str, count: int) -> list:
+    return [
+        {
+            "plan_id": plan_id,
+            "agent": f"Agent{m % 4}",
+            "agent_type": "AI_Agent",
+            "content": f"Step {m}: " + "Lorem ipsum dolor sit amet. " * 10,
+            "is_final": m == count - 1,
+            "streaming_message": "Done" if m == count - 1 else "",
+        }
+        for m in range(count)
+    ]
+
+
+async def send_single(client: httpx.AsyncClient, payloads: list) -> None:
+    for payload in payloads:
+        response = await client.post("/api/v3/agent_message", json=payload)
+        response.raise_for_status()
+
+
+async def send_batch(client: httpx.AsyncClient, payloads: list) -> None:
+    operations = [{"type": "agent_message", "payload": payload} for payload in payloads]
+    response = await client.post("/api/v3/batch", json={"operations": operations})
+    response.raise_for_status()
+    assert all(result["status_code"] == 200 for result in response.json()["results"])
+
+
+async def run_mode(mode: str, messages: int, repeat: int) -> dict:
+    from api.router import app_v3
+
+    cosmos_stub.reset_stub()
+    db = CosmosDBClient("https://stub", None, "macae", "memory")
+    await db.initialize()
+    store = db.for_user(USER_ID)
+
+    async def get_database(user_id: str = "", force_new: bool = False):
+        return db.for_user(user_id)
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    send = send_single if mode == "single" else send_batch
+    latencies, round_trips, charge = [], 0, 0.0
+    with patch("api.router.DatabaseFactory.get_database", get_database):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", headers=HEADERS
+        ) as client:
+            for run in range(repeat):
+                plan_id = f"plan-{mode}-{run:03d}"
+                await store.add_plan(
+                    Plan(id=plan_id, plan_id=plan_id, user_id=USER_ID, team_id="team-bench", initial_goal="Bench")
+                )
+                payloads = agent_messages(plan_id, messages)
+                cosmos_stub.stats.reset()
+                started = time.perf_counter()
+                await send(client, payloads)
+                latencies.append((time.perf_counter() - started) * 1000)
+                round_trips += sum(cosmos_stub.stats.operations.values())
+                charge += cosmos_stub.stats.snapshot()["request_charge"]
+    await db.close()
+    summary = latency_summary(latencies)
+    return {
+        "mode": mode,
+        "http_requests": messages if mode == "single" else 1,
+        "p50_ms": summary["p50_ms"],
+        "p99_ms": summary["p99_ms"],
+        "round_trips": round(round_trips / repeat, 1),
+        "ru": round(charge / repeat, 2),
+    }
+
+
+async def main(messages: int, repeat: int, latency_ms: float) -> None:
+    cosmos_stub.CosmosClientStub.latency = latency_ms / 1000
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        rows = [await run_mode(mode, messages, repeat) for mode in ("single", "batch")]
+    print_table(
+        f"{messages} agent messages per burst, {repeat} bursts, {latency_ms}ms per Cosmos request",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.repeat, args.latency_ms))
@@ -0,0 +1,192 @@
+"""Cost of the frontend polling ``/api/v3/team_configs`` and ``/api/v3/plans``.
+
+Seeds team configurations and a user's completed plans in the Cosmos stand-in,
+then polls both lists:
+
+* ``before``: the handlers as they were, querying and re-serializing every
+  document on each call
+* ``no_etag``: current handlers with the response cache off and a client that
+  ignores ETags (version query + full query + serialization)
+* ``cached``: response cache on, client ignores ETags (version query, body
+  from the cache)
+* ``if_none_match``: response cache on, client revalidates with its ETag
+  (version query, 304 without a body)
+
+The team cache is off unless ``--team-cache-ttl`` is set, so every version
+query reaches Cosmos.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_conditional_get --polls 200 --teams 20 --plans 100
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    Plan,
+    PlanStatus,
+    TeamAgent,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+
+USER_ID = "user-bench"
+TEAM_ID = "team-0000"
+HEADERS = {"x-ms-client-principal-id": USER_ID}
+ROUTES = ("team_configs", "plans")
+
+
+async def seed(db: CosmosDBClient, teams: int, plans: int) -> None:
+    for t in range(teams):
+        team_id = f"team-{t:04d}"
+        await db.add_team(
+            TeamConfiguration(
+                id=team_id,
+                team_id=team_id,
+                session_id=team_id,
+                name=f"Team {t}",
+                status="visible",
+                created=f"2024-01-{t % 28 + 1:02d}T00:00:00Z",
+                created_by=USER_ID,
+                user_id=USER_ID,
+                agents=[
+                    TeamAgent(
+                        input_key=f"agent-{i}",
+                        type="ai",
+                        name=f"Agent{i}",
+                        deployment_name="gpt-4o",
+                        icon="Person",
+                        system_message="You are a helpful agent. " * 20,
+                        description="Handles part of the process.",
+                    )
+                    for i in range(4)
+                ],
+            )
+        )
+    await db.set_current_team(UserCurrentTeam(user_id=USER_ID, team_id=TEAM_ID))
+    for p in range(plans):
+        plan_id = f"plan-{p:04d}"
+        await db.add_plan(
+            Plan(
+                id=plan_id,
+                plan_id=plan_id,
+                user_id=USER_ID,
+                team_id=TEAM_ID,
+                initial_goal=f"Onboard new employee number {p}",
+                overall_status=PlanStatus.completed,
+                m_plan={"steps": [{"agent": "HRHelperAgent", "action": "Do something"}] * 10},
+            )
+        )
+
+
+def before_app(db: CosmosDBClient) -> FastAPI:
+    """The two handlers as they were before conditional GET."""
+    app = FastAPI()
+
+    @app.get("/api/v3/team_configs")
+    async def team_configs(request: Request):
+        return [config.model_dump() for config in await db.get_all_teams()]
+
+    @app.get("/api/v3/plans")
+    async def plans(request: Request):
+        current_team = await db.get_current_team(user_id=USER_ID)
+        return await db.get_plan_summaries_by_team_id_status(
+            user_id=USER_ID, team_id=current_team.team_id, status=PlanStatus.completed
+        )
+
+    return app
+
+
+def current_app() -> FastAPI:
+    from api.router import app_v3
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    return app
+
+
+async def run_mode(mode: str, polls: int, teams: int, plans: int, team_cache_ttl: float) -> list:
+    from api.response_cache import response_cache
+
+    cosmos_stub.reset_stub()
+    db = CosmosDBClient(
+        "https://stub", None, "macae", "memory", team_cache_ttl_seconds=team_cache_ttl
+    )
+    await db.initialize()
+    await seed(db.for_user(USER_ID), teams, plans)
+
+    async def get_database(user_id: str = "", force_new: bool = False):
+        return db.for_user(user_id)
+
+    response_cache.clear()
+    response_cache.ttl_seconds = 0 if mode == "no_etag" else 300
+    app = before_app(db) if mode == "before" else current_app()
+    rows = []
+    with patch("api.router.DatabaseFactory.get_database", get_database):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", headers=HEADERS
+        ) as client:
+            for route in ROUTES:
+                path = f"/api/v3/{route}"
+                etag = (await client.get(path)).headers.get("etag")
+                cosmos_stub.stats.reset()
+                latencies, received = [], 0
+                for _ in range(polls):
+                    headers = {"If-None-Match": etag} if mode == "if_none_match" else {}
+                    started = time.perf_counter()
+                    response = await client.get(path, headers=headers)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    assert response.status_code in (200, 304)
+                    received += len(response.content)
+                stats = cosmos_stub.stats.snapshot()
+                summary = latency_summary(latencies)
+                rows.append(
+                    {
+                        "route": route,
+                        "mode": mode,
+                        "p50_ms": summary["p50_ms"],
+                        "p99_ms": summary["p99_ms"],
+                        "round_trips_per_poll": round(sum(cosmos_stub.stats.operations.values()) / polls, 2),
+                        "ru_per_poll": round(stats["request_charge"] / polls, 2),
+                        "bytes_per_poll": received // polls,
+                    }
+                )
+    await db.close()
+    return rows
+
+
+async def main(polls: int, teams: int, plans: int, latency_ms: float, team_cache_ttl: float) -> None:
+    cosmos_stub.CosmosClientStub.latency = latency_ms / 1000
+    rows = []
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        for mode in ("before", "no_etag", "cached", "if_none_match"):
+            rows.extend(await run_mode(mode, polls, teams, plans, team_cache_ttl))
+    rows.sort(key=lambda row: ROUTES.index(row["route"]))
+    print_table(
+        f"{polls} polls per route, {teams} teams, {plans} plans, {latency_ms}ms per Cosmos request",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--plans", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--team-cache-ttl", type=float, default=0)
+    args = parser.parse_args()
+    asyncio.run(main(args.polls, args.teams, args.plans, args.latency_ms, args.team_cache_ttl))
@@ -0,0 +1,111 @@
+"""Token requests and event-loop stalls of ``ad_token_provider`` calls with per-agent credentials vs the credential broker.
+
+``--agents`` agents (reasoning templates, the Magentic manager and other
+chat services) each make ``--calls`` model calls, all concurrently. Every
+model call first calls the service's synchronous ``ad_token_provider`` on
+the event loop, then waits ``--llm-ms``. The credential is a stand-in that
+blocks ``--token-ms`` for each token it issues:
+
+* ``per_agent``: each agent has its own credential, and each token is
+  requested when the provider is called (the providers as they were, with
+  no token cache in the credential: the worst case, since some Azure
+  credentials cache tokens per instance)
+* ``broker``: every agent uses ``credential_broker.token_provider``, and the
+  token is renewed in the background before it expires
+
+A heartbeat task measures the longest stall of the event loop.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_credential_broker --agents 20 --calls 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import print_table, setup_environment
+
+setup_environment()
+
+from azure.core.credentials import AccessToken  # noqa: E402
+
+from common.utils.credential_broker import CredentialBroker  # noqa: E402
+
+SCOPE = "https://cognitiveservices.azure.com/.default"
+
+
+class SlowCredential:
+    """Blocks for every token it issues, as a token request to the identity provider does."""
+
+    issued = 0
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def get_token(self, *scopes, **kwargs):
+        time.sleep(self.seconds)
+        SlowCredential.issued += 1
+        return AccessToken("token", int(time.time() + 3600))
+
+
+async def heartbeat(stop: asyncio.Event, stalls: list) -> None:
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.005)
+        now = time.perf_counter()
+        stalls.append((now - last - 0.005) * 1000)
+        last = now
+
+
+async def run_mode(mode: str, args) -> dict:
+    SlowCredential.issued = 0
+    token_seconds = args.token_ms / 1000
+    if mode == "per_agent":
+        providers = []
+        for _ in range(args.agents):
+            credential = SlowCredential(token_seconds)
+            providers.append(lambda credential=credential: credential.get_token(SCOPE).token)
+    else:
+        broker = CredentialBroker(lambda: SlowCredential(token_seconds), refresh_margin_seconds=300)
+        # Warmed at startup and kept fresh by the background renewal
+        await broker.get_token_async(SCOPE)
+        providers = [broker.token_provider(SCOPE)] * args.agents
+    warmup_tokens = SlowCredential.issued
+
+    async def agent(provider):
+        for _ in range(args.calls):
+            provider()
+            await asyncio.sleep(args.llm_ms / 1000)
+
+    stop, stalls = asyncio.Event(), []
+    beat = asyncio.create_task(heartbeat(stop, stalls))
+    started = time.perf_counter()
+    await asyncio.gather(*(agent(provider) for provider in providers))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    return {
+        "mode": mode,
+        "token_requests": SlowCredential.issued - warmup_tokens,
+        "max_loop_stall_ms": round(max(stalls), 1),
+        "total_s": round(elapsed, 2),
+        "ideal_s": round(args.calls * args.llm_ms / 1000, 2),
+    }
+
+
+async def main(args) -> None:
+    rows = [await run_mode(mode, args) for mode in ("per_agent", "broker")]
+    print_table(
+        f"{args.agents} agents x {args.calls} model calls, {args.token_ms:g}ms per token request",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--token-ms", type=float, default=50)
+    parser.add_argument("--llm-ms", type=float, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,123 @@
+"""Load benchmark for ``DatabaseFactory`` connection reuse on ``GET /api/v3/plans``.
+
+Runs the real router against the in-memory Cosmos stand-in and compares:
+
+* ``shared``    - the pooled client with per-user views (current behaviour)
+* ``per_request`` - a new CosmosClient per request (the ``force_new=True`` fix)
+
+For each mode it reports how many CosmosClient instances were opened and the
+request latency distribution, and checks that no user received another
+user's plans.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_database_pool --users 500 --plans-per-user 5
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.database_factory import DatabaseFactory  # noqa: E402
+from common.models.messages_kernel import Plan, PlanStatus, UserCurrentTeam  # noqa: E402
+
+TEAM_ID = "00000000-0000-0000-0000-000000000001"
+
+
+async def seed(users: int, plans_per_user: int) -> None:
+    seeder = await DatabaseFactory.get_database(force_new=True)
+    for u in range(users):
+        user_id = f"user-{u}"
+        await seeder.set_current_team(UserCurrentTeam(user_id=user_id, team_id=TEAM_ID))
+        for p in range(plans_per_user):
+            plan_id = f"{user_id}-plan-{p}"
+            await seeder.add_plan(
+                Plan(
+                    id=plan_id,
+                    plan_id=plan_id,
+                    user_id=user_id,
+                    team_id=TEAM_ID,
+                    initial_goal=f"Goal {p} for {user_id}",
+                    overall_status=PlanStatus.completed,
+                )
+            )
+    await seeder.close()
+
+
+async def run_mode(mode: str, users: int) -> dict:
+    from api.router import app_v3
+
+    app = FastAPI()
+    app.include_router(app_v3)
+
+    await DatabaseFactory.close_all()
+    cosmos_stub.stats.reset()
+
+    original_get_database = DatabaseFactory.get_database
+
+    async def per_request_get_database(user_id: str = "", force_new: bool = False):
+        return await original_get_database(user_id=user_id, force_new=True)
+
+    latencies = []
+    leaks = 0
+    transport = httpx.ASGITransport(app=app)
+
+    async def one_user(client: httpx.AsyncClient, index: int) -> None:
+        nonlocal leaks
+        user_id = f"user-{index}"
+        started = time.perf_counter()
+        response = await client.get(
+            "/api/v3/plans", headers={"x-ms-client-principal-id": user_id}
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        leaks += sum(1 for plan in response.json() if plan["user_id"] != user_id)
+
+    getter = per_request_get_database if mode == "per_request" else original_get_database
+    with patch.object(DatabaseFactory, "get_database", staticmethod(getter)):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await asyncio.gather(*(one_user(client, i) for i in range(users)))
+
+    result = {
+        "mode": mode,
+        "cosmos_clients_opened": cosmos_stub.stats.clients_created,
+        "peak_open_clients": cosmos_stub.stats.peak_open_clients,
+        "cross_user_leaks": leaks,
+    }
+    result.update(latency_summary(latencies))
+    await DatabaseFactory.close_all()
+    return result
+
+
+async def main(users: int, plans_per_user: int, latency_ms: float, connect_ms: float) -> None:
+    cosmos_stub.reset_stub()
+    cosmos_stub.CosmosClientStub.latency = latency_ms / 1000
+    cosmos_stub.CosmosClientStub.connect_latency = connect_ms / 1000
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        await seed(users, plans_per_user)
+        rows = [await run_mode(mode, users) for mode in ("per_request", "shared")]
+    print_table(
+        f"GET /api/v3/plans, {users} concurrent users, "
+        f"{latency_ms}ms per operation, {connect_ms}ms per new connection",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--plans-per-user", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--connect-ms", type=float, default=40.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.plans_per_user, args.latency_ms, args.connect_ms))
@@ -0,0 +1,182 @@
+"""Per-connection memory and fan-out cost of the ``/socket`` WebSocket vs ``/api/v3/events`` SSE.
+
+Starts the API under uvicorn in a child process, opens ``--connections``
+clients (one user each) over one transport, then asks the server to send
+``--messages`` status updates to every user through
+``ConnectionConfig.send_status_update_async``. Reports:
+
+* ``rss_kb_per_conn``: growth of the server's RSS per open connection
+* ``send_ms``: server time to hand every message to every connection
+* ``deliver_ms``: time until every client has received every message
+* ``resume_ms``: (SSE only) reconnecting with ``Last-Event-ID`` and getting
+  the last ``--messages`` events replayed
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_event_stream --connections 200 --messages 20
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.common import BACKEND_DIR, print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+import psutil  # noqa: E402
+
+
+def serve(port: int) -> None:
+    import uvicorn
+    from fastapi import FastAPI
+
+    from api.router import app_v3
+    from auth.user_context import UserContextMiddleware
+    from config.settings import connection_config
+    from models.messages import WebsocketMessageType
+
+    app = FastAPI()
+    app.add_middleware(UserContextMiddleware)
+    app.include_router(app_v3)
+
+    @app.post("/bench/fanout")
+    async def fanout(users: int, messages: int):
+        started = time.perf_counter()
+        for m in range(messages):
+            for u in range(users):
+                await connection_config.send_status_update_async(
+                    {"step": m, "content": "Working on the next step of the plan. " * 4},
+                    f"user-{u:05d}",
+                    WebsocketMessageType.AGENT_MESSAGE,
+                )
+        return {"send_ms": (time.perf_counter() - started) * 1000}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error", ws="websockets")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(base_url: str) -> None:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(200):
+            try:
+                await client.get("/openapi.json")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+async def websocket_client(port: int, user_id: str, expected: int, done: asyncio.Event, opened: asyncio.Event):
+    import websockets
+
+    url = f"ws://127.0.0.1:{port}/api/v3/socket/{user_id}?user_id={user_id}"
+    async with websockets.connect(url) as ws:
+        opened.set()
+        for _ in range(expected):
+            await ws.recv()
+        done.set()
+
+
+async def sse_client(
+    client: httpx.AsyncClient, user_id: str, expected: int, done: asyncio.Event, opened: asyncio.Event,
+    last_event_id: str = "",
+):
+    headers = {"x-ms-client-principal-id": user_id}
+    if last_event_id:
+        headers["Last-Event-ID"] = last_event_id
+    received, last_id = 0, ""
+    async with client.stream("GET", "/api/v3/events", headers=headers) as response:
+        async for line in response.aiter_lines():
+            if line.startswith("retry:"):
+                opened.set()
+            elif line.startswith("id: "):
+                last_id = line[4:]
+            elif line.startswith("data: "):
+                received += 1
+                if received == expected:
+                    done.set()
+                    return last_id
+
+
+async def run_transport(transport: str, connections: int, messages: int) -> dict:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_event_stream", "--serve", str(port)],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        stderr=subprocess.DEVNULL,
+    )
+    row = {"transport": transport, "connections": connections}
+    try:
+        await wait_ready(base_url)
+        process = psutil.Process(server.pid)
+        await asyncio.sleep(0.5)
+        baseline = process.memory_info().rss
+
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+            users = [f"user-{u:05d}" for u in range(connections)]
+            opened = [asyncio.Event() for _ in users]
+            done = [asyncio.Event() for _ in users]
+            if transport == "websocket":
+                tasks = [
+                    asyncio.create_task(websocket_client(port, user, messages, d, o))
+                    for user, d, o in zip(users, done, opened)
+                ]
+            else:
+                tasks = [
+                    asyncio.create_task(sse_client(client, user, messages, d, o))
+                    for user, d, o in zip(users, done, opened)
+                ]
+            await asyncio.gather(*(event.wait() for event in opened))
+            await asyncio.sleep(0.5)
+            row["rss_kb_per_conn"] = round((process.memory_info().rss - baseline) / 1024 / connections, 1)
+
+            started = time.perf_counter()
+            response = await client.post("/bench/fanout", params={"users": connections, "messages": messages})
+            await asyncio.gather(*(event.wait() for event in done))
+            row["deliver_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            row["send_ms"] = round(response.json()["send_ms"], 1)
+            results = await asyncio.gather(*tasks)
+
+            if transport == "sse":
+                # Reconnect from the first event: the rest is replayed from the buffer
+                first_id = results[0].rsplit("-", 1)[0] + "-1"
+                started = time.perf_counter()
+                await sse_client(client, users[0], messages - 1, asyncio.Event(), asyncio.Event(), first_id)
+                row["resume_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            else:
+                row["resume_ms"] = "n/a"
+    finally:
+        server.terminate()
+        server.wait()
+    return row
+
+
+async def main(connections: int, messages: int) -> None:
+    rows = [await run_transport(transport, connections, messages) for transport in ("websocket", "sse")]
+    print_table(f"{connections} connections, {messages} messages to each", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve)
+    else:
+        asyncio.run(main(args.connections, args.messages))
@@ -0,0 +1,112 @@
+"""RU charge of the ordered queries with the default vs the generated indexing policy.
+
+Seeds a user's plans (spread over statuses) with agent messages, then runs the
+queries CosmosDBClient orders results in, once on a container with the
+default indexing policy and once after applying
+``CosmosDBClient.indexing_policy()``:
+
+* ``list_plans``   - ``get_plan_summaries_page_by_team_id_status`` (first page)
+* ``get_messages`` - ``get_agent_messages`` for one plan
+
+Without a composite index the stub charges for every document the query
+matches, standing in for the service sorting them itself.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_indexing_policy --plans 2000 --messages 50
+"""
+
+import argparse
+import asyncio
+from unittest.mock import patch
+
+from benchmarks.common import print_table, setup_environment
+
+setup_environment()
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    Plan,
+    PlanStatus,
+)
+
+USER_ID = "user-bench"
+TEAM_ID = "00000000-0000-0000-0000-000000000001"
+STATUSES = (PlanStatus.completed, PlanStatus.in_progress, PlanStatus.failed)
+SAMPLES = 20
+
+
+async def seed(db: CosmosDBClient, plans: int, messages: int) -> None:
+    for p in range(plans):
+        plan_id = f"plan-{p:05d}"
+        await db.add_plan(
+            Plan(
+                id=plan_id,
+                plan_id=plan_id,
+                user_id=USER_ID,
+                team_id=TEAM_ID,
+                initial_goal=f"Onboard new employee number {p}",
+                overall_status=STATUSES[p % len(STATUSES)],
+            )
+        )
+    for m in range(messages):
+        await db.add_agent_message(
+            AgentMessageData(
+                plan_id="plan-00000", user_id=USER_ID, agent="HRHelperAgent", content=f"Message {m}", raw_data="{}"
+            )
+        )
+
+
+async def measure(db: CosmosDBClient, policy: str) -> list:
+    calls = (
+        (
+            "list_plans",
+            lambda: db.get_plan_summaries_page_by_team_id_status(
+                USER_ID, TEAM_ID, PlanStatus.completed, limit=20
+            ),
+        ),
+        ("get_messages", lambda: db.get_agent_messages("plan-00000")),
+    )
+    rows = []
+    for operation, call in calls:
+        cosmos_stub.stats.reset()
+        for _ in range(SAMPLES):
+            await call()
+        rows.append(
+            {
+                "policy": policy,
+                "operation": operation,
+                "ru_per_call": round(cosmos_stub.stats.request_charge / SAMPLES, 2),
+            }
+        )
+    return rows
+
+
+async def main(plans: int, messages: int) -> None:
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        db = CosmosDBClient("https://stub", None, "macae", "memory", user_id=USER_ID)
+        await db.initialize()
+        await seed(db, plans, messages)
+
+        rows = await measure(db, "default")
+        await db.database.replace_container(
+            db.container, indexing_policy=CosmosDBClient.indexing_policy()
+        )
+        missing = await db._check_indexing_policy()
+        assert not missing, missing
+        rows += await measure(db, "generated")
+        await db.close()
+
+    print_table(f"{plans} plans, {messages} messages in the queried plan", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.plans, args.messages))
@@ -0,0 +1,154 @@
+"""Orchestration throughput in the API process vs in orchestration worker processes.
+
+Each job stands in for an orchestration: ``--cpu-ms`` of Python work (prompt
+building, parsing, callbacks) plus ``--io-ms`` waiting on the model. Jobs
+run either on the API's event loop (``inprocess``) or in 1, 2 and 4
+``OrchestrationWorker`` processes fed through the SQLite queue. Alongside
+throughput, the API's event-loop lag shows how much room is left to serve
+HTTP and WebSockets while orchestrations run.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_job_transport --jobs 200 --cpu-ms 20 --io-ms 50
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import tempfile
+import time
+from typing import List
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+from common.jobs.sqlite_queue import SqliteJobQueue  # noqa: E402
+from common.models.messages_kernel import InputTask  # noqa: E402
+from orchestration.job_transport import QueueJobTransport  # noqa: E402
+
+SLOTS_PER_WORKER = 4
+LAG_INTERVAL = 0.005
+
+
+def fake_orchestration(cpu_ms: float, io_ms: float):
+    async def run(user_id: str, input_task: InputTask) -> None:
+        deadline = time.perf_counter() + cpu_ms / 1000
+        while time.perf_counter() < deadline:
+            pass
+        await asyncio.sleep(io_ms / 1000)
+
+    return run
+
+
+async def event_loop_lag(samples: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append((time.perf_counter() - started - LAG_INTERVAL) * 1000)
+
+
+async def submit_all(run, jobs: int) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(run(f"user-{i % 50}", InputTask(session_id=f"s-{i}", description=f"task {i}")) for i in range(jobs))
+    )
+    return time.perf_counter() - started
+
+
+async def measure(mode: str, workers: int, run, jobs: int) -> dict:
+    lag: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(event_loop_lag(lag, stop))
+    elapsed = await submit_all(run, jobs)
+    stop.set()
+    await monitor
+    summary = latency_summary(lag)
+    return {
+        "mode": mode,
+        "workers": workers,
+        "jobs_per_s": round(jobs / elapsed, 1),
+        "jobs_per_s_per_worker": round(jobs / elapsed / max(workers, 1), 1),
+        "api_lag_p50_ms": summary["p50_ms"],
+        "api_lag_p99_ms": summary["p99_ms"],
+    }
+
+
+async def run_inprocess(jobs: int, cpu_ms: float, io_ms: float) -> dict:
+    orchestration = fake_orchestration(cpu_ms, io_ms)
+    slots = asyncio.Semaphore(SLOTS_PER_WORKER)
+
+    async def run(user_id, input_task):
+        async with slots:
+            await orchestration(user_id, input_task)
+
+    return await measure("inprocess", 1, run, jobs)
+
+
+async def run_workers(workers: int, jobs: int, cpu_ms: float, io_ms: float) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "queue.sqlite3")
+        transport = QueueJobTransport(SqliteJobQueue(path), poll_seconds=0.01)
+        await transport.start()
+        processes = [
+            await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "benchmarks.bench_job_transport", "--worker",
+                "--queue", path, "--cpu-ms", str(cpu_ms), "--io-ms", str(io_ms),
+                stdout=asyncio.subprocess.PIPE,
+            )
+            for _ in range(workers)
+        ]
+        # Leave worker start-up (imports) out of the measurement
+        for process in processes:
+            await process.stdout.readline()
+        try:
+            row = await measure("sqlite queue", workers, transport.run, jobs)
+        finally:
+            for process in processes:
+                process.send_signal(signal.SIGTERM)
+            await asyncio.gather(*(p.wait() for p in processes))
+            await transport.close()
+    return row
+
+
+async def worker_main(queue_path: str, cpu_ms: float, io_ms: float) -> None:
+    from orchestration_worker import OrchestrationWorker
+
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    queue = SqliteJobQueue(queue_path)
+    worker = OrchestrationWorker(
+        queue,
+        concurrency=SLOTS_PER_WORKER,
+        poll_seconds=0.01,
+        runner=fake_orchestration(cpu_ms, io_ms),
+    )
+    print("ready", flush=True)
+    await worker.run(stop)
+    await queue.close()
+
+
+async def main(jobs: int, cpu_ms: float, io_ms: float) -> None:
+    rows = [await run_inprocess(jobs, cpu_ms, io_ms)]
+    for workers in (1, 2, 4):
+        rows.append(await run_workers(workers, jobs, cpu_ms, io_ms))
+    print_table(
+        f"{jobs} jobs of {cpu_ms} ms CPU + {io_ms} ms I/O, {SLOTS_PER_WORKER} slots per worker",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--cpu-ms", type=float, default=20)
+    parser.add_argument("--io-ms", type=float, default=50)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--queue", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        asyncio.run(worker_main(args.queue, args.cpu_ms, args.io_ms))
+    else:
+        asyncio.run(main(args.jobs, args.cpu_ms, args.io_ms))
@@ -0,0 +1,147 @@
+"""Operation latency of the database backends selectable with DATABASE_BACKEND.
+
+Seeds the same plans and agent messages into each backend and times the calls
+the API makes most often:
+
+* ``add_message``   - ``add_agent_message``
+* ``get_plan``      - ``get_plan_by_plan_id``
+* ``list_plans``    - ``get_plan_summaries_by_team_id_status``
+* ``get_messages``  - ``get_agent_messages`` for one plan
+
+``cosmos_stub`` is CosmosDBClient over the in-memory Cosmos stand-in with
+``--latency-ms`` per request, as a reference for what the local backends save.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_local_backends --plans 500 --messages 20 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.database.sqlite_database import SqliteDatabase  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    Plan,
+    PlanStatus,
+)
+
+USER_ID = "user-bench"
+TEAM_ID = "00000000-0000-0000-0000-000000000001"
+SAMPLES = 200
+
+
+async def seed(db, plans: int, messages: int) -> None:
+    for p in range(plans):
+        plan_id = f"plan-{p:05d}"
+        await db.add_plan(
+            Plan(
+                id=plan_id,
+                plan_id=plan_id,
+                user_id=USER_ID,
+                team_id=TEAM_ID,
+                initial_goal=f"Onboard new employee number {p}",
+                overall_status=PlanStatus.completed,
+            )
+        )
+        for m in range(messages):
+            await db.add_agent_message(
+                AgentMessageData(
+                    plan_id=plan_id,
+                    user_id=USER_ID,
+                    agent="HRHelperAgent",
+                    content=f"Message {m}: " + "streamed agent output " * 10,
+                    raw_data="{}",
+                )
+            )
+
+
+async def timed(call, samples: int = SAMPLES) -> dict:
+    latencies = []
+    for i in range(samples):
+        started = time.perf_counter()
+        await call(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latency_summary(latencies)
+
+
+async def run_backend(name: str, db, plans: int, messages: int) -> list:
+    await db.initialize()
+    db = db.for_user(USER_ID)
+    started = time.perf_counter()
+    await seed(db, plans, messages)
+    seed_s = time.perf_counter() - started
+
+    async def add_message(i):
+        await db.add_agent_message(
+            AgentMessageData(plan_id="plan-00000", user_id=USER_ID, agent="HRHelperAgent", content=f"extra {i}", raw_data="{}")
+        )
+
+    async def get_plan(i):
+        await db.get_plan_by_plan_id(f"plan-{i % plans:05d}")
+
+    async def list_plans(i):
+        await db.get_plan_summaries_by_team_id_status(USER_ID, TEAM_ID, PlanStatus.completed)
+
+    async def get_messages(i):
+        await db.get_agent_messages(f"plan-{i % plans:05d}")
+
+    rows = []
+    for operation, call, samples in (
+        ("add_message", add_message, SAMPLES),
+        ("get_plan", get_plan, SAMPLES),
+        ("list_plans", list_plans, 20),
+        ("get_messages", get_messages, SAMPLES),
+    ):
+        rows.append(
+            {
+                "backend": name,
+                "operation": operation,
+                **await timed(call, samples),
+                "seed_docs_per_s": round(plans * (messages + 1) / seed_s),
+            }
+        )
+    return rows
+
+
+async def main(plans: int, messages: int, latency_ms: float) -> None:
+    cosmos_stub.reset_stub()
+    cosmos_stub.CosmosClientStub.latency = latency_ms / 1000
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = (
+            ("memory", MemoryDatabase()),
+            ("sqlite", SqliteDatabase(os.path.join(tmp, "bench.sqlite3"))),
+            ("cosmos_stub", CosmosDBClient("https://stub", None, "macae", "memory")),
+        )
+        with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+            for name, db in backends:
+                try:
+                    rows.extend(await run_backend(name, db, plans, messages))
+                finally:
+                    await db.close()
+    print_table(
+        f"{plans} plans with {messages} messages each; cosmos_stub at {latency_ms}ms per request",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.plans, args.messages, args.latency_ms))
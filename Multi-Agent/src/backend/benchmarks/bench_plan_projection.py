@@ -0,0 +1,127 @@
+"""Payload size and RU of ``GET /api/v3/plans``: full documents vs PlanSummary projection.
+
+Seeds one user with completed plans that carry a realistic ``m_plan``,
+``streaming_message`` and clarification text, then calls the endpoint with
+the list built from ``SELECT *`` (``full``) and from the projection the
+endpoint now uses (``summary``).
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_plan_projection --plans 200 --steps 8
+"""
+
+import argparse
+import asyncio
+from unittest.mock import patch
+
+from benchmarks.common import print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import Plan, PlanStatus, UserCurrentTeam  # noqa: E402
+
+USER_ID = "user-bench"
+TEAM_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _m_plan(plan_id: str, steps: int) -> dict:
+    return {
+        "id": plan_id,
+        "user_id": USER_ID,
+        "team_id": TEAM_ID,
+        "plan_id": plan_id,
+        "overall_status": "completed",
+        "user_request": "Onboard the new hire, order their laptop and schedule orientation. " * 3,
+        "team": ["HRHelperAgent", "TechnicalSupportAgent", "ProductAgent"],
+        "facts": "Known facts gathered while planning the request. " * 20,
+        "steps": [
+            {"agent": "HRHelperAgent", "action": f"Step {i}: " + "do the next thing carefully " * 6}
+            for i in range(steps)
+        ],
+    }
+
+
+async def seed(db: CosmosDBClient, plans: int, steps: int) -> None:
+    await db.set_current_team(UserCurrentTeam(user_id=USER_ID, team_id=TEAM_ID))
+    for p in range(plans):
+        plan_id = f"plan-{p:05d}"
+        await db.add_plan(
+            Plan(
+                id=plan_id,
+                plan_id=plan_id,
+                user_id=USER_ID,
+                team_id=TEAM_ID,
+                initial_goal=f"Onboard new employee number {p}",
+                overall_status=PlanStatus.completed,
+                m_plan=_m_plan(plan_id, steps),
+                streaming_message="Agent output streamed while the plan ran. " * 40,
+                human_clarification_request="Which office will they work from?",
+                human_clarification_response="The Seattle office, starting Monday.",
+            )
+        )
+
+
+async def run_mode(db: CosmosDBClient, mode: str) -> dict:
+    from api.router import app_v3
+
+    app = FastAPI()
+    app.include_router(app_v3)
+
+    async def get_database(user_id: str = "", force_new: bool = False):
+        return db
+
+    patches = [patch("api.router.DatabaseFactory.get_database", get_database)]
+    if mode == "full":
+        patches.append(
+            patch.object(
+                db, "get_plan_summaries_by_team_id_status", db.get_all_plans_by_team_id_status
+            )
+        )
+    for p in patches:
+        p.start()
+    try:
+        cosmos_stub.stats.reset()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            response = await client.get(
+                "/api/v3/plans", headers={"x-ms-client-principal-id": USER_ID}
+            )
+        response.raise_for_status()
+        query_ru = cosmos_stub.stats.charge_by_operation["query_items"]
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+    return {
+        "mode": mode,
+        "plans": len(response.json()),
+        "payload_kb": round(len(response.content) / 1024, 1),
+        "bytes_per_plan": len(response.content) // max(1, len(response.json())),
+        "query_ru": round(query_ru, 1),
+    }
+
+
+async def main(plans: int, steps: int) -> None:
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        db = CosmosDBClient("https://stub", None, "macae", "memory", user_id=USER_ID)
+        await db.initialize()
+        await seed(db, plans, steps)
+        rows = [await run_mode(db, mode) for mode in ("full", "summary")]
+        await db.close()
+    print_table(f"GET /api/v3/plans, {plans} completed plans with {steps}-step m_plans", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.plans, args.steps))
@@ -0,0 +1,205 @@
+"""Serialization cost of ``GET /api/v3/plan`` for a plan with a long message history.
+
+Encodes a plan, its team and ``--messages`` agent messages:
+
+* ``jsonable_encoder``: one buffered body through FastAPI's default path
+  (``jsonable_encoder`` then ``json.dumps``)
+* ``jsonable_encoder per item``: the streamed body encoding each part that way
+* ``to_json_bytes per item``: the streamed body as ``/api/v3/plan`` now writes
+  it (compiled serializer + orjson)
+* ``ndjson``: the lines of ``/api/v3/plan/messages``
+
+then times whole requests to both endpoints over the memory backend with the
+old and the new encoder.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_plan_response --messages 2000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.database.serialization import orjson, to_json_bytes  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    Plan,
+    PlanStatus,
+    TeamAgent,
+    TeamConfiguration,
+)
+
+USER_ID = "user-bench"
+TEAM_ID = "team-bench"
+PLAN_ID = "plan-bench"
+HEADERS = {"x-ms-client-principal-id": USER_ID}
+
+
+def old_json_bytes(value) -> bytes:
+    return json.dumps(jsonable_encoder(value), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def build(messages: int):
+    team = TeamConfiguration(
+        id=TEAM_ID,
+        team_id=TEAM_ID,
+        session_id=TEAM_ID,
+        name="Human Resources Team",
+        status="visible",
+        created="2024-01-01T00:00:00Z",
+        created_by=USER_ID,
+        user_id=USER_ID,
+        agents=[
+            TeamAgent(
+                input_key=f"agent-{i}",
+                type="ai",
+                name=f"Agent{i}",
+                deployment_name="gpt-4o",
+                icon="Person",
+                system_message="You are a helpful agent. " * 20,
+            )
+            for i in range(4)
+        ],
+    )
+    plan = Plan(
+        id=PLAN_ID,
+        plan_id=PLAN_ID,
+        user_id=USER_ID,
+        team_id=TEAM_ID,
+        initial_goal="Onboard a new employee",
+        overall_status=PlanStatus.completed,
+        m_plan={"steps": [{"agent": "HRHelperAgent", "action": "Do something"}] * 10},
+    )
+    history = [
+        AgentMessageData(
+            plan_id=PLAN_ID,
+            user_id=USER_ID,
+            agent=f"Agent{m % 4}",
+            content=f"Message {m}: " + "Lorem ipsum dolor sit amet. " * 15,
+            raw_data=json.dumps({"index": m, "tokens": 120}),
+            steps=[{"step": m}],
+            next_steps=[],
+        )
+        for m in range(messages)
+    ]
+    return plan, team, history
+
+
+def encode_modes(plan, team, history):
+    def buffered():
+        return old_json_bytes({"plan": plan, "m_plan": None, "streaming_message": "", "messages": history, "team": team})
+
+    def streamed(encode):
+        def run():
+            parts = [encode(plan), encode(None), encode("")]
+            parts.extend(encode(message) for message in history)
+            parts.append(encode(team))
+            return sum(len(part) for part in parts)
+
+        return run
+
+    def ndjson():
+        return sum(len(to_json_bytes(message) + b"\n") for message in history)
+
+    return {
+        "jsonable_encoder": buffered,
+        "jsonable_encoder per item": streamed(old_json_bytes),
+        "to_json_bytes per item": streamed(to_json_bytes),
+        "ndjson": ndjson,
+    }
+
+
+def time_encoding(plan, team, history, repeat: int) -> list:
+    rows = []
+    baseline = None
+    for mode, run in encode_modes(plan, team, history).items():
+        run()
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - started) * 1000)
+        p50 = latency_summary(samples)["p50_ms"]
+        baseline = baseline or p50
+        rows.append({"measure": "encode", "mode": mode, "p50_ms": p50, "speedup": round(baseline / p50, 2)})
+    return rows
+
+
+async def time_requests(plan, team, history, repeat: int) -> list:
+    from api.router import app_v3
+
+    db = MemoryDatabase().for_user(USER_ID)
+    await db.add_team(team)
+    await db.add_plan(plan)
+    for message in history:
+        await db.add_agent_message(message)
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    rows = []
+
+    async def get_database(user_id: str = "", force_new: bool = False):
+        return db
+
+    with patch("api.router.DatabaseFactory.get_database", get_database):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", headers=HEADERS
+        ) as client:
+            cases = (
+                ("/api/v3/plan", "jsonable_encoder", patch("api.router.to_json_bytes", old_json_bytes)),
+                ("/api/v3/plan", "to_json_bytes", None),
+                ("/api/v3/plan/messages", "ndjson", None),
+            )
+            for path, mode, encoder_patch in cases:
+                if encoder_patch:
+                    encoder_patch.start()
+                try:
+                    samples = []
+                    for _ in range(repeat + 1):
+                        started = time.perf_counter()
+                        response = await client.get(path, params={"plan_id": PLAN_ID})
+                        samples.append((time.perf_counter() - started) * 1000)
+                        response.raise_for_status()
+                finally:
+                    if encoder_patch:
+                        encoder_patch.stop()
+                rows.append(
+                    {
+                        "measure": f"GET {path}",
+                        "mode": mode,
+                        "p50_ms": latency_summary(samples[1:])["p50_ms"],
+                        "speedup": "",
+                    }
+                )
+    await db.close()
+    return rows
+
+
+async def main(messages: int, repeat: int) -> None:
+    plan, team, history = build(messages)
+    rows = time_encoding(plan, team, history, repeat)
+    rows.extend(await time_requests(plan, team, history, repeat))
+    print_table(
+        f"Plan with {messages} messages, {repeat} runs each, orjson {'on' if orjson else 'off'}",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.repeat))
@@ -0,0 +1,126 @@
+"""Memory and RU of listing plans: full list vs streamed vs one page at a time.
+
+Seeds a single user with an increasing number of completed plans and, for
+each size, measures:
+
+* ``list``   - ``get_all_plans_by_team_id_status`` (everything in one list)
+* ``stream`` - ``query_items_stream`` counting the plans without keeping them
+* ``page``   - ``get_plans_page_by_team_id_status`` for the first page
+
+Peak memory is measured with tracemalloc around the call. The stand-in does
+its filtering and ordering in-process, which the service would do server-side,
+so the peak of that step alone is subtracted (``client_peak_kb``).
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_plans_paging --sizes 1000 10000 50000 --page-size 50
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from benchmarks.common import print_table, setup_environment
+
+setup_environment()
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import Plan, PlanStatus  # noqa: E402
+
+USER_ID = "user-bench"
+TEAM_ID = "00000000-0000-0000-0000-000000000001"
+
+
+async def grow(db: CosmosDBClient, current: int, target: int) -> None:
+    for p in range(current, target):
+        plan_id = f"plan-{p:06d}"
+        await db.add_plan(
+            Plan(
+                id=plan_id,
+                plan_id=plan_id,
+                user_id=USER_ID,
+                team_id=TEAM_ID,
+                initial_goal=f"Goal number {p} with a realistic amount of text in it",
+                overall_status=PlanStatus.completed,
+                summary="A completed plan summary " * 4,
+            )
+        )
+
+
+def traced_peak(call) -> int:
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+async def measure(name: str, size: int, call, server_peak: int) -> dict:
+    cosmos_stub.stats.reset()
+    tracemalloc.start()
+    started = time.perf_counter()
+    returned = await call()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "plans": size,
+        "mode": name,
+        "returned": returned,
+        "client_peak_kb": max(0, round((peak - server_peak) / 1024)),
+        "ru": round(cosmos_stub.stats.request_charge, 1),
+        "elapsed_ms": round(elapsed_ms, 1),
+    }
+
+
+async def main(sizes, page_size: int) -> None:
+    cosmos_stub.reset_stub()
+    rows = []
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        db = CosmosDBClient("https://stub", None, "macae", "memory", user_id=USER_ID)
+        await db.initialize()
+        seeded = 0
+        for size in sorted(sizes):
+            await grow(db, seeded, size)
+            seeded = size
+            query, parameters = db._plans_by_team_id_status_query(
+                USER_ID, TEAM_ID, PlanStatus.completed
+            )
+
+            async def full_list():
+                return len(
+                    await db.get_all_plans_by_team_id_status(USER_ID, TEAM_ID, PlanStatus.completed)
+                )
+
+            async def stream():
+                count = 0
+                async for _ in db.query_items_stream(query, parameters, Plan, page_size=page_size):
+                    count += 1
+                return count
+
+            async def first_page():
+                page = await db.get_plans_page_by_team_id_status(
+                    USER_ID, TEAM_ID, PlanStatus.completed, limit=page_size
+                )
+                return len(page.items)
+
+            server_peak = traced_peak(lambda: db.container._select(query, parameters, None))
+            for mode, call in (("list", full_list), ("stream", stream), ("page", first_page)):
+                # Start every mode with an empty partition key map
+                db._partition_keys.clear()
+                rows.append(await measure(mode, size, call, server_peak))
+        await db.close()
+
+    print_table(f"Completed plans for one user, page size {page_size}", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.page_size))
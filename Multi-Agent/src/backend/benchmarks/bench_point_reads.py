@@ -0,0 +1,229 @@
+"""RU and latency comparison of id lookups: cross-partition queries vs point reads.
+
+For every single-document lookup in ``CosmosDBClient`` it runs the query the
+method used to issue (``query``) and the method itself (``point_read``),
+against documents in the current partition layout and in the legacy layout
+(random partition key, resolved through the id -> partition key map). Plans
+live in the caller's session partition in both layouts: current plans are
+located through their PlanLocation record, legacy plans through the map (or
+a query, after which their location is recorded).
+
+Runs against the in-memory stand-in by default. Pass ``--emulator-endpoint``
+and ``--emulator-key`` to run against the Cosmos DB emulator instead; request
+charges are then read from the ``x-ms-request-charge`` response header.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_point_reads --users 200 --lookups 500
+    python -m benchmarks.bench_point_reads --emulator-endpoint https://localhost:8081 \\
+        --emulator-key <key>
+"""
+
+import argparse
+import asyncio
+import functools
+import random
+import time
+import uuid
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+from azure.cosmos import PartitionKey  # noqa: E402
+from azure.cosmos.aio import CosmosClient  # noqa: E402
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentType,
+    Plan,
+    PlanStatus,
+    Step,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+
+DATABASE = "macae-bench"
+CONTAINER = "memory-bench"
+
+# The queries each lookup issued before it used point reads
+LEGACY_QUERIES = {
+    "get_plan_by_plan_id": "SELECT * FROM c WHERE c.id=@id AND c.data_type=@data_type",
+    "get_team_by_id": "SELECT * FROM c WHERE c.team_id=@id AND c.data_type=@data_type",
+    "get_current_team": "SELECT * FROM c WHERE c.data_type=@data_type AND c.user_id=@id",
+    "get_step": "SELECT * FROM c WHERE c.id=@id AND c.session_id=@session_id AND c.data_type=@data_type",
+}
+MODELS = {
+    "get_plan_by_plan_id": Plan,
+    "get_team_by_id": TeamConfiguration,
+    "get_current_team": UserCurrentTeam,
+    "get_step": Step,
+}
+
+
+class ChargeMeter:
+    """Accumulates request charges from the stub or from response headers."""
+
+    def __init__(self, emulator: bool) -> None:
+        self.emulator = emulator
+        self._header_total = 0.0
+
+    def response_hook(self, response) -> None:
+        charge = response.http_response.headers.get("x-ms-request-charge")
+        if charge:
+            self._header_total += float(charge)
+
+    @property
+    def total(self) -> float:
+        return self._header_total if self.emulator else cosmos_stub.stats.request_charge
+
+
+def _team(team_id: str, session_id: str, user_id: str) -> TeamConfiguration:
+    return TeamConfiguration(
+        id=team_id,
+        team_id=team_id,
+        session_id=session_id,
+        name="Benchmark team",
+        status="visible",
+        created="2025-01-01T00:00:00Z",
+        created_by=user_id,
+        user_id=user_id,
+    )
+
+
+async def seed(db: CosmosDBClient, users: int) -> dict:
+    """Write one team, current team, plan and step per user in both layouts."""
+    keys = {"current": [], "legacy": []}
+    for u in range(users):
+        user_id = f"user-{u}"
+        layout = "legacy" if u % 2 else "current"
+        team_id = str(uuid.uuid4())
+        plan_id = str(uuid.uuid4())
+        session_id = str(uuid.uuid4())
+        step = Step(
+            plan_id=plan_id,
+            user_id=user_id,
+            session_id=session_id,
+            action="Do the thing",
+            agent=AgentType.GENERIC,
+        )
+        if layout == "current":
+            team = _team(team_id, team_id, user_id)
+            current_team = UserCurrentTeam(user_id=user_id, team_id=team_id)
+        else:
+            team = _team(team_id, str(uuid.uuid4()), user_id)
+            current_team = UserCurrentTeam(
+                id=str(uuid.uuid4()),
+                session_id=str(uuid.uuid4()),
+                user_id=user_id,
+                team_id=team_id,
+            )
+        await db.add_team(team)
+        await db.add_item(current_team)
+        plan = Plan(
+            id=plan_id,
+            plan_id=plan_id,
+            user_id=user_id,
+            session_id=session_id,
+            team_id=team_id,
+            initial_goal="Benchmark goal",
+            overall_status=PlanStatus.completed,
+        )
+        # Legacy plans have no PlanLocation record
+        await (db.add_plan(plan) if layout == "current" else db.add_item(plan))
+        await db.add_step(step)
+        keys[layout].append(
+            {
+                "get_plan_by_plan_id": (plan_id,),
+                "get_team_by_id": (team_id,),
+                "get_current_team": (user_id,),
+                "get_step": (step.id, session_id),
+            }
+        )
+    return keys
+
+
+async def run_lookup(db, meter, method, mode, args_list, lookups) -> dict:
+    latencies = []
+    charge_before = meter.total
+    for i in range(lookups):
+        args = args_list[i % len(args_list)]
+        started = time.perf_counter()
+        if mode == "query":
+            model_class = MODELS[method]
+            parameters = [
+                {"name": "@id", "value": args[0]},
+                {"name": "@data_type", "value": model_class.model_fields["data_type"].default},
+            ]
+            if method == "get_step":
+                parameters.append({"name": "@session_id", "value": args[1]})
+            found = await db.query_items(LEGACY_QUERIES[method], parameters, model_class)
+        else:
+            found = await getattr(db, method)(*args)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert found, f"{method}{args} returned nothing in {mode} mode"
+    row = {
+        "lookup": method,
+        "mode": mode,
+        "ru_per_lookup": round((meter.total - charge_before) / lookups, 2),
+    }
+    row.update(latency_summary(latencies))
+    return row
+
+
+async def main(args) -> None:
+    emulator = bool(args.emulator_endpoint)
+    meter = ChargeMeter(emulator)
+
+    with ExitStack() as stack:
+        if emulator:
+            client_cls = functools.partial(CosmosClient, raw_response_hook=meter.response_hook)
+            endpoint, credential = args.emulator_endpoint, args.emulator_key
+            async with CosmosClient(endpoint, credential) as admin:
+                database = await admin.create_database_if_not_exists(DATABASE)
+                await database.create_container_if_not_exists(
+                    CONTAINER, partition_key=PartitionKey(path="/session_id")
+                )
+        else:
+            cosmos_stub.reset_stub()
+            cosmos_stub.CosmosClientStub.latency = args.latency_ms / 1000
+            client_cls = cosmos_stub.CosmosClientStub
+            endpoint, credential = "https://stub", None
+        stack.enter_context(patch.object(cosmosdb, "CosmosClient", client_cls))
+
+        db = CosmosDBClient(endpoint, credential, DATABASE, CONTAINER)
+        await db.initialize()
+        try:
+            keys = await seed(db, args.users)
+            rows = []
+            for layout in ("current", "legacy"):
+                for method in LEGACY_QUERIES:
+                    args_list = [k[method] for k in keys[layout]]
+                    random.Random(0).shuffle(args_list)
+                    # Run the point reads once with a cold partition key map and
+                    # once more after it has seen every document
+                    db._partition_keys.clear()
+                    for mode in ("query", "point_read_cold", "point_read_warm"):
+                        if mode == "point_read_cold":
+                            db._partition_keys.clear()
+                        row = await run_lookup(db, meter, method, mode, args_list, args.lookups)
+                        rows.append({"layout": layout, **row})
+        finally:
+            await db.close()
+
+    target = "emulator" if emulator else f"in-memory stand-in, {args.latency_ms}ms per operation"
+    print_table(f"Single-document lookups, {args.users} users ({target})", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--emulator-endpoint", default="")
+    parser.add_argument("--emulator-key", default="")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,155 @@
+"""Latency of ``rai_success`` with a Foundry agent per check vs the long-lived RAI service.
+
+``--checks`` texts are checked one after the other (``sequential``) and all
+at once (``burst``):
+
+* ``agent_per_call``: the check as it was, a ``FoundryAgentTemplate`` with
+  the RAI instructions opened, registered and invoked for each text; opening the agent is replaced by a stand-in that waits
+  ``--open-ms`` (credential, project client, agent lookup or creation) and
+  the invoke by one that waits ``--llm-ms``
+* ``service``: ``rai_service`` with a stand-in chat completion of ``--llm-ms``
+  and at most ``--max-concurrent`` checks in flight
+
+and reports the agents opened, those never closed (their Foundry
+definition, credential and client are left behind) and the agent registry
+entries left after the checks.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_rai --checks 50
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+from common.services.rai_service import RAI_INSTRUCTIONS, RAIService  # noqa: E402
+from common.utils.utils_kernel import rai_success  # noqa: E402
+from config.agent_registry import agent_registry  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+
+
+class FoundryStandIn:
+    def __init__(self, open_seconds: float, llm_seconds: float):
+        self.open_seconds = open_seconds
+        self.llm_seconds = llm_seconds
+        self.opens = 0
+        self.closes = 0
+
+    def patch(self):
+        stand_in = self
+
+        async def close_template(template):
+            stand_in.closes += 1
+            template._agent = None
+
+        async def invoke(query):
+            await asyncio.sleep(stand_in.llm_seconds)
+            yield SimpleNamespace(content="False")
+
+        async def open_template(template):
+            stand_in.opens += 1
+            await asyncio.sleep(stand_in.open_seconds)
+            template._agent = SimpleNamespace(invoke=invoke)
+            return template
+
+        return (
+            patch.object(FoundryAgentTemplate, "open", open_template),
+            patch.object(FoundryAgentTemplate, "close", close_template),
+        )
+
+
+class ChatStandIn:
+    def __init__(self, llm_seconds: float):
+        self.llm_seconds = llm_seconds
+        self.client = SimpleNamespace(close=lambda: asyncio.sleep(0))
+
+    async def get_chat_message_content(self, history, settings):
+        await asyncio.sleep(self.llm_seconds)
+        return SimpleNamespace(content="False")
+
+
+async def agent_per_call(text: str) -> bool:
+    """``rai_success`` as it was: a new Foundry agent for every check, never closed."""
+    agent = FoundryAgentTemplate(
+        agent_name="RAIAgent",
+        agent_description="A comprehensive research assistant for integration testing",
+        agent_instructions=RAI_INSTRUCTIONS,
+        model_deployment_name="gpt-4.1",
+        enable_code_interpreter=False,
+        mcp_config=None,
+        search_config=None,
+    )
+    await agent.open()
+    agent_registry.register_agent(agent)
+    response = "".join([str(message.content) async for message in agent.invoke(text)])
+    return response.upper() == "FALSE"
+
+
+async def run_mode(mode: str, arrival: str, args) -> dict:
+    stand_in = FoundryStandIn(args.open_ms / 1000, args.llm_ms / 1000)
+    service = RAIService(
+        "gpt-4.1",
+        "https://openai.bench",
+        max_concurrent=args.max_concurrent,
+        chat_service_factory=lambda: ChatStandIn(args.llm_ms / 1000),
+    )
+    check = agent_per_call if mode == "agent_per_call" else rai_success
+    # Registry metadata outlives the weakly held agents
+    registered = len(agent_registry._agent_metadata)
+    latencies = []
+
+    async def timed(i):
+        started = time.perf_counter()
+        assert await check(f"Please onboard employee {i}")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    open_patch, close_patch = stand_in.patch()
+    with open_patch, close_patch, patch("common.utils.utils_kernel.rai_service", service):
+        started = time.perf_counter()
+        if arrival == "sequential":
+            for i in range(args.checks):
+                await timed(i)
+        else:
+            await asyncio.gather(*(timed(i) for i in range(args.checks)))
+        elapsed = time.perf_counter() - started
+    registry_entries = len(agent_registry._agent_metadata) - registered
+    await service.close()
+    summary = latency_summary(latencies)
+    return {
+        "arrival": arrival,
+        "mode": mode,
+        "p50_ms": summary["p50_ms"],
+        "p99_ms": summary["p99_ms"],
+        "total_s": round(elapsed, 2),
+        "agents_opened": stand_in.opens,
+        "agents_unclosed": stand_in.opens - stand_in.closes,
+        "registry_entries": registry_entries,
+    }
+
+
+async def main(args) -> None:
+    rows = [
+        await run_mode(mode, arrival, args)
+        for arrival in ("sequential", "burst")
+        for mode in ("agent_per_call", "service")
+    ]
+    print_table(
+        f"{args.checks} RAI checks, {args.open_ms:g}ms agent open, {args.llm_ms:g}ms model call",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=50)
+    parser.add_argument("--open-ms", type=float, default=400)
+    parser.add_argument("--llm-ms", type=float, default=150)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
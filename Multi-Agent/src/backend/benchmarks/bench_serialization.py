@@ -0,0 +1,141 @@
+"""Cost of turning data models into stored documents and back.
+
+For ``Plan``, ``AgentMessageData`` and ``TeamConfiguration`` documents this
+times, per document:
+
+* ``dump``   - ``legacy``: ``model_dump()`` plus converting top-level datetimes
+  (what CosmosDBClient used to do) vs ``compiled``: ``serialization.to_document``
+* ``encode`` - the dumped document to JSON text with ``json`` vs ``orjson``
+  (the wire format; the memory and sqlite backends store this text)
+* ``load``   - ``model_validate`` vs ``serialization.from_document`` on a
+  document carrying the Cosmos system properties
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_serialization --docs 10000
+"""
+
+import argparse
+import datetime
+import json
+import time
+
+from benchmarks.common import print_table, setup_environment
+
+setup_environment()
+
+from common.database import serialization  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    Plan,
+    PlanStatus,
+    TeamAgent,
+    TeamConfiguration,
+)
+
+USER_ID = "user-bench"
+TEAM_ID = "00000000-0000-0000-0000-000000000001"
+SYSTEM_PROPERTIES = {"_rid": "rid", "_self": "self", "_etag": '"etag"', "_attachments": "attachments/", "_ts": 1714566600}
+
+
+def make_plan(i: int) -> Plan:
+    return Plan(
+        plan_id=f"plan-{i:05d}",
+        user_id=USER_ID,
+        team_id=TEAM_ID,
+        initial_goal=f"Onboard new employee number {i}",
+        overall_status=PlanStatus.completed,
+        m_plan={"steps": [{"agent": "HRHelperAgent", "action": f"Step {s}"} for s in range(5)]},
+    )
+
+
+def make_message(i: int) -> AgentMessageData:
+    return AgentMessageData(
+        plan_id=f"plan-{i:05d}",
+        user_id=USER_ID,
+        agent="HRHelperAgent",
+        content="streamed agent output " * 20,
+        raw_data="{}",
+    )
+
+
+def make_team(i: int) -> TeamConfiguration:
+    return TeamConfiguration(
+        team_id=f"team-{i:05d}",
+        session_id=f"team-{i:05d}",
+        name="Human Resources Team",
+        status="visible",
+        created="2024-01-01T00:00:00Z",
+        created_by=USER_ID,
+        user_id=USER_ID,
+        agents=[
+            TeamAgent(
+                input_key=f"agent-{a}",
+                type="ai",
+                name=f"Agent{a}",
+                deployment_name="gpt-4o",
+                icon="Person",
+                system_message="You are a helpful agent. " * 20,
+            )
+            for a in range(4)
+        ],
+    )
+
+
+def legacy_dump(item) -> dict:
+    document = item.model_dump()
+    for key, value in list(document.items()):
+        if isinstance(value, datetime.datetime):
+            document[key] = value.isoformat()
+    return document
+
+
+def per_doc_us(call, values) -> float:
+    started = time.perf_counter()
+    for value in values:
+        call(value)
+    return round((time.perf_counter() - started) * 1_000_000 / len(values), 2)
+
+
+def run_model(name: str, factory, docs: int) -> list:
+    items = [factory(i) for i in range(docs)]
+    documents = [{**serialization.to_document(item), **SYSTEM_PROPERTIES} for item in items]
+    model_class = type(items[0])
+
+    rows = [
+        ("dump", "legacy", per_doc_us(legacy_dump, items)),
+        ("dump", "compiled", per_doc_us(serialization.to_document, items)),
+        ("encode", "json", per_doc_us(json.dumps, documents)),
+    ]
+    if serialization.orjson is not None:
+        rows.append(("encode", "orjson", per_doc_us(serialization.dumps, documents)))
+    rows += [
+        ("load", "model_validate", per_doc_us(model_class.model_validate, documents)),
+        (
+            "load",
+            "compiled",
+            per_doc_us(lambda d: serialization.from_document(d, model_class), documents),
+        ),
+    ]
+    return [
+        {"model": name, "step": step, "method": method, "us_per_doc": us, "docs_per_s": round(1_000_000 / us)}
+        for step, method, us in rows
+    ]
+
+
+def main(docs: int) -> None:
+    rows = []
+    for name, factory in (
+        ("Plan", make_plan),
+        ("AgentMessageData", make_message),
+        ("TeamConfiguration", make_team),
+    ):
+        rows.extend(run_model(name, factory, docs))
+    print_table(f"{docs} documents per model", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=10000)
+    args = parser.parse_args()
+    main(args.docs)
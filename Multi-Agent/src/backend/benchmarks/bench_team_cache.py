@@ -0,0 +1,151 @@
+"""Latency of ``GET /api/v3/plan`` with and without the team cache.
+
+Every ``/api/v3/plan`` request looks up the plan's team configuration. This
+seeds one team, a user's plans and their agent messages, then requests the
+plans in turn with the team cache off (``TEAM_CACHE_TTL_SECONDS=0``) and on,
+reporting latency percentiles, Cosmos round trips per request and the cache
+hit ratio.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_team_cache --requests 300 --plans 20 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from benchmarks.common import latency_summary, print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    Plan,
+    PlanStatus,
+    TeamAgent,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+
+USER_ID = "user-bench"
+TEAM_ID = "00000000-0000-0000-0000-000000000001"
+
+
+async def seed(db: CosmosDBClient, plans: int) -> None:
+    await db.add_team(
+        TeamConfiguration(
+            id=TEAM_ID,
+            team_id=TEAM_ID,
+            session_id=TEAM_ID,
+            name="Human Resources Team",
+            status="visible",
+            created="2024-01-01T00:00:00Z",
+            created_by=USER_ID,
+            user_id=USER_ID,
+            agents=[
+                TeamAgent(
+                    input_key=f"agent-{i}",
+                    type="ai",
+                    name=f"Agent{i}",
+                    deployment_name="gpt-4o",
+                    icon="Person",
+                    system_message="You are a helpful agent. " * 20,
+                    description="Handles part of the onboarding process.",
+                )
+                for i in range(4)
+            ],
+        )
+    )
+    await db.set_current_team(UserCurrentTeam(user_id=USER_ID, team_id=TEAM_ID))
+    for p in range(plans):
+        plan_id = f"plan-{p:04d}"
+        await db.add_plan(
+            Plan(
+                id=plan_id,
+                plan_id=plan_id,
+                user_id=USER_ID,
+                team_id=TEAM_ID,
+                initial_goal=f"Onboard new employee number {p}",
+                overall_status=PlanStatus.completed,
+            )
+        )
+        for m in range(5):
+            await db.add_agent_message(
+                AgentMessageData(
+                    plan_id=plan_id, user_id=USER_ID, agent="HRHelperAgent", content=f"Message {m}", raw_data="{}"
+                )
+            )
+
+
+async def run_mode(mode: str, requests: int, plans: int) -> dict:
+    from api.router import app_v3
+
+    cosmos_stub.reset_stub()
+    db = CosmosDBClient(
+        "https://stub",
+        None,
+        "macae",
+        "memory",
+        team_cache_ttl_seconds=60 if mode == "cache" else 0,
+    )
+    await db.initialize()
+    await seed(db.for_user(USER_ID), plans)
+    cosmos_stub.stats.reset()
+
+    async def get_database(user_id: str = "", force_new: bool = False):
+        return db.for_user(user_id)
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    latencies = []
+    with patch("api.router.DatabaseFactory.get_database", get_database):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            for i in range(requests):
+                started = time.perf_counter()
+                response = await client.get(
+                    "/api/v3/plan",
+                    params={"plan_id": f"plan-{i % plans:04d}"},
+                    headers={"x-ms-client-principal-id": USER_ID},
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+                assert response.json()["team"]["team_id"] == TEAM_ID
+
+    cache = db._team_cache
+    round_trips = sum(cosmos_stub.stats.operations.values())
+    await db.close()
+    return {
+        "mode": mode,
+        **latency_summary(latencies),
+        "round_trips_per_request": round(round_trips / requests, 2),
+        "hit_ratio": round(cache.hit_ratio, 3) if cache else "-",
+    }
+
+
+async def main(requests: int, plans: int, latency_ms: float) -> None:
+    cosmos_stub.CosmosClientStub.latency = latency_ms / 1000
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        rows = [await run_mode(mode, requests, plans) for mode in ("no_cache", "cache")]
+    print_table(
+        f"GET /api/v3/plan x{requests} over {plans} plans, {latency_ms}ms per Cosmos request",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--plans", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.plans, args.latency_ms))
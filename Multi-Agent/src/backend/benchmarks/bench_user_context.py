@@ -0,0 +1,150 @@
+"""Per-handler cost of resolving the signed-in user.
+
+Compares the old pattern, where every handler called
+``get_authenticated_user_details(request.headers)`` and decoded the tenant id
+from ``x-ms-client-principal`` itself, with ``UserContextMiddleware`` resolving
+the user once per request and handlers receiving it via ``get_user_context``.
+Both EasyAuth requests and local development requests (no EasyAuth headers,
+which fall back to the sample user) are measured, as a bare lookup and as
+whole requests through a minimal FastAPI app.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_user_context --calls 100000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import time
+
+from benchmarks.common import print_table, setup_environment
+
+setup_environment()
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, Request  # noqa: E402
+from starlette.datastructures import Headers  # noqa: E402
+
+from auth.auth_utils import _decode_tenant_id, get_authenticated_user_details  # noqa: E402
+from auth.user_context import (  # noqa: E402
+    DEVELOPMENT_USER,
+    UserContext,
+    UserContextMiddleware,
+    get_user_context,
+    user_context_from_raw_headers,
+)
+
+EASYAUTH_HEADERS = {
+    "x-ms-client-principal-id": "00000000-0000-0000-0000-000000000001",
+    "x-ms-client-principal-name": "jane@example.com",
+    "x-ms-client-principal-idp": "aad",
+    "x-ms-token-aad-id-token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJSUzI1NiJ9." + "a" * 900,
+    "x-ms-client-principal": base64.b64encode(
+        json.dumps({"tid": "tenant-1", "claims": [{"typ": "name", "val": "Jane"}] * 20}).encode()
+    ).decode(),
+}
+# What a browser sends besides the EasyAuth headers
+BROWSER_HEADERS = {
+    "accept": "application/json",
+    "accept-encoding": "gzip, deflate, br",
+    "accept-language": "en",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "cookie": "AppServiceAuthSession=" + "x" * 600,
+}
+
+
+def old_resolve(headers) -> tuple:
+    user = get_authenticated_user_details(request_headers=headers)
+    # Before the cache every call decoded the principal again; the sample
+    # user's principal is not a real one, so development requests skip it
+    tenant_id = ""
+    if "x-ms-client-principal-id" in headers:
+        tenant_id = _decode_tenant_id.__wrapped__(user["client_principal_b64"])
+    return user["user_principal_id"], tenant_id
+
+
+def new_resolve(user: UserContext) -> tuple:
+    tenant_id = user.tenant_id if user is not DEVELOPMENT_USER else ""
+    return user.user_principal_id, tenant_id
+
+
+def per_call(label: str, headers: dict, calls: int) -> dict:
+    starlette_headers = Headers(headers=headers)
+    raw = starlette_headers.raw
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        old_resolve(starlette_headers)
+    old_us = (time.perf_counter() - started) / calls * 1e6
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        # Middleware work plus the handler reading the context
+        new_resolve(user_context_from_raw_headers(raw))
+    new_us = (time.perf_counter() - started) / calls * 1e6
+
+    return {
+        "requests": label,
+        "measure": "resolve user",
+        "old_us": round(old_us, 2),
+        "middleware_us": round(new_us, 2),
+        "speedup": round(old_us / new_us, 1),
+    }
+
+
+def build_app(middleware: bool) -> FastAPI:
+    app = FastAPI()
+    if middleware:
+        app.add_middleware(UserContextMiddleware)
+
+        @app.get("/whoami")
+        async def whoami_new(user: UserContext = Depends(get_user_context)):
+            return new_resolve(user)
+
+    else:
+
+        @app.get("/whoami")
+        async def whoami_old(request: Request):
+            return old_resolve(request.headers)
+
+    return app
+
+
+async def per_request(label: str, headers: dict, requests: int) -> dict:
+    timings = {}
+    for name, middleware in (("old_us", False), ("middleware_us", True)):
+        transport = httpx.ASGITransport(app=build_app(middleware))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/whoami", headers=headers)
+            started = time.perf_counter()
+            for _ in range(requests):
+                await client.get("/whoami", headers=headers)
+            timings[name] = (time.perf_counter() - started) / requests * 1e6
+    return {
+        "requests": label,
+        "measure": "whole request",
+        "old_us": round(timings["old_us"], 2),
+        "middleware_us": round(timings["middleware_us"], 2),
+        "speedup": round(timings["old_us"] / timings["middleware_us"], 2),
+    }
+
+
+async def main(calls: int, requests: int) -> None:
+    cases = (
+        ("easyauth", {**BROWSER_HEADERS, **EASYAUTH_HEADERS}),
+        ("development", BROWSER_HEADERS),
+    )
+    rows = [per_call(label, headers, calls) for label, headers in cases]
+    for label, headers in cases:
+        rows.append(await per_request(label, headers, requests))
+    print_table(f"User resolution, {calls} lookups and {requests} requests per case", rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.requests))
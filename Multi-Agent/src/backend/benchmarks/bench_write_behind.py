@@ -0,0 +1,128 @@
+"""Throughput of persisting streamed agent messages, with and without write-behind.
+
+Runs ``PlanService.handle_agent_messages`` for many plans at once, each plan
+streaming its messages one after another and finishing with an ``is_final``
+message (which reads and completes the plan). Compares:
+
+* ``direct``       - one ``create_item`` per message (write-behind window 0)
+* ``write_behind`` - messages and plan updates buffered per partition and
+  flushed with ``execute_item_batch``
+
+Reports messages/sec, Cosmos round trips and RU, and checks that every
+message and plan update was persisted once the client was closed. The
+stand-in serves any number of requests at once, so with many concurrent
+plans ``direct`` stops waiting on I/O and both modes become CPU-bound; the
+round-trip count is what a real account's RU/s and connection limits see.
+
+Usage (from src/backend)::
+
+    python -m benchmarks.bench_write_behind --plans 1 10 50 --messages 40 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from benchmarks.common import print_table, setup_environment
+
+setup_environment()
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import DataType, Plan, PlanStatus  # noqa: E402
+from common.services.plan_service import PlanService  # noqa: E402
+from models.messages import AgentMessageResponse, AgentMessageType  # noqa: E402
+
+USER_ID = "user-bench"
+
+
+async def stream_plan(plan_id: str, messages: int) -> None:
+    for i in range(messages):
+        is_final = i == messages - 1
+        ok = await PlanService.handle_agent_messages(
+            AgentMessageResponse(
+                plan_id=plan_id,
+                agent="HRHelperAgent",
+                content=f"Message {i} for {plan_id}: " + "streamed agent output " * 10,
+                agent_type=AgentMessageType.AI_AGENT,
+                is_final=is_final,
+                streaming_message="Final answer" if is_final else None,
+            ),
+            USER_ID,
+        )
+        assert ok, "handle_agent_messages failed"
+
+
+async def run_mode(mode: str, plans: int, messages: int, window_ms: int) -> dict:
+    cosmos_stub.reset_stub()
+    db = CosmosDBClient(
+        "https://stub",
+        None,
+        "macae",
+        "memory",
+        write_behind_window_ms=window_ms if mode == "write_behind" else 0,
+    )
+    await db.initialize()
+    plan_ids = [f"plan-{p:04d}" for p in range(plans)]
+    for plan_id in plan_ids:
+        await db.add_plan(
+            Plan(id=plan_id, plan_id=plan_id, user_id=USER_ID, initial_goal="Streamed plan")
+        )
+    cosmos_stub.stats.reset()
+
+    async def get_database(user_id: str = "", force_new: bool = False):
+        return db.for_user(user_id)
+
+    with patch("common.services.plan_service.DatabaseFactory.get_database", get_database):
+        started = time.perf_counter()
+        await asyncio.gather(*(stream_plan(plan_id, messages) for plan_id in plan_ids))
+        elapsed = time.perf_counter() - started
+        await db.close()
+
+    round_trips = sum(cosmos_stub.stats.operations.values())
+    ru = cosmos_stub.stats.request_charge
+
+    # Verify durability with a fresh client once everything has been flushed
+    verify = CosmosDBClient("https://stub", None, "macae", "memory", user_id=USER_ID)
+    await verify.initialize()
+    stored = await verify.get_data_by_type(DataType.m_plan_message)
+    completed = [await verify.get_plan_by_plan_id(plan_id) for plan_id in plan_ids]
+    await verify.close()
+    assert len(stored) == plans * messages, f"{len(stored)} messages persisted"
+    assert all(p.overall_status == PlanStatus.completed for p in completed)
+
+    return {
+        "plans": plans,
+        "mode": mode,
+        "messages": plans * messages,
+        "msgs_per_sec": round(plans * messages / elapsed),
+        "elapsed_ms": round(elapsed * 1000),
+        "round_trips": round_trips,
+        "ru": round(ru, 1),
+    }
+
+
+async def main(plan_counts, messages: int, latency_ms: float, window_ms: int) -> None:
+    cosmos_stub.CosmosClientStub.latency = latency_ms / 1000
+    rows = []
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        for plans in plan_counts:
+            for mode in ("direct", "write_behind"):
+                rows.append(await run_mode(mode, plans, messages, window_ms))
+    print_table(
+        f"Concurrent plans streaming {messages} messages each, {latency_ms}ms per operation, "
+        f"{window_ms}ms write-behind window",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--messages", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--window-ms", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.plans, args.messages, args.latency_ms, args.window_ms))
@@ -0,0 +1,63 @@
+"""Shared helpers for the benchmark scripts."""
+
+import os
+import statistics
+import sys
+from typing import Dict, List
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# AppConfig reads these at import time; benchmarks never talk to Azure.
+BENCHMARK_ENV = {
+    "APPLICATIONINSIGHTS_CONNECTION_STRING": "",
+    "APP_ENV": "dev",
+    "AZURE_OPENAI_ENDPOINT": "https://benchmark.openai.azure.com/",
+    "AZURE_AI_SUBSCRIPTION_ID": "00000000-0000-0000-0000-000000000000",
+    "AZURE_AI_RESOURCE_GROUP": "rg-benchmark",
+    "AZURE_AI_PROJECT_NAME": "proj-benchmark",
+    "AZURE_AI_AGENT_ENDPOINT": "https://agents.benchmark.local/",
+    "COSMOSDB_ENDPOINT": "https://benchmark.documents.azure.com:443/",
+    "COSMOSDB_DATABASE": "macae",
+    "COSMOSDB_CONTAINER": "memory",
+    "SUPPORTED_MODELS": '["o3","o4-mini","gpt-4.1","gpt-4.1-mini"]',
+}
+
+
+def setup_environment() -> None:
+    """Make backend modules importable and satisfy AppConfig without Azure."""
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(samples_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max summary in milliseconds."""
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(statistics.median(samples_ms), 2) if samples_ms else 0.0,
+        "p95_ms": round(percentile(samples_ms, 95), 2),
+        "p99_ms": round(percentile(samples_ms, 99), 2),
+        "max_ms": round(max(samples_ms), 2) if samples_ms else 0.0,
+    }
+
+
+def print_table(title: str, rows: List[Dict[str, object]]) -> None:
+    """Print a list of flat dicts as an aligned table."""
+    print(f"\n{title}")
+    if not rows:
+        return
+    headers = list(rows[0].keys())
+    widths = {h: max(len(str(h)), *(len(str(r.get(h, ""))) for r in rows)) for h in headers}
+    print("  ".join(str(h).ljust(widths[h]) for h in headers))
+    for row in rows:
+        print("  ".join(str(row.get(h, "")).ljust(widths[h]) for h in headers))
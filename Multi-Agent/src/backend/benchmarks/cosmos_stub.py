@@ -0,0 +1,566 @@
+"""In-memory stand-in for ``azure.cosmos.aio.CosmosClient`` used by the benchmarks.
+
+Only the surface that ``CosmosDBClient`` touches is implemented. The stub keeps
+one document store per (database, container) for the whole process, the same
+way a real account is shared by every client connected to it, and it tracks how
+many clients are open so benchmarks can report connection counts.
+
+Request charges are a rough model of Cosmos DB pricing (point read ~1 RU, a
+query pays a fixed overhead plus a per-document cost, per page, and fans out
+across every physical partition when no partition key is given). They are good
+for comparing access patterns against each other, not for capacity planning.
+A query that filters on some fields and orders by another also pays for every
+matching document unless a composite index in the container's indexing policy
+serves it, the way the service has to sort such results itself.
+"""
+
+import asyncio
+import base64
+import copy
+import json
+import re
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from azure.cosmos.exceptions import (
+    CosmosBatchOperationError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+
+from common.database.indexing import (
+    INDEX_UTILIZATION_HEADER,
+    REQUEST_CHARGE_HEADER,
+    QueryShape,
+    serves_composite,
+)
+
+POINT_READ_RU = 1.0
+WRITE_RU_PER_KB = 5.5
+QUERY_BASE_RU = 2.3
+QUERY_PARTITION_RU = 1.0
+# Physical partitions a cross-partition query fans out to (capped by the
+# number of logical partitions that actually hold data)
+PHYSICAL_PARTITIONS = 4
+QUERY_DOC_RU = 0.25
+QUERY_KB_RU = 0.1
+
+# What a new container gets when no indexing policy is given
+DEFAULT_INDEXING_POLICY = {
+    "indexingMode": "consistent",
+    "automatic": True,
+    "includedPaths": [{"path": "/*"}],
+    "excludedPaths": [{"path": '/"_etag"/?'}],
+}
+
+_QUERY_RE = re.compile(
+    r"^\s*SELECT\s+(?P<projection>.+?)\s+FROM\s+c"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?"
+    r"(?:\s+ORDER\s+BY\s+c\.(?P<order>\w+)(?:\s+(?P<direction>ASC|DESC))?)?"
+    r"(?:\s+OFFSET\s+(?P<offset>\d+|@\w+)\s+LIMIT\s+(?P<limit>\d+|@\w+))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONDITION_RE = re.compile(r"^c\.(?P<field>\w+)\s*=\s*(?P<value>@\w+)$")
+
+
+class StubStats:
+    """Counters shared by every client connected to the stub account."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.clients_created = 0
+        self.open_clients = 0
+        self.peak_open_clients = 0
+        self.request_charge = 0.0
+        self.operations: Dict[str, int] = defaultdict(int)
+        self.charge_by_operation: Dict[str, float] = defaultdict(float)
+
+    def record(self, operation: str, charge: float) -> None:
+        self.operations[operation] += 1
+        self.request_charge += charge
+        self.charge_by_operation[operation] += charge
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "clients_created": self.clients_created,
+            "peak_open_clients": self.peak_open_clients,
+            "request_charge": round(self.request_charge, 2),
+            "operations": dict(self.operations),
+        }
+
+
+class _Store:
+    """Documents keyed on (partition key, id) plus an equality index per top-level field."""
+
+    def __init__(self) -> None:
+        self.docs: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.index: Dict[Tuple[str, Any], set] = defaultdict(set)
+        self.partition_sizes: Dict[str, int] = defaultdict(int)
+        # Change feed position of each document's latest write
+        self.lsn = 0
+        self.modified: Dict[Tuple[str, str], int] = {}
+        self.indexing_policy: Dict[str, Any] = copy.deepcopy(DEFAULT_INDEXING_POLICY)
+
+    def _index_keys(self, doc: Dict[str, Any]):
+        for field, value in doc.items():
+            if isinstance(value, (str, int, float, bool)) or value is None:
+                yield (field, value)
+
+    def put(self, key: Tuple[str, str], doc: Dict[str, Any]) -> None:
+        self.pop(key)
+        self.docs[key] = doc
+        self.partition_sizes[key[0]] += 1
+        self.lsn += 1
+        self.modified[key] = self.lsn
+        for index_key in self._index_keys(doc):
+            self.index[index_key].add(key)
+
+    def pop(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        doc = self.docs.pop(key, None)
+        if doc is not None:
+            # Like the latest-version change feed, deletes are not reported
+            del self.modified[key]
+            self.partition_sizes[key[0]] -= 1
+            if not self.partition_sizes[key[0]]:
+                del self.partition_sizes[key[0]]
+            for index_key in self._index_keys(doc):
+                self.index[index_key].discard(key)
+        return doc
+
+    def find(self, filters: Dict[str, Any], partition_key: Optional[str]) -> List[Dict[str, Any]]:
+        if filters:
+            keys = set.intersection(*(self.index.get((f, v), set()) for f, v in filters.items()))
+        else:
+            keys = set(self.docs)
+        return [self.docs[k] for k in keys if partition_key is None or k[0] == partition_key]
+
+    def partitions(self) -> int:
+        return len(self.partition_sizes)
+
+    def changed_since(self, lsn: int) -> List[Dict[str, Any]]:
+        changed = sorted((m, k) for k, m in self.modified.items() if m > lsn)
+        return [self.docs[k] for _, k in changed]
+
+
+stats = StubStats()
+_stores: Dict[Tuple[str, str], _Store] = defaultdict(_Store)
+
+
+def reset_stub() -> None:
+    """Drop all stored documents and counters."""
+    _stores.clear()
+    stats.reset()
+
+
+def _doc_kb(doc: Dict[str, Any]) -> float:
+    return len(json.dumps(doc, default=str)) / 1024
+
+
+def parse_query(query: str, parameters: List[Dict[str, Any]]):
+    """Split a query into (projection, filters, order, offset, limit)."""
+    match = _QUERY_RE.match(query)
+    if not match:
+        raise ValueError(f"Query not supported by the Cosmos stub: {query}")
+
+    values = {p["name"]: p["value"] for p in parameters or []}
+    filters: Dict[str, Any] = {}
+    if match.group("where"):
+        for condition in re.split(r"\s+AND\s+", match.group("where").strip(), flags=re.IGNORECASE):
+            cond = _CONDITION_RE.match(condition.strip())
+            if not cond:
+                raise ValueError(f"Condition not supported by the Cosmos stub: {condition}")
+            filters[cond.group("field")] = _json_value(values.get(cond.group("value")))
+
+    projection = match.group("projection").strip()
+    fields = None
+    if projection != "*":
+        fields = [f.strip()[2:] for f in projection.split(",")]
+
+    def _int(token):
+        if token is None:
+            return None
+        return int(values[token]) if token.startswith("@") else int(token)
+
+    order = None
+    if match.group("order"):
+        order = (match.group("order"), (match.group("direction") or "ASC").upper())
+
+    return fields, filters, order, _int(match.group("offset")), _int(match.group("limit"))
+
+
+def _json_value(value: Any) -> Any:
+    """Normalize a parameter the way the SDK would serialize it (enums become strings)."""
+    return json.loads(json.dumps(value, default=str))
+
+
+class _ChangeFeedIterator:
+    """Async iterator over the latest-version change feed of a container.
+
+    The continuation token handed to ``response_hook`` in the ``etag``
+    header is the feed position after this read, as with the SDK.
+    """
+
+    def __init__(self, container: "ContainerStub", start_time, continuation, response_hook):
+        self._container = container
+        self._start_time = start_time
+        self._continuation = continuation
+        self._response_hook = response_hook
+        self._items = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._items is None:
+            await self._container._io()
+            store = self._container._store
+            if self._continuation is not None:
+                since = int(self._continuation)
+            elif self._start_time == "Beginning":
+                since = 0
+            else:
+                since = store.lsn
+            changed = [copy.deepcopy(doc) for doc in store.changed_since(since)]
+            stats.record(
+                "query_items_change_feed",
+                QUERY_BASE_RU + QUERY_DOC_RU * len(changed) + QUERY_KB_RU * sum(_doc_kb(d) for d in changed),
+            )
+            if self._response_hook:
+                self._response_hook({"etag": str(store.lsn)}, changed)
+            self._items = iter(changed)
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _QueryIterator:
+    """Async iterator over query results, mirroring ``AsyncItemPaged``.
+
+    Like the service, results are fetched one page (``max_item_count``
+    documents) per round trip and each page is charged separately.
+    """
+
+    def __init__(
+        self,
+        container: "ContainerStub",
+        query: str,
+        parameters,
+        partition_key,
+        max_item_count,
+        response_hook=None,
+        populate_index_metrics=False,
+    ):
+        self._container = container
+        self._query = query
+        self._parameters = parameters
+        self._partition_key = partition_key
+        self._max_item_count = max_item_count or 100
+        self._response_hook = response_hook
+        self._populate_index_metrics = populate_index_metrics
+        self._pages: Optional["_PageIterator"] = None
+        self._page: Optional["_AsyncList"] = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._pages is None:
+            self._pages = self.by_page()
+        while True:
+            if self._page is None:
+                self._page = await self._pages.__anext__()
+            try:
+                return await self._page.__anext__()
+            except StopAsyncIteration:
+                self._page = None
+
+    def by_page(self, continuation_token: Optional[str] = None):
+        return _PageIterator(self, continuation_token)
+
+
+class _PageIterator:
+    def __init__(self, query_iterator: _QueryIterator, continuation_token: Optional[str]):
+        self._query_iterator = query_iterator
+        self._offset = int(continuation_token) if continuation_token else 0
+        self.continuation_token: Optional[str] = continuation_token
+        self._done = False
+        # Server-side cursor: the matching documents, resolved on the first page
+        self._cursor = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._done:
+            raise StopAsyncIteration
+        qi = self._query_iterator
+        if self._cursor is None:
+            self._cursor = qi._container._select(qi._query, qi._parameters, qi._partition_key)
+        page, total, headers = await qi._container._fetch_page(
+            self._cursor,
+            qi._partition_key,
+            self._offset,
+            qi._max_item_count,
+            qi._populate_index_metrics,
+        )
+        if qi._response_hook:
+            qi._response_hook(headers, page)
+        self._offset += len(page)
+        if self._offset >= total:
+            self.continuation_token = None
+            self._done = True
+            if not page and self._offset > 0:
+                raise StopAsyncIteration
+        else:
+            self.continuation_token = str(self._offset)
+        return _AsyncList(page)
+
+
+class _AsyncList:
+    def __init__(self, items):
+        self._items = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class ContainerStub:
+    """Minimal async ContainerProxy backed by a dict keyed on (partition key, id)."""
+
+    def __init__(self, client: "CosmosClientStub", database: str, name: str, partition_key_path: str = "session_id"):
+        self.id = name
+        self._client = client
+        self._store = _stores[(database, name)]
+        self._pk_field = partition_key_path
+
+    async def _io(self) -> None:
+        await self._client._connect()
+        if self._client.latency:
+            await asyncio.sleep(self._client.latency)
+
+    def _stamp(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        # Round-trip through JSON so stored documents look like what Cosmos returns
+        doc = json.loads(json.dumps(body, default=str))
+        doc["_ts"] = int(time.time())
+        doc["_etag"] = f'"{uuid.uuid4()}"'
+        return doc
+
+    async def create_item(self, body: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        await self._io()
+        key = (body.get(self._pk_field), body["id"])
+        if key in self._store.docs:
+            raise CosmosResourceExistsError(status_code=409, message=f"Item {body['id']} already exists")
+        doc = self._stamp(body)
+        self._store.put(key, doc)
+        stats.record("create_item", WRITE_RU_PER_KB * max(1.0, _doc_kb(doc)))
+        return copy.deepcopy(doc)
+
+    async def upsert_item(self, body: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        await self._io()
+        doc = self._stamp(body)
+        self._store.put((body.get(self._pk_field), body["id"]), doc)
+        stats.record("upsert_item", WRITE_RU_PER_KB * max(1.0, _doc_kb(doc)))
+        return copy.deepcopy(doc)
+
+    async def read_item(self, item: str, partition_key: str, **kwargs) -> Dict[str, Any]:
+        await self._io()
+        doc = self._store.docs.get((partition_key, item))
+        stats.record("read_item", POINT_READ_RU)
+        if doc is None:
+            raise CosmosResourceNotFoundError(status_code=404, message=f"Item {item} not found")
+        return copy.deepcopy(doc)
+
+    async def delete_item(self, item: str, partition_key: str, **kwargs) -> None:
+        await self._io()
+        stats.record("delete_item", WRITE_RU_PER_KB)
+        if self._store.pop((partition_key, item)) is None:
+            raise CosmosResourceNotFoundError(status_code=404, message=f"Item {item} not found")
+
+    async def execute_item_batch(self, batch_operations, partition_key: str, **kwargs) -> List[Dict[str, Any]]:
+        """Apply create/upsert/delete operations atomically within one partition."""
+        await self._io()
+        # key -> staged document, or None for a staged delete
+        staged: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+
+        def exists(key):
+            return staged[key] is not None if key in staged else key in self._store.docs
+
+        def fail(index, status_code, message):
+            raise CosmosBatchOperationError(
+                error_index=index, status_code=status_code, message=message, headers={}, operation_responses=[]
+            )
+
+        for index, (operation, args, *_) in enumerate(batch_operations):
+            if operation == "delete":
+                key = (partition_key, args[0])
+                if not exists(key):
+                    fail(index, 404, "Not found")
+                staged[key] = None
+                continue
+            if operation not in ("create", "upsert"):
+                raise ValueError(f"Batch operation not supported by the Cosmos stub: {operation}")
+            body = args[0]
+            key = (partition_key, body["id"])
+            if body.get(self._pk_field) != partition_key:
+                fail(index, 400, "Partition key mismatch")
+            if operation == "create" and exists(key):
+                fail(index, 409, "Conflict")
+            staged[key] = self._stamp(body)
+
+        charge = 0.0
+        for key, doc in staged.items():
+            if doc is None:
+                self._store.pop(key)
+                charge += WRITE_RU_PER_KB
+            else:
+                self._store.put(key, doc)
+                charge += WRITE_RU_PER_KB * max(1.0, _doc_kb(doc))
+        stats.record("execute_item_batch", charge)
+        return [{"statusCode": 200 if doc else 204, "resourceBody": doc} for doc in staged.values()]
+
+    def query_items_change_feed(self, start_time=None, continuation=None, response_hook=None, **kwargs):
+        return _ChangeFeedIterator(self, start_time, continuation, response_hook)
+
+    def query_items(
+        self,
+        query: str,
+        parameters=None,
+        partition_key=None,
+        max_item_count=None,
+        response_hook=None,
+        populate_index_metrics=False,
+        **kwargs,
+    ):
+        return _QueryIterator(
+            self, query, parameters, partition_key, max_item_count, response_hook, populate_index_metrics
+        )
+
+    async def read(self, **kwargs) -> Dict[str, Any]:
+        await self._io()
+        return {
+            "id": self.id,
+            "partitionKey": {"paths": [f"/{self._pk_field}"], "kind": "Hash"},
+            "indexingPolicy": copy.deepcopy(self._store.indexing_policy),
+        }
+
+    def _index_utilization(self, shape: QueryShape) -> Dict[str, Any]:
+        """Index use of a query, in the shape of the index utilization header."""
+        utilization = {
+            "UtilizedSingleIndexes": [{"IndexSpec": f"/{f}/?"} for f in shape.filters],
+            "PotentialSingleIndexes": [],
+            "UtilizedCompositeIndexes": [],
+            "PotentialCompositeIndexes": [],
+        }
+        required = shape.composite_index()
+        if required:
+            directions = {"ascending": "ASC", "descending": "DESC"}
+            spec = {"IndexSpecs": [f"{i['path']} {directions[i['order']]}" for i in required]}
+            served = any(
+                serves_composite(existing, required)
+                for existing in self._store.indexing_policy.get("compositeIndexes", [])
+            )
+            key = "UtilizedCompositeIndexes" if served else "PotentialCompositeIndexes"
+            utilization[key].append(spec)
+        return utilization
+
+    def _select(self, query: str, parameters, partition_key):
+        """Resolve a query to (projected fields, matching stored documents, index use)."""
+        fields, filters, order, offset, limit = parse_query(query, parameters)
+        matches = self._store.find(filters, partition_key)
+        if order:
+            field, direction = order
+            matches.sort(key=lambda d: d.get(field, ""), reverse=direction == "DESC")
+        if offset is not None:
+            matches = matches[offset:offset + limit]
+        shape = QueryShape("stub", tuple(filters), (order[0], order[1] == "DESC") if order else None)
+        return fields, matches, self._index_utilization(shape)
+
+    async def _fetch_page(
+        self, cursor, partition_key, start: int, count: int, populate_index_metrics: bool = False
+    ) -> Tuple[List[Dict[str, Any]], int, Dict[str, Any]]:
+        """Return one page of a resolved query, the total result count and response headers."""
+        await self._io()
+        fields, matches, utilization = cursor
+        page = matches[start:start + count]
+        if fields is not None:
+            page = [{f: doc.get(f) for f in fields if f in doc} for doc in page]
+        else:
+            page = [copy.deepcopy(doc) for doc in page]
+
+        partitions = 1
+        if partition_key is None:
+            partitions = max(1, min(PHYSICAL_PARTITIONS, self._store.partitions()))
+        charge = (
+            QUERY_BASE_RU
+            + QUERY_PARTITION_RU * partitions
+            + QUERY_DOC_RU * len(page)
+            + QUERY_KB_RU * sum(_doc_kb(d) for d in page)
+        )
+        if utilization["PotentialCompositeIndexes"] and start == 0:
+            # Without a composite index every match is read to sort it
+            charge += QUERY_DOC_RU * len(matches)
+        stats.record("query_items", charge)
+        headers = {REQUEST_CHARGE_HEADER: str(round(charge, 2))}
+        if populate_index_metrics:
+            headers[INDEX_UTILIZATION_HEADER] = base64.b64encode(
+                json.dumps(utilization).encode()
+            ).decode()
+        return page, len(matches), headers
+
+
+class DatabaseStub:
+    def __init__(self, client: "CosmosClientStub", name: str):
+        self.id = name
+        self._client = client
+
+    def get_container_client(self, container: str) -> ContainerStub:
+        return ContainerStub(self._client, self.id, container)
+
+    async def replace_container(self, container, partition_key=None, indexing_policy=None, **kwargs):
+        container_id = getattr(container, "id", container)
+        if indexing_policy is not None:
+            _stores[(self.id, container_id)].indexing_policy = copy.deepcopy(indexing_policy)
+        return self.get_container_client(container_id)
+
+
+class CosmosClientStub:
+    """Drop-in replacement for ``azure.cosmos.aio.CosmosClient``.
+
+    ``latency`` is paid by every operation; ``connect_latency`` is paid once by
+    the first operation of each client, standing in for the TLS handshake and
+    account metadata fetch a fresh SDK client performs.
+    """
+
+    latency: float = 0.0
+    connect_latency: float = 0.0
+
+    def __init__(self, url: str = "", credential: Any = None, **kwargs) -> None:
+        stats.clients_created += 1
+        stats.open_clients += 1
+        stats.peak_open_clients = max(stats.peak_open_clients, stats.open_clients)
+        self._closed = False
+        self._connected: Optional[asyncio.Future] = None
+
+    async def _connect(self) -> None:
+        if self._connected is None:
+            self._connected = asyncio.ensure_future(asyncio.sleep(self.connect_latency))
+        await asyncio.shield(self._connected)
+
+    def get_database_client(self, database: str) -> DatabaseStub:
+        return DatabaseStub(self, database)
+
+    async def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            stats.open_clients -= 1
@@ -24,10 +24,148 @@ class AppConfig:
         self.AZURE_CLIENT_ID = self._get_optional("AZURE_CLIENT_ID")
         self.AZURE_CLIENT_SECRET = self._get_optional("AZURE_CLIENT_SECRET")
 
+        # Database backend: "cosmos", or "memory" / "sqlite" to run locally
+        # without a Cosmos DB account (load tests, benchmarks, offline dev)
+        self.DATABASE_BACKEND = self._get_optional("DATABASE_BACKEND", "cosmos").lower()
+        self.SQLITE_DATABASE_PATH = self._get_optional(
+            "SQLITE_DATABASE_PATH", "macae.sqlite3"
+        )
+
         # CosmosDB settings
         self.COSMOSDB_ENDPOINT = self._get_optional("COSMOSDB_ENDPOINT")
         self.COSMOSDB_DATABASE = self._get_optional("COSMOSDB_DATABASE")
         self.COSMOSDB_CONTAINER = self._get_optional("COSMOSDB_CONTAINER")
+        # Agent messages and plan updates are buffered for this long and written
+        # as one transactional batch per partition; 0 (the default) writes them
+        # immediately
+        self.COSMOSDB_WRITE_BEHIND_WINDOW_MS = int(
+            self._get_optional("COSMOSDB_WRITE_BEHIND_WINDOW_MS", "0")
+        )
+        self.COSMOSDB_WRITE_BEHIND_MAX_BATCH = int(
+            self._get_optional("COSMOSDB_WRITE_BEHIND_MAX_BATCH", "100")
+        )
+        # Team and current-team lookups are cached for this long (0 disables);
+        # the change feed is polled to drop entries other replicas changed
+        self.TEAM_CACHE_TTL_SECONDS = float(
+            self._get_optional("TEAM_CACHE_TTL_SECONDS", "60")
+        )
+        self.TEAM_CACHE_MAX_ENTRIES = int(
+            self._get_optional("TEAM_CACHE_MAX_ENTRIES", "1000")
+        )
+        # Serialized bodies of GET /api/v3/team_configs and /api/v3/plans are
+        # kept this long (0 disables); each carries the ETag it was built for
+        self.RESPONSE_CACHE_TTL_SECONDS = float(
+            self._get_optional("RESPONSE_CACHE_TTL_SECONDS", "300")
+        )
+        self.RESPONSE_CACHE_MAX_ENTRIES = int(
+            self._get_optional("RESPONSE_CACHE_MAX_ENTRIES", "1000")
+        )
+        # GET /api/v3/events: status updates kept per user for Last-Event-ID
+        # replay, seconds between heartbeats, and users whose buffers are kept
+        self.SSE_REPLAY_BUFFER_SIZE = int(
+            self._get_optional("SSE_REPLAY_BUFFER_SIZE", "100")
+        )
+        self.SSE_HEARTBEAT_SECONDS = float(
+            self._get_optional("SSE_HEARTBEAT_SECONDS", "15")
+        )
+        self.SSE_MAX_CHANNELS = int(self._get_optional("SSE_MAX_CHANNELS", "10000"))
+        self.COSMOSDB_CHANGE_FEED_POLL_SECONDS = float(
+            self._get_optional("COSMOSDB_CHANGE_FEED_POLL_SECONDS", "5")
+        )
+        # Warn at startup when the container's indexing policy does not serve
+        # the client's queries; log RU charge and index use of every query
+        self.COSMOSDB_VERIFY_INDEXING_POLICY = self._get_bool(
+            "COSMOSDB_VERIFY_INDEXING_POLICY", default=True
+        )
+        self.COSMOSDB_QUERY_METRICS = self._get_bool("COSMOSDB_QUERY_METRICS")
+
+        # Orchestration job pool: runs at once (overall and per user), jobs
+        # waiting beyond which submissions get a 429, and how long finished
+        # jobs (and their idempotency keys) are kept
+        self.ORCHESTRATION_MAX_CONCURRENT_JOBS = int(
+            self._get_optional("ORCHESTRATION_MAX_CONCURRENT_JOBS", "4")
+        )
+        self.ORCHESTRATION_MAX_JOBS_PER_USER = int(
+            self._get_optional("ORCHESTRATION_MAX_JOBS_PER_USER", "1")
+        )
+        self.ORCHESTRATION_MAX_QUEUED_JOBS = int(
+            self._get_optional("ORCHESTRATION_MAX_QUEUED_JOBS", "100")
+        )
+        self.ORCHESTRATION_MAX_QUEUED_JOBS_PER_USER = int(
+            self._get_optional("ORCHESTRATION_MAX_QUEUED_JOBS_PER_USER", "5")
+        )
+        self.ORCHESTRATION_JOB_RETENTION_SECONDS = float(
+            self._get_optional("ORCHESTRATION_JOB_RETENTION_SECONDS", "3600")
+        )
+        # Where orchestrations run: "inprocess" (in the API process) or
+        # "sqlite" (queued in ORCHESTRATION_QUEUE_PATH for orchestration_worker
+        # processes on the same host)
+        self.ORCHESTRATION_JOB_TRANSPORT = self._get_optional(
+            "ORCHESTRATION_JOB_TRANSPORT", "inprocess"
+        ).lower()
+        self.ORCHESTRATION_QUEUE_PATH = self._get_optional(
+            "ORCHESTRATION_QUEUE_PATH", "orchestration_queue.sqlite3"
+        )
+        self.ORCHESTRATION_QUEUE_POLL_SECONDS = float(
+            self._get_optional("ORCHESTRATION_QUEUE_POLL_SECONDS", "0.1")
+        )
+        self.ORCHESTRATION_WORKER_CONCURRENCY = int(
+            self._get_optional("ORCHESTRATION_WORKER_CONCURRENCY", "4")
+        )
+        # A worker renews the lease of its running jobs; a job whose lease is
+        # not renewed for this long is requeued, and dropped once it has been
+        # claimed ORCHESTRATION_JOB_MAX_ATTEMPTS times
+        self.ORCHESTRATION_JOB_LEASE_SECONDS = float(
+            self._get_optional("ORCHESTRATION_JOB_LEASE_SECONDS", "60")
+        )
+        self.ORCHESTRATION_JOB_MAX_ATTEMPTS = int(
+            self._get_optional("ORCHESTRATION_JOB_MAX_ATTEMPTS", "2")
+        )
+        # The API fails a queued job whose result has not arrived after this
+        # long (0 waits forever)
+        self.ORCHESTRATION_JOB_TIMEOUT_SECONDS = float(
+            self._get_optional("ORCHESTRATION_JOB_TIMEOUT_SECONDS", "3600")
+        )
+
+        # Opened agent templates are shared by the users of a team and closed
+        # (deleting their Foundry definition) after this long unused
+        self.AGENT_POOL_IDLE_SECONDS = float(
+            self._get_optional("AGENT_POOL_IDLE_SECONDS", "900")
+        )
+        # Agents of a team opened at the same time by init_team
+        self.AGENT_BUILD_CONCURRENCY = int(
+            self._get_optional("AGENT_BUILD_CONCURRENCY", "8")
+        )
+        # Name -> id index of the project's agent definitions, saved to this
+        # file ("" keeps it in memory) and rebuilt from list_agents this often
+        # (0: only when missing); connection lookups are cached as long
+        self.AGENT_INDEX_PATH = self._get_optional("AGENT_INDEX_PATH", "agent_index.json")
+        self.AGENT_INDEX_REFRESH_SECONDS = float(
+            self._get_optional("AGENT_INDEX_REFRESH_SECONDS", "300")
+        )
+        # A name missing from the index triggers a rescan (for agents created
+        # by other hosts) unless the index was built less than this long ago
+        self.AGENT_INDEX_MISS_RESCAN_SECONDS = float(
+            self._get_optional("AGENT_INDEX_MISS_RESCAN_SECONDS", "30")
+        )
+
+        # Admission control of the LLM-backed routes: per-user token buckets
+        # (JSON {"route": "<burst>/<seconds>"} overriding the defaults), kept
+        # in "memory" or in a "sqlite" file shared by the API processes, and
+        # a bound on concurrent model requests derived from the deployment's
+        # tokens-per-minute quota (0 disables it)
+        self.RATE_LIMITS = self._get_optional("RATE_LIMITS")
+        self.RATE_LIMIT_STORE = self._get_optional("RATE_LIMIT_STORE", "memory").lower()
+        self.RATE_LIMIT_SQLITE_PATH = self._get_optional(
+            "RATE_LIMIT_SQLITE_PATH", "rate_limits.sqlite3"
+        )
+        self.LLM_TPM_BUDGET = int(self._get_optional("LLM_TPM_BUDGET", "0"))
+        self.LLM_TOKENS_PER_REQUEST = int(
+            self._get_optional("LLM_TOKENS_PER_REQUEST", "4000")
+        )
+        self.LLM_REQUEST_SECONDS = float(
+            self._get_optional("LLM_REQUEST_SECONDS", "20")
+        )
 
         self.APPLICATIONINSIGHTS_CONNECTION_STRING = self._get_required(
             "APPLICATIONINSIGHTS_CONNECTION_STRING"
@@ -44,6 +182,16 @@ class AppConfig:
         self.AZURE_MANAGEMENT_SCOPE = self._get_optional(
             "AZURE_MANAGEMENT_SCOPE", "https://management.azure.com/.default"
         )
+        # Cached Azure tokens are renewed this long before they expire (and
+        # in the background up to twice as early)
+        self.CREDENTIAL_REFRESH_MARGIN_SECONDS = float(
+            self._get_optional("CREDENTIAL_REFRESH_MARGIN_SECONDS", "300")
+        )
+        # RAI checks of user text: model deployment, checks in flight at once
+        # (0: unbounded) and how long one may take
+        self.RAI_DEPLOYMENT_NAME = self._get_optional("RAI_DEPLOYMENT_NAME", "gpt-4.1")
+        self.RAI_MAX_CONCURRENT = int(self._get_optional("RAI_MAX_CONCURRENT", "8"))
+        self.RAI_TIMEOUT_SECONDS = float(self._get_optional("RAI_TIMEOUT_SECONDS", "30"))
 
         # Azure OpenAI settings
         self.AZURE_OPENAI_DEPLOYMENT_NAME = self._get_required(
@@ -178,16 +326,20 @@ class AppConfig:
             return os.environ[name]
         return default
 
-    def _get_bool(self, name: str) -> bool:
+    def _get_bool(self, name: str, default: bool = False) -> bool:
         """Get a boolean configuration value from environment variables.
 
         Args:
             name: The name of the environment variable
+            default: Value used when the environment variable is not set
 
         Returns:
-            True if the environment variable exists and is set to 'true' or '1', False otherwise
+            ``default`` if the environment variable is not set, otherwise True
+            if it is set to 'true' or '1' and False for anything else
         """
-        return name in os.environ and os.environ[name].lower() in ["true", "1"]
+        if name not in os.environ:
+            return default
+        return os.environ[name].lower() in ["true", "1"]
 
     def get_cosmos_database_client(self):
         """Get a Cosmos DB client for the configured database.
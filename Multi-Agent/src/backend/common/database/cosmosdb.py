@@ -1,12 +1,19 @@
 """CosmosDB implementation of the database interface."""
 
-import datetime
+import asyncio
+import copy
 import logging
-from typing import Any, Dict, List, Optional, Type
+from collections import OrderedDict, defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Type, Union
 
 import models.messages as messages
 from azure.cosmos.aio import CosmosClient
 from azure.cosmos.aio._database import DatabaseProxy
+from azure.cosmos.exceptions import (
+    CosmosBatchOperationError,
+    CosmosResourceNotFoundError,
+)
+from pydantic import BaseModel
 from common.config.app_config import config
 from common.database.database_base import DatabaseBase
 
@@ -16,11 +23,24 @@ from ..models.messages_kernel import (
     BaseDataModel,
     DataType,
     Plan,
+    PlanLocation,
+    PlanSummary,
     Step,
     TeamConfiguration,
     UserCurrentTeam,
 )
-from .database_base import DatabaseBase
+from .database_base import DatabaseBase, DeleteResult, ItemPage, documents_version
+from .indexing import QueryMetricsHook, build_indexing_policy, verify_indexing_policy
+from .serialization import from_document, to_document
+from .team_cache import (
+    ALL_TEAMS,
+    ALL_TEAMS_VERSION,
+    TeamCache,
+    TeamChangeFeedListener,
+    current_team_key,
+    team_key,
+)
+from .write_behind import MAX_BATCH_OPERATIONS, WriteBehindBuffer
 
 
 class CosmosDBClient(DatabaseBase):
@@ -28,12 +48,54 @@ class CosmosDBClient(DatabaseBase):
 
     MODEL_CLASS_MAPPING = {
         DataType.plan: Plan,
+        DataType.plan_location: PlanLocation,
         DataType.step: Step,
         DataType.agent_message: AgentMessage,
         DataType.team_config: TeamConfiguration,
         DataType.user_current_team: UserCurrentTeam,
     }
 
+    # Every query the client runs, by name. The indexing policy is generated
+    # from these and query metrics are logged under these names. Queries that
+    # read fewer fields swap "SELECT *" for a projection (see _query).
+    QUERIES = {
+        "document_by_id": "SELECT * FROM c WHERE c.id=@id AND c.data_type=@data_type",
+        "documents_by_user": "SELECT * FROM c WHERE c.user_id=@user_id",
+        "documents_by_user_type": "SELECT * FROM c WHERE c.user_id=@user_id AND c.data_type=@data_type",
+        "documents_by_plan": "SELECT * FROM c WHERE c.plan_id=@plan_id",
+        "documents_by_plan_type": "SELECT * FROM c WHERE c.plan_id=@plan_id AND c.data_type=@data_type",
+        "documents_by_plan_type_oldest_first": "SELECT * FROM c WHERE c.plan_id=@plan_id AND c.data_type=@data_type ORDER BY c.timestamp ASC",
+        "plans_by_team": "SELECT * FROM c WHERE c.team_id=@team_id AND c.data_type=@data_type AND c.user_id=@user_id",
+        "plans_by_team_status_newest_first": "SELECT * FROM c WHERE c.team_id=@team_id AND c.data_type=@data_type AND c.user_id=@user_id AND c.overall_status=@status ORDER BY c._ts DESC",
+        "team_by_team_id": "SELECT * FROM c WHERE c.team_id=@team_id AND c.data_type=@data_type",
+        "teams_newest_first": "SELECT * FROM c WHERE c.data_type=@data_type ORDER BY c.created DESC",
+    }
+    _QUERY_NAMES = {query.split(" FROM ", 1)[1]: name for name, query in QUERIES.items()}
+
+    # Large or nested fields no query filters or orders on, left out of the index
+    UNINDEXED_PATHS = (
+        '/"_etag"/?',
+        "/content/?",
+        "/raw_data/?",
+        "/m_plan/*",
+        "/steps/*",
+        "/next_steps/*",
+        "/agents/*",
+        "/starting_tasks/*",
+    )
+
+    # Fields read by queries that only need to locate documents for deletion
+    _DELETE_FIELDS = ("id", "session_id", "data_type")
+
+    # Fields read to compute the version of a query result
+    _VERSION_FIELDS = ("id", "_etag")
+
+    # Upper bound on the id -> partition key map kept for point reads
+    PARTITION_KEY_CACHE_SIZE = 10000
+
+    # Partitions deleted from concurrently by one bulk delete
+    BULK_DELETE_CONCURRENCY = 8
+
     def __init__(
         self,
         endpoint: str,
@@ -42,6 +104,13 @@ class CosmosDBClient(DatabaseBase):
         container_name: str,
         session_id: str = "",
         user_id: str = "",
+        write_behind_window_ms: int = 0,
+        write_behind_max_batch: int = MAX_BATCH_OPERATIONS,
+        team_cache_ttl_seconds: float = 0,
+        team_cache_max_entries: int = 1000,
+        change_feed_poll_seconds: float = 0,
+        verify_indexing_policy: bool = False,
+        query_metrics: bool = False,
     ):
         self.endpoint = endpoint
         self.credential = credential
@@ -55,6 +124,27 @@ class CosmosDBClient(DatabaseBase):
         self.database = None
         self.container = None
         self._initialized = False
+        # Views created through for_user() share the client and must not close it
+        self._owns_client = True
+        # id -> partition key of documents seen by this client (shared with views),
+        # so documents whose partition cannot be derived can still be point-read
+        self._partition_keys: "OrderedDict[str, str]" = OrderedDict()
+        # Agent messages and plan updates go through a write-behind buffer when
+        # a window is configured (shared with views like the container)
+        self.write_behind_window_ms = write_behind_window_ms
+        self.write_behind_max_batch = write_behind_max_batch
+        self._write_buffer: Optional[WriteBehindBuffer] = None
+        # Team and current-team lookups are cached when a TTL is configured;
+        # the change feed listener invalidates writes made by other replicas
+        self.team_cache_ttl_seconds = team_cache_ttl_seconds
+        self.team_cache_max_entries = team_cache_max_entries
+        self.change_feed_poll_seconds = change_feed_poll_seconds
+        self._team_cache: Optional[TeamCache] = None
+        self._change_feed_listener: Optional[TeamChangeFeedListener] = None
+        # Startup check of the container's indexing policy against QUERIES,
+        # and per-query RU / index utilization logging
+        self.verify_indexing_policy = verify_indexing_policy
+        self.query_metrics = query_metrics
 
     async def initialize(self) -> None:
         """Initialize the CosmosDB client and create container if needed."""
@@ -68,12 +158,70 @@ class CosmosDBClient(DatabaseBase):
                 self.container = await self._get_container(
                     self.database, self.container_name
                 )
+                if self.write_behind_window_ms > 0:
+                    self._write_buffer = WriteBehindBuffer(
+                        self.container,
+                        window_seconds=self.write_behind_window_ms / 1000,
+                        max_batch_size=self.write_behind_max_batch,
+                    )
+                if self.team_cache_ttl_seconds > 0:
+                    self._team_cache = TeamCache(
+                        self.team_cache_ttl_seconds, self.team_cache_max_entries
+                    )
+                    if self.change_feed_poll_seconds > 0:
+                        self._change_feed_listener = TeamChangeFeedListener(
+                            self.container, self._team_cache, self.change_feed_poll_seconds
+                        )
+                        self._change_feed_listener.start()
+                if self.verify_indexing_policy:
+                    await self._check_indexing_policy()
                 self._initialized = True
 
         except Exception as e:
             self.logger.error("Failed to initialize CosmosDB: %s", str(e))
             raise
 
+    @classmethod
+    def indexing_policy(cls) -> Dict[str, Any]:
+        """The indexing policy the container needs to serve QUERIES efficiently."""
+        return build_indexing_policy(cls.QUERIES, cls.UNINDEXED_PATHS)
+
+    async def _check_indexing_policy(self) -> List[str]:
+        """Log what the container's indexing policy is missing for QUERIES.
+
+        Returns:
+            The problems found (also logged as warnings)
+        """
+        try:
+            properties = await self.container.read()
+            problems = verify_indexing_policy(
+                properties.get("indexingPolicy", {}), self.indexing_policy(), self.QUERIES
+            )
+        except Exception as e:
+            self.logger.warning("Could not verify the container indexing policy: %s", e)
+            return []
+        for problem in problems:
+            self.logger.warning("Container %s indexing policy: %s", self.container_name, problem)
+        if problems:
+            self.logger.warning(
+                "Apply the policy printed by `python -m common.database.indexing` to container %s",
+                self.container_name,
+            )
+        return problems
+
+    def for_user(self, user_id: str) -> "CosmosDBClient":
+        """Return a lightweight view of this client scoped to ``user_id``.
+
+        The view shares the underlying CosmosClient, database and container
+        handles (and therefore the HTTP connection pool) with this instance, so
+        it is cheap to create per request. Closing a view is a no-op; the pool
+        is released when the owning client is closed.
+        """
+        view = copy.copy(self)
+        view.user_id = user_id
+        view._owns_client = False
+        return view
+
     # Helper Methods
     async def _ensure_initialized(self) -> None:
         """Ensure the database is initialized."""
@@ -88,26 +236,178 @@ class CosmosDBClient(DatabaseBase):
             self.logger.error("Failed to Get cosmosdb container", error=str(e))
             raise
 
+    def _remember_partition_key(self, item_id: Optional[str], partition_key: Optional[str]) -> None:
+        """Record where a document lives so later lookups can point-read it."""
+        if not item_id or not partition_key:
+            return
+        self._partition_keys[item_id] = partition_key
+        self._partition_keys.move_to_end(item_id)
+        if len(self._partition_keys) > self.PARTITION_KEY_CACHE_SIZE:
+            self._partition_keys.popitem(last=False)
+
+    async def _read_document(
+        self,
+        item_id: str,
+        partition_key: str,
+        data_type: DataType,
+        model_class: Type[BaseDataModel],
+    ) -> Optional[BaseDataModel]:
+        """Point-read a document, returning None if it is missing or of another type."""
+        await self._ensure_initialized()
+        try:
+            item = await self.container.read_item(
+                item=item_id, partition_key=partition_key
+            )
+        except CosmosResourceNotFoundError:
+            return None
+        if item.get("data_type") != data_type:
+            return None
+        self._remember_partition_key(item.get("id"), item.get("session_id"))
+        return from_document(item, model_class)
+
+    async def _get_document(
+        self,
+        item_id: Optional[str],
+        data_type: DataType,
+        model_class: Type[BaseDataModel],
+        fallback_query: str,
+        fallback_parameters: List[Dict[str, Any]],
+        partition_key: Optional[str] = None,
+    ) -> Optional[BaseDataModel]:
+        """Fetch a single document, preferring point reads over a query.
+
+        Args:
+            item_id: Document id to read
+            data_type: Expected data_type of the document
+            model_class: Model to validate the document into
+            fallback_query: Query used when no point read finds the document
+            fallback_parameters: Parameters for ``fallback_query``
+            partition_key: Partition key the document is expected in, if it can
+                be derived from the lookup key
+
+        Returns:
+            The document or None if not found
+        """
+        if not item_id:
+            return None
+
+        # A remembered partition key is authoritative; the derived one only
+        # holds for documents written in the current layout
+        candidates = [self._partition_keys.get(item_id), partition_key]
+        tried = set()
+        for candidate in candidates:
+            if candidate is None or candidate in tried:
+                continue
+            tried.add(candidate)
+            document = await self._read_document(
+                item_id, candidate, data_type, model_class
+            )
+            if document is not None:
+                return document
+
+        # Documents written before partition keys were derivable; the query
+        # result populates the partition key map for next time
+        results = await self.query_items(
+            fallback_query, fallback_parameters, model_class
+        )
+        return results[0] if results else None
+
     async def close(self) -> None:
         """Close the CosmosDB connection."""
+        if not self._owns_client:
+            return
+        if self._change_feed_listener:
+            await self._change_feed_listener.stop()
+        if self._write_buffer:
+            try:
+                await self._write_buffer.close()
+            except Exception as e:
+                self.logger.error("Failed to flush buffered writes: %s", str(e))
         if self.client:
             await self.client.close()
             self.logger.info("Closed CosmosDB connection")
 
+    @staticmethod
+    def _to_document(item: BaseDataModel) -> Dict[str, Any]:
+        """Convert a model to the JSON document stored for it."""
+        return to_document(item)
+
+    async def _write_behind(self, operation: str, item: BaseDataModel) -> None:
+        """Buffer a write when write-behind is enabled, otherwise write it now."""
+        await self._ensure_initialized()
+        if self._write_buffer is None:
+            if operation == "create":
+                await self.add_item(item)
+            else:
+                await self.update_item(item)
+            return
+
+        self._remember_partition_key(item.id, item.session_id)
+        await self._write_buffer.add(operation, self._to_document(item), item.session_id)
+
+    async def _flush_writes(self, plan_id: Optional[str] = None) -> None:
+        """Make buffered writes (for one plan, or all) visible to the next read."""
+        if self._write_buffer is None:
+            return
+        if plan_id:
+            await self._write_buffer.flush_plan(plan_id)
+        else:
+            await self._write_buffer.flush()
+
+    async def _cached(self, key, load):
+        """Return ``key`` from the team cache, calling ``load`` on a miss."""
+        if self._team_cache is None:
+            return await load()
+        found, value = self._team_cache.get(key)
+        if found:
+            return value
+        version = self._team_cache.version
+        value = await load()
+        self._team_cache.put(key, value, version)
+        return value
+
+    async def _version(self, query: str, parameters: List[Dict[str, Any]]) -> str:
+        """Version of a query's result; ``query`` reads _VERSION_FIELDS."""
+        await self._ensure_initialized()
+        items = self._query_container(query, parameters)
+        return documents_version([document async for document in items])
+
+    def _invalidate_team(self, team_id: Optional[str]) -> None:
+        if self._team_cache is not None:
+            self._team_cache.invalidate_team(team_id)
+
+    def _invalidate_current_team(self, user_id: Optional[str]) -> None:
+        if self._team_cache is not None:
+            self._team_cache.invalidate_current_team(user_id)
+
+    @classmethod
+    def _query(
+        cls, name: str, projection: Union[Type[BaseModel], Sequence[str], None] = None
+    ) -> str:
+        """Query text of ``name``, reading only ``projection``'s fields if given."""
+        return cls._select_clause(projection) + cls.QUERIES[name][len("SELECT *"):]
+
+    def _query_name(self, query: str) -> str:
+        return self._QUERY_NAMES.get(query.split(" FROM ", 1)[-1], "ad_hoc")
+
+    def _query_container(self, query: str, parameters: List[Dict[str, Any]], **kwargs):
+        """``container.query_items``, logging query metrics when enabled."""
+        if self.query_metrics:
+            kwargs.update(
+                populate_index_metrics=True,
+                response_hook=QueryMetricsHook(self._query_name(query), self.logger),
+            )
+        return self.container.query_items(query=query, parameters=parameters, **kwargs)
+
     # Core CRUD Operations
     async def add_item(self, item: BaseDataModel) -> None:
         """Add an item to CosmosDB."""
         await self._ensure_initialized()
 
         try:
-            # Convert to dictionary and handle datetime serialization
-            document = item.model_dump()
-
-            for key, value in list(document.items()):
-                if isinstance(value, datetime.datetime):
-                    document[key] = value.isoformat()
-
+            document = self._to_document(item)
             await self.container.create_item(body=document)
+            self._remember_partition_key(item.id, item.session_id)
         except Exception as e:
             self.logger.error("Failed to add item to CosmosDB: %s", str(e))
             raise
@@ -117,12 +417,9 @@ class CosmosDBClient(DatabaseBase):
         await self._ensure_initialized()
 
         try:
-            # Convert to dictionary and handle datetime serialization
-            document = item.model_dump()
-            for key, value in list(document.items()):
-                if isinstance(value, datetime.datetime):
-                    document[key] = value.isoformat()
+            document = self._to_document(item)
             await self.container.upsert_item(body=document)
+            self._remember_partition_key(item.id, item.session_id)
         except Exception as e:
             self.logger.error("Failed to update item in CosmosDB: %s", str(e))
             raise
@@ -137,7 +434,7 @@ class CosmosDBClient(DatabaseBase):
             item = await self.container.read_item(
                 item=item_id, partition_key=partition_key
             )
-            return model_class.model_validate(item)
+            return from_document(item, model_class)
         except Exception as e:
             self.logger.error("Failed to retrieve item from CosmosDB: %s", str(e))
             return None
@@ -149,54 +446,221 @@ class CosmosDBClient(DatabaseBase):
         model_class: Type[BaseDataModel],
     ) -> List[BaseDataModel]:
         """Query items from CosmosDB and return a list of model instances."""
-        await self._ensure_initialized()
-
         try:
-            items = self.container.query_items(query=query, parameters=parameters)
-            result_list = []
-            async for item in items:
-                # item["ts"] = item["_ts"]
-                try:
-                    result_list.append(model_class.model_validate(item))
-                except Exception as validation_error:
-                    self.logger.warning(
-                        "Failed to validate item: %s", str(validation_error)
-                    )
-                    continue
-            return result_list
+            return [
+                item
+                async for item in self.query_items_stream(query, parameters, model_class)
+            ]
         except Exception as e:
             self.logger.error("Failed to query items from CosmosDB: %s", str(e))
             return []
 
+    def _validate_item(
+        self, item: Dict[str, Any], model_class: Type[BaseDataModel]
+    ) -> Optional[BaseDataModel]:
+        """Validate a raw document, skipping (and logging) ones that do not fit."""
+        # item["ts"] = item["_ts"]
+        self._remember_partition_key(item.get("id"), item.get("session_id"))
+        try:
+            return from_document(item, model_class)
+        except Exception as validation_error:
+            self.logger.warning("Failed to validate item: %s", str(validation_error))
+            return None
+
+    async def query_items_stream(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Type[BaseDataModel],
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[BaseDataModel]:
+        """Yield model instances page by page instead of building a list.
+
+        Args:
+            query: SQL query
+            parameters: Query parameters
+            model_class: Model to validate each document into
+            page_size: Documents fetched per round trip (SDK default if None)
+
+        Yields:
+            Validated model instances; documents that fail validation are skipped
+        """
+        await self._ensure_initialized()
+
+        items = self._query_container(query, parameters, max_item_count=page_size)
+        async for page in items.by_page():
+            async for item in page:
+                model = self._validate_item(item, model_class)
+                if model is not None:
+                    yield model
+
+    async def query_items_page(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Type[BaseDataModel],
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Return a single page of query results and the token for the next one.
+
+        Args:
+            query: SQL query
+            parameters: Query parameters
+            model_class: Model to validate each document into
+            limit: Maximum number of documents in the page
+            continuation_token: Token returned with the previous page, if any
+
+        Returns:
+            ItemPage with the results and the next continuation token
+        """
+        await self._ensure_initialized()
+
+        try:
+            pages = self._query_container(
+                query, parameters, max_item_count=limit
+            ).by_page(continuation_token)
+            result = ItemPage()
+            async for page in pages:
+                async for item in page:
+                    model = self._validate_item(item, model_class)
+                    if model is not None:
+                        result.items.append(model)
+                result.continuation_token = pages.continuation_token
+                break
+            return result
+        except Exception as e:
+            self.logger.error("Failed to query page from CosmosDB: %s", str(e))
+            raise
+
     async def delete_item(self, item_id: str, partition_key: str) -> None:
         """Delete an item from CosmosDB."""
         await self._ensure_initialized()
 
         try:
             await self.container.delete_item(item=item_id, partition_key=partition_key)
+            self._partition_keys.pop(item_id, None)
         except Exception as e:
             self.logger.error("Failed to delete item from CosmosDB: %s", str(e))
             raise
 
+    async def _delete_documents(self, documents: List[Dict[str, Any]]) -> DeleteResult:
+        """Delete documents with one transactional batch per partition.
+
+        Partitions are deleted concurrently, at most BULK_DELETE_CONCURRENCY
+        at a time, in batches of up to MAX_BATCH_OPERATIONS documents.
+
+        Args:
+            documents: Documents with at least ``id``, ``session_id`` and ``data_type``
+
+        Returns:
+            Counts of deleted documents by data type and of failures
+        """
+        await self._ensure_initialized()
+        result = DeleteResult()
+        by_partition: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for document in documents:
+            by_partition[document["session_id"]].append(document)
+
+        semaphore = asyncio.Semaphore(self.BULK_DELETE_CONCURRENCY)
+
+        async def delete_partition(partition_key: str, docs: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                for start in range(0, len(docs), MAX_BATCH_OPERATIONS):
+                    await self._delete_batch(
+                        partition_key, docs[start:start + MAX_BATCH_OPERATIONS], result
+                    )
+
+        await asyncio.gather(
+            *(delete_partition(pk, docs) for pk, docs in by_partition.items())
+        )
+        return result
+
+    async def _delete_batch(
+        self, partition_key: str, docs: List[Dict[str, Any]], result: DeleteResult
+    ) -> None:
+        """Delete documents of one partition in a batch, falling back to one by one."""
+        try:
+            await self.container.execute_item_batch(
+                batch_operations=[("delete", (doc["id"],)) for doc in docs],
+                partition_key=partition_key,
+            )
+            deleted = docs
+        except CosmosBatchOperationError as e:
+            # The whole batch was rolled back, e.g. because one document is
+            # already gone; delete the rest individually
+            self.logger.warning(
+                "Batch delete in partition %s failed, deleting individually: %s",
+                partition_key,
+                e.message,
+            )
+            deleted = []
+            for doc in docs:
+                try:
+                    await self.container.delete_item(
+                        item=doc["id"], partition_key=partition_key
+                    )
+                    deleted.append(doc)
+                except CosmosResourceNotFoundError:
+                    self._partition_keys.pop(doc["id"], None)
+                except Exception as err:
+                    self.logger.warning(
+                        "Failed deleting %s doc %s: %s", doc.get("data_type"), doc["id"], err
+                    )
+                    result.failed += 1
+
+        for doc in deleted:
+            self._partition_keys.pop(doc["id"], None)
+            data_type = doc.get("data_type") or "unknown"
+            result.deleted[data_type] = result.deleted.get(data_type, 0) + 1
+
     # Plan Operations
     async def add_plan(self, plan: Plan) -> None:
-        """Add a plan to CosmosDB."""
+        """Add a plan to CosmosDB, with the record locating it by its id."""
         await self.add_item(plan)
+        await self._record_plan_location(plan)
+
+    async def _record_plan_location(self, plan: Plan) -> None:
+        """Write the PlanLocation of ``plan``; without it the plan is found by a query."""
+        try:
+            await self.update_item(
+                PlanLocation(plan_id=plan.id, user_id=plan.user_id, plan_session_id=plan.session_id)
+            )
+        except Exception as e:
+            self.logger.warning("Failed to record the location of plan %s: %s", plan.id, e)
+
+    async def _plan_partition_key(self, plan_id: str) -> Optional[str]:
+        """Partition of plan ``plan_id`` from its PlanLocation, if it has one."""
+        location = await self._read_document(
+            PlanLocation.document_id(plan_id), plan_id, DataType.plan_location, PlanLocation
+        )
+        return location.plan_session_id if location else None
 
     async def update_plan(self, plan: Plan) -> None:
-        """Update a plan in CosmosDB."""
-        await self.update_item(plan)
+        """Update a plan in CosmosDB (buffered when write-behind is enabled)."""
+        await self._write_behind("upsert", plan)
 
     async def get_plan_by_plan_id(self, plan_id: str) -> Optional[Plan]:
         """Retrieve a plan by plan_id."""
-        query = "SELECT * FROM c WHERE c.id=@plan_id AND c.data_type=@data_type"
+        await self._flush_writes(plan_id)
+        query = self._query("document_by_id")
         parameters = [
-            {"name": "@plan_id", "value": plan_id},
+            {"name": "@id", "value": plan_id},
             {"name": "@data_type", "value": DataType.plan},
             {"name": "@user_id", "value": self.user_id},
         ]
-        results = await self.query_items(query, parameters, Plan)
-        return results[0] if results else None
+        if not plan_id or plan_id in self._partition_keys:
+            return await self._get_document(plan_id, DataType.plan, Plan, query, parameters)
+        # Not seen by this process: two point reads rather than a
+        # cross-partition query
+        partition_key = await self._plan_partition_key(plan_id)
+        plan = await self._get_document(
+            plan_id, DataType.plan, Plan, query, parameters, partition_key=partition_key
+        )
+        if plan is not None and partition_key is None:
+            # Written before plans were located by id; found by the query once
+            await self._record_plan_location(plan)
+        return plan
 
     async def get_plan(self, plan_id: str) -> Optional[Plan]:
         """Retrieve a plan by plan_id."""
@@ -204,7 +668,8 @@ class CosmosDBClient(DatabaseBase):
 
     async def get_all_plans(self) -> List[Plan]:
         """Retrieve all plans for the user."""
-        query = "SELECT * FROM c WHERE c.user_id=@user_id AND c.data_type=@data_type"
+        await self._flush_writes()
+        query = self._query("documents_by_user_type")
         parameters = [
             {"name": "@user_id", "value": self.user_id},
             {"name": "@data_type", "value": DataType.plan},
@@ -213,7 +678,8 @@ class CosmosDBClient(DatabaseBase):
 
     async def get_all_plans_by_team_id(self, team_id: str) -> List[Plan]:
         """Retrieve all plans for a specific team."""
-        query = "SELECT * FROM c WHERE c.team_id=@team_id AND c.data_type=@data_type and c.user_id=@user_id"
+        await self._flush_writes()
+        query = self._query("plans_by_team")
         parameters = [
             {"name": "@user_id", "value": self.user_id},
             {"name": "@team_id", "value": team_id},
@@ -225,14 +691,115 @@ class CosmosDBClient(DatabaseBase):
         self, user_id: str, team_id: str, status: str
     ) -> List[Plan]:
         """Retrieve all plans for a specific team."""
-        query = "SELECT * FROM c WHERE c.team_id=@team_id AND c.data_type=@data_type and c.user_id=@user_id and c.overall_status=@status ORDER BY c._ts DESC"
+        await self._flush_writes()
+        query, parameters = self._plans_by_team_id_status_query(user_id, team_id, status)
+        return await self.query_items(query, parameters, Plan)
+
+    async def get_plans_page_by_team_id_status(
+        self,
+        user_id: str,
+        team_id: str,
+        status: str,
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Retrieve one page of a team's plans with a status, newest first.
+
+        Args:
+            user_id: Owner of the plans
+            team_id: Team the plans belong to
+            status: Plan status to filter on
+            limit: Maximum number of plans in the page
+            continuation_token: Token returned with the previous page, if any
+
+        Returns:
+            ItemPage of Plan objects
+        """
+        await self._flush_writes()
+        query, parameters = self._plans_by_team_id_status_query(user_id, team_id, status)
+        return await self.query_items_page(
+            query, parameters, Plan, limit, continuation_token
+        )
+
+    async def get_plan_summaries_by_team_id_status(
+        self, user_id: str, team_id: str, status: str
+    ) -> List[PlanSummary]:
+        """Retrieve summaries of a team's plans with a status, newest first.
+
+        Only the PlanSummary fields are read, so large fields such as m_plan
+        are neither charged for nor transferred.
+        """
+        await self._flush_writes()
+        query, parameters = self._plans_by_team_id_status_query(
+            user_id, team_id, status, PlanSummary
+        )
+        return await self.query_items(query, parameters, PlanSummary)
+
+    async def get_plans_version(self, user_id: str, team_id: str, status: str) -> str:
+        """Version of a team's plans with a status, from their ids and _etags."""
+        await self._flush_writes()
+        query, parameters = self._plans_by_team_id_status_query(
+            user_id, team_id, status, self._VERSION_FIELDS
+        )
+        return await self._version(query, parameters)
+
+    async def get_plan_summaries_page_by_team_id_status(
+        self,
+        user_id: str,
+        team_id: str,
+        status: str,
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Retrieve one page of plan summaries, newest first.
+
+        Args:
+            user_id: Owner of the plans
+            team_id: Team the plans belong to
+            status: Plan status to filter on
+            limit: Maximum number of plans in the page
+            continuation_token: Token returned with the previous page, if any
+
+        Returns:
+            ItemPage of PlanSummary objects
+        """
+        await self._flush_writes()
+        query, parameters = self._plans_by_team_id_status_query(
+            user_id, team_id, status, PlanSummary
+        )
+        return await self.query_items_page(
+            query, parameters, PlanSummary, limit, continuation_token
+        )
+
+    @staticmethod
+    def _select_clause(
+        projection: Union[Type[BaseModel], Sequence[str], None] = None
+    ) -> str:
+        """SELECT clause reading all fields, or only the projection's.
+
+        ``projection`` is a model class (its fields are read) or field names.
+        """
+        if projection is None:
+            return "SELECT *"
+        fields = projection.model_fields if isinstance(projection, type) else projection
+        return "SELECT " + ", ".join(f"c.{name}" for name in fields)
+
+    @classmethod
+    def _plans_by_team_id_status_query(
+        cls,
+        user_id: str,
+        team_id: str,
+        status: str,
+        projection: Union[Type[BaseModel], Sequence[str], None] = None,
+    ):
+        query = cls._query("plans_by_team_status_newest_first", projection)
         parameters = [
             {"name": "@user_id", "value": user_id},
             {"name": "@team_id", "value": team_id},
             {"name": "@data_type", "value": DataType.plan},
             {"name": "@status", "value": status},
         ]
-        return await self.query_items(query, parameters, Plan)
+        return query, parameters
 
     # Step Operations
     async def add_step(self, step: Step) -> None:
@@ -245,7 +812,7 @@ class CosmosDBClient(DatabaseBase):
 
     async def get_steps_by_plan(self, plan_id: str) -> List[Step]:
         """Retrieve all steps for a plan."""
-        query = "SELECT * FROM c WHERE c.plan_id=@plan_id AND c.data_type=@data_type ORDER BY c.timestamp"
+        query = self._query("documents_by_plan_type_oldest_first")
         parameters = [
             {"name": "@plan_id", "value": plan_id},
             {"name": "@data_type", "value": DataType.step},
@@ -254,14 +821,10 @@ class CosmosDBClient(DatabaseBase):
 
     async def get_step(self, step_id: str, session_id: str) -> Optional[Step]:
         """Retrieve a step by step_id and session_id."""
-        query = "SELECT * FROM c WHERE c.id=@step_id AND c.session_id=@session_id AND c.data_type=@data_type"
-        parameters = [
-            {"name": "@step_id", "value": step_id},
-            {"name": "@session_id", "value": session_id},
-            {"name": "@data_type", "value": DataType.step},
-        ]
-        results = await self.query_items(query, parameters, Step)
-        return results[0] if results else None
+        if not step_id or not session_id:
+            return None
+        # session_id is the partition key, so this is always a point read
+        return await self._read_document(step_id, session_id, DataType.step, Step)
 
     # Removed duplicate update_team method definition
 
@@ -274,13 +837,24 @@ class CosmosDBClient(DatabaseBase):
         Returns:
             TeamConfiguration object or None if not found
         """
-        query = "SELECT * FROM c WHERE c.team_id=@team_id AND c.data_type=@data_type"
+        query = self._query("team_by_team_id")
         parameters = [
             {"name": "@team_id", "value": team_id},
             {"name": "@data_type", "value": DataType.team_config},
         ]
-        teams = await self.query_items(query, parameters, TeamConfiguration)
-        return teams[0] if teams else None
+        # Teams use team_id as their document id; uploaded teams are also
+        # partitioned on it, older ones are found through the partition key map
+        return await self._cached(
+            team_key(team_id),
+            lambda: self._get_document(
+                team_id,
+                DataType.team_config,
+                TeamConfiguration,
+                query,
+                parameters,
+                partition_key=team_id,
+            ),
+        )
 
     async def get_team_by_id(self, team_id: str) -> Optional[TeamConfiguration]:
         """Retrieve a specific team configuration by its document id.
@@ -291,13 +865,7 @@ class CosmosDBClient(DatabaseBase):
         Returns:
             TeamConfiguration object or None if not found
         """
-        query = "SELECT * FROM c WHERE c.team_id=@team_id AND c.data_type=@data_type"
-        parameters = [
-            {"name": "@team_id", "value": team_id},
-            {"name": "@data_type", "value": DataType.team_config},
-        ]
-        teams = await self.query_items(query, parameters, TeamConfiguration)
-        return teams[0] if teams else None
+        return await self.get_team(team_id)
 
     async def get_all_teams(self) -> List[TeamConfiguration]:
         """Retrieve all team configurations for a specific user.
@@ -308,12 +876,24 @@ class CosmosDBClient(DatabaseBase):
         Returns:
             List of TeamConfiguration objects
         """
-        query = "SELECT * FROM c WHERE c.data_type=@data_type ORDER BY c.created DESC"
+        query = self._query("teams_newest_first")
+        parameters = [
+            {"name": "@data_type", "value": DataType.team_config},
+        ]
+        return await self._cached(
+            ALL_TEAMS, lambda: self.query_items(query, parameters, TeamConfiguration)
+        )
+
+    async def get_teams_version(self) -> str:
+        """Version of all team configurations, from their ids and _etags.
+
+        Cached alongside the team list, so it is invalidated with it.
+        """
+        query = self._query("teams_newest_first", self._VERSION_FIELDS)
         parameters = [
             {"name": "@data_type", "value": DataType.team_config},
         ]
-        teams = await self.query_items(query, parameters, TeamConfiguration)
-        return teams
+        return await self._cached(ALL_TEAMS_VERSION, lambda: self._version(query, parameters))
 
     async def delete_team(self, team_id: str) -> bool:
         """Delete a team configuration by team_id.
@@ -332,6 +912,7 @@ class CosmosDBClient(DatabaseBase):
             print(team)
             if team:
                 await self.delete_item(item_id=team.id, partition_key=team.session_id)
+            self._invalidate_team(team_id)
             return True
         except Exception as e:
             logging.exception(f"Failed to delete team from Cosmos DB: {e}")
@@ -340,7 +921,8 @@ class CosmosDBClient(DatabaseBase):
     # Data Management Operations
     async def get_data_by_type(self, data_type: str) -> List[BaseDataModel]:
         """Retrieve all data of a specific type."""
-        query = "SELECT * FROM c WHERE c.data_type=@data_type AND c.user_id=@user_id"
+        await self._flush_writes()
+        query = self._query("documents_by_user_type")
         parameters = [
             {"name": "@data_type", "value": data_type},
             {"name": "@user_id", "value": self.user_id},
@@ -352,13 +934,14 @@ class CosmosDBClient(DatabaseBase):
 
     async def get_all_items(self) -> List[Dict[str, Any]]:
         """Retrieve all items as dictionaries."""
-        query = "SELECT * FROM c WHERE c.user_id=@user_id"
+        await self._flush_writes()
+        query = self._query("documents_by_user")
         parameters = [
             {"name": "@user_id", "value": self.user_id},
         ]
 
         await self._ensure_initialized()
-        items = self.container.query_items(query=query, parameters=parameters)
+        items = self._query_container(query, parameters)
         results = []
         async for item in items:
             results.append(item)
@@ -378,6 +961,7 @@ class CosmosDBClient(DatabaseBase):
             team: The TeamConfiguration to add
         """
         await self.add_item(team)
+        self._invalidate_team(team.team_id)
 
     async def update_team(self, team: TeamConfiguration) -> None:
         """Update an existing team configuration in Cosmos DB.
@@ -386,77 +970,115 @@ class CosmosDBClient(DatabaseBase):
             team: The TeamConfiguration to update
         """
         await self.update_item(team)
+        self._invalidate_team(team.team_id)
 
     async def get_current_team(self, user_id: str) -> Optional[UserCurrentTeam]:
         """Retrieve the current team for a user."""
         await self._ensure_initialized()
         if self.container is None:
             return None
+        return await self._cached(
+            current_team_key(user_id), lambda: self._load_current_team(user_id)
+        )
 
-        query = "SELECT * FROM c WHERE c.data_type=@data_type AND c.user_id=@user_id"
+    async def _load_current_team(self, user_id: str) -> Optional[UserCurrentTeam]:
+        query = self._query("documents_by_user_type")
         parameters = [
             {"name": "@data_type", "value": DataType.user_current_team},
             {"name": "@user_id", "value": user_id},
         ]
 
-        # Get the appropriate model class
-        teams = await self.query_items(query, parameters, UserCurrentTeam)
-        return teams[0] if teams else None
+        current_team = await self._get_document(
+            UserCurrentTeam.document_id(user_id),
+            DataType.user_current_team,
+            UserCurrentTeam,
+            query,
+            parameters,
+            partition_key=user_id,
+        )
+        if current_team and current_team.id != UserCurrentTeam.document_id(user_id):
+            current_team = await self._migrate_current_team(current_team)
+        return current_team
+
+    async def _migrate_current_team(self, legacy: UserCurrentTeam) -> UserCurrentTeam:
+        """Rewrite a current team document into the per-user layout.
+
+        The record is found by user rather than by id, so a document with a
+        random id could otherwise only ever be reached through a query.
+        """
+        current_team = UserCurrentTeam(user_id=legacy.user_id, team_id=legacy.team_id)
+        try:
+            await self.update_item(current_team)
+            await self.delete_item(item_id=legacy.id, partition_key=legacy.session_id)
+        except Exception as e:
+            self.logger.warning(
+                "Failed migrating current team doc %s: %s", legacy.id, e
+            )
+            return legacy
+        return current_team
 
     async def delete_current_team(self, user_id: str) -> bool:
         """Delete the current team for a user."""
-        query = "SELECT c.id, c.session_id FROM c WHERE c.user_id=@user_id AND c.data_type=@data_type"
+        query = self._query("documents_by_user_type", self._DELETE_FIELDS)
 
         params = [
             {"name": "@user_id", "value": user_id},
             {"name": "@data_type", "value": DataType.user_current_team},
         ]
-        items = self.container.query_items(query=query, parameters=params)
-        print("Items to delete:", items)
-        if items:
-            async for doc in items:
-                try:
-                    await self.container.delete_item(
-                        doc["id"], partition_key=doc["session_id"]
-                    )
-                except Exception as e:
-                    self.logger.warning(
-                        "Failed deleting current team doc %s: %s", doc.get("id"), e
-                    )
+        await self._ensure_initialized()
+        items = self._query_container(query, params)
+        result = await self._delete_documents([doc async for doc in items])
+        self._invalidate_current_team(user_id)
+        if result.failed:
+            self.logger.warning(
+                "Failed deleting %d current team docs for user %s", result.failed, user_id
+            )
 
         return True
 
     async def set_current_team(self, current_team: UserCurrentTeam) -> None:
         """Set the current team for a user."""
         await self._ensure_initialized()
-        await self.add_item(current_team)
+        # Current team documents have a per-user id, so replace rather than insert
+        await self.update_item(current_team)
+        self._invalidate_current_team(current_team.user_id)
 
     async def update_current_team(self, current_team: UserCurrentTeam) -> None:
         """Update the current team for a user."""
         await self._ensure_initialized()
         await self.update_item(current_team)
+        self._invalidate_current_team(current_team.user_id)
 
     async def delete_plan_by_plan_id(self, plan_id: str) -> bool:
-        """Delete a plan by its ID."""
-        query = "SELECT c.id, c.session_id FROM c WHERE c.id=@plan_id "
+        """Delete a plan together with its messages and steps."""
+        result = await self.delete_plan_cascade(plan_id)
+        return not result.failed
+
+    async def delete_plan_cascade(self, plan_id: str) -> DeleteResult:
+        """Delete a plan and every document that belongs to it.
+
+        Finds the plan, its steps, agent messages and m_plan with one query on
+        ``plan_id`` and deletes them with partition-scoped batches.
 
+        Args:
+            plan_id: The plan to delete
+
+        Returns:
+            Counts of deleted documents by data type and of failures
+        """
+        await self._ensure_initialized()
+        # Buffered messages for the plan must land before they can be deleted
+        await self._flush_writes(plan_id)
+        query = self._query("documents_by_plan", self._DELETE_FIELDS)
         params = [
             {"name": "@plan_id", "value": plan_id},
         ]
-        items = self.container.query_items(query=query, parameters=params)
-        print("Items to delete planid:", items)
-        if items:
-            async for doc in items:
-                try:
-                    await self.container.delete_item(
-                        doc["id"], partition_key=doc["session_id"]
-                    )
-                except Exception as e:
-                    self.logger.warning(
-                        "Failed deleting current team doc %s: %s", doc.get("id"), e
-                    )
-
-        return True
+        items = self._query_container(query, params)
+        result = await self._delete_documents([doc async for doc in items])
+        self.logger.info(
+            "Deleted plan %s: %s (%d failed)", plan_id, result.deleted, result.failed
+        )
+        return result
 
     async def add_mplan(self, mplan: messages.MPlan) -> None:
         """Add a team configuration to the database."""
@@ -468,7 +1090,7 @@ class CosmosDBClient(DatabaseBase):
 
     async def get_mplan(self, plan_id: str) -> Optional[messages.MPlan]:
         """Retrieve a mplan configuration by mplan_id."""
-        query = "SELECT * FROM c WHERE c.plan_id=@plan_id AND c.data_type=@data_type"
+        query = self._query("documents_by_plan_type")
         parameters = [
             {"name": "@plan_id", "value": plan_id},
             {"name": "@data_type", "value": DataType.m_plan},
@@ -477,8 +1099,51 @@ class CosmosDBClient(DatabaseBase):
         return results[0] if results else None
 
     async def add_agent_message(self, message: AgentMessageData) -> None:
-        """Add an agent message to the database."""
-        await self.add_item(message)
+        """Add an agent message to the database (buffered when write-behind is enabled)."""
+        await self._ensure_initialized()
+        # Store messages in their plan's partition so they batch together with it
+        plan_partition = self._partition_keys.get(message.plan_id)
+        if plan_partition:
+            message.session_id = plan_partition
+        await self._write_behind("create", message)
+
+    async def add_agent_messages(self, messages: List[AgentMessageData]) -> None:
+        """Add agent messages with one transactional batch per partition.
+
+        Messages go to their plan's partition when it is known (the plan was
+        read or written by this client), so a plan's messages share a batch.
+        With write-behind enabled they are buffered like single messages.
+        """
+        await self._ensure_initialized()
+        if self._write_buffer is not None:
+            for message in messages:
+                await self.add_agent_message(message)
+            return
+
+        by_partition: Dict[str, List[AgentMessageData]] = defaultdict(list)
+        for message in messages:
+            plan_partition = self._partition_keys.get(message.plan_id)
+            if plan_partition:
+                message.session_id = plan_partition
+            by_partition[message.session_id].append(message)
+
+        for partition_key, group in by_partition.items():
+            for start in range(0, len(group), MAX_BATCH_OPERATIONS):
+                chunk = group[start:start + MAX_BATCH_OPERATIONS]
+                try:
+                    await self.container.execute_item_batch(
+                        batch_operations=[
+                            ("create", (self._to_document(message),)) for message in chunk
+                        ],
+                        partition_key=partition_key,
+                    )
+                except Exception as e:
+                    self.logger.error(
+                        "Failed to add %d agent messages to CosmosDB: %s", len(chunk), str(e)
+                    )
+                    raise
+                for message in chunk:
+                    self._remember_partition_key(message.id, message.session_id)
 
     async def update_agent_message(self, message: AgentMessageData) -> None:
         """Update an agent message in the database."""
@@ -486,10 +1151,23 @@ class CosmosDBClient(DatabaseBase):
 
     async def get_agent_messages(self, plan_id: str) -> List[AgentMessageData]:
         """Retrieve an agent message by message_id."""
-        query = "SELECT * FROM c WHERE c.plan_id=@plan_id AND c.data_type=@data_type ORDER BY c._ts ASC"
+        await self._flush_writes(plan_id)
+        query, parameters = self._agent_messages_query(plan_id)
+        return await self.query_items(query, parameters, AgentMessageData)
+
+    async def stream_agent_messages(self, plan_id: str) -> AsyncIterator[AgentMessageData]:
+        """Yield a plan's agent messages page by page, oldest first."""
+        await self._flush_writes(plan_id)
+        query, parameters = self._agent_messages_query(plan_id)
+        async for message in self.query_items_stream(query, parameters, AgentMessageData):
+            yield message
+
+    @classmethod
+    def _agent_messages_query(cls, plan_id: str):
+        # Messages flushed in one batch share a _ts, so order by creation time
+        query = cls._query("documents_by_plan_type_oldest_first")
         parameters = [
             {"name": "@plan_id", "value": plan_id},
             {"name": "@data_type", "value": DataType.m_plan_message},
         ]
-
-        return await self.query_items(query, parameters, AgentMessageData)
+        return query, parameters
@@ -3,20 +3,65 @@
 
 # pylint: disable=unnecessary-pass
 
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Type
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Type
 
 import models.messages as messages
 from common.models.messages_kernel import (
     AgentMessageData,
     BaseDataModel,
     Plan,
+    PlanSummary,
     Step,
     TeamConfiguration,
     UserCurrentTeam,
 )
 
 
+@dataclass
+class ItemPage:
+    """One page of query results.
+
+    ``continuation_token`` is opaque to callers; pass it back to fetch the next
+    page. It is None once the last page has been returned.
+    """
+
+    items: List[BaseDataModel] = field(default_factory=list)
+    continuation_token: Optional[str] = None
+
+
+@dataclass
+class DeleteResult:
+    """Outcome of a bulk delete.
+
+    ``deleted`` counts removed documents by ``data_type``; ``failed`` counts
+    documents that could not be removed.
+    """
+
+    deleted: Dict[str, int] = field(default_factory=dict)
+    failed: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of documents removed."""
+        return sum(self.deleted.values())
+
+
+def documents_version(documents: Iterable[Dict[str, Any]]) -> str:
+    """Version of a query result from its documents' ids and ``_etag``s.
+
+    Every write gives a document a new ``_etag``, so the version changes
+    whenever a document in the result is added, changed or removed, or the
+    order changes.
+    """
+    digest = hashlib.sha256()
+    for document in documents:
+        digest.update(f"{document.get('id')}:{document.get('_etag')};".encode())
+    return digest.hexdigest()[:32]
+
+
 class DatabaseBase(ABC):
     """Abstract base class for database operations."""
 
@@ -58,6 +103,29 @@ class DatabaseBase(ABC):
         """Query items from the database and return a list of model instances."""
         pass
 
+    @abstractmethod
+    def query_items_stream(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Type[BaseDataModel],
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[BaseDataModel]:
+        """Yield model instances as results arrive, holding one page at a time."""
+        pass
+
+    @abstractmethod
+    async def query_items_page(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Type[BaseDataModel],
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Return up to ``limit`` results starting at ``continuation_token``."""
+        pass
+
     @abstractmethod
     async def delete_item(self, item_id: str, partition_key: str) -> None:
         """Delete an item from the database."""
@@ -101,6 +169,45 @@ class DatabaseBase(ABC):
         """Retrieve all plans for a specific team."""
         pass
 
+    @abstractmethod
+    async def get_plans_page_by_team_id_status(
+        self,
+        user_id: str,
+        team_id: str,
+        status: str,
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Retrieve one page of a team's plans with a status, newest first."""
+        pass
+
+    @abstractmethod
+    async def get_plan_summaries_by_team_id_status(
+        self, user_id: str, team_id: str, status: str
+    ) -> List[PlanSummary]:
+        """Retrieve summaries of a team's plans with a status, newest first."""
+        pass
+
+    @abstractmethod
+    async def get_plan_summaries_page_by_team_id_status(
+        self,
+        user_id: str,
+        team_id: str,
+        status: str,
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Retrieve one page of plan summaries, newest first."""
+        pass
+
+    @abstractmethod
+    async def get_plans_version(self, user_id: str, team_id: str, status: str) -> str:
+        """Version of the plans ``get_plan_summaries_by_team_id_status`` returns.
+
+        Reads only each plan's id and ``_etag``; see :func:`documents_version`.
+        """
+        pass
+
     # Step Operations
     @abstractmethod
     async def add_step(self, step: Step) -> None:
@@ -148,6 +255,11 @@ class DatabaseBase(ABC):
         """Retrieve all team configurations for the given user."""
         pass
 
+    @abstractmethod
+    async def get_teams_version(self) -> str:
+        """Version of the team configurations ``get_all_teams`` returns."""
+        pass
+
     @abstractmethod
     async def delete_team(self, team_id: str) -> bool:
         """Delete a team configuration by team_id and return True if deleted."""
@@ -200,7 +312,12 @@ class DatabaseBase(ABC):
 
     @abstractmethod
     async def delete_plan_by_plan_id(self, plan_id: str) -> bool:
-        """Retrieve the current team for a user."""
+        """Delete a plan together with its messages and steps."""
+        pass
+
+    @abstractmethod
+    async def delete_plan_cascade(self, plan_id: str) -> DeleteResult:
+        """Delete a plan and every document that belongs to it, returning counts."""
         pass
 
     @abstractmethod
@@ -222,6 +339,15 @@ class DatabaseBase(ABC):
     async def add_agent_message(self, message: AgentMessageData) -> None:
         pass
 
+    async def add_agent_messages(self, messages: List[AgentMessageData]) -> None:
+        """Add several agent messages, in order.
+
+        Backends that can write a group of documents in one request override
+        this; the default adds them one by one.
+        """
+        for message in messages:
+            await self.add_agent_message(message)
+
     @abstractmethod
     async def update_agent_message(self, message: AgentMessageData) -> None:
         """Update an agent message in the database."""
@@ -231,3 +357,12 @@ class DatabaseBase(ABC):
     async def get_agent_messages(self, plan_id: str) -> Optional[AgentMessageData]:
         """Retrieve an agent message by message_id."""
         pass
+
+    async def stream_agent_messages(self, plan_id: str) -> AsyncIterator[AgentMessageData]:
+        """Yield a plan's agent messages in the order they were created.
+
+        Backends that page through query results override this so callers
+        can start on the first messages before the last ones are read.
+        """
+        for message in await self.get_agent_messages(plan_id) or []:
+            yield message
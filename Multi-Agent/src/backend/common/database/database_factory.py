@@ -1,5 +1,6 @@
 """Database factory for creating database instances."""
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -7,54 +8,99 @@ from common.config.app_config import config
 
 from .cosmosdb import CosmosDBClient
 from .database_base import DatabaseBase
+from .memory_database import MemoryDatabase
+from .sqlite_database import SqliteDatabase
 
 
 class DatabaseFactory:
-    """Factory class for creating database instances."""
+    """Factory class for creating database instances.
+
+    A single client owns the process-wide connection (for Cosmos DB, the
+    CosmosClient and its HTTP connection pool). Callers receive a per-user
+    view of that client, so the connection is reused across requests without
+    leaking one user's scope into another's queries.
+
+    ``DATABASE_BACKEND`` selects the implementation: ``cosmos`` (default),
+    ``memory`` or ``sqlite``.
+    """
 
     _instance: Optional[DatabaseBase] = None
+    _init_lock: Optional[asyncio.Lock] = None
     _logger = logging.getLogger(__name__)
 
+    @staticmethod
+    def _create_client(user_id: str = "") -> DatabaseBase:
+        """Build an uninitialized database client from application config."""
+        backend = config.DATABASE_BACKEND
+        if backend == "memory":
+            return MemoryDatabase(user_id=user_id)
+        if backend == "sqlite":
+            return SqliteDatabase(config.SQLITE_DATABASE_PATH, user_id=user_id)
+        if backend != "cosmos":
+            raise ValueError(f"Unknown DATABASE_BACKEND: {backend}")
+        return CosmosDBClient(
+            endpoint=config.COSMOSDB_ENDPOINT,
+            credential=config.get_azure_credentials(),
+            database_name=config.COSMOSDB_DATABASE,
+            container_name=config.COSMOSDB_CONTAINER,
+            session_id="",
+            user_id=user_id,
+            write_behind_window_ms=config.COSMOSDB_WRITE_BEHIND_WINDOW_MS,
+            write_behind_max_batch=config.COSMOSDB_WRITE_BEHIND_MAX_BATCH,
+            team_cache_ttl_seconds=config.TEAM_CACHE_TTL_SECONDS,
+            team_cache_max_entries=config.TEAM_CACHE_MAX_ENTRIES,
+            change_feed_poll_seconds=config.COSMOSDB_CHANGE_FEED_POLL_SECONDS,
+            verify_indexing_policy=config.COSMOSDB_VERIFY_INDEXING_POLICY,
+            query_metrics=config.COSMOSDB_QUERY_METRICS,
+        )
+
+    @staticmethod
+    async def _get_shared_client() -> DatabaseBase:
+        """Return the pooled client, creating it once per process."""
+        if DatabaseFactory._instance is not None:
+            return DatabaseFactory._instance
+
+        if DatabaseFactory._init_lock is None:
+            DatabaseFactory._init_lock = asyncio.Lock()
+
+        async with DatabaseFactory._init_lock:
+            # Another request may have finished initialization while we waited
+            if DatabaseFactory._instance is None:
+                client = DatabaseFactory._create_client()
+                await client.initialize()
+                DatabaseFactory._instance = client
+                DatabaseFactory._logger.info(
+                    "Initialized shared %s database client", config.DATABASE_BACKEND
+                )
+
+        return DatabaseFactory._instance
+
     @staticmethod
     async def get_database(
         user_id: str = "",
         force_new: bool = False,
     ) -> DatabaseBase:
         """
-        Get a database instance.
+        Get a database instance scoped to a user.
 
         Args:
-            endpoint: CosmosDB endpoint URL
-            credential: Azure credential for authentication
-            database_name: Name of the CosmosDB database
-            container_name: Name of the CosmosDB container
-            session_id: Session ID for partitioning
             user_id: User ID for data isolation
-            force_new: Force creation of new instance
+            force_new: Create a dedicated client with its own connection
+                instead of a view over the shared one. The caller owns the
+                returned instance and must close it. The in-memory backend
+                keeps its documents in the shared instance, so it always
+                returns a view.
 
         Returns:
             DatabaseBase: Database instance
         """
+        if force_new and config.DATABASE_BACKEND != "memory":
+            client = DatabaseFactory._create_client(user_id=user_id)
+            await client.initialize()
+            return client
 
-        # Create new instance if forced or if singleton doesn't exist
-        if force_new or DatabaseFactory._instance is None:
-            cosmos_db_client = CosmosDBClient(
-                endpoint=config.COSMOSDB_ENDPOINT,
-                credential=config.get_azure_credentials(),
-                database_name=config.COSMOSDB_DATABASE,
-                container_name=config.COSMOSDB_CONTAINER,
-                session_id="",
-                user_id=user_id,
-            )
-
-            await cosmos_db_client.initialize()
-
-            if not force_new:
-                DatabaseFactory._instance = cosmos_db_client
-
-            return cosmos_db_client
-
-        return DatabaseFactory._instance
+        shared_client = await DatabaseFactory._get_shared_client()
+        return shared_client.for_user(user_id)
 
     @staticmethod
     async def close_all():
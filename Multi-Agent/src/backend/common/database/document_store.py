@@ -0,0 +1,575 @@
+"""Shared DatabaseBase implementation for the local (non-Cosmos) backends."""
+
+import copy
+import logging
+import re
+import time
+import uuid
+from abc import abstractmethod
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+
+import models.messages as messages
+from pydantic import BaseModel
+
+from ..models.messages_kernel import (
+    AgentMessage,
+    AgentMessageData,
+    BaseDataModel,
+    DataType,
+    Plan,
+    PlanSummary,
+    Step,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+from .database_base import DatabaseBase, DeleteResult, ItemPage, documents_version
+from .serialization import from_document, to_document
+
+# The subset of Cosmos SQL that the typed methods (and CosmosDBClient) use:
+# SELECT * | c.f1, c.f2 FROM c [WHERE c.f=@p AND ...] [ORDER BY c.f [ASC|DESC]]
+_QUERY_RE = re.compile(
+    r"^\s*SELECT\s+(?P<projection>.+?)\s+FROM\s+c"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?"
+    r"(?:\s+ORDER\s+BY\s+c\.(?P<order>\w+)(?:\s+(?P<direction>ASC|DESC))?)?\s*$",
+    re.IGNORECASE,
+)
+_CONDITION_RE = re.compile(r"^c\.(?P<field>\w+)\s*=\s*(?P<value>@\w+)$")
+
+# Filter on equality of fields, ordered by (field, descending)
+Filters = Dict[str, Any]
+Order = Optional[Tuple[str, bool]]
+
+
+def parse_query(
+    query: str, parameters: Optional[List[Dict[str, Any]]]
+) -> Tuple[Optional[List[str]], Filters, Order]:
+    """Translate a Cosmos SQL query into (projected fields, filters, order).
+
+    Raises:
+        ValueError: If the query uses anything beyond the supported subset
+    """
+    match = _QUERY_RE.match(query)
+    if not match:
+        raise ValueError(f"Query not supported by the local database: {query}")
+
+    values = {p["name"]: p["value"] for p in parameters or []}
+    filters: Filters = {}
+    if match.group("where"):
+        for condition in re.split(
+            r"\s+AND\s+", match.group("where").strip(), flags=re.IGNORECASE
+        ):
+            parsed = _CONDITION_RE.match(condition.strip())
+            if not parsed:
+                raise ValueError(
+                    f"Condition not supported by the local database: {condition}"
+                )
+            filters[parsed.group("field")] = to_json_value(
+                values.get(parsed.group("value"))
+            )
+
+    fields = None
+    projection = match.group("projection").strip()
+    if projection != "*":
+        fields = [f.strip()[2:] for f in projection.split(",")]
+
+    order = None
+    if match.group("order"):
+        descending = (match.group("direction") or "ASC").upper() == "DESC"
+        order = (match.group("order"), descending)
+    return fields, filters, order
+
+
+def to_json_value(value: Any) -> Any:
+    """Compare parameters the way they are stored (enums as their values)."""
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class DocumentStoreDatabase(DatabaseBase):
+    """DatabaseBase over a local document store laid out like the Cosmos container.
+
+    Documents are stored as the JSON dictionaries CosmosDBClient writes,
+    keyed on (session_id, id) with session_id acting as the partition key, so
+    the typed methods behave the same on every backend. Subclasses provide the
+    storage primitives ``_put``, ``_get``, ``_find`` and ``_remove`` and index
+    ``INDEXED_FIELDS``; filters on other fields are checked on the candidates
+    those indexes return.
+    """
+
+    INDEXED_FIELDS = ("data_type", "user_id", "team_id", "plan_id")
+
+    MODEL_CLASS_MAPPING = {
+        DataType.plan: Plan,
+        DataType.step: Step,
+        DataType.agent_message: AgentMessage,
+        DataType.team_config: TeamConfiguration,
+        DataType.user_current_team: UserCurrentTeam,
+    }
+
+    # Plans are listed newest first, like the Cosmos queries
+    _NEWEST_FIRST: Order = ("_ts", True)
+
+    def __init__(self, user_id: str = ""):
+        self.user_id = user_id
+        self.logger = logging.getLogger(__name__)
+        self._initialized = False
+        # Views created through for_user() share the store and must not close it
+        self._owns_store = True
+
+    def for_user(self, user_id: str) -> "DocumentStoreDatabase":
+        """Return a view of this database scoped to ``user_id``.
+
+        The view shares the underlying store; closing it is a no-op.
+        """
+        view = copy.copy(self)
+        view.user_id = user_id
+        view._owns_store = False
+        return view
+
+    # Storage primitives
+    @abstractmethod
+    async def _put(self, document: Dict[str, Any], create: bool) -> None:
+        """Store ``document``; with ``create`` fail if it already exists."""
+        pass
+
+    @abstractmethod
+    async def _get(self, item_id: str, partition_key: str) -> Optional[Dict[str, Any]]:
+        """Return the document with ``item_id`` in ``partition_key``, if any."""
+        pass
+
+    @abstractmethod
+    async def _find(self, filters: Filters, order: Order = None) -> List[Dict[str, Any]]:
+        """Return documents whose fields equal ``filters``, ordered by ``order``.
+
+        Documents written later sort after earlier ones with the same value.
+        """
+        pass
+
+    @abstractmethod
+    async def _remove(self, item_id: str, partition_key: str) -> bool:
+        """Delete a document, returning False if it did not exist."""
+        pass
+
+    # Helper Methods
+    async def _ensure_initialized(self) -> None:
+        """Ensure the database is initialized."""
+        if not self._initialized:
+            await self.initialize()
+
+    @staticmethod
+    def _to_document(item: BaseModel) -> Dict[str, Any]:
+        """Convert a model to the JSON document stored for it."""
+        document = to_document(item)
+        document["session_id"] = document.get("session_id") or ""
+        document["_ts"] = int(time.time())
+        # Like Cosmos, every write gives the document a new _etag
+        document["_etag"] = f'"{uuid.uuid4()}"'
+        return document
+
+    def _validate(
+        self, document: Dict[str, Any], model_class: Type[BaseModel]
+    ) -> Optional[BaseModel]:
+        """Validate a stored document, skipping (and logging) ones that do not fit."""
+        try:
+            return from_document(document, model_class)
+        except Exception as validation_error:
+            self.logger.warning("Failed to validate item: %s", str(validation_error))
+            return None
+
+    async def _version(self, filters: Filters, order: Order = None) -> str:
+        """Version of the documents matching ``filters``; see documents_version."""
+        await self._ensure_initialized()
+        documents = await self._find(
+            {field: to_json_value(value) for field, value in filters.items()}, order
+        )
+        return documents_version(documents)
+
+    async def _find_models(
+        self,
+        filters: Filters,
+        model_class: Type[BaseModel],
+        order: Order = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[BaseModel]:
+        """Find documents and validate them into ``model_class``.
+
+        Args:
+            filters: Field values the documents must have
+            model_class: Model to validate the documents into
+            order: Field to order on and whether descending
+            fields: Only read these fields, like a SELECT projection
+        """
+        await self._ensure_initialized()
+        documents = await self._find(
+            {field: to_json_value(value) for field, value in filters.items()}, order
+        )
+        results = []
+        for document in documents:
+            if fields is not None:
+                document = {f: document[f] for f in fields if f in document}
+            model = self._validate(document, model_class)
+            if model is not None:
+                results.append(model)
+        return results
+
+    async def _find_one(
+        self, filters: Filters, model_class: Type[BaseModel]
+    ) -> Optional[BaseModel]:
+        results = await self._find_models(filters, model_class)
+        return results[0] if results else None
+
+    async def _page(
+        self,
+        filters: Filters,
+        model_class: Type[BaseModel],
+        order: Order,
+        limit: int,
+        continuation_token: Optional[str],
+        fields: Optional[List[str]] = None,
+    ) -> ItemPage:
+        """Return one page of results; the continuation token is an offset."""
+        try:
+            offset = int(continuation_token) if continuation_token else 0
+        except ValueError:
+            offset = -1
+        if offset < 0:
+            raise ValueError(f"Invalid continuation token: {continuation_token}")
+
+        results = await self._find_models(filters, model_class, order, fields)
+        end = offset + limit
+        return ItemPage(
+            items=results[offset:end],
+            continuation_token=str(end) if end < len(results) else None,
+        )
+
+    # Core CRUD Operations
+    async def add_item(self, item: BaseDataModel) -> None:
+        """Add an item to the database."""
+        await self._ensure_initialized()
+        await self._put(self._to_document(item), create=True)
+
+    async def update_item(self, item: BaseDataModel) -> None:
+        """Update (or insert) an item in the database."""
+        await self._ensure_initialized()
+        await self._put(self._to_document(item), create=False)
+
+    async def get_item_by_id(
+        self, item_id: str, partition_key: str, model_class: Type[BaseDataModel]
+    ) -> Optional[BaseDataModel]:
+        """Retrieve an item by its ID and partition key."""
+        await self._ensure_initialized()
+        document = await self._get(item_id, partition_key)
+        return self._validate(document, model_class) if document else None
+
+    async def query_items(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Type[BaseDataModel],
+    ) -> List[BaseDataModel]:
+        """Run a Cosmos SQL query (see ``parse_query``) and return model instances."""
+        try:
+            fields, filters, order = parse_query(query, parameters)
+            return await self._find_models(filters, model_class, order, fields)
+        except Exception as e:
+            self.logger.error("Failed to query items: %s", str(e))
+            return []
+
+    async def query_items_stream(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Type[BaseDataModel],
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[BaseDataModel]:
+        """Yield the results of a Cosmos SQL query one model at a time."""
+        fields, filters, order = parse_query(query, parameters)
+        for item in await self._find_models(filters, model_class, order, fields):
+            yield item
+
+    async def query_items_page(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Type[BaseDataModel],
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Return one page of a Cosmos SQL query."""
+        fields, filters, order = parse_query(query, parameters)
+        return await self._page(
+            filters, model_class, order, limit, continuation_token, fields
+        )
+
+    async def delete_item(self, item_id: str, partition_key: str) -> None:
+        """Delete an item from the database."""
+        await self._ensure_initialized()
+        if not await self._remove(item_id, partition_key):
+            raise KeyError(f"Item {item_id} not found in partition {partition_key}")
+
+    # Plan Operations
+    async def add_plan(self, plan: Plan) -> None:
+        """Add a plan to the database."""
+        await self.add_item(plan)
+
+    async def update_plan(self, plan: Plan) -> None:
+        """Update a plan in the database."""
+        await self.update_item(plan)
+
+    async def get_plan_by_plan_id(self, plan_id: str) -> Optional[Plan]:
+        """Retrieve a plan by plan_id."""
+        return await self._find_one({"id": plan_id, "data_type": DataType.plan}, Plan)
+
+    async def get_plan(self, plan_id: str) -> Optional[Plan]:
+        """Retrieve a plan by plan_id."""
+        return await self.get_plan_by_plan_id(plan_id)
+
+    async def get_all_plans(self) -> List[Plan]:
+        """Retrieve all plans for the user."""
+        return await self._find_models(
+            {"user_id": self.user_id, "data_type": DataType.plan}, Plan
+        )
+
+    async def get_all_plans_by_team_id(self, team_id: str) -> List[Plan]:
+        """Retrieve all plans for a specific team."""
+        return await self._find_models(
+            {"team_id": team_id, "data_type": DataType.plan, "user_id": self.user_id},
+            Plan,
+        )
+
+    @staticmethod
+    def _plans_by_team_id_status(user_id: str, team_id: str, status: str) -> Filters:
+        return {
+            "team_id": team_id,
+            "data_type": DataType.plan,
+            "user_id": user_id,
+            "overall_status": status,
+        }
+
+    async def get_all_plans_by_team_id_status(
+        self, user_id: str, team_id: str, status: str
+    ) -> List[Plan]:
+        """Retrieve all plans of a team with a status, newest first."""
+        return await self._find_models(
+            self._plans_by_team_id_status(user_id, team_id, status),
+            Plan,
+            self._NEWEST_FIRST,
+        )
+
+    async def get_plans_page_by_team_id_status(
+        self,
+        user_id: str,
+        team_id: str,
+        status: str,
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Retrieve one page of a team's plans with a status, newest first."""
+        return await self._page(
+            self._plans_by_team_id_status(user_id, team_id, status),
+            Plan,
+            self._NEWEST_FIRST,
+            limit,
+            continuation_token,
+        )
+
+    async def get_plan_summaries_by_team_id_status(
+        self, user_id: str, team_id: str, status: str
+    ) -> List[PlanSummary]:
+        """Retrieve summaries of a team's plans with a status, newest first."""
+        return await self._find_models(
+            self._plans_by_team_id_status(user_id, team_id, status),
+            PlanSummary,
+            self._NEWEST_FIRST,
+            list(PlanSummary.model_fields),
+        )
+
+    async def get_plans_version(self, user_id: str, team_id: str, status: str) -> str:
+        """Version of a team's plans with a status, from their ids and _etags."""
+        return await self._version(
+            self._plans_by_team_id_status(user_id, team_id, status), self._NEWEST_FIRST
+        )
+
+    async def get_plan_summaries_page_by_team_id_status(
+        self,
+        user_id: str,
+        team_id: str,
+        status: str,
+        limit: int,
+        continuation_token: Optional[str] = None,
+    ) -> ItemPage:
+        """Retrieve one page of plan summaries, newest first."""
+        return await self._page(
+            self._plans_by_team_id_status(user_id, team_id, status),
+            PlanSummary,
+            self._NEWEST_FIRST,
+            limit,
+            continuation_token,
+            list(PlanSummary.model_fields),
+        )
+
+    # Step Operations
+    async def add_step(self, step: Step) -> None:
+        """Add a step to the database."""
+        await self.add_item(step)
+
+    async def update_step(self, step: Step) -> None:
+        """Update a step in the database."""
+        await self.update_item(step)
+
+    async def get_steps_by_plan(self, plan_id: str) -> List[Step]:
+        """Retrieve all steps for a plan."""
+        return await self._find_models(
+            {"plan_id": plan_id, "data_type": DataType.step},
+            Step,
+            ("timestamp", False),
+        )
+
+    async def get_steps_for_plan(self, plan_id: str) -> List[Step]:
+        """Alias for get_steps_by_plan for compatibility."""
+        return await self.get_steps_by_plan(plan_id)
+
+    async def get_step(self, step_id: str, session_id: str) -> Optional[Step]:
+        """Retrieve a step by step_id and session_id."""
+        if not step_id or not session_id:
+            return None
+        await self._ensure_initialized()
+        document = await self._get(step_id, session_id)
+        if not document or document.get("data_type") != DataType.step:
+            return None
+        return self._validate(document, Step)
+
+    # Team Operations
+    async def add_team(self, team: TeamConfiguration) -> None:
+        """Add a team configuration to the database."""
+        await self.add_item(team)
+
+    async def update_team(self, team: TeamConfiguration) -> None:
+        """Update an existing team configuration in the database."""
+        await self.update_item(team)
+
+    async def get_team(self, team_id: str) -> Optional[TeamConfiguration]:
+        """Retrieve a specific team configuration by team_id."""
+        return await self._find_one(
+            {"team_id": team_id, "data_type": DataType.team_config}, TeamConfiguration
+        )
+
+    async def get_team_by_id(self, team_id: str) -> Optional[TeamConfiguration]:
+        """Retrieve a specific team configuration by its id."""
+        return await self.get_team(team_id)
+
+    async def get_all_teams(self) -> List[TeamConfiguration]:
+        """Retrieve all team configurations, newest first."""
+        return await self._find_models(
+            {"data_type": DataType.team_config}, TeamConfiguration, ("created", True)
+        )
+
+    async def get_teams_version(self) -> str:
+        """Version of all team configurations, from their ids and _etags."""
+        return await self._version({"data_type": DataType.team_config}, ("created", True))
+
+    async def delete_team(self, team_id: str) -> bool:
+        """Delete a team configuration by team_id."""
+        try:
+            team = await self.get_team(team_id)
+            if team:
+                await self.delete_item(item_id=team.id, partition_key=team.session_id)
+            return True
+        except Exception as e:
+            self.logger.exception("Failed to delete team: %s", e)
+            return False
+
+    # Data Management Operations
+    async def get_data_by_type(self, data_type: str) -> List[BaseDataModel]:
+        """Retrieve all of the user's data of a specific type."""
+        model_class = self.MODEL_CLASS_MAPPING.get(data_type, BaseDataModel)
+        return await self._find_models(
+            {"data_type": data_type, "user_id": self.user_id}, model_class
+        )
+
+    async def get_all_items(self) -> List[Dict[str, Any]]:
+        """Retrieve all of the user's items as dictionaries."""
+        await self._ensure_initialized()
+        return await self._find({"user_id": self.user_id})
+
+    # Current team Operations
+    async def get_current_team(self, user_id: str) -> Optional[UserCurrentTeam]:
+        """Retrieve the current team for a user."""
+        await self._ensure_initialized()
+        document = await self._get(UserCurrentTeam.document_id(user_id), user_id)
+        if document:
+            return self._validate(document, UserCurrentTeam)
+        return await self._find_one(
+            {"data_type": DataType.user_current_team, "user_id": user_id},
+            UserCurrentTeam,
+        )
+
+    async def set_current_team(self, current_team: UserCurrentTeam) -> None:
+        """Set the current team for a user."""
+        await self.update_item(current_team)
+
+    async def update_current_team(self, current_team: UserCurrentTeam) -> None:
+        """Update the current team for a user."""
+        await self.update_item(current_team)
+
+    async def delete_current_team(self, user_id: str) -> bool:
+        """Delete the current team for a user."""
+        await self._ensure_initialized()
+        documents = await self._find(
+            {"user_id": user_id, "data_type": DataType.user_current_team.value}
+        )
+        await self._delete_documents(documents)
+        return True
+
+    # Plan deletion
+    async def _delete_documents(self, documents: List[Dict[str, Any]]) -> DeleteResult:
+        result = DeleteResult()
+        for document in documents:
+            if await self._remove(document["id"], document["session_id"]):
+                data_type = document.get("data_type") or "unknown"
+                result.deleted[data_type] = result.deleted.get(data_type, 0) + 1
+        return result
+
+    async def delete_plan_by_plan_id(self, plan_id: str) -> bool:
+        """Delete a plan together with its messages and steps."""
+        result = await self.delete_plan_cascade(plan_id)
+        return not result.failed
+
+    async def delete_plan_cascade(self, plan_id: str) -> DeleteResult:
+        """Delete a plan and every document that carries its plan_id."""
+        await self._ensure_initialized()
+        return await self._delete_documents(await self._find({"plan_id": plan_id}))
+
+    # MPlan Operations
+    async def add_mplan(self, mplan: messages.MPlan) -> None:
+        """Add an m_plan to the database."""
+        await self.add_item(mplan)
+
+    async def update_mplan(self, mplan: messages.MPlan) -> None:
+        """Update an m_plan in the database."""
+        await self.update_item(mplan)
+
+    async def get_mplan(self, plan_id: str) -> Optional[messages.MPlan]:
+        """Retrieve the m_plan of a plan."""
+        return await self._find_one(
+            {"plan_id": plan_id, "data_type": DataType.m_plan}, messages.MPlan
+        )
+
+    # Agent message Operations
+    async def add_agent_message(self, message: AgentMessageData) -> None:
+        """Add an agent message to the database."""
+        await self.add_item(message)
+
+    async def update_agent_message(self, message: AgentMessageData) -> None:
+        """Update an agent message in the database."""
+        await self.update_item(message)
+
+    async def get_agent_messages(self, plan_id: str) -> List[AgentMessageData]:
+        """Retrieve a plan's agent messages in the order they were created."""
+        return await self._find_models(
+            {"plan_id": plan_id, "data_type": DataType.m_plan_message},
+            AgentMessageData,
+            ("timestamp", False),
+        )
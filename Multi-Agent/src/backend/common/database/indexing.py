@@ -0,0 +1,205 @@
+"""Cosmos DB indexing policy derived from the queries CosmosDBClient runs.
+
+Cosmos indexes every path by default, which serves equality filters and
+single-field ORDER BY, but a query that filters on some fields and orders by
+another needs a composite index made of the filtered fields followed by the
+ordered one. :func:`build_indexing_policy` derives those composite indexes
+from the client's named queries, and :func:`verify_indexing_policy` reports
+what a container's policy is missing.
+
+Print the policy for a deployment (from src/backend)::
+
+    python -m common.database.indexing > indexing-policy.json
+"""
+
+import base64
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .document_store import parse_query
+
+# A composite index as Cosmos describes it: [{"path": "/f", "order": "ascending"}, ...]
+CompositeIndex = List[Dict[str, str]]
+
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+INDEX_UTILIZATION_HEADER = "x-ms-cosmos-index-utilization"
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """The fields a query filters on (by equality) and orders by."""
+
+    name: str
+    filters: Tuple[str, ...]
+    order: Optional[Tuple[str, bool]] = None
+
+    @classmethod
+    def parse(cls, name: str, query: str) -> "QueryShape":
+        _, filters, order = parse_query(query, None)
+        return cls(name, tuple(filters), order)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self.filters + ((self.order[0],) if self.order else ())
+
+    def composite_index(self) -> Optional[CompositeIndex]:
+        """The composite index this query needs, if any."""
+        if not self.order or not self.filters:
+            return None
+        field, descending = self.order
+        return [{"path": f"/{f}", "order": "ascending"} for f in self.filters] + [
+            {"path": f"/{field}", "order": "descending" if descending else "ascending"}
+        ]
+
+
+def _path_field(path: str) -> str:
+    """Top-level field of an index path such as ``/m_plan/*``."""
+    return path.strip("/").split("/")[0].strip('"')
+
+
+def build_indexing_policy(
+    queries: Mapping[str, str], excluded_paths: Sequence[str] = ()
+) -> Dict[str, Any]:
+    """Build the indexing policy that serves ``queries``.
+
+    Args:
+        queries: Query text by name
+        excluded_paths: Paths never queried (large text or nested fields),
+            left out of the index to make writes cheaper
+
+    Returns:
+        Indexing policy in the shape Cosmos DB accepts
+
+    Raises:
+        ValueError: If a query filters or orders on an excluded path
+    """
+    shapes = [QueryShape.parse(name, query) for name, query in queries.items()]
+    excluded_fields = {_path_field(path) for path in excluded_paths}
+    composite_indexes: List[CompositeIndex] = []
+    for shape in shapes:
+        clash = excluded_fields.intersection(shape.fields)
+        if clash:
+            raise ValueError(
+                f"Query {shape.name} uses unindexed field(s): {', '.join(sorted(clash))}"
+            )
+        index = shape.composite_index()
+        if index and index not in composite_indexes:
+            composite_indexes.append(index)
+
+    return {
+        "indexingMode": "consistent",
+        "automatic": True,
+        "includedPaths": [{"path": "/*"}],
+        "excludedPaths": [{"path": path} for path in excluded_paths],
+        "compositeIndexes": composite_indexes,
+    }
+
+
+def serves_composite(existing: CompositeIndex, required: CompositeIndex) -> bool:
+    """Whether ``existing`` serves ``required`` as is or with every order reversed."""
+    if [i.get("path") for i in existing] != [i["path"] for i in required]:
+        return False
+    orders = [i.get("order", "ascending") for i in existing]
+    wanted = [i["order"] for i in required]
+    flip = {"ascending": "descending", "descending": "ascending"}
+    return orders == wanted or orders == [flip[o] for o in wanted]
+
+
+def verify_indexing_policy(
+    actual: Mapping[str, Any], required: Mapping[str, Any], queries: Mapping[str, str]
+) -> List[str]:
+    """Compare a container's indexing policy with the one the queries need.
+
+    Args:
+        actual: The container's ``indexingPolicy``
+        required: Policy from :func:`build_indexing_policy`
+        queries: Query text by name, to report which queries are affected
+
+    Returns:
+        Human readable problems; empty if the container serves every query
+    """
+    problems = []
+    if actual.get("indexingMode", "consistent").lower() == "none":
+        return ["indexing is disabled on the container"]
+
+    existing = actual.get("compositeIndexes", [])
+    for index in required.get("compositeIndexes", []):
+        if not any(serves_composite(e, index) for e in existing):
+            spec = ", ".join(f"{i['path']} {i['order']}" for i in index)
+            problems.append(f"missing composite index ({spec})")
+
+    excluded = {e.get("path") for e in actual.get("excludedPaths", [])}
+    included = {i.get("path") for i in actual.get("includedPaths", [])}
+    for name, query in queries.items():
+        for field in QueryShape.parse(name, query).fields:
+            paths = {f"/{field}/?", f"/{field}/*"}
+            if paths & excluded or ("/*" in excluded and not paths & included):
+                problems.append(f"query {name} filters or orders on unindexed field {field}")
+    return problems
+
+
+def _index_specs(indexes: Iterable[Dict[str, Any]]) -> str:
+    """Index utilization entries as ``/f/?, (/a ASC, /b DESC)``."""
+    specs = []
+    for index in indexes:
+        if index.get("IndexSpecs"):
+            specs.append("(" + ", ".join(index["IndexSpecs"]) + ")")
+        else:
+            specs.append(str(index.get("IndexSpec")))
+    return ", ".join(specs) or "none"
+
+
+class QueryMetricsHook:
+    """``response_hook`` logging the RU charge and index use of each query page.
+
+    Created per query execution with the query's name; pass it to
+    ``container.query_items`` together with ``populate_index_metrics=True``.
+    """
+
+    def __init__(self, name: str, logger: logging.Logger):
+        self.name = name
+        self.logger = logger
+        self.request_charge = 0.0
+        self.pages = 0
+
+    def __call__(self, headers: Mapping[str, Any], _result: Any) -> None:
+        self.pages += 1
+        charge = float(headers.get(REQUEST_CHARGE_HEADER) or 0)
+        self.request_charge += charge
+        utilization = self._index_utilization(headers.get(INDEX_UTILIZATION_HEADER))
+        utilized = _index_specs(
+            utilization.get("UtilizedSingleIndexes", [])
+            + utilization.get("UtilizedCompositeIndexes", [])
+        )
+        potential = _index_specs(
+            utilization.get("PotentialSingleIndexes", [])
+            + utilization.get("PotentialCompositeIndexes", [])
+        )
+        self.logger.info(
+            "Cosmos query %s page %d: %.2f RU; utilized indexes: %s; potential indexes: %s",
+            self.name,
+            self.pages,
+            charge,
+            utilized,
+            potential,
+        )
+
+    @staticmethod
+    def _index_utilization(raw: Any) -> Dict[str, Any]:
+        """Decode the base64 JSON index utilization header (already a dict in some SDK paths)."""
+        if not raw:
+            return {}
+        if isinstance(raw, dict):
+            return raw
+        try:
+            return json.loads(base64.b64decode(raw)) or {}
+        except ValueError:
+            return {}
+
+
+if __name__ == "__main__":
+    from .cosmosdb import CosmosDBClient
+
+    print(json.dumps(CosmosDBClient.indexing_policy(), indent=2))
@@ -0,0 +1,129 @@
+"""In-memory implementation of the database interface."""
+
+import itertools
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .document_store import DocumentStoreDatabase, Filters, Order
+from .serialization import dumps, loads
+
+# (partition key, id)
+DocumentKey = Tuple[str, str]
+
+
+class _MemoryStore:
+    """Documents keyed on (partition key, id) with an index per INDEXED_FIELDS value."""
+
+    def __init__(self, indexed_fields) -> None:
+        self.indexed_fields = indexed_fields
+        self.docs: Dict[DocumentKey, Dict[str, Any]] = {}
+        # Serialized copy handed out on reads, so callers never share the stored dict
+        self.raw: Dict[DocumentKey, str] = {}
+        # Write sequence of each document, so equal sort values keep write order
+        self.sequence: Dict[DocumentKey, int] = {}
+        self.by_id: Dict[str, Set[DocumentKey]] = defaultdict(set)
+        self.index: Dict[Tuple[str, Any], Set[DocumentKey]] = defaultdict(set)
+        self._counter = itertools.count()
+
+    def _index_keys(self, document: Dict[str, Any]):
+        for field in self.indexed_fields:
+            value = document.get(field)
+            if value is not None:
+                yield (field, value)
+
+    def put(self, key: DocumentKey, document: Dict[str, Any]) -> None:
+        self.pop(key)
+        raw = dumps(document)
+        # Keep what a round trip through the service would return, not the caller's dict
+        self.docs[key] = loads(raw)
+        self.raw[key] = raw
+        self.sequence[key] = next(self._counter)
+        self.by_id[key[1]].add(key)
+        for index_key in self._index_keys(self.docs[key]):
+            self.index[index_key].add(key)
+
+    def pop(self, key: DocumentKey) -> Optional[Dict[str, Any]]:
+        document = self.docs.pop(key, None)
+        if document is None:
+            return None
+        del self.raw[key]
+        del self.sequence[key]
+        self._discard(self.by_id, key[1], key)
+        for index_key in self._index_keys(document):
+            self._discard(self.index, index_key, key)
+        return document
+
+    @staticmethod
+    def _discard(index, index_key, key: DocumentKey) -> None:
+        keys = index.get(index_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[index_key]
+
+    def candidates(self, filters: Filters) -> Set[DocumentKey]:
+        """Keys that can match ``filters``, from the smallest applicable index."""
+        indexes = [
+            self.index.get((field, value), set())
+            for field, value in filters.items()
+            if field in self.indexed_fields
+        ]
+        if "id" in filters:
+            indexes.append(self.by_id.get(filters["id"], set()))
+        if not indexes:
+            return set(self.docs)
+        return min(indexes, key=len)
+
+
+class MemoryDatabase(DocumentStoreDatabase):
+    """Database that keeps documents in process memory.
+
+    Nothing is persisted and nothing goes over the network, which makes it the
+    backend for local load tests and benchmarks. Views returned by
+    ``for_user`` share the same documents.
+    """
+
+    def __init__(self, user_id: str = ""):
+        super().__init__(user_id=user_id)
+        self._store = _MemoryStore(self.INDEXED_FIELDS)
+
+    async def initialize(self) -> None:
+        """Nothing to set up for the in-memory store."""
+        self._initialized = True
+
+    async def close(self) -> None:
+        """Drop the stored documents when the owning instance is closed."""
+        if self._owns_store:
+            self._store = _MemoryStore(self.INDEXED_FIELDS)
+
+    async def _put(self, document: Dict[str, Any], create: bool) -> None:
+        key = (document["session_id"], document["id"])
+        if create and key in self._store.docs:
+            raise ValueError(f"Item {document['id']} already exists")
+        self._store.put(key, document)
+
+    async def _get(self, item_id: str, partition_key: str) -> Optional[Dict[str, Any]]:
+        raw = self._store.raw.get((partition_key, item_id))
+        return loads(raw) if raw is not None else None
+
+    async def _find(self, filters: Filters, order: Order = None) -> List[Dict[str, Any]]:
+        store = self._store
+        keys = [
+            key
+            for key in store.candidates(filters)
+            if all(store.docs[key].get(f) == v for f, v in filters.items())
+        ]
+        if order:
+            field, descending = order
+
+            def sort_key(key: DocumentKey):
+                value = store.docs[key].get(field)
+                return (value is not None, value, store.sequence[key])
+
+            keys.sort(key=sort_key, reverse=descending)
+        else:
+            keys.sort(key=store.sequence.__getitem__)
+        return [loads(store.raw[key]) for key in keys]
+
+    async def _remove(self, item_id: str, partition_key: str) -> bool:
+        return self._store.pop((partition_key, item_id)) is not None
@@ -0,0 +1,88 @@
+"""Conversion between data models and the JSON documents stored for them.
+
+Models are dumped with their compiled pydantic-core serializer in JSON mode, so
+datetimes (at any depth) become ISO 8601 strings and enums become their values,
+and read back with their compiled validator. Both are looked up once per model
+class. ``dumps``/``loads`` use orjson, a dependency of the backend, and fall
+back to the standard library in an environment that lacks it;
+``to_json_bytes`` encodes API responses the same way.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Type, TypeVar
+
+import pydantic_core
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - declared in pyproject.toml
+    orjson = None
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _serializer(model_class: Type[BaseModel]) -> Callable[[BaseModel], Dict[str, Any]]:
+    if not model_class.__pydantic_complete__:
+        model_class.model_rebuild()
+    to_python = model_class.__pydantic_serializer__.to_python
+    return lambda item: to_python(item, mode="json")
+
+
+@lru_cache(maxsize=None)
+def _validator(model_class: Type[BaseModel]) -> Callable[[Dict[str, Any]], BaseModel]:
+    if not model_class.__pydantic_complete__:
+        model_class.model_rebuild()
+    return model_class.__pydantic_validator__.validate_python
+
+
+def to_document(item: BaseModel) -> Dict[str, Any]:
+    """Dump a model to a JSON-compatible dictionary.
+
+    Equivalent to ``item.model_dump(mode="json")``.
+    """
+    return _serializer(type(item))(item)
+
+
+def from_document(document: Dict[str, Any], model_class: Type[ModelT]) -> ModelT:
+    """Validate a stored document into ``model_class``.
+
+    Equivalent to ``model_class.model_validate(document)``.
+
+    Raises:
+        pydantic.ValidationError: If the document does not fit the model
+    """
+    return _validator(model_class)(document)
+
+
+def dumps(document: Dict[str, Any]) -> str:
+    """Encode a JSON-compatible document as a JSON string."""
+    if orjson is not None:
+        return orjson.dumps(document).decode()
+    return json.dumps(document)
+
+
+def loads(raw: str) -> Dict[str, Any]:
+    """Decode a JSON string produced by :func:`dumps`."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _encode_model(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return _serializer(type(value))(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def to_json_bytes(value: Any) -> bytes:
+    """Encode a response body (models, or lists and dicts holding them) as JSON.
+
+    Models go through their compiled serializer rather than
+    ``jsonable_encoder``, giving the same JSON FastAPI's JSONResponse would.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_encode_model)
+    return pydantic_core.to_json(value)
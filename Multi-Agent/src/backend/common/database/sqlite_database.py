@@ -0,0 +1,161 @@
+"""SQLite implementation of the database interface."""
+
+import asyncio
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .document_store import DocumentStoreDatabase, Filters, Order
+from .serialization import dumps, loads
+
+_FIELD_RE = re.compile(r"^\w+$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT NOT NULL,
+    partition_key TEXT NOT NULL,
+    data_type TEXT,
+    user_id TEXT,
+    team_id TEXT,
+    plan_id TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (id, partition_key)
+);
+CREATE INDEX IF NOT EXISTS ix_documents_type_user_team
+    ON documents (data_type, user_id, team_id);
+CREATE INDEX IF NOT EXISTS ix_documents_plan ON documents (plan_id, data_type);
+CREATE INDEX IF NOT EXISTS ix_documents_team ON documents (team_id, data_type);
+"""
+
+
+class SqliteDatabase(DocumentStoreDatabase):
+    """Database that stores documents in a local SQLite file.
+
+    Each document is a row holding its JSON body, with the INDEXED_FIELDS
+    copied into indexed columns; other fields are filtered with
+    ``json_extract``. Useful as a zero-network development backend. Views
+    returned by ``for_user`` share the connection.
+    """
+
+    def __init__(self, path: str, user_id: str = ""):
+        super().__init__(user_id=user_id)
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        # sqlite3 connections must not be used from two threads at once
+        self._lock = threading.Lock()
+
+    async def initialize(self) -> None:
+        """Open the database file and create the table and indexes if needed."""
+        if self._initialized:
+            return
+        try:
+            self._connection = await asyncio.to_thread(self._connect)
+            self._initialized = True
+        except Exception as e:
+            self.logger.error("Failed to initialize SQLite database: %s", str(e))
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        if self.path != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    async def close(self) -> None:
+        """Close the connection when the owning instance is closed."""
+        if not self._owns_store or self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        self._initialized = False
+        await asyncio.to_thread(connection.close)
+        self.logger.info("Closed SQLite database %s", self.path)
+
+    async def _execute(
+        self, sql: str, parameters: Sequence[Any] = ()
+    ) -> Tuple[List[Tuple], int]:
+        """Run one statement on a worker thread and return (rows, rows changed)."""
+
+        def run() -> Tuple[List[Tuple], int]:
+            with self._lock:
+                cursor = self._connection.execute(sql, parameters)
+                return cursor.fetchall(), cursor.rowcount
+
+        return await asyncio.to_thread(run)
+
+    @classmethod
+    def _column(cls, field: str) -> str:
+        """SQL expression reading ``field`` of a document."""
+        if field == "id":
+            return "id"
+        if field == "session_id":
+            return "partition_key"
+        if field in cls.INDEXED_FIELDS:
+            return field
+        if not _FIELD_RE.match(field):
+            raise ValueError(f"Invalid field name: {field}")
+        return f"json_extract(body, '$.{field}')"
+
+    async def _put(self, document: Dict[str, Any], create: bool) -> None:
+        verb = "INSERT" if create else "INSERT OR REPLACE"
+        try:
+            await self._execute(
+                f"{verb} INTO documents "
+                "(id, partition_key, data_type, user_id, team_id, plan_id, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    document["id"],
+                    document["session_id"],
+                    *(document.get(field) for field in self.INDEXED_FIELDS),
+                    dumps(document),
+                ),
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Item {document['id']} already exists")
+
+    async def _get(self, item_id: str, partition_key: str) -> Optional[Dict[str, Any]]:
+        rows, _ = await self._execute(
+            "SELECT body FROM documents WHERE id = ? AND partition_key = ?",
+            (item_id, partition_key),
+        )
+        return loads(rows[0][0]) if rows else None
+
+    async def _find(self, filters: Filters, order: Order = None) -> List[Dict[str, Any]]:
+        conditions = []
+        parameters = []
+        by_id = "id" in filters
+        for field, value in filters.items():
+            column = self._column(field)
+            if by_id and field != "id":
+                # Without statistics SQLite would pick the data_type index over
+                # the primary key; a unary + keeps the column out of index choice
+                column = f"+{column}"
+            if value is None:
+                conditions.append(f"{column} IS NULL")
+            else:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+
+        sql = "SELECT body FROM documents"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        # rowid grows with every write, so ties keep write order
+        if order:
+            field, descending = order
+            direction = "DESC" if descending else "ASC"
+            sql += f" ORDER BY {self._column(field)} {direction}, rowid {direction}"
+        else:
+            sql += " ORDER BY rowid"
+
+        rows, _ = await self._execute(sql, parameters)
+        return [loads(body) for (body,) in rows]
+
+    async def _remove(self, item_id: str, partition_key: str) -> bool:
+        _, deleted = await self._execute(
+            "DELETE FROM documents WHERE id = ? AND partition_key = ?",
+            (item_id, partition_key),
+        )
+        return deleted > 0
@@ -0,0 +1,173 @@
+"""Process-local cache for team configuration lookups."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ..models.messages_kernel import DataType
+
+ALL_TEAMS = ("all_teams",)
+ALL_TEAMS_VERSION = ("all_teams_version",)
+
+
+def team_key(team_id: str) -> Tuple[str, str]:
+    return ("team", team_id)
+
+
+def current_team_key(user_id: str) -> Tuple[str, str]:
+    return ("current_team", user_id)
+
+
+def _copy(value: Any) -> Any:
+    """Copy cached models so callers can mutate what they get back."""
+    if isinstance(value, BaseModel):
+        return value.model_copy(deep=True)
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+class TeamCache:
+    """TTL + LRU cache for team configurations and users' current teams.
+
+    Entries expire ``ttl_seconds`` after they were loaded and the least
+    recently used entry is evicted beyond ``max_entries``. Missing documents
+    (None) are cached too, so users without a current team do not hit the
+    database on every request.
+
+    A load that raced with an invalidation is not stored: callers take
+    :attr:`version` before loading and pass it to :meth:`put`.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.version = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for ``key``."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, _copy(entry[1])
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key: Hashable, value: Any, version: int) -> None:
+        """Store ``value`` unless the cache was invalidated since ``version``."""
+        if version != self.version:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, _copy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        self.version += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def invalidate_team(self, team_id: Optional[str]) -> None:
+        """Drop a team, the team list and its version."""
+        self.invalidate(team_key(team_id), ALL_TEAMS, ALL_TEAMS_VERSION)
+
+    def invalidate_current_team(self, user_id: Optional[str]) -> None:
+        self.invalidate(current_team_key(user_id))
+
+    def invalidate_document(self, document: Dict[str, Any]) -> None:
+        """Drop whatever a changed Cosmos document may have made stale."""
+        data_type = document.get("data_type")
+        if data_type == DataType.team_config:
+            self.invalidate_team(document.get("team_id"))
+        elif data_type == DataType.user_current_team:
+            self.invalidate_current_team(document.get("user_id"))
+
+    def clear(self) -> None:
+        self.version += 1
+        self._entries.clear()
+
+
+class TeamChangeFeedListener:
+    """Keeps a TeamCache coherent with writes made by other replicas.
+
+    Polls the container's change feed every ``poll_seconds`` and invalidates
+    the entries of changed team and current-team documents. The change feed
+    does not report deletes, so a team deleted on another replica stays
+    cached until its TTL expires.
+    """
+
+    def __init__(self, container: Any, cache: TeamCache, poll_seconds: float):
+        self.container = container
+        self.cache = cache
+        self.poll_seconds = poll_seconds
+        self.logger = logging.getLogger(__name__)
+        self._continuation: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning("Team cache change feed poll failed: %s", e)
+            await asyncio.sleep(self.poll_seconds)
+
+    async def poll(self) -> int:
+        """Read changes since the last poll and invalidate them.
+
+        The first poll starts the feed at the current time.
+
+        Returns:
+            Number of changed documents read
+        """
+        headers: Dict[str, str] = {}
+
+        def remember_continuation(response_headers, _result) -> None:
+            headers.update(response_headers)
+
+        if self._continuation is None:
+            feed = self.container.query_items_change_feed(
+                start_time="Now", response_hook=remember_continuation
+            )
+        else:
+            feed = self.container.query_items_change_feed(
+                continuation=self._continuation, response_hook=remember_continuation
+            )
+
+        changed = 0
+        async for document in feed:
+            changed += 1
+            self.cache.invalidate_document(document)
+        self._continuation = headers.get("etag", self._continuation)
+        return changed
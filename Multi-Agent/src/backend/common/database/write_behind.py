@@ -0,0 +1,270 @@
+"""Write-behind buffer that coalesces Cosmos writes into transactional batches."""
+
+import asyncio
+import logging
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from azure.core.exceptions import HttpResponseError
+from azure.cosmos.exceptions import CosmosBatchOperationError
+
+# Cosmos DB rejects transactional batches with more operations than this
+MAX_BATCH_OPERATIONS = 100
+# Longest wait between retries of writes that failed with a transient error
+MAX_RETRY_DELAY_SECONDS = 30
+# Throttled, timed out or "retry with" responses; 5xx are retried as well
+RETRYABLE_STATUS_CODES = {408, 429, 449}
+
+class WriteBehindBuffer:
+    """Buffers document writes per partition key and flushes them in batches.
+
+    Writes are acknowledged as soon as they are buffered. A partition is
+    flushed with ``execute_item_batch`` when it reaches ``max_batch_size``
+    operations, when ``window_seconds`` has passed since its first buffered
+    write, or when :meth:`flush` / :meth:`close` is called. Repeated writes of
+    the same document within a window are coalesced into the last one.
+
+    Writes that fail with a transient error (throttling, timeouts, 5xx,
+    connection errors) go back into the buffer and are retried with
+    exponential backoff. Writes rejected for good (a conflict, a bad
+    document) are dropped. Either failure is raised by the :meth:`flush`,
+    :meth:`flush_plan` or :meth:`close` call that attempts the write; a
+    failure of a background flush is raised by the next one that covers
+    its partition.
+
+    Readers get read-your-writes within the process by calling
+    :meth:`flush_plan` (or :meth:`flush`) before reading; both also wait for
+    a flush of the same partition that is already in progress.
+    """
+
+    def __init__(
+        self,
+        container: Any,
+        window_seconds: float,
+        max_batch_size: int = MAX_BATCH_OPERATIONS,
+    ):
+        self.container = container
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, min(max_batch_size, MAX_BATCH_OPERATIONS))
+        self.logger = logging.getLogger(__name__)
+
+        # partition key -> document id -> (operation, document)
+        self._pending: Dict[str, "OrderedDict[str, Tuple[str, Dict[str, Any]]]"] = {}
+        # plan_id -> partition keys with pending or in-flight writes for the plan
+        self._plan_partitions: Dict[str, Set[str]] = defaultdict(set)
+        self._in_flight: Set[str] = set()
+        self._timers: Dict[str, asyncio.Task] = {}
+        # Per-partition flush locks, dropped once no flush is using them
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = defaultdict(int)
+        # Consecutive failed flushes of a partition, for the retry backoff
+        self._attempts: Dict[str, int] = {}
+        # Dropped writes of background flushes, raised by the next flush
+        self._errors: Dict[str, Exception] = {}
+        self._closed = False
+
+    @property
+    def pending_count(self) -> int:
+        """Number of buffered operations not yet written."""
+        return sum(len(ops) for ops in self._pending.values())
+
+    async def add(
+        self, operation: str, document: Dict[str, Any], partition_key: str
+    ) -> None:
+        """Buffer a ``create`` or ``upsert`` of ``document`` in ``partition_key``."""
+        ops = self._pending.setdefault(partition_key, OrderedDict())
+        self._coalesce(ops, operation, document)
+        if document.get("plan_id"):
+            self._plan_partitions[document["plan_id"]].add(partition_key)
+
+        if len(ops) >= self.max_batch_size:
+            # The write is already acknowledged: failures go to the next flush
+            await self._flush_partition(partition_key, defer_errors=True)
+        elif partition_key not in self._timers:
+            self._schedule(partition_key, self.window_seconds)
+
+    async def flush_plan(self, plan_id: str) -> None:
+        """Write every buffered operation that belongs to ``plan_id``."""
+        await self._flush_partitions(list(self._plan_partitions.get(plan_id, ())))
+
+    async def flush(self) -> None:
+        """Write every buffered operation."""
+        await self._flush_partitions(set(self._pending) | self._in_flight | set(self._errors))
+
+    async def close(self) -> None:
+        """Cancel pending timers and write everything still buffered."""
+        self._closed = True
+        for timer in list(self._timers.values()):
+            timer.cancel()
+        self._timers.clear()
+        await self.flush()
+
+    async def _flush_partitions(self, partition_keys) -> None:
+        """Flush each partition, then raise the first failure."""
+        errors = []
+        for partition_key in partition_keys:
+            try:
+                await self._flush_partition(partition_key)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _coalesce(ops, operation: str, document: Dict[str, Any]) -> None:
+        previous = ops.pop(document["id"], None)
+        if previous is not None and previous[0] == "upsert":
+            # An upsert followed by a create of the same document is still an upsert
+            operation = "upsert"
+        ops[document["id"]] = (operation, document)
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        if isinstance(error, HttpResponseError) and error.status_code is not None:
+            return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+        # Timeouts, connection resets and other errors without a response
+        return True
+
+    @asynccontextmanager
+    async def _partition_lock(self, partition_key: str):
+        self._lock_users[partition_key] += 1
+        lock = self._locks.setdefault(partition_key, asyncio.Lock())
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[partition_key] -= 1
+            if not self._lock_users[partition_key]:
+                del self._lock_users[partition_key]
+                del self._locks[partition_key]
+
+    def _schedule(self, partition_key: str, delay: float) -> None:
+        self._timers[partition_key] = asyncio.create_task(
+            self._flush_after_window(partition_key, delay)
+        )
+
+    async def _flush_after_window(self, partition_key: str, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+            self._timers.pop(partition_key, None)
+            await self._flush_partition(partition_key, defer_errors=True)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Nobody awaits the timer, so the error has to be reported here
+            self.logger.error(
+                "Write-behind flush of partition %s failed: %s", partition_key, e
+            )
+
+    async def _flush_partition(self, partition_key: str, defer_errors: bool = False) -> None:
+        async with self._partition_lock(partition_key):
+            dropped: Optional[Exception] = None if defer_errors else self._errors.pop(partition_key, None)
+            retried: Optional[Exception] = None
+            ops = self._pending.pop(partition_key, None) or OrderedDict()
+            # Requeued if the flush fails or is interrupted before writing them
+            unwritten = OrderedDict(ops)
+            self._in_flight.add(partition_key)
+            try:
+                items = list(ops.items())
+                for start in range(0, len(items), self.max_batch_size):
+                    chunk = items[start:start + self.max_batch_size]
+                    failures = await self._write_batch(
+                        [(op, (doc,)) for _, (op, doc) in chunk], partition_key
+                    )
+                    for document_id, _ in chunk:
+                        error = failures.get(document_id)
+                        if error is not None and self._is_transient(error):
+                            retried = retried or error
+                            continue
+                        if error is not None:
+                            dropped = dropped or error
+                        del unwritten[document_id]
+            finally:
+                self._in_flight.discard(partition_key)
+                if unwritten:
+                    self._requeue(partition_key, unwritten)
+                else:
+                    self._attempts.pop(partition_key, None)
+                if dropped is not None and defer_errors:
+                    self._errors.setdefault(partition_key, dropped)
+                self._forget_plans(partition_key)
+
+            if defer_errors:
+                if retried is not None:
+                    self.logger.warning(
+                        "Write-behind flush of partition %s will be retried: %s", partition_key, retried
+                    )
+                return
+            if dropped is not None or retried is not None:
+                raise dropped or retried
+
+    def _requeue(self, partition_key: str, unwritten) -> None:
+        """Put writes that were not made back in front of newer buffered ones."""
+        newer = self._pending.get(partition_key)
+        if newer:
+            for operation, document in newer.values():
+                self._coalesce(unwritten, operation, document)
+        self._pending[partition_key] = unwritten
+        if self._closed:
+            return
+        attempts = self._attempts[partition_key] = self._attempts.get(partition_key, 0) + 1
+        timer = self._timers.pop(partition_key, None)
+        if timer is not None:
+            timer.cancel()
+        self._schedule(
+            partition_key, min(self.window_seconds * 2 ** attempts, MAX_RETRY_DELAY_SECONDS)
+        )
+
+    def _forget_plans(self, partition_key: str) -> None:
+        """Drop plan -> partition entries that have nothing left to write or report."""
+        if partition_key in self._errors:
+            return
+        still_pending = {
+            doc.get("plan_id") for _, doc in self._pending.get(partition_key, {}).values()
+        }
+        for plan_id, partitions in list(self._plan_partitions.items()):
+            if partition_key in partitions and plan_id not in still_pending:
+                partitions.discard(partition_key)
+                if not partitions:
+                    del self._plan_partitions[plan_id]
+
+    async def _write_batch(
+        self, operations: List[Tuple[str, Tuple[Dict[str, Any]]]], partition_key: str
+    ) -> Dict[str, Exception]:
+        """Write ``operations`` and return the error of each document that was not written."""
+        try:
+            await self.container.execute_item_batch(
+                batch_operations=operations, partition_key=partition_key
+            )
+            return {}
+        except CosmosBatchOperationError as e:
+            # The batch is rolled back as a whole; write the operations one by
+            # one so a single bad document does not drop the rest
+            self.logger.warning(
+                "Batch of %d writes to partition %s failed at operation %s, retrying individually: %s",
+                len(operations),
+                partition_key,
+                e.error_index,
+                e.message,
+            )
+        except Exception as e:
+            # Throttled, timed out or unreachable: nothing was written
+            self.logger.warning(
+                "Batch of %d writes to partition %s failed: %s", len(operations), partition_key, e
+            )
+            return {document["id"]: e for _, (document,) in operations}
+
+        failures = {}
+        for operation, (document,) in operations:
+            try:
+                if operation == "create":
+                    await self.container.create_item(body=document)
+                else:
+                    await self.container.upsert_item(body=document)
+            except Exception as e:
+                self.logger.error(
+                    "Failed to write document %s: %s", document.get("id"), e
+                )
+                failures[document["id"]] = e
+        return failures
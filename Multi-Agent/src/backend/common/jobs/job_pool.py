@@ -0,0 +1,302 @@
+"""Bounded pool running orchestration jobs in the web process."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+from common.config.app_config import config
+from common.models.messages_kernel import JobStatus, OrchestrationJob
+
+# Bounds of the Retry-After hint sent with a 429
+MIN_RETRY_AFTER_SECONDS = 1
+MAX_RETRY_AFTER_SECONDS = 300
+
+JobRun = Callable[[], Awaitable[None]]
+
+
+class JobQueueFullError(Exception):
+    """The pool cannot take another job right now."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class IdempotencyConflictError(Exception):
+    """Another request with the same idempotency key is still being submitted."""
+
+
+class JobPool:
+    """Queue of orchestration jobs run by at most ``max_workers`` at a time.
+
+    A user has at most ``max_jobs_per_user`` jobs running; their other jobs
+    wait while other users' jobs run. Submissions are refused (see
+    :meth:`check_capacity`) once ``max_queued`` jobs, or
+    ``max_queued_per_user`` jobs of one user, are waiting or reserved.
+
+    Jobs submitted with an idempotency key are remembered per user, with
+    finished jobs, for ``retention_seconds``. A request is admitted in
+    three steps so that a retried request never creates a second plan:
+    :meth:`claim` the key, :meth:`reserve` a queue slot, then
+    :meth:`submit` with ``reserved=True`` (or :meth:`release` the key and
+    :meth:`unreserve` the slot if the request fails before that). The slot
+    is taken before the request's slow work, so requests arriving together
+    cannot all pass the capacity check and overfill the queue.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_jobs_per_user: int = 1,
+        max_queued: int = 100,
+        max_queued_per_user: int = 5,
+        retention_seconds: float = 3600,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_jobs_per_user = max(1, max_jobs_per_user)
+        self.max_queued = max_queued
+        self.max_queued_per_user = max_queued_per_user
+        self.retention_seconds = retention_seconds
+        self.logger = logging.getLogger(__name__)
+
+        self._jobs: Dict[str, OrchestrationJob] = {}
+        self._runs: Dict[str, JobRun] = {}
+        self._pending: Deque[str] = deque()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._running_by_user: Dict[str, int] = defaultdict(int)
+        self._queued_by_user: Dict[str, int] = defaultdict(int)
+        # Queue slots held by requests that have not submitted their job yet
+        self._reserved = 0
+        self._reserved_by_user: Dict[str, int] = defaultdict(int)
+        self._keys: Dict[Tuple[str, str], str] = {}
+        self._claimed: Set[Tuple[str, str]] = set()
+        # Finished job ids in finishing order, with their monotonic finish time
+        self._finished: Deque[Tuple[float, str]] = deque()
+        # Moving average of run time, for the Retry-After estimate
+        self._average_run_seconds = 60.0
+        self._closed = False
+
+    @classmethod
+    def from_config(cls) -> "JobPool":
+        return cls(
+            max_workers=config.ORCHESTRATION_MAX_CONCURRENT_JOBS,
+            max_jobs_per_user=config.ORCHESTRATION_MAX_JOBS_PER_USER,
+            max_queued=config.ORCHESTRATION_MAX_QUEUED_JOBS,
+            max_queued_per_user=config.ORCHESTRATION_MAX_QUEUED_JOBS_PER_USER,
+            retention_seconds=config.ORCHESTRATION_JOB_RETENTION_SECONDS,
+        )
+
+    @property
+    def queued(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> int:
+        return len(self._tasks)
+
+    def get(self, job_id: str) -> Optional[OrchestrationJob]:
+        """Return a copy of a job, or None if it is unknown or expired."""
+        job = self._jobs.get(job_id)
+        return job.model_copy() if job else None
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position of a queued job among all waiting jobs."""
+        try:
+            return self._pending.index(job_id) + 1
+        except ValueError:
+            return None
+
+    def claim(self, user_id: str, idempotency_key: Optional[str]) -> Optional[OrchestrationJob]:
+        """Look up a user's idempotency key, reserving it if it is new.
+
+        Args:
+            user_id: Submitting user
+            idempotency_key: Key sent with the request (None skips the check)
+
+        Returns:
+            The job submitted earlier with this key, or None if the caller
+            should submit a new one
+
+        Raises:
+            IdempotencyConflictError: If a request with this key is in flight
+        """
+        if not idempotency_key:
+            return None
+        self._evict_finished()
+        key = (user_id, idempotency_key)
+        job_id = self._keys.get(key)
+        if job_id is not None:
+            return self.get(job_id)
+        if key in self._claimed:
+            raise IdempotencyConflictError(
+                f"A request with idempotency key {idempotency_key} is in progress"
+            )
+        self._claimed.add(key)
+        return None
+
+    def release(self, user_id: str, idempotency_key: Optional[str]) -> None:
+        """Give up a key claimed by a request that did not submit a job."""
+        if idempotency_key:
+            self._claimed.discard((user_id, idempotency_key))
+
+    def check_capacity(self, user_id: str) -> None:
+        """Raise JobQueueFullError if a job of ``user_id`` would not be admitted."""
+        if self._closed:
+            raise JobQueueFullError("The job pool is shutting down", self.retry_after())
+        waiting = len(self._pending) + self._reserved
+        if waiting >= self.max_queued:
+            raise JobQueueFullError(f"{waiting} jobs are already waiting", self.retry_after())
+        queued = self._queued_by_user.get(user_id, 0) + self._reserved_by_user.get(user_id, 0)
+        if queued >= self.max_queued_per_user:
+            raise JobQueueFullError(
+                f"{queued} of your jobs are already waiting",
+                self.retry_after(),
+            )
+
+    def reserve(self, user_id: str) -> None:
+        """Hold a queue slot for a job ``user_id`` is about to submit.
+
+        Raises:
+            JobQueueFullError: If the job would not be admitted
+        """
+        self.check_capacity(user_id)
+        self._reserved += 1
+        self._reserved_by_user[user_id] += 1
+
+    def unreserve(self, user_id: str) -> None:
+        """Give up a slot reserved by a request that did not submit a job."""
+        if not self._reserved_by_user.get(user_id):
+            return
+        self._reserved -= 1
+        self._reserved_by_user[user_id] -= 1
+        if not self._reserved_by_user[user_id]:
+            del self._reserved_by_user[user_id]
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained by one batch of workers."""
+        batches = len(self._pending) // self.max_workers + 1
+        estimate = math.ceil(batches * self._average_run_seconds)
+        return max(MIN_RETRY_AFTER_SECONDS, min(MAX_RETRY_AFTER_SECONDS, estimate))
+
+    def submit(
+        self,
+        user_id: str,
+        run: JobRun,
+        plan_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        reserved: bool = False,
+    ) -> OrchestrationJob:
+        """Queue ``run`` and start it as soon as a worker slot is free.
+
+        Capacity is checked by :meth:`reserve` before the caller does any
+        work for the job; ``reserved=True`` hands the slot to the job.
+        Only a pool that is shutting down refuses it.
+
+        Returns:
+            A copy of the queued (or already running) job
+
+        Raises:
+            JobQueueFullError: If the pool is shutting down
+        """
+        if reserved:
+            self.unreserve(user_id)
+        if self._closed:
+            raise JobQueueFullError("The job pool is shutting down", self.retry_after())
+        self._evict_finished()
+        job = OrchestrationJob(
+            user_id=user_id,
+            plan_id=plan_id,
+            session_id=session_id,
+            idempotency_key=idempotency_key,
+        )
+        self._jobs[job.job_id] = job
+        self._runs[job.job_id] = run
+        if idempotency_key:
+            self._keys[(user_id, idempotency_key)] = job.job_id
+            self._claimed.discard((user_id, idempotency_key))
+        self._pending.append(job.job_id)
+        self._queued_by_user[user_id] += 1
+        self._dispatch()
+        return job.model_copy()
+
+    def _dispatch(self) -> None:
+        """Start waiting jobs, oldest first, while worker slots are free."""
+        if self._closed:
+            return
+        skipped: Deque[str] = deque()
+        while self._pending and len(self._tasks) < self.max_workers:
+            job_id = self._pending.popleft()
+            job = self._jobs[job_id]
+            if self._running_by_user.get(job.user_id, 0) >= self.max_jobs_per_user:
+                skipped.append(job_id)
+                continue
+            self._queued_by_user[job.user_id] -= 1
+            if not self._queued_by_user[job.user_id]:
+                del self._queued_by_user[job.user_id]
+            self._running_by_user[job.user_id] += 1
+            job.status = JobStatus.running
+            job.started = datetime.now(timezone.utc)
+            self._tasks[job_id] = asyncio.create_task(self._run(job, self._runs.pop(job_id)))
+        skipped.extend(self._pending)
+        self._pending = skipped
+
+    async def _run(self, job: OrchestrationJob, run: JobRun) -> None:
+        started = time.monotonic()
+        try:
+            await run()
+            job.status = JobStatus.completed
+        except asyncio.CancelledError:
+            job.status = JobStatus.cancelled
+        except Exception as e:
+            self.logger.exception("Orchestration job %s for plan %s failed", job.job_id, job.plan_id)
+            job.status = JobStatus.failed
+            job.error = str(e)
+        finally:
+            elapsed = time.monotonic() - started
+            self._average_run_seconds = 0.8 * self._average_run_seconds + 0.2 * elapsed
+            job.finished = datetime.now(timezone.utc)
+            self._finish(job)
+            self._dispatch()
+
+    def _finish(self, job: OrchestrationJob) -> None:
+        self._tasks.pop(job.job_id, None)
+        self._running_by_user[job.user_id] -= 1
+        if not self._running_by_user[job.user_id]:
+            del self._running_by_user[job.user_id]
+        self._finished.append((time.monotonic(), job.job_id))
+        self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        """Forget finished jobs (and their idempotency keys) past retention."""
+        cutoff = time.monotonic() - self.retention_seconds
+        while self._finished and self._finished[0][0] <= cutoff:
+            _, job_id = self._finished.popleft()
+            job = self._jobs.pop(job_id, None)
+            if job and job.idempotency_key:
+                self._keys.pop((job.user_id, job.idempotency_key), None)
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop taking jobs, cancel waiting ones and give running ones ``timeout`` to finish."""
+        self._closed = True
+        while self._pending:
+            job = self._jobs[self._pending.popleft()]
+            job.status = JobStatus.cancelled
+            job.finished = datetime.now(timezone.utc)
+            self._runs.pop(job.job_id, None)
+        self._queued_by_user.clear()
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        _, still_running = await asyncio.wait(tasks, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        await asyncio.gather(*still_running, return_exceptions=True)
+
+
+# Process-wide pool used by the API
+job_pool = JobPool.from_config()
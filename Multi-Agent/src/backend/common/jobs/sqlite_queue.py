@@ -0,0 +1,214 @@
+"""SQLite-backed job queue and message channels shared by API and worker processes."""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    created REAL NOT NULL,
+    claimed REAL,
+    heartbeat REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created);
+CREATE TABLE IF NOT EXISTS messages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_messages_channel_seq ON messages (channel, seq);
+"""
+
+# Columns added to the jobs table after its first release
+_JOB_COLUMNS = {
+    "heartbeat": "heartbeat REAL",
+    "attempts": "attempts INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def _dumps(body: Dict[str, Any]) -> str:
+    # Event payloads are built for the WebSocket, which also falls back to str()
+    return json.dumps(body, default=str)
+
+
+def default_worker_id() -> str:
+    """``host:pid`` of the current process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SqliteJobQueue:
+    """Job queue plus append-only message channels in one SQLite file.
+
+    The API process enqueues jobs and workers claim them oldest first; a
+    claim is a single ``UPDATE ... RETURNING`` so two workers never get the
+    same job. Channels carry everything else (worker events, results and
+    the user's replies) as rows read by sequence number, so each reader
+    keeps its own position and several API replicas or workers can read the
+    same channel. Any number of processes on one host can share the file.
+
+    A claimed job is leased to its worker, which renews the lease with
+    :meth:`heartbeat` while the job runs. :meth:`reclaim_expired` puts jobs
+    whose worker stopped renewing back in the queue, so a worker that dies
+    mid-job does not leave it running forever.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._connection: Optional[sqlite3.Connection] = None
+        # sqlite3 connections must not be used from two threads at once
+        self._lock = threading.Lock()
+
+    async def initialize(self) -> None:
+        """Open the queue file and create the tables if needed."""
+        if self._connection is None:
+            self._connection = await asyncio.to_thread(self._connect)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        if self.path != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+        for name, definition in _JOB_COLUMNS.items():
+            if name not in columns:
+                connection.execute(f"ALTER TABLE jobs ADD COLUMN {definition}")
+        return connection
+
+    async def close(self) -> None:
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        await asyncio.to_thread(connection.close)
+
+    async def _execute(self, sql: str, parameters: Sequence[Any] = ()) -> List[Tuple]:
+        """Run one statement on a worker thread and return its rows."""
+
+        def run() -> List[Tuple]:
+            with self._lock:
+                return self._connection.execute(sql, parameters).fetchall()
+
+        return await asyncio.to_thread(run)
+
+    async def enqueue(self, job_id: str, user_id: str, payload: Dict[str, Any]) -> None:
+        await self._execute(
+            "INSERT INTO jobs (job_id, user_id, payload, status, created) VALUES (?, ?, ?, 'queued', ?)",
+            (job_id, user_id, _dumps(payload), time.time()),
+        )
+
+    async def claim(self, worker_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Take the oldest queued job and lease it to ``worker_id``.
+
+        Returns:
+            ``(job_id, payload)``, or None if no job is waiting
+        """
+        now = time.time()
+        rows = await self._execute(
+            """
+            UPDATE jobs
+            SET status = 'running', worker = ?, claimed = ?, heartbeat = ?, attempts = attempts + 1
+            WHERE job_id = (
+                SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1
+            )
+            RETURNING job_id, payload
+            """,
+            (worker_id, now, now),
+        )
+        if not rows:
+            return None
+        job_id, payload = rows[0]
+        return job_id, json.loads(payload)
+
+    async def heartbeat(self, worker_id: str, job_ids: Sequence[str]) -> None:
+        """Renew the lease of the jobs ``worker_id`` is running."""
+        if not job_ids:
+            return
+        placeholders = ", ".join("?" * len(job_ids))
+        await self._execute(
+            f"UPDATE jobs SET heartbeat = ? WHERE worker = ? AND status = 'running' AND job_id IN ({placeholders})",
+            (time.time(), worker_id, *job_ids),
+        )
+
+    async def reclaim_expired(self, lease_seconds: float, max_attempts: int) -> List[str]:
+        """Requeue running jobs whose lease was not renewed for ``lease_seconds``.
+
+        Jobs already claimed ``max_attempts`` times are removed instead, as
+        their worker most likely died running them.
+
+        Returns:
+            Ids of the jobs that were removed
+        """
+        cutoff = time.time() - lease_seconds
+        abandoned = await self._execute(
+            "DELETE FROM jobs WHERE status = 'running' AND COALESCE(heartbeat, claimed) < ? AND attempts >= ? RETURNING job_id",
+            (cutoff, max_attempts),
+        )
+        requeued = await self._execute(
+            """
+            UPDATE jobs SET status = 'queued', worker = NULL, claimed = NULL, heartbeat = NULL
+            WHERE status = 'running' AND COALESCE(heartbeat, claimed) < ?
+            RETURNING job_id
+            """,
+            (cutoff,),
+        )
+        if requeued:
+            self.logger.warning(
+                "Requeued %d jobs whose worker stopped renewing its lease", len(requeued)
+            )
+        return [job_id for (job_id,) in abandoned]
+
+    async def finish(self, job_id: str) -> None:
+        """Remove a job its worker has reported the result of."""
+        await self._execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    async def cancel(self, job_id: str) -> None:
+        """Remove a job nobody waits for any more, whether or not it was claimed."""
+        await self._execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    async def pending_jobs(self) -> int:
+        rows = await self._execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'")
+        return rows[0][0]
+
+    async def publish(self, channel: str, body: Dict[str, Any]) -> None:
+        await self._execute(
+            "INSERT INTO messages (channel, body, created) VALUES (?, ?, ?)",
+            (channel, _dumps(body), time.time()),
+        )
+
+    async def read(
+        self, channel: str, after: int, limit: int = 500
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """Messages of ``channel`` with a sequence number above ``after``, in order."""
+        rows = await self._execute(
+            "SELECT seq, body FROM messages WHERE channel = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (channel, after, limit),
+        )
+        return [(seq, json.loads(body)) for seq, body in rows]
+
+    async def last_seq(self, channel: str) -> int:
+        """Sequence number a new reader starts after, skipping older messages."""
+        rows = await self._execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM messages WHERE channel = ?", (channel,)
+        )
+        return rows[0][0]
+
+    async def prune(self, retention_seconds: float) -> None:
+        """Delete messages older than ``retention_seconds``."""
+        await self._execute(
+            "DELETE FROM messages WHERE created < ?", (time.time() - retention_seconds,)
+        )
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Literal, Optional
 
+from pydantic import model_validator
 from semantic_kernel.kernel_pydantic import Field, KernelBaseModel
 
 
@@ -17,6 +18,7 @@ class DataType(str, Enum):
     user_current_team = "user_current_team"
     m_plan = "m_plan"
     m_plan_message = "m_plan_message"
+    plan_location = "plan_location"
 
 
 class AgentType(str, Enum):
@@ -107,7 +109,12 @@ class Session(BaseDataModel):
 
 
 class UserCurrentTeam(BaseDataModel):
-    """Represents the current team of a user."""
+    """Represents the current team of a user.
+
+    New documents are keyed on the user (``id`` from :meth:`document_id`,
+    partition ``user_id``) so they can be fetched with a point read. Documents
+    written before that keep their random id and partition.
+    """
 
     data_type: Literal[DataType.user_current_team] = Field(
         DataType.user_current_team, Literal=True
@@ -115,6 +122,20 @@ class UserCurrentTeam(BaseDataModel):
     user_id: str
     team_id: str
 
+    @staticmethod
+    def document_id(user_id: str) -> str:
+        """Document id of a user's current team record."""
+        return f"{DataType.user_current_team.value}-{user_id}"
+
+    @model_validator(mode="before")
+    @classmethod
+    def _default_user_keys(cls, data: Any) -> Any:
+        if isinstance(data, dict) and data.get("user_id"):
+            data = dict(data)
+            data.setdefault("id", cls.document_id(data["user_id"]))
+            data.setdefault("session_id", data["user_id"])
+        return data
+
 
 class Plan(BaseDataModel):
     """Represents a plan containing multiple steps."""
@@ -134,6 +155,54 @@ class Plan(BaseDataModel):
     human_clarification_response: Optional[str] = None
 
 
+class PlanLocation(BaseDataModel):
+    """Where a plan is stored: the ``session_id`` its document is partitioned on.
+
+    Plans live in their session's partition, which their id does not tell.
+    This record is keyed on the plan (``id`` from :meth:`document_id``,
+    partition ``plan_id``), so any process can point-read it and then the
+    plan, given only the plan id.
+    """
+
+    data_type: Literal[DataType.plan_location] = Field(
+        DataType.plan_location, Literal=True
+    )
+    plan_id: str
+    user_id: str
+    plan_session_id: str
+
+    @staticmethod
+    def document_id(plan_id: str) -> str:
+        """Document id of a plan's location record."""
+        return f"{DataType.plan_location.value}-{plan_id}"
+
+    @model_validator(mode="before")
+    @classmethod
+    def _default_plan_keys(cls, data: Any) -> Any:
+        if isinstance(data, dict) and data.get("plan_id"):
+            data = dict(data)
+            data.setdefault("id", cls.document_id(data["plan_id"]))
+            data.setdefault("session_id", data["plan_id"])
+        return data
+
+
+class PlanSummary(KernelBaseModel):
+    """The fields of a Plan needed to list it, loaded with a projection query.
+
+    The full document (m_plan, streaming and clarification fields) is only
+    read when a single plan is opened.
+    """
+
+    id: str
+    plan_id: str
+    session_id: str
+    user_id: str
+    team_id: Optional[str] = None
+    initial_goal: str
+    overall_status: PlanStatus = PlanStatus.in_progress
+    timestamp: Optional[datetime] = None
+
+
 class Step(BaseDataModel):
     """Represents an individual step (task) within a plan."""
 
@@ -189,7 +258,7 @@ class TeamConfiguration(BaseDataModel):
 
     team_id: str
     data_type: Literal[DataType.team_config] = Field(DataType.team_config, Literal=True)
-    session_id: str  # Partition key
+    session_id: str  # Partition key; new teams use their team_id
     name: str
     status: str
     created: str
@@ -251,12 +320,65 @@ class InputTask(KernelBaseModel):
     session_id: str
     description: str  # Initial goal
     # team_id: str
+    # Resubmitting with the same key returns the original job instead of
+    # starting another orchestration
+    idempotency_key: Optional[str] = None
 
 
 class UserLanguage(KernelBaseModel):
     language: str
 
 
+class JobStatus(str, Enum):
+    """Enumeration of possible statuses for an orchestration job."""
+
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+class OrchestrationJob(KernelBaseModel):
+    """An orchestration run queued for (or running on) the job pool."""
+
+    job_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    plan_id: Optional[str] = None
+    session_id: Optional[str] = None
+    idempotency_key: Optional[str] = None
+    status: JobStatus = JobStatus.queued
+    created: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started: Optional[datetime] = None
+    finished: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.completed, JobStatus.failed, JobStatus.cancelled)
+
+
+class BatchOperationType(str, Enum):
+    """Endpoints whose requests can be sent through /api/v3/batch."""
+
+    plan_approval = "plan_approval"
+    user_clarification = "user_clarification"
+    agent_message = "agent_message"
+
+
+class BatchOperation(KernelBaseModel):
+    """One operation of a batch: the body its endpoint would receive."""
+
+    type: BatchOperationType
+    payload: Dict[str, Any]
+
+
+class BatchRequest(KernelBaseModel):
+    """Operations applied in order by /api/v3/batch."""
+
+    operations: List[BatchOperation]
+
+
 class AgentMessageType(str, Enum):
     HUMAN_AGENT = "Human_Agent",
     AI_AGENT = "AI_Agent",
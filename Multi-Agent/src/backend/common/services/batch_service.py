@@ -0,0 +1,297 @@
+"""Applies the operations of a ``/api/v3/batch`` request."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import models.messages as messages
+from common.database.database_base import DatabaseBase
+from common.models.messages_kernel import (
+    AgentMessageData,
+    BatchOperation,
+    BatchOperationType,
+    Plan,
+    PlanStatus,
+)
+from common.services.plan_service import (
+    PlanService,
+    build_agent_message_from_agent_message_response,
+    build_agent_message_from_user_clarification,
+)
+from common.utils.event_utils import track_event_if_configured
+from common.utils.utils_kernel import RAI_FAILED_DETAIL, rai_success
+from config.settings import orchestration_config
+from pydantic import TypeAdapter, ValidationError
+
+# Body each operation type carries, as its own endpoint receives it
+PAYLOAD_ADAPTERS = {
+    BatchOperationType.plan_approval: TypeAdapter(messages.PlanApprovalResponse),
+    BatchOperationType.user_clarification: TypeAdapter(messages.UserClarificationResponse),
+    BatchOperationType.agent_message: TypeAdapter(messages.AgentMessageResponse),
+}
+
+
+@dataclass
+class BatchItemResult:
+    """Status and body (or error detail) of one batch operation."""
+
+    index: int
+    type: BatchOperationType
+    status_code: int
+    body: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        key = "body" if self.status_code < 400 else "detail"
+        return {
+            "index": self.index,
+            "type": self.type.value,
+            "status_code": self.status_code,
+            key: self.body,
+        }
+
+
+class BatchService:
+    """Applies a user's plan approvals, clarifications and agent messages in one go.
+
+    Every payload is validated and every clarification answer RAI-checked
+    (concurrently) before anything is applied; an operation that fails either
+    gets an error result and the others still run. Operations are then
+    applied in order with the same effects as their endpoints, except that
+    the agent messages they produce are written together through
+    ``add_agent_messages`` (one transactional batch per plan partition on
+    Cosmos) and each finished plan is read and updated once. Messages and
+    plan updates are written at the end, or before a plan approval when they
+    belong to the plan it approves or rejects (and may delete), so the
+    result is the same as calling the endpoints one after the other.
+    """
+
+    def __init__(self, memory_store: DatabaseBase, user_id: str):
+        self.memory_store = memory_store
+        self.user_id = user_id
+        self.logger = logging.getLogger(__name__)
+
+    async def apply(self, operations: List[BatchOperation]) -> List[BatchItemResult]:
+        """Apply ``operations`` in order.
+
+        Args:
+            operations: The operations of the batch
+
+        Returns:
+            One result per operation, in the same order
+        """
+        results: List[Optional[BatchItemResult]] = [None] * len(operations)
+        payloads: Dict[int, Any] = {}
+        for index, operation in enumerate(operations):
+            try:
+                payloads[index] = PAYLOAD_ADAPTERS[operation.type].validate_python(
+                    operation.payload
+                )
+            except ValidationError as e:
+                results[index] = BatchItemResult(
+                    index, operation.type, 422, e.errors(include_url=False)
+                )
+
+        await self._check_rai(operations, payloads, results)
+
+        # (operation index, message) to write, and plan_id -> streaming message
+        # of the plans an agent message finished
+        new_messages: List[Tuple[int, AgentMessageData]] = []
+        finished_plans: Dict[str, Tuple[int, Optional[str]]] = {}
+        for index in sorted(payloads):
+            operation, payload = operations[index], payloads[index]
+            if operation.type == BatchOperationType.plan_approval:
+                await self._persist_plan(
+                    payload.plan_id, operations, new_messages, finished_plans, results
+                )
+                results[index] = await self._plan_approval(index, payload)
+            elif operation.type == BatchOperationType.user_clarification:
+                results[index] = self._user_clarification(index, payload, new_messages)
+            else:
+                results[index] = self._agent_message(index, payload, new_messages, finished_plans)
+
+        await self._persist(operations, new_messages, finished_plans, results)
+        return results
+
+    async def _check_rai(
+        self,
+        operations: List[BatchOperation],
+        payloads: Dict[int, Any],
+        results: List[Optional[BatchItemResult]],
+    ) -> None:
+        clarifications = [
+            index
+            for index in payloads
+            if operations[index].type == BatchOperationType.user_clarification
+        ]
+        verdicts = await asyncio.gather(
+            *(rai_success(payloads[index].answer) for index in clarifications)
+        )
+        for index, passed in zip(clarifications, verdicts):
+            if passed:
+                continue
+            track_event_if_configured(
+                "RAI failed",
+                {
+                    "status": "Plan Clarification ",
+                    "description": payloads[index].answer,
+                    "request_id": payloads[index].request_id,
+                },
+            )
+            results[index] = BatchItemResult(index, operations[index].type, 400, RAI_FAILED_DETAIL)
+            del payloads[index]
+
+    async def _plan_approval(
+        self, index: int, human_feedback: messages.PlanApprovalResponse
+    ) -> BatchItemResult:
+        kind = BatchOperationType.plan_approval
+        if not (
+            orchestration_config
+            and human_feedback.m_plan_id
+            and human_feedback.m_plan_id in orchestration_config.approvals
+        ):
+            self.logger.warning(
+                "No orchestration or plan found for plan_id: %s", human_feedback.m_plan_id
+            )
+            return BatchItemResult(index, kind, 404, "No active plan found for approval")
+
+        orchestration_config.set_approval_result(
+            human_feedback.m_plan_id, human_feedback.approved
+        )
+        try:
+            await PlanService.handle_plan_approval(human_feedback, self.user_id)
+        except Exception as e:
+            self.logger.error("Error processing plan approval: %s", e)
+        track_event_if_configured(
+            "PlanApprovalReceived",
+            {
+                "plan_id": human_feedback.plan_id,
+                "m_plan_id": human_feedback.m_plan_id,
+                "approved": human_feedback.approved,
+                "user_id": self.user_id,
+                "feedback": human_feedback.feedback,
+            },
+        )
+        return BatchItemResult(index, kind, 200, {"status": "approval recorded"})
+
+    def _user_clarification(
+        self,
+        index: int,
+        human_feedback: messages.UserClarificationResponse,
+        new_messages: List[Tuple[int, AgentMessageData]],
+    ) -> BatchItemResult:
+        kind = BatchOperationType.user_clarification
+        if not (
+            orchestration_config
+            and human_feedback.request_id
+            and human_feedback.request_id in orchestration_config.clarifications
+        ):
+            self.logger.warning(
+                "No orchestration or plan found for request_id: %s", human_feedback.request_id
+            )
+            return BatchItemResult(index, kind, 404, "No active plan found for clarification")
+
+        orchestration_config.set_clarification_result(
+            human_feedback.request_id, human_feedback.answer
+        )
+        new_messages.append(
+            (index, build_agent_message_from_user_clarification(human_feedback, self.user_id))
+        )
+        track_event_if_configured(
+            "HumanClarificationReceived",
+            {
+                "request_id": human_feedback.request_id,
+                "answer": human_feedback.answer,
+                "user_id": self.user_id,
+            },
+        )
+        return BatchItemResult(index, kind, 200, {"status": "clarification recorded"})
+
+    def _agent_message(
+        self,
+        index: int,
+        agent_message: messages.AgentMessageResponse,
+        new_messages: List[Tuple[int, AgentMessageData]],
+        finished_plans: Dict[str, Tuple[int, Optional[str]]],
+    ) -> BatchItemResult:
+        message = build_agent_message_from_agent_message_response(agent_message, self.user_id)
+        new_messages.append((index, message))
+        if agent_message.is_final:
+            finished_plans[message.plan_id] = (index, agent_message.streaming_message)
+        track_event_if_configured(
+            "AgentMessageReceived",
+            {
+                "agent": agent_message.agent,
+                "content": agent_message.content,
+                "user_id": self.user_id,
+            },
+        )
+        return BatchItemResult(index, BatchOperationType.agent_message, 200, {"status": "message recorded"})
+
+    async def _persist_plan(
+        self,
+        plan_id: Optional[str],
+        operations: List[BatchOperation],
+        new_messages: List[Tuple[int, AgentMessageData]],
+        finished_plans: Dict[str, Tuple[int, Optional[str]]],
+        results: List[Optional[BatchItemResult]],
+    ) -> None:
+        """Write what the batch has buffered so far for ``plan_id``, and drop it from the buffers."""
+        if not plan_id:
+            return
+        plan_messages = [(index, message) for index, message in new_messages if message.plan_id == plan_id]
+        if not plan_messages:
+            return
+        new_messages[:] = [(index, message) for index, message in new_messages if message.plan_id != plan_id]
+        finished = {plan_id: finished_plans.pop(plan_id)} if plan_id in finished_plans else {}
+        await self._persist(operations, plan_messages, finished, results)
+
+    async def _persist(
+        self,
+        operations: List[BatchOperation],
+        new_messages: List[Tuple[int, AgentMessageData]],
+        finished_plans: Dict[str, Tuple[int, Optional[str]]],
+        results: List[Optional[BatchItemResult]],
+    ) -> None:
+        """Write the batch's agent messages together, then update finished plans."""
+        if not new_messages:
+            return
+        # Reading each plan once lets its messages go to its partition together
+        plan_ids = list(dict.fromkeys(message.plan_id for _, message in new_messages))
+        loaded = await asyncio.gather(
+            *(self._get_plan(plan_id) for plan_id in plan_ids)
+        )
+        plans = dict(zip(plan_ids, loaded))
+
+        try:
+            await self.memory_store.add_agent_messages([message for _, message in new_messages])
+        except Exception as e:
+            self.logger.exception("Failed to record %d agent messages: %s", len(new_messages), e)
+            for index, _ in new_messages:
+                results[index] = BatchItemResult(
+                    index, operations[index].type, 500, "Failed to record message"
+                )
+            return
+
+        for plan_id, (index, streaming_message) in finished_plans.items():
+            plan = plans.get(plan_id)
+            try:
+                if plan is None:
+                    raise ValueError(f"Plan {plan_id} not found")
+                plan.streaming_message = streaming_message
+                plan.overall_status = PlanStatus.completed
+                await self.memory_store.update_plan(plan)
+            except Exception as e:
+                self.logger.exception("Failed to complete plan %s: %s", plan_id, e)
+                results[index] = BatchItemResult(
+                    index, operations[index].type, 500, "Failed to complete plan"
+                )
+
+    async def _get_plan(self, plan_id: str) -> Optional[Plan]:
+        if not plan_id:
+            return None
+        try:
+            return await self.memory_store.get_plan(plan_id)
+        except Exception as e:
+            self.logger.warning("Failed to read plan %s: %s", plan_id, e)
+            return None
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import re
 from typing import Any, Dict, List
@@ -6,6 +7,7 @@ from typing import Any, Dict, List
 import aiohttp
 from azure.ai.projects.aio import AIProjectClient
 from common.config.app_config import config
+from common.utils.credential_broker import credential_broker
 
 
 class FoundryService:
@@ -54,8 +56,7 @@ class FoundryService:
 
         try:
             # Get Azure Management API token (not Cognitive Services token)
-            credential = config.get_azure_credentials()
-            token = credential.get_token(config.AZURE_MANAGEMENT_SCOPE)
+            token = await credential_broker.get_token_async(config.AZURE_MANAGEMENT_SCOPE)
 
             # Extract Azure OpenAI resource name from endpoint URL
             openai_endpoint = config.AZURE_OPENAI_ENDPOINT
@@ -180,7 +180,15 @@ class PlanService:
                             "user_id": user_id,
                         },
                     )
-                    await memory_store.delete_plan_by_plan_id(human_feedback.plan_id)
+                    result = await memory_store.delete_plan_cascade(
+                        human_feedback.plan_id
+                    )
+                    logger.info(
+                        "Rejected plan %s: deleted %d documents (%d failed)",
+                        human_feedback.plan_id,
+                        result.total,
+                        result.failed,
+                    )
 
         except Exception as e:
             print(f"Error processing plan approval: {e}")
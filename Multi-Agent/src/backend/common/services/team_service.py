@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 from datetime import datetime, timezone
@@ -62,7 +63,8 @@ class TeamService:
 
             # Generate unique IDs and timestamps
             unique_team_id = str(uuid.uuid4())
-            session_id = str(uuid.uuid4())
+            # Partition on the team id so the team can be point-read by id
+            session_id = unique_team_id
             current_timestamp = datetime.now(timezone.utc).isoformat()
 
             # Validate agents array exists and is not empty
@@ -490,15 +492,17 @@ class TeamService:
                 )
                 return True, []
 
-            validation_errors: List[str] = []
-            unique_indexes = set(index_names)
+            unique_indexes = sorted(set(index_names))
             self.logger.info(
-                f"Validating {len(unique_indexes)} search indexes: {list(unique_indexes)}"
+                f"Validating {len(unique_indexes)} search indexes: {unique_indexes}"
             )
-            for index_name in unique_indexes:
-                is_valid, error_message = await self.validate_single_index(index_name)
-                if not is_valid:
-                    validation_errors.append(error_message)
+            index_client = SearchIndexClient(
+                endpoint=self.search_endpoint, credential=self.search_credential
+            )
+            results = await asyncio.gather(
+                *(self.validate_single_index(name, index_client) for name in unique_indexes)
+            )
+            validation_errors = [error for is_valid, error in results if not is_valid]
             return len(validation_errors) == 0, validation_errors
         except Exception as e:
             self.logger.error(f"Error validating search indexes: {str(e)}")
@@ -527,13 +531,17 @@ class TeamService:
                     return True
         return False
 
-    async def validate_single_index(self, index_name: str) -> Tuple[bool, str]:
+    async def validate_single_index(
+        self, index_name: str, index_client: Optional[SearchIndexClient] = None
+    ) -> Tuple[bool, str]:
         """Validate that a single search index exists and is accessible."""
         try:
-            index_client = SearchIndexClient(
-                endpoint=self.search_endpoint, credential=self.search_credential
-            )
-            index = index_client.get_index(index_name)
+            if index_client is None:
+                index_client = SearchIndexClient(
+                    endpoint=self.search_endpoint, credential=self.search_credential
+                )
+            # The client is synchronous; keep the event loop free meanwhile
+            index = await asyncio.to_thread(index_client.get_index, index_name)
             if index:
                 self.logger.info(f"Search index '{index_name}' found and accessible")
                 return True, ""
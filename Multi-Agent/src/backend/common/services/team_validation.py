@@ -0,0 +1,161 @@
+"""Validation of an uploaded team configuration, with the remote checks run concurrently."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from common.models.messages_kernel import TeamConfiguration
+from common.services.team_service import TeamService
+from common.utils.utils_kernel import rai_validate_team_config
+
+# Outcome of one check: (passed, error message for the user, details for telemetry)
+CheckOutcome = Tuple[bool, str, Dict[str, Any]]
+
+
+@dataclass
+class CheckResult:
+    """Outcome and duration of one validation check."""
+
+    name: str
+    # "passed", "failed", or "skipped" when an earlier failure made it moot
+    status: str
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {"check": self.name, "status": self.status, "duration_ms": self.duration_ms}
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+@dataclass
+class TeamValidationResult:
+    """Parsed team configuration (if every check passed) and per-check timings."""
+
+    team_config: Optional[TeamConfiguration]
+    checks: List[CheckResult]
+    duration_ms: float
+
+    @property
+    def failure(self) -> Optional[CheckResult]:
+        return next((c for c in self.checks if c.status == "failed"), None)
+
+    def timings(self) -> List[Dict[str, Any]]:
+        return [check.to_dict() for check in self.checks]
+
+
+class TeamConfigValidator:
+    """Runs the checks ``/api/v3/upload_team_config`` needs before saving a team.
+
+    The configuration is parsed first, locally, so a malformed file never
+    costs a remote call. The remote checks (RAI, model deployments, search
+    indexes) are independent of each other and run concurrently; the first
+    one to fail cancels the others, which are reported as skipped. Upload
+    latency is therefore that of the slowest check rather than their sum.
+    """
+
+    def __init__(self, team_service: TeamService):
+        self.team_service = team_service
+        self.logger = logging.getLogger(__name__)
+
+    async def validate(
+        self, json_data: Dict[str, Any], user_id: str, check_rai: bool = True
+    ) -> TeamValidationResult:
+        """Validate an uploaded team configuration.
+
+        Args:
+            json_data: Parsed JSON of the uploaded file
+            user_id: Uploading user
+            check_rai: Whether to run the RAI content check
+
+        Returns:
+            The result; ``team_config`` is None if a check failed
+        """
+        started = time.perf_counter()
+        checks: List[CheckResult] = []
+
+        parse_started = time.perf_counter()
+        try:
+            team_config = await self.team_service.validate_and_parse_team_config(
+                json_data, user_id
+            )
+            checks.append(CheckResult("parse", "passed", _elapsed_ms(parse_started)))
+        except ValueError as e:
+            checks.append(CheckResult("parse", "failed", _elapsed_ms(parse_started), str(e)))
+            return TeamValidationResult(None, checks, _elapsed_ms(started))
+
+        remote: Dict[str, Callable[[], Awaitable[CheckOutcome]]] = {}
+        if check_rai:
+            remote["rai"] = lambda: self._check_rai(json_data)
+        remote["models"] = lambda: self._check_models(json_data)
+        remote["search_indexes"] = lambda: self._check_search_indexes(json_data)
+        checks.extend(await self._run_concurrently(remote))
+
+        failed = any(check.status == "failed" for check in checks)
+        result = TeamValidationResult(None if failed else team_config, checks, _elapsed_ms(started))
+        self.logger.info(
+            "Team configuration validation took %.1f ms: %s", result.duration_ms, result.timings()
+        )
+        return result
+
+    async def _run_concurrently(
+        self, checks: Dict[str, Callable[[], Awaitable[CheckOutcome]]]
+    ) -> List[CheckResult]:
+        started = time.perf_counter()
+        tasks = {asyncio.create_task(run()): name for name, run in checks.items()}
+        results: Dict[str, CheckResult] = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks[task]
+                    try:
+                        passed, error, details = task.result()
+                    except Exception as e:
+                        self.logger.error("Team configuration check %s raised: %s", name, e)
+                        passed, error, details = False, f"{name} validation error: {e}", {}
+                    results[name] = CheckResult(
+                        name,
+                        "passed" if passed else "failed",
+                        _elapsed_ms(started),
+                        None if passed else error,
+                        details,
+                    )
+                if any(r.status == "failed" for r in results.values()):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in pending:
+            results[tasks[task]] = CheckResult(tasks[task], "skipped", _elapsed_ms(started))
+        return [results[name] for name in checks]
+
+    async def _check_rai(self, json_data: Dict[str, Any]) -> CheckOutcome:
+        valid, error = await rai_validate_team_config(json_data)
+        return valid, error, {}
+
+    async def _check_models(self, json_data: Dict[str, Any]) -> CheckOutcome:
+        valid, missing_models = await self.team_service.validate_team_models(json_data)
+        error = (
+            f"The following required models are not deployed in your Azure AI project: {', '.join(missing_models)}. "
+            f"Please deploy these models in Azure AI Foundry before uploading this team configuration."
+        )
+        return valid, error, {"missing_models": missing_models}
+
+    async def _check_search_indexes(self, json_data: Dict[str, Any]) -> CheckOutcome:
+        valid, search_errors = await self.team_service.validate_team_search_indexes(json_data)
+        error = (
+            f"Search index validation failed:\n\n{chr(10).join([f'• {e}' for e in search_errors])}\n\n"
+            f"Please ensure all referenced search indexes exist in your Azure AI Search service."
+        )
+        return valid, error, {"search_errors": search_errors}
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
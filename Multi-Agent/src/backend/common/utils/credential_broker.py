@@ -0,0 +1,219 @@
+"""Process-wide Azure credential with cached tokens and shared project clients."""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from azure.core.credentials import AccessToken
+
+from common.config.app_config import config
+
+
+class CredentialBroker:
+    """One credential, one token per scope and one project client per process.
+
+    Agent templates, chat services and Foundry helpers used to create their
+    own credential (and project client, with its own connection pool) and
+    ask it for a token on every call. The broker holds the application's
+    credential (``config.get_azure_credentials()``) and hands out:
+
+    * :meth:`get_token` / :meth:`get_token_async` / :meth:`token_provider`:
+      tokens cached per scope until ``refresh_margin_seconds`` before they
+      expire, so a token is requested about once an hour per scope
+    * :attr:`credential` / :attr:`async_credential`: ``TokenCredential`` and
+      ``AsyncTokenCredential`` views of that cache for Azure SDK clients
+    * :meth:`project_client`: the async ``AIProjectClient`` agent templates
+      share, and :meth:`sync_project_client` for the synchronous callers
+
+    Once :meth:`start` is called, tokens are renewed in the background before
+    they reach the margin, so the synchronous ``ad_token_provider`` callbacks
+    chat services call on the event loop never wait on the identity provider.
+    """
+
+    def __init__(
+        self,
+        credential_factory: Optional[Callable[[], Any]] = None,
+        refresh_margin_seconds: float = 300,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.credential_factory = credential_factory or config.get_azure_credentials
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        # Tokens requested from the identity provider
+        self.acquired = 0
+        self._credential: Any = None
+        self._tokens: Dict[str, AccessToken] = {}
+        # Token requests run in threads: one at a time per scope
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._project_client: Any = None
+        self._sync_project_clients: Dict[str, Any] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.credential = BrokeredCredential(self)
+        self.async_credential = BrokeredAsyncCredential(self)
+
+    @classmethod
+    def from_config(cls) -> "CredentialBroker":
+        return cls(refresh_margin_seconds=config.CREDENTIAL_REFRESH_MARGIN_SECONDS)
+
+    def get_token(self, scope: str) -> AccessToken:
+        """Token for ``scope``, requested only when the cached one is about to expire.
+
+        Args:
+            scope: Scope (or space-separated scopes) of the token
+
+        Returns:
+            An ``AccessToken`` valid for at least ``refresh_margin_seconds``
+        """
+        token = self._tokens.get(scope)
+        if token is not None and not self._expiring(token, self.refresh_margin_seconds):
+            return token
+        with self._lock(scope):
+            token = self._tokens.get(scope)
+            if token is not None and not self._expiring(token, self.refresh_margin_seconds):
+                return token
+            return self._acquire(scope)
+
+    async def get_token_async(self, scope: str) -> AccessToken:
+        """:meth:`get_token` that requests a new token off the event loop."""
+        token = self._tokens.get(scope)
+        if token is not None and not self._expiring(token, self.refresh_margin_seconds):
+            return token
+        return await asyncio.to_thread(self.get_token, scope)
+
+    def token_provider(self, scope: str) -> Callable[[], str]:
+        """``ad_token_provider`` for Semantic Kernel and OpenAI clients."""
+        return lambda: self.get_token(scope).token
+
+    def project_client(self) -> Any:
+        """The async ``AIProjectClient`` of the agents endpoint, shared by every template."""
+        if self._project_client is None:
+            from semantic_kernel.agents import AzureAIAgent  # pylint: disable=E0611
+
+            self._project_client = AzureAIAgent.create_client(credential=self.async_credential)
+        return self._project_client
+
+    def sync_project_client(self, endpoint: str) -> Any:
+        """A synchronous ``AIProjectClient`` of ``endpoint``, shared by its callers."""
+        client = self._sync_project_clients.get(endpoint)
+        if client is None:
+            from azure.ai.projects import AIProjectClient
+
+            client = AIProjectClient(endpoint=endpoint, credential=self.credential)
+            self._sync_project_clients[endpoint] = client
+        return client
+
+    def start(self) -> None:
+        """Renew cached tokens before they reach the margin until :meth:`close`."""
+        if self.refresh_margin_seconds <= 0 or self._refresh_task is not None:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        clients, self._sync_project_clients = self._sync_project_clients, {}
+        for client in clients.values():
+            client.close()
+        if self._project_client is not None:
+            client, self._project_client = self._project_client, None
+            await client.close()
+
+    async def refresh_expiring(self) -> None:
+        """Renew the tokens that expire within twice the margin."""
+        for scope, token in list(self._tokens.items()):
+            if self._expiring(token, 2 * self.refresh_margin_seconds):
+                try:
+                    await asyncio.to_thread(self._renew, scope)
+                except Exception as e:
+                    self.logger.warning("Could not renew token for %s: %s", scope, e)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_margin_seconds / 2)
+            await self.refresh_expiring()
+
+    def _renew(self, scope: str) -> None:
+        with self._lock(scope):
+            if self._expiring(self._tokens[scope], 2 * self.refresh_margin_seconds):
+                self._acquire(scope)
+
+    def _acquire(self, scope: str) -> AccessToken:
+        if self._credential is None:
+            self._credential = self.credential_factory()
+        token = self._credential.get_token(*scope.split())
+        self._tokens[scope] = token
+        self.acquired += 1
+        return token
+
+    def _expiring(self, token: AccessToken, within_seconds: float) -> bool:
+        return token.expires_on - self.clock() < within_seconds
+
+    def _lock(self, scope: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(scope, threading.Lock())
+
+    def _passthrough(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        if self._credential is None:
+            self._credential = self.credential_factory()
+        return self._credential.get_token(*scopes, **kwargs)
+
+
+class BrokeredCredential:
+    """``TokenCredential`` answering from the broker's token cache."""
+
+    def __init__(self, broker: CredentialBroker):
+        self._broker = broker
+
+    def get_token(
+        self, *scopes: str, claims: Optional[str] = None, tenant_id: Optional[str] = None, **kwargs: Any
+    ) -> AccessToken:
+        if claims or tenant_id:
+            # Claims challenges and other tenants are not cached
+            return self._broker._passthrough(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+        return self._broker.get_token(" ".join(scopes))
+
+    def close(self) -> None:
+        """The broker's credential outlives its users."""
+
+    def __enter__(self) -> "BrokeredCredential":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+class BrokeredAsyncCredential:
+    """``AsyncTokenCredential`` answering from the broker's token cache."""
+
+    def __init__(self, broker: CredentialBroker):
+        self._broker = broker
+
+    async def get_token(
+        self, *scopes: str, claims: Optional[str] = None, tenant_id: Optional[str] = None, **kwargs: Any
+    ) -> AccessToken:
+        if claims or tenant_id:
+            return await asyncio.to_thread(
+                self._broker._passthrough, *scopes, claims=claims, tenant_id=tenant_id, **kwargs
+            )
+        return await self._broker.get_token_async(" ".join(scopes))
+
+    async def close(self) -> None:
+        """The broker's credential outlives its users."""
+
+    async def __aenter__(self) -> "BrokeredAsyncCredential":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+credential_broker = CredentialBroker.from_config()
@@ -0,0 +1,172 @@
+"""Server-Sent Events stream of the status updates sent to each user.
+
+Every ``{"type", "data"}`` message that ``ConnectionConfig.send_to_user``
+delivers over the ``/socket`` WebSocket is also published here. It is encoded
+once as an SSE frame, kept in the user's replay buffer and handed to each of
+the user's open ``/api/v3/events`` streams. A client that reconnects with
+``Last-Event-ID`` gets the frames it missed from the buffer first.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+from common.config.app_config import config
+
+HEARTBEAT_FRAME = b": heartbeat\n\n"
+# How long a disconnected EventSource waits before reconnecting
+RETRY_FRAME = b"retry: 3000\n\n"
+# Frames queued for a subscriber that is not reading before it is dropped
+# (the client reconnects and catches up from the replay buffer)
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+def _message_type(standard_message: Dict[str, Any]) -> str:
+    message_type = standard_message.get("type")
+    return str(getattr(message_type, "value", message_type) or "message")
+
+
+class _UserChannel:
+    """Replay buffer and open subscriber queues of one user."""
+
+    __slots__ = ("events", "next_id", "subscribers")
+
+    def __init__(self, buffer_size: int):
+        self.events: Deque[Tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self.next_id = 1
+        self.subscribers: Set[asyncio.Queue] = set()
+
+
+class EventStream:
+    """Per-user fan-out of status updates to SSE subscribers with replay.
+
+    Event ids are ``<stream id>-<sequence>``; the stream id changes when the
+    process restarts, so a ``Last-Event-ID`` from an earlier process replays
+    the whole buffer instead of skipping events. Users without an open stream
+    keep their buffer until ``max_channels`` is exceeded, oldest first.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 100,
+        heartbeat_seconds: float = 15,
+        max_channels: int = 10000,
+    ):
+        self.buffer_size = max(1, buffer_size)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_channels = max(1, max_channels)
+        self.stream_id = uuid.uuid4().hex[:8]
+        self.logger = logging.getLogger(__name__)
+        self._channels: "OrderedDict[str, _UserChannel]" = OrderedDict()
+
+    @classmethod
+    def from_config(cls) -> "EventStream":
+        return cls(
+            config.SSE_REPLAY_BUFFER_SIZE,
+            config.SSE_HEARTBEAT_SECONDS,
+            config.SSE_MAX_CHANNELS,
+        )
+
+    def has_subscribers(self, user_id: str) -> bool:
+        channel = self._channels.get(user_id)
+        return bool(channel and channel.subscribers)
+
+    def publish(self, user_id: str, standard_message: Dict[str, Any]) -> None:
+        """Buffer a message for ``user_id`` and queue it on their open streams.
+
+        Args:
+            user_id: The user the message is for
+            standard_message: The ``{"type", "data"}`` message sent over the socket
+        """
+        channel = self._channel(user_id)
+        event_id = channel.next_id
+        channel.next_id += 1
+        frame = (
+            f"id: {self.stream_id}-{event_id}\n"
+            f"event: {_message_type(standard_message)}\n"
+            f"data: {json.dumps(standard_message, default=str)}\n\n"
+        ).encode()
+        channel.events.append((event_id, frame))
+        for queue in list(channel.subscribers):
+            try:
+                queue.put_nowait((event_id, frame))
+            except asyncio.QueueFull:
+                self.logger.warning(
+                    "Dropping SSE subscriber of user %s that stopped reading", user_id
+                )
+                channel.subscribers.discard(queue)
+                # Replace what it has not read with the end-of-stream marker
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+        self._evict()
+
+    async def subscribe(
+        self, user_id: str, last_event_id: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield SSE frames for ``user_id``: missed frames, then new ones.
+
+        A heartbeat comment is sent whenever nothing was sent for
+        ``heartbeat_seconds``, so proxies keep the connection open.
+
+        Args:
+            user_id: The signed-in user
+            last_event_id: The ``Last-Event-ID`` header of a reconnecting client
+        """
+        channel = self._channel(user_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        # Register before reading the buffer so nothing published in between is lost
+        channel.subscribers.add(queue)
+        try:
+            yield RETRY_FRAME
+            sent = self._resume_after(last_event_id)
+            for event_id, frame in list(channel.events):
+                if event_id > sent:
+                    sent = event_id
+                    yield frame
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT_FRAME
+                    continue
+                if item is None:
+                    return
+                event_id, frame = item
+                if event_id > sent:
+                    sent = event_id
+                    yield frame
+        finally:
+            channel.subscribers.discard(queue)
+
+    def _resume_after(self, last_event_id: Optional[str]) -> int:
+        """Sequence number after which to replay, 0 for the whole buffer."""
+        if not last_event_id:
+            return 0
+        stream_id, _, sequence = last_event_id.strip().rpartition("-")
+        if stream_id != self.stream_id or not sequence.isdigit():
+            return 0
+        return int(sequence)
+
+    def _channel(self, user_id: str) -> _UserChannel:
+        channel = self._channels.get(user_id)
+        if channel is None:
+            channel = self._channels[user_id] = _UserChannel(self.buffer_size)
+        else:
+            self._channels.move_to_end(user_id)
+        return channel
+
+    def _evict(self) -> None:
+        if len(self._channels) <= self.max_channels:
+            return
+        for user_id in list(self._channels):
+            if len(self._channels) <= self.max_channels:
+                break
+            if not self._channels[user_id].subscribers:
+                del self._channels[user_id]
+
+
+event_stream = EventStream.from_config()
@@ -0,0 +1,314 @@
+"""Admission control for the LLM-backed routes: per-user token buckets and a global bound."""
+
+import asyncio
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from common.config.app_config import config
+
+# Requests a user may send to each route: "<burst>/<seconds to refill it>"
+DEFAULT_RATE_LIMITS = {
+    "hr_chat": "20/60",
+    "process_request": "5/60",
+    "user_clarification": "30/60",
+    "upload_team_config": "5/60",
+}
+
+# Empty buckets whose refill time is remembered to refuse without the store
+MAX_REMEMBERED_EMPTY_BUCKETS = 10000
+
+# Bounds of the Retry-After hint sent with a 429
+MIN_RETRY_AFTER_SECONDS = 1
+MAX_RETRY_AFTER_SECONDS = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+class RateLimitExceededError(Exception):
+    """A request was refused by the rate limiter or the concurrency bound."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(seconds: float) -> int:
+    return max(MIN_RETRY_AFTER_SECONDS, min(MAX_RETRY_AFTER_SECONDS, math.ceil(seconds)))
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A bucket of ``capacity`` tokens refilled evenly over ``period_seconds``."""
+
+    capacity: float
+    period_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """Parse ``"<capacity>/<period_seconds>"``, e.g. ``"20/60"``."""
+        capacity, _, period = str(spec).partition("/")
+        return cls(float(capacity), float(period or 60))
+
+
+def refill(tokens: float, updated: float, limit: RateLimit, now: float) -> float:
+    """Tokens in a bucket last seen at ``updated`` with ``tokens`` left."""
+    return min(limit.capacity, tokens + max(0.0, now - updated) * limit.refill_per_second)
+
+
+class TokenBucketStore(ABC):
+    """Where bucket levels are kept."""
+
+    @abstractmethod
+    async def take(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        """Take ``cost`` tokens from the bucket ``key`` if it has them.
+
+        Args:
+            key: Bucket key (route and user)
+            limit: Capacity and refill rate of the bucket
+            cost: Tokens the request needs
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until they will be there
+        """
+
+    async def close(self) -> None:
+        """Release the store's resources."""
+
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """Buckets of this process only; the least recently used are dropped past ``max_keys``.
+
+    A dropped bucket starts full again, which only ever admits more.
+    """
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max(1, max_keys)
+        self.clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        now = self.clock()
+        tokens, updated = self._buckets.pop(key, (limit.capacity, now))
+        tokens = refill(tokens, updated, limit, now)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / limit.refill_per_second
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class SqliteTokenBucketStore(TokenBucketStore):
+    """Buckets in a SQLite file shared by every API process on the host.
+
+    Each take reads and updates the bucket in one ``BEGIN IMMEDIATE``
+    transaction, so two processes never spend the same token. Levels are
+    timed with the wall clock, which all processes share.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._connection: Optional[sqlite3.Connection] = None
+        # sqlite3 connections must not be used from two threads at once
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        if self.path != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def _take(self, key: str, limit: RateLimit, cost: float) -> float:
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                now = self.clock()
+                row = connection.execute(
+                    "SELECT tokens, updated FROM token_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens = refill(*row, limit, now) if row else limit.capacity
+                wait = 0.0
+                if tokens >= cost:
+                    tokens -= cost
+                else:
+                    wait = (cost - tokens) / limit.refill_per_second
+                connection.execute(
+                    "INSERT INTO token_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                    (key, tokens, now),
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            return wait
+
+    async def take(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        return await asyncio.to_thread(self._take, key, limit, cost)
+
+    async def close(self) -> None:
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        await asyncio.to_thread(connection.close)
+
+
+def max_concurrent_for_budget(
+    tokens_per_minute: int, tokens_per_request: int, request_seconds: float
+) -> int:
+    """Concurrent requests that keep a model deployment within its TPM quota.
+
+    One slot completes ``60 / request_seconds`` requests a minute, each using
+    ``tokens_per_request`` tokens; 0 means no bound.
+    """
+    if tokens_per_minute <= 0:
+        return 0
+    per_slot = tokens_per_request * 60 / max(request_seconds, 0.001)
+    return max(1, int(tokens_per_minute // per_slot))
+
+
+class AdmissionController:
+    """Admits requests to the LLM-backed routes, or refuses them cheaply.
+
+    A request needs a free slot of the global bound (``max_concurrent``
+    requests at once, 0 for none) and ``cost`` tokens of its user's bucket
+    for the route. Refusals raise :class:`RateLimitExceededError` without
+    waiting; once a bucket is found empty, requests are refused from memory
+    until it can have refilled. Routes without a limit are only bounded by
+    the slots. A request costing more than the bucket holds can never be
+    admitted and is rejected outright, and a refused request only marks its
+    bucket empty until it has one token again, so that a large request does
+    not hold back small ones.
+    """
+
+    def __init__(
+        self,
+        store: TokenBucketStore,
+        limits: Dict[str, RateLimit],
+        max_concurrent: int = 0,
+        request_seconds: float = 20,
+    ):
+        self.store = store
+        self.limits = limits
+        self.max_concurrent = max_concurrent
+        self.request_seconds = request_seconds
+        self.logger = logging.getLogger(__name__)
+        self._slots = asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+        # Bucket key -> monotonic time before which it cannot have the tokens
+        # again (other processes only ever take more); refusals until then
+        # do not read the store
+        self._empty_until: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls) -> "AdmissionController":
+        limits = dict(DEFAULT_RATE_LIMITS)
+        if config.RATE_LIMITS:
+            limits.update(json.loads(config.RATE_LIMITS))
+        if config.RATE_LIMIT_STORE == "sqlite":
+            store: TokenBucketStore = SqliteTokenBucketStore(config.RATE_LIMIT_SQLITE_PATH)
+        else:
+            store = MemoryTokenBucketStore()
+        return cls(
+            store,
+            {route: RateLimit.parse(spec) for route, spec in limits.items() if spec},
+            max_concurrent=max_concurrent_for_budget(
+                config.LLM_TPM_BUDGET,
+                config.LLM_TOKENS_PER_REQUEST,
+                config.LLM_REQUEST_SECONDS,
+            ),
+            request_seconds=config.LLM_REQUEST_SECONDS,
+        )
+
+    async def acquire(self, user_id: str, route: str, cost: float = 1) -> None:
+        """Admit a request, taking a slot; :meth:`release` it when the request is done.
+
+        Args:
+            user_id: The signed-in user
+            route: The route's rate limit name
+            cost: Tokens the request takes from the user's bucket
+
+        Raises:
+            ValueError: ``cost`` is more than the user's bucket can ever hold
+            RateLimitExceededError: No slot is free or the user's bucket is empty
+        """
+        limit = self.limits.get(route)
+        if limit is not None and cost > limit.capacity:
+            raise ValueError(
+                f"{cost:g} requests exceed the {route} rate limit of "
+                f"{limit.capacity:g} requests per {limit.period_seconds:g}s"
+            )
+        self._check_slot()
+        if limit is not None:
+            key = f"{route}:{user_id}"
+            now = time.monotonic()
+            wait = self._empty_until.get(key, 0) - now
+            if wait <= 0:
+                wait = await self.store.take(key, limit, cost)
+                # Until the bucket has one token, any request would be refused
+                empty_for = wait - (cost - 1) / limit.refill_per_second
+                if empty_for > 0:
+                    self._remember_empty(key, now + empty_for, now)
+            if wait > 0:
+                raise RateLimitExceededError(
+                    f"Rate limit of {limit.capacity:g} requests per "
+                    f"{limit.period_seconds:g}s exceeded for {route}",
+                    _retry_after(wait),
+                )
+        if self._slots is not None:
+            # Slots may have filled up while the bucket was read; the tokens
+            # are spent then, but no slot is held during the store round trip
+            self._check_slot()
+            await self._slots.acquire()
+
+    def _remember_empty(self, key: str, until: float, now: float) -> None:
+        if len(self._empty_until) >= MAX_REMEMBERED_EMPTY_BUCKETS:
+            self._empty_until = {k: t for k, t in self._empty_until.items() if t > now}
+            if len(self._empty_until) >= MAX_REMEMBERED_EMPTY_BUCKETS:
+                return
+        self._empty_until[key] = until
+
+    def _check_slot(self) -> None:
+        if self._slots is not None and self._slots.locked():
+            raise RateLimitExceededError(
+                f"{self.max_concurrent} model requests are in progress",
+                _retry_after(self.request_seconds),
+            )
+
+    def release(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
+
+    async def close(self) -> None:
+        await self.store.close()
+
+
+admission_controller = AdmissionController.from_config()
@@ -6,7 +6,7 @@ Handles Azure OpenAI, MCP, and environment setup.
 import asyncio
 import json
 import logging
-from typing import Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from magentic_agents.foundry_agent import FoundryAgentTemplate
 from magentic_agents.models.agent_models import MCPConfig, SearchConfig
@@ -19,6 +19,8 @@ from semantic_kernel.connectors.ai.open_ai import (
 from models.messages import MPlan, WebsocketMessageType
 from common.models.messages_kernel import TeamConfiguration
 from common.config.app_config import config
+from common.utils.credential_broker import credential_broker
+from common.utils.event_stream import event_stream
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +34,11 @@ class AzureConfig:
         self.standard_model = config.AZURE_OPENAI_DEPLOYMENT_NAME
         # self.bing_connection_name = config.AZURE_BING_CONNECTION_NAME
 
-        # Create credential
-        self.credential = config.get_azure_credentials()
+        # Process-wide credential with cached tokens
+        self.credential = credential_broker.credential
 
     def ad_token_provider(self) -> str:
-        token = self.credential.get_token(config.AZURE_COGNITIVE_SERVICES)
+        token = credential_broker.get_token(config.AZURE_COGNITIVE_SERVICES)
         return token.token
 
     async def create_chat_completion_service(self, use_reasoning_model: bool = False):
@@ -95,6 +97,19 @@ class OrchestrationConfig:
         # Default timeout for waiting operations (5 minutes)
         self.default_timeout: float = 300.0
 
+        # Called as relay(kind, request_id, value) whenever an approval or
+        # clarification becomes pending ("approval_pending",
+        # "clarification_pending") or gets its answer ("approval",
+        # "clarification"); set when orchestrations run in worker processes
+        self.relay: Optional[Callable[[str, str, Any], None]] = None
+
+    def _relay(self, kind: str, request_id: str, value: Any = None) -> None:
+        if self.relay is not None:
+            try:
+                self.relay(kind, request_id, value)
+            except Exception as e:
+                logger.error(f"Error relaying {kind} for {request_id}: {e}")
+
     def get_current_orchestration(self, user_id: str) -> MagenticOrchestration:
         """get existing orchestration instance."""
         return self.orchestrations.get(user_id, None)
@@ -107,12 +122,14 @@ class OrchestrationConfig:
         else:
             # Clear existing event to reset state
             self._approval_events[plan_id].clear()
+        self._relay("approval_pending", plan_id)
 
     def set_approval_result(self, plan_id: str, approved: bool) -> None:
         """Set the approval result and trigger the event."""
         self.approvals[plan_id] = approved
         if plan_id in self._approval_events:
             self._approval_events[plan_id].set()
+        self._relay("approval", plan_id, approved)
 
     async def wait_for_approval(self, plan_id: str, timeout: Optional[float] = None) -> bool:
         """
@@ -172,12 +189,14 @@ class OrchestrationConfig:
         else:
             # Clear existing event to reset state
             self._clarification_events[request_id].clear()
+        self._relay("clarification_pending", request_id)
 
     def set_clarification_result(self, request_id: str, answer: str) -> None:
         """Set the clarification response and trigger the event."""
         self.clarifications[request_id] = answer
         if request_id in self._clarification_events:
             self._clarification_events[request_id].set()
+        self._relay("clarification", request_id, answer)
 
     async def wait_for_clarification(self, request_id: str, timeout: Optional[float] = None) -> str:
         """
@@ -249,6 +268,11 @@ class ConnectionConfig:
         self.connections: Dict[str, WebSocket] = {}
         # Map user_id to process_id for context-based messaging
         self.user_to_process: Dict[str, str] = {}
+        # Set in orchestration worker processes, which have no sockets:
+        # messages go to event_sink(user_id, standard_message) instead
+        self.event_sink: Optional[
+            Callable[[str, Dict[str, Any]], Awaitable[None]]
+        ] = None
 
     def add_connection(
         self, process_id: str, connection: WebSocket, user_id: str = None
@@ -335,14 +359,6 @@ class ConnectionConfig:
             logger.warning("No user_id available for WebSocket message")
             return
 
-        process_id = self.user_to_process.get(user_id)
-        if not process_id:
-            logger.warning("No active WebSocket process found for user ID: %s", user_id)
-            logger.debug(
-                f"Available user mappings: {list(self.user_to_process.keys())}"
-            )
-            return
-
         # Convert message to proper format for frontend
         try:
             if hasattr(message, "to_dict"):
@@ -362,6 +378,27 @@ class ConnectionConfig:
             message_data = str(message)
 
         standard_message = {"type": message_type, "data": message_data}
+        if self.event_sink is not None:
+            await self.event_sink(user_id, standard_message)
+            return
+        await self.send_to_user(user_id, standard_message)
+
+    async def send_to_user(self, user_id: str, standard_message: Dict[str, Any]):
+        """Send an already formatted ``{"type", "data"}`` message to a user's socket.
+
+        The message is also published to the user's ``/api/v3/events`` streams.
+        """
+        event_stream.publish(user_id, standard_message)
+        process_id = self.user_to_process.get(user_id)
+        if not process_id:
+            if event_stream.has_subscribers(user_id):
+                return
+            logger.warning("No active WebSocket process found for user ID: %s", user_id)
+            logger.debug(
+                f"Available user mappings: {list(self.user_to_process.keys())}"
+            )
+            return
+
         connection = self.get_connection(process_id)
         if connection:
             try:
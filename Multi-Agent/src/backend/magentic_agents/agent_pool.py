@@ -0,0 +1,161 @@
+"""Process-wide pool of opened agent templates shared by the users of a team."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from common.config.app_config import config
+
+AgentKey = Tuple[str, str, str]
+
+
+def agent_config_hash(agent_obj: Any) -> str:
+    """Digest of an agent's configuration, so an edited team gets new templates."""
+    if hasattr(agent_obj, "model_dump"):
+        fields = agent_obj.model_dump()
+    else:
+        fields = dict(vars(agent_obj))
+    encoded = json.dumps(fields, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def agent_key(team_id: str, agent_obj: Any) -> AgentKey:
+    return (team_id, agent_obj.name, agent_config_hash(agent_obj))
+
+
+class PooledAgent:
+    """One user's handle on a pooled agent template.
+
+    Attributes are read from the template (and through it from the
+    underlying AzureAIAgent), so the handle stands in for the template as an
+    orchestration member. :meth:`close` gives the handle back to the pool
+    instead of closing the template, which other users may still hold.
+    """
+
+    def __init__(self, pool: "AgentPool", key: Hashable, template: Any, user_id: str):
+        self._pool = pool
+        self._key = key
+        self._template = template
+        self.user_id = user_id
+        self._released = False
+
+    async def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        await self._pool.release(self._key)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._template, name)
+
+
+class _PoolEntry:
+    __slots__ = ("template", "refs", "idle_since")
+
+    def __init__(self, template: Any):
+        self.template = template
+        self.refs = 0
+        self.idle_since: Optional[float] = None
+
+
+class AgentPool:
+    """Opened agent templates keyed by (team_id, agent name, config hash).
+
+    The first user of a team opens each template (credential, project
+    client, Foundry definition lookup or creation); later users get handles
+    on the same template. A template no handle refers to is closed, which
+    deletes its Foundry definition, once it has been idle for
+    ``idle_seconds`` (0: as soon as the last handle is closed). Idle
+    templates are swept whenever a handle is taken or given back.
+    """
+
+    def __init__(self, idle_seconds: float = 900, clock: Callable[[], float] = time.monotonic):
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self.opened = 0
+        self.reused = 0
+        self._entries: Dict[Hashable, _PoolEntry] = {}
+        # One open at a time per key, so concurrent users of a new team
+        # open each template once
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    @classmethod
+    def from_config(cls) -> "AgentPool":
+        return cls(config.AGENT_POOL_IDLE_SECONDS)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def acquire(
+        self, key: Hashable, user_id: str, open_template: Callable[[], Awaitable[Any]]
+    ) -> PooledAgent:
+        """Get a handle on the template for ``key``, opening it if needed.
+
+        Args:
+            key: Pool key, see :func:`agent_key`
+            user_id: The user the handle is for
+            open_template: Opens and returns a new template for ``key``
+
+        Returns:
+            A handle to close when the user's orchestration no longer needs it
+        """
+        await self.evict_idle()
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PoolEntry(await open_template())
+                self._entries[key] = entry
+                self.opened += 1
+                self.logger.info("Opened pooled agent %s for team %s", key[1], key[0])
+            else:
+                self.reused += 1
+            entry.refs += 1
+            entry.idle_since = None
+        return PooledAgent(self, key, entry.template, user_id)
+
+    async def release(self, key: Hashable) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.refs = max(0, entry.refs - 1)
+        if entry.refs == 0:
+            entry.idle_since = self.clock()
+        await self.evict_idle()
+
+    async def evict_idle(self) -> None:
+        """Close the templates idle for longer than ``idle_seconds``."""
+        now = self.clock()
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if entry.refs == 0
+            and entry.idle_since is not None
+            and now - entry.idle_since >= self.idle_seconds
+        ]
+        for key in expired:
+            entry = self._entries.pop(key)
+            self._locks.pop(key, None)
+            await self._close_template(key, entry.template)
+
+    async def close(self) -> None:
+        """Close every template, in use or not (application shutdown)."""
+        entries, self._entries = self._entries, {}
+        self._locks.clear()
+        await asyncio.gather(
+            *(self._close_template(key, entry.template) for key, entry in entries.items())
+        )
+
+    async def _close_template(self, key: Hashable, template: Any) -> None:
+        try:
+            await template.close()
+            self.logger.info("Closed pooled agent %s of team %s", key[1], key[0])
+        except Exception as e:
+            self.logger.warning("Error closing pooled agent %s: %s", key[1], e)
+
+
+agent_pool = AgentPool.from_config()
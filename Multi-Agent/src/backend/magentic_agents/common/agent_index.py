@@ -0,0 +1,225 @@
+"""Name → id index of the Foundry project's agent definitions, and a cache of its connections."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+
+from common.config.app_config import config
+from common.utils.credential_broker import credential_broker
+
+
+class AgentDefinitionIndex:
+    """Agent definition ids of a Foundry project, looked up by agent name.
+
+    Finding an agent by name used to mean paging through
+    ``client.agents.list_agents()`` on every template open, which gets slower
+    as the project accumulates agents. The index is built from one such scan
+    (or loaded from ``path`` when it was saved for the same project),
+    kept current by recording the agents templates create and forgetting
+    the ones they delete, and rebuilt every ``refresh_seconds`` in the
+    background once :meth:`start` is called. A name missing from the index
+    triggers one rescan, unless the index was built less than
+    ``miss_rescan_seconds`` ago, so agents created by another replica or host
+    are found rather than duplicated. An id that no longer resolves is
+    forgotten by the caller through :meth:`forget`.
+
+    Connections (``client.connections.get(name=...)``) are cached for
+    ``refresh_seconds`` as well.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        path: Optional[str] = None,
+        refresh_seconds: float = 300,
+        miss_rescan_seconds: float = 30,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.endpoint = endpoint
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self.miss_rescan_seconds = miss_rescan_seconds
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self.scans = 0
+        self._ids: Dict[str, str] = {}
+        self._built_at: Optional[float] = None
+        self._loaded = False
+        # One scan at a time, so templates opened together scan once
+        self._scan_lock = asyncio.Lock()
+        self._connections: Dict[str, Tuple[Any, float]] = {}
+        self._connection_locks: Dict[str, asyncio.Lock] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls) -> "AgentDefinitionIndex":
+        return cls(
+            config.AZURE_AI_AGENT_ENDPOINT,
+            path=config.AGENT_INDEX_PATH or None,
+            refresh_seconds=config.AGENT_INDEX_REFRESH_SECONDS,
+            miss_rescan_seconds=config.AGENT_INDEX_MISS_RESCAN_SECONDS,
+        )
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._ids)
+
+    @property
+    def built(self) -> bool:
+        self.load()
+        return self._built_at is not None
+
+    def lookup(self, agent_name: str) -> Optional[str]:
+        """Id of the agent named ``agent_name`` as far as the index knows."""
+        self.load()
+        return self._ids.get(agent_name)
+
+    async def get_agent_id(self, client: Any, agent_name: str) -> Optional[str]:
+        """Id of the agent named ``agent_name``, scanning the project if the index does not know it.
+
+        Args:
+            client: An open ``AIProjectClient`` of the project
+            agent_name: Name of the agent definition
+
+        Returns:
+            The definition id, or None if the project has no such agent
+        """
+        agent_id = self.lookup(agent_name)
+        if agent_id is None and self._may_rescan():
+            async with self._scan_lock:
+                # Another caller may have scanned while this one waited
+                agent_id = self._ids.get(agent_name)
+                if agent_id is None and self._may_rescan():
+                    await self.refresh(client)
+                    agent_id = self._ids.get(agent_name)
+        return agent_id
+
+    def _may_rescan(self) -> bool:
+        return not self.built or self.clock() - self._built_at >= self.miss_rescan_seconds
+
+    async def refresh(self, client: Any) -> None:
+        """Rebuild the index from a ``list_agents`` scan of the project."""
+        ids = {}
+        async for agent in client.agents.list_agents():
+            # The first agent listed wins, as with the scan this replaces
+            ids.setdefault(agent.name, agent.id)
+        self.scans += 1
+        self.replace(ids)
+        await asyncio.to_thread(self.save)
+        self.logger.info("Indexed %d agent definitions of %s", len(ids), self.endpoint)
+
+    def replace(self, ids: Dict[str, str]) -> None:
+        self._loaded = True
+        self._ids = dict(ids)
+        self._built_at = self.clock()
+
+    def record(self, agent_name: str, agent_id: str) -> None:
+        """Remember an agent definition that was just created."""
+        self.load()
+        self._ids[agent_name] = agent_id
+        self.save()
+
+    def forget(self, agent_id: str) -> None:
+        """Drop an agent definition that was deleted or no longer exists."""
+        self.load()
+        names = [name for name, known_id in self._ids.items() if known_id == agent_id]
+        for name in names:
+            del self._ids[name]
+        if names:
+            self.save()
+
+    def load(self) -> None:
+        """Read the index saved for this project, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning("Could not read agent index %s: %s", self.path, e)
+            return
+        if saved.get("endpoint") != self.endpoint:
+            return
+        self._ids = {**saved.get("agents", {}), **self._ids}
+        self._built_at = saved.get("built_at")
+
+    def save(self) -> None:
+        """Write the index to ``path`` (atomically, so readers never see half a file)."""
+        if not self.path:
+            return
+        data = {"endpoint": self.endpoint, "built_at": self._built_at, "agents": self._ids}
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            self.logger.warning("Could not save agent index %s: %s", self.path, e)
+
+    async def get_connection(self, client: Any, connection_name: str) -> Any:
+        """``client.connections.get(name=connection_name)``, cached for ``refresh_seconds``."""
+        lock = self._connection_locks.setdefault(connection_name, asyncio.Lock())
+        async with lock:
+            cached = self._connections.get(connection_name)
+            if cached is not None and self.clock() - cached[1] < self.refresh_seconds:
+                return cached[0]
+            connection = await client.connections.get(name=connection_name)
+            self._connections[connection_name] = (connection, self.clock())
+            return connection
+
+    def start(self, open_client: Optional[Callable[[], Any]] = None) -> None:
+        """Rebuild the index every ``refresh_seconds`` until :meth:`close`.
+
+        Args:
+            open_client: Returns an async context manager yielding an
+                ``AIProjectClient``; defaults to the credential broker's
+        """
+        if self.refresh_seconds <= 0 or self._refresh_task is not None:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_loop(open_client or _open_project_client))
+
+    async def close(self) -> None:
+        if self._refresh_task is None:
+            return
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+    async def _refresh_loop(self, open_client: Callable[[], Any]) -> None:
+        while True:
+            if self.built:
+                # A saved index is used until it is refresh_seconds old
+                await asyncio.sleep(max(0.0, self._built_at + self.refresh_seconds - self.clock()))
+            try:
+                async with self._scan_lock, open_client() as client:
+                    await self.refresh(client)
+            except Exception as e:
+                self.logger.warning("Agent index refresh failed: %s", e)
+                await asyncio.sleep(self.refresh_seconds)
+
+
+@asynccontextmanager
+async def _open_project_client() -> AsyncIterator[Any]:
+    # The process's shared client, left open for the agent templates
+    yield credential_broker.project_client()
+
+
+def index_agents(agents: Iterable[Any]) -> Dict[str, str]:
+    """Name → id of listed agent definitions, the first listed winning (sync clients)."""
+    ids: Dict[str, str] = {}
+    for agent in agents:
+        ids.setdefault(agent.name, agent.id)
+    return ids
+
+
+agent_index = AgentDefinitionIndex.from_config()
@@ -3,9 +3,9 @@ from typing import Any
 
 from azure.ai.projects.aio import AIProjectClient
 # from azure.ai.projects.models import Agent as AzureAgent
-from azure.identity.aio import DefaultAzureCredential
-from semantic_kernel.agents.azure_ai.azure_ai_agent import AzureAIAgent
 from semantic_kernel.connectors.mcp import MCPStreamableHttpPlugin
+from common.utils.credential_broker import BrokeredAsyncCredential, credential_broker
+from magentic_agents.common.agent_index import agent_index
 from magentic_agents.models.agent_models import MCPConfig
 from config.agent_registry import agent_registry
 
@@ -91,26 +91,25 @@ class MCPEnabledBase:
 
 class AzureAgentBase(MCPEnabledBase):
     """
-    Extends MCPEnabledBase with Azure async contexts that many agents need:
-    - DefaultAzureCredential (async)
-    - AzureAIAgent.create_client(...) (async)
+    Extends MCPEnabledBase with the Azure clients many agents need, shared by
+    every agent of the process through the credential broker:
+    - the broker's async credential (cached tokens)
+    - the broker's AIProjectClient (one connection pool)
     Subclasses then create an AzureAIAgent definition and bind plugins.
     """
 
     def __init__(self, mcp: MCPConfig | None = None) -> None:
         super().__init__(mcp=mcp)
-        self.creds: DefaultAzureCredential | None = None
+        self.creds: BrokeredAsyncCredential | None = None
         self.client: AIProjectClient | None = None
 
     async def open(self) -> "AzureAgentBase":
         if self._stack is not None:
             return self
         self._stack = AsyncExitStack()
-        # Azure async contexts
-        self.creds = DefaultAzureCredential()
-        await self._stack.enter_async_context(self.creds)
-        self.client = AzureAIAgent.create_client(credential=self.creds)
-        await self._stack.enter_async_context(self.client)
+        # Shared Azure clients, closed with the broker rather than the agent
+        self.creds = credential_broker.async_credential
+        self.client = credential_broker.project_client()
 
         # MCP async context if requested
         await self._enter_mcp_if_configured()
@@ -122,7 +121,8 @@ class AzureAgentBase(MCPEnabledBase):
     async def close(self) -> None:
         """
         Close the agent and clean up Azure AI Foundry resources.
-        This method deletes the agent from Azure AI Foundry and closes credentials.
+        This method deletes the agent from Azure AI Foundry; the shared
+        credential and client stay open for the other agents.
         """
 
         try:
@@ -133,6 +133,7 @@ class AzureAgentBase(MCPEnabledBase):
                 if agent_id and self.client:
                     try:
                         await self.client.agents.delete_agent(agent_id)
+                        agent_index.forget(agent_id)
                     except Exception:
                         pass
             # Unregister from agent registry
@@ -142,10 +143,6 @@ class AzureAgentBase(MCPEnabledBase):
                 pass
         except Exception:
             pass
-        # Always close credentials and parent resources
-        try:
-            if hasattr(self, 'creds') and self.creds:
-                await self.creds.close()
-        except Exception:
-            pass
+        self.creds = None
+        self.client = None
         await super().close()
@@ -5,6 +5,7 @@ from typing import Awaitable, List, Optional
 
 from azure.ai.agents.models import AzureAISearchTool, CodeInterpreterToolDefinition
 from semantic_kernel.agents import Agent, AzureAIAgent  # pylint: disable=E0611
+from magentic_agents.common.agent_index import agent_index
 from magentic_agents.common.lifecycle import AzureAgentBase
 from magentic_agents.models.agent_models import MCPConfig, SearchConfig
 
@@ -72,8 +73,8 @@ class FoundryAgentTemplate(AzureAgentBase):
 
         try:
             # Get the existing connection by name
-            self._search_connection = await self.client.connections.get(
-                name=self.search.connection_name
+            self._search_connection = await agent_index.get_connection(
+                self.client, self.search.connection_name
             )
             self.logger.info(
                 "Found Azure AI Search connection: %s", self._search_connection.id
@@ -151,6 +152,7 @@ class FoundryAgentTemplate(AzureAgentBase):
             connection_compatible = await self._check_connection_compatibility(definition)
             if not connection_compatible:
                 await self.client.agents.delete_agent(definition.id)
+                agent_index.forget(definition.id)
                 self.logger.info(f"Existing agent '{self.agent_name}' uses different connection. Creating new agent definition.")
                 definition = None
 
@@ -168,6 +170,7 @@ class FoundryAgentTemplate(AzureAgentBase):
                 tools=tools,
                 tool_resources=tool_resources,
             )
+            agent_index.record(self.agent_name, definition.id)
 
         # Add MCP plugins if available
         plugins = [self.mcp_plugin] if self.mcp_plugin else []
@@ -259,7 +262,7 @@ class FoundryAgentTemplate(AzureAgentBase):
 
             # Get the current connection to compare
             try:
-                current_connection = await self.client.connections.get(name=self.search.connection_name)
+                current_connection = await agent_index.get_connection(self.client, self.search.connection_name)
                 current_connection_id = current_connection.id
 
                 # Compare connection IDs
@@ -288,13 +291,10 @@ class FoundryAgentTemplate(AzureAgentBase):
         Gets an Azure AI Agent with the specified name and instructions using AIProjectClient if it is already created.
         """
         # # First try to get an existing agent with this name as assistant_id
+        agent_id = None
         try:
-            agent_id = None
-            agent_list = self.client.agents.list_agents()
-            async for agent in agent_list:
-                if agent.name == agent_name:
-                    agent_id = agent.id
-                    break
+            # Looked up in the project's agent index rather than a list_agents scan
+            agent_id = await agent_index.get_agent_id(self.client, agent_name)
             # If the agent already exists, we can use it directly
             # Get the existing agent definition
             if agent_id is not None:
@@ -309,6 +309,9 @@ class FoundryAgentTemplate(AzureAgentBase):
             # The Azure AI Projects SDK throws an exception when the agent doesn't exist
             # (not returning None), so we catch it and proceed to create a new agent
             if "ResourceNotFound" in str(e) or "404" in str(e):
+                # Deleted since it was indexed
+                if agent_id is not None:
+                    agent_index.forget(agent_id)
                 logging.info(
                     f"Agent with ID {agent_name} not found. Will create a new one."
                 )
@@ -1,13 +1,18 @@
 # Copyright (c) Microsoft. All rights reserved.
 """Factory for creating and managing magentic agents from JSON configurations."""
 
+import asyncio
 import json
 import logging
+import time
 from types import SimpleNamespace
-from typing import List, Union
+from typing import List, Optional, Union
+
+from opentelemetry import metrics
 
 from common.config.app_config import config
 from common.models.messages_kernel import TeamConfiguration
+from magentic_agents.agent_pool import PooledAgent, agent_key, agent_pool
 from magentic_agents.foundry_agent import FoundryAgentTemplate
 from magentic_agents.models.agent_models import MCPConfig, SearchConfig
 
@@ -16,6 +21,14 @@ from magentic_agents.models.agent_models import MCPConfig, SearchConfig
 from magentic_agents.proxy_agent import ProxyAgent
 from magentic_agents.reasoning_agent import ReasoningAgentTemplate
 
+# Time to create (open) one agent of a team, exported with the app's other
+# telemetry when Azure Monitor is configured
+agent_build_duration = metrics.get_meter(__name__).create_histogram(
+    "magentic_agents.agent_build.duration",
+    unit="ms",
+    description="Time to create one agent of a team",
+)
+
 
 class UnsupportedModelError(Exception):
     """Raised when an unsupported model is specified."""
@@ -39,14 +52,17 @@ class MagenticAgentFactory:
     #         data = json.load(f)
     #     return json.loads(json.dumps(data), object_hook=lambda d: SimpleNamespace(**d))
 
-    async def create_agent_from_config(self, user_id: str, agent_obj: SimpleNamespace) -> Union[FoundryAgentTemplate, ReasoningAgentTemplate, ProxyAgent]:
+    async def create_agent_from_config(
+        self, user_id: str, agent_obj: SimpleNamespace, team_id: Optional[str] = None
+    ) -> Union[FoundryAgentTemplate, ReasoningAgentTemplate, ProxyAgent, PooledAgent]:
         """
         Create an agent from configuration object.
 
         Args:
             user_id: User ID
             agent_obj: Agent object from parsed JSON (SimpleNamespace)
-            team_model: Model name to determine which template to use
+            team_id: Team the agent belongs to; when set, the user gets a handle
+                on the team's pooled template instead of a template of their own
 
         Returns:
             Configured agent instance
@@ -124,9 +140,19 @@ class MagenticAgentFactory:
                 search_config=search_config,
             )
 
+        if team_id:
+            # Opened once per process for all users of the team
+            return await agent_pool.acquire(
+                agent_key(team_id, agent_obj), user_id, lambda: self._open(agent)
+            )
+        return await self._open(agent)
+
+    async def _open(
+        self, agent: Union[FoundryAgentTemplate, ReasoningAgentTemplate]
+    ) -> Union[FoundryAgentTemplate, ReasoningAgentTemplate]:
         await agent.open()
         self.logger.info(
-            f"Successfully created and initialized agent '{agent_obj.name}'"
+            f"Successfully created and initialized agent '{agent.agent_name}'"
         )
         return agent
 
@@ -139,35 +165,29 @@ class MagenticAgentFactory:
             team_config_input: team configuration object from cosmos db
 
         Returns:
-            List of initialized agent instances
+            List of initialized agent instances: the user's own ProxyAgent and
+            handles on the team's pooled templates for the others
         """
         # self.logger.info(f"Loading team configuration from: {file_path}")
 
         try:
-
-            initalized_agents = []
-
-            for i, agent_cfg in enumerate(team_config_input.agents, 1):
-                try:
-                    self.logger.info(f"Creating agent {i}/{len(team_config_input.agents)}: {agent_cfg.name}")
-
-                    agent = await self.create_agent_from_config(user_id, agent_cfg)
-                    initalized_agents.append(agent)
-                    self._agent_list.append(agent)  # Keep track for cleanup
-
-                    self.logger.info(
-                        f"✅ Agent {i}/{len(team_config_input.agents)} created: {agent_cfg.name}"
+            total = len(team_config_input.agents)
+            # Agents are independent of each other: build them concurrently,
+            # a bounded number at a time, keeping the team's order
+            semaphore = asyncio.Semaphore(max(1, config.AGENT_BUILD_CONCURRENCY))
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(
+                        self._build_agent(user_id, team_config_input.team_id, agent_cfg, i, total, semaphore)
                     )
+                    for i, agent_cfg in enumerate(team_config_input.agents, 1)
+                ]
 
-                except (UnsupportedModelError, InvalidConfigurationError) as e:
-                    self.logger.warning(f"Skipped agent {agent_cfg.name}: {e}")
-                    continue
-                except Exception as e:
-                    self.logger.error(f"Failed to create agent {agent_cfg.name}: {e}")
-                    continue
+            initalized_agents = [task.result() for task in tasks if task.result() is not None]
+            self._agent_list.extend(initalized_agents)  # Keep track for cleanup
 
             self.logger.info(
-                f"Successfully created {len(initalized_agents)}/{len(team_config_input.agents)} agents for team '{team_config_input.name}'"
+                f"Successfully created {len(initalized_agents)}/{total} agents for team '{team_config_input.name}'"
             )
             return initalized_agents
 
@@ -175,6 +195,39 @@ class MagenticAgentFactory:
             self.logger.error(f"Failed to load team configuration: {e}")
             raise
 
+    async def _build_agent(
+        self,
+        user_id: str,
+        team_id: Optional[str],
+        agent_cfg: SimpleNamespace,
+        i: int,
+        total: int,
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[Union[FoundryAgentTemplate, ReasoningAgentTemplate, ProxyAgent, PooledAgent]]:
+        """Create one agent of a team, or None when it has to be skipped.
+
+        Failures are contained here so that one agent that cannot be built
+        does not cancel the construction of the others.
+        """
+        async with semaphore:
+            started = time.perf_counter()
+            status = "created"
+            agent = None
+            try:
+                self.logger.info(f"Creating agent {i}/{total}: {agent_cfg.name}")
+                agent = await self.create_agent_from_config(user_id, agent_cfg, team_id=team_id)
+                self.logger.info(f"✅ Agent {i}/{total} created: {agent_cfg.name}")
+            except (UnsupportedModelError, InvalidConfigurationError) as e:
+                status = "skipped"
+                self.logger.warning(f"Skipped agent {agent_cfg.name}: {e}")
+            except Exception as e:
+                status = "failed"
+                self.logger.error(f"Failed to create agent {agent_cfg.name}: {e}")
+            duration_ms = (time.perf_counter() - started) * 1000
+            agent_build_duration.record(duration_ms, {"agent": agent_cfg.name, "status": status})
+            self.logger.debug(f"Agent {agent_cfg.name} {status} in {duration_ms:.1f} ms")
+            return agent
+
     @classmethod
     async def cleanup_all_agents(cls, agent_list: List):
         """Clean up all created agents."""
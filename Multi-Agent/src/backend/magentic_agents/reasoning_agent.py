@@ -1,6 +1,7 @@
 import logging
 
 from common.config.app_config import config
+from common.utils.credential_broker import credential_broker
 from semantic_kernel import Kernel
 from semantic_kernel.agents import ChatCompletionAgent  # pylint: disable=E0611
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
@@ -37,8 +38,7 @@ class ReasoningAgentTemplate(MCPEnabledBase):
         self.logger = logging.getLogger(__name__)
 
     def ad_token_provider(self) -> str:
-        credential = config.get_azure_credentials()
-        token = credential.get_token(config.AZURE_COGNITIVE_SERVICES)
+        token = credential_broker.get_token(config.AZURE_COGNITIVE_SERVICES)
         return token.token
 
     async def _after_open(self) -> None:
@@ -3,7 +3,7 @@ import os
 import asyncio
 from typing import Optional, Any, Dict
 from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+from common.utils.credential_broker import credential_broker
 from common.config.app_config import config
 
 logger = logging.getLogger(__name__)
@@ -22,10 +22,7 @@ class AzureAIOrchestrator:
         try:
             endpoint = os.getenv("AZURE_AI_AGENT_ENDPOINT")
             if endpoint:
-                self.project_client = AIProjectClient(
-                    endpoint=endpoint,
-                    credential=DefaultAzureCredential(),
-                )
+                self.project_client = credential_broker.sync_project_client(endpoint)
                 # Load agent IDs from file or env
                 # For now, we assume it's passed or loaded
                 self.orchestrator_agent_id = os.getenv("ORCHESTRATOR_AGENT_ID")
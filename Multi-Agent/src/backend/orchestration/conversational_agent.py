@@ -2,7 +2,7 @@ import logging
 import os
 from typing import Optional, Dict, Any
 from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+from common.utils.credential_broker import credential_broker
 
 logger = logging.getLogger(__name__)
 
@@ -42,10 +42,8 @@ class ConversationalAgent:
                 # Construct full agents endpoint
                 agents_endpoint = f"{endpoint}/agents/v1.0/subscriptions/{subscription_id}/resourceGroups/{resource_group}/providers/Microsoft.MachineLearningServices/workspaces/{project_name}"
                 
-                self.project_client = AIProjectClient(
-                    endpoint=agents_endpoint,
-                    credential=DefaultAzureCredential(),
-                )
+                # Shared with the other requests: one credential and connection pool
+                self.project_client = credential_broker.sync_project_client(agents_endpoint)
                 logger.info(f"ConversationalAgent initialized with agent ID: {self.conversational_agent_id}")
             else:
                 logger.warning("Azure AI configuration incomplete. Running in mock mode.")
@@ -0,0 +1,229 @@
+"""Transports that run the orchestration jobs queued by the API.
+
+``InProcessJobTransport`` runs them in the API process. ``QueueJobTransport``
+queues them for ``orchestration_worker`` processes and relays what the
+workers send back (WebSocket events, pending approvals and clarifications,
+job results) into this process, and the user's answers to the workers.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from common.config.app_config import config
+from common.jobs.sqlite_queue import SqliteJobQueue
+from common.models.messages_kernel import InputTask
+from config.settings import (
+    ConnectionConfig,
+    OrchestrationConfig,
+    connection_config,
+    orchestration_config,
+)
+from models.messages import MPlan
+from orchestration.orchestration_manager import OrchestrationManager
+
+# Channel workers publish events, pending requests and results on
+TO_API = "to_api"
+# Channel the API publishes approvals and clarification answers on
+TO_WORKERS = "to_workers"
+
+# How long relayed messages are kept for readers that fall behind
+MESSAGE_RETENTION_SECONDS = 3600
+PRUNE_INTERVAL_SECONDS = 60
+
+
+class JobTransport(ABC):
+    """Runs the orchestration of one InputTask for the job pool."""
+
+    # Whether orchestrations (and their agents) live in this process
+    local = True
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    async def start(self) -> None:
+        """Called once the event loop is running, before the first job."""
+
+    async def close(self) -> None:
+        """Called at shutdown, after the job pool has stopped."""
+
+    @abstractmethod
+    async def run(self, user_id: str, input_task: InputTask) -> None:
+        """Run the orchestration and return when it has finished.
+
+        Raises:
+            Exception: If the orchestration failed
+        """
+
+
+class InProcessJobTransport(JobTransport):
+    """Runs orchestrations in the API process."""
+
+    async def run(self, user_id: str, input_task: InputTask) -> None:
+        await OrchestrationManager().run_orchestration(user_id, input_task)
+
+
+class QueueJobTransport(JobTransport):
+    """Queues orchestrations for worker processes sharing a SqliteJobQueue."""
+
+    local = False
+
+    def __init__(
+        self,
+        queue: SqliteJobQueue,
+        poll_seconds: float = 0.1,
+        orchestration: Optional[OrchestrationConfig] = None,
+        connections: Optional[ConnectionConfig] = None,
+        timeout_seconds: float = 0,
+    ):
+        super().__init__()
+        self.queue = queue
+        self.poll_seconds = poll_seconds
+        # 0: wait for the worker's result however long it takes
+        self.timeout_seconds = timeout_seconds
+        self.orchestration = orchestration or orchestration_config
+        self.connections = connections or connection_config
+        self._after = 0
+        self._results: Dict[str, asyncio.Future] = {}
+        self._outbox: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        await self.queue.initialize()
+        self._after = await self.queue.last_seq(TO_API)
+        self._outbox = asyncio.Queue()
+        self.orchestration.relay = self._relay
+        self._tasks = [
+            asyncio.create_task(self._poll()),
+            asyncio.create_task(self._publish()),
+        ]
+        self.logger.info("Queueing orchestration jobs in %s", self.queue.path)
+
+    async def close(self) -> None:
+        if self.orchestration.relay == self._relay:
+            self.orchestration.relay = None
+        if self._outbox is not None:
+            # Deliver answers the user has already given
+            try:
+                await asyncio.wait_for(self._outbox.join(), timeout=5)
+            except asyncio.TimeoutError:
+                self.logger.warning("Dropping %d undelivered replies", self._outbox.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.queue.close()
+
+    async def run(self, user_id: str, input_task: InputTask) -> None:
+        """Queue the job and wait for its result, at most ``timeout_seconds``.
+
+        A job that times out, or whose pool job is cancelled, is removed
+        from the queue so no worker picks it up afterwards.
+        """
+        job_id = str(uuid.uuid4())
+        future = asyncio.get_running_loop().create_future()
+        self._results[job_id] = future
+        try:
+            await self.queue.enqueue(
+                job_id,
+                user_id,
+                {"user_id": user_id, "input_task": input_task.model_dump(mode="json")},
+            )
+            result = await asyncio.wait_for(future, self.timeout_seconds or None)
+        except asyncio.TimeoutError:
+            await self._cancel(job_id)
+            raise RuntimeError(
+                f"Job {job_id} did not finish within {self.timeout_seconds:g} seconds"
+            ) from None
+        except asyncio.CancelledError:
+            await self._cancel(job_id)
+            raise
+        finally:
+            self._results.pop(job_id, None)
+        if result.get("status") != "completed":
+            raise RuntimeError(result.get("error") or f"Job {job_id} {result.get('status')}")
+
+    async def _cancel(self, job_id: str) -> None:
+        try:
+            await self.queue.cancel(job_id)
+        except Exception as e:
+            self.logger.error("Failed to remove job %s from the queue: %s", job_id, e)
+
+    def _relay(self, kind: str, request_id: str, value: Any = None) -> None:
+        """Forward the user's answers; pending requests are mirrored from workers."""
+        if kind == "approval":
+            cleanup = self.orchestration.cleanup_approval
+        elif kind == "clarification":
+            cleanup = self.orchestration.cleanup_clarification
+        else:
+            return
+        self._outbox.put_nowait({"kind": kind, "request_id": request_id, "value": value})
+        # Nothing waits on the mirrored request in this process
+        asyncio.get_running_loop().call_soon(cleanup, request_id)
+
+    async def _publish(self) -> None:
+        while True:
+            body = await self._outbox.get()
+            try:
+                await self.queue.publish(TO_WORKERS, body)
+            except Exception as e:
+                self.logger.error("Failed to relay %s to workers: %s", body.get("kind"), e)
+            finally:
+                self._outbox.task_done()
+
+    async def _poll(self) -> None:
+        last_prune = time.monotonic()
+        while True:
+            messages = []
+            try:
+                messages = await self.queue.read(TO_API, self._after)
+                for seq, body in messages:
+                    self._after = seq
+                    await self._handle(body)
+                if time.monotonic() - last_prune > PRUNE_INTERVAL_SECONDS:
+                    last_prune = time.monotonic()
+                    await self.queue.prune(MESSAGE_RETENTION_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error("Error reading orchestration worker messages: %s", e)
+            if not messages:
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _handle(self, body: Dict[str, Any]) -> None:
+        kind = body.get("kind")
+        if kind == "event":
+            # Published to the user's event streams and replay buffer even
+            # without a socket here (another API replica may hold it)
+            await self.connections.send_to_user(body["user_id"], body["message"])
+        elif kind == "approval_pending":
+            if body.get("plan"):
+                self.orchestration.plans[body["request_id"]] = MPlan.model_validate(body["plan"])
+            self.orchestration.set_approval_pending(body["request_id"])
+        elif kind == "clarification_pending":
+            self.orchestration.set_clarification_pending(body["request_id"])
+        elif kind == "result":
+            future = self._results.get(body["job_id"])
+            if future is not None and not future.done():
+                future.set_result(body)
+
+
+def create_job_transport() -> JobTransport:
+    """The transport selected by ``ORCHESTRATION_JOB_TRANSPORT``."""
+    transport = config.ORCHESTRATION_JOB_TRANSPORT
+    if transport == "inprocess":
+        return InProcessJobTransport()
+    if transport == "sqlite":
+        return QueueJobTransport(
+            SqliteJobQueue(config.ORCHESTRATION_QUEUE_PATH),
+            poll_seconds=config.ORCHESTRATION_QUEUE_POLL_SECONDS,
+            timeout_seconds=config.ORCHESTRATION_JOB_TIMEOUT_SECONDS,
+        )
+    raise ValueError(f"Unknown ORCHESTRATION_JOB_TRANSPORT: {transport}")
+
+
+# Process-wide transport used by the API
+job_transport = create_job_transport()
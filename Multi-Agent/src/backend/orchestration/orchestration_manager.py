@@ -6,6 +6,7 @@ import uuid
 from typing import List, Optional
 
 from common.config.app_config import config
+from common.utils.credential_broker import credential_broker
 from common.models.messages_kernel import TeamConfiguration
 from semantic_kernel.agents.orchestration.magentic import MagenticOrchestration
 from semantic_kernel.agents.runtime import InProcessRuntime
@@ -59,12 +60,6 @@ class OrchestrationManager:
             max_tokens=4000, temperature=0.1
         )
 
-        credential = config.get_azure_credential(client_id=config.AZURE_CLIENT_ID)
-
-        def get_token():
-            token = credential.get_token("https://cognitiveservices.azure.com/.default")
-            return token.token
-
         # 1. Create a Magentic orchestration with Azure OpenAI
         magentic_orchestration = MagenticOrchestration(
             members=agents,
@@ -73,7 +68,10 @@ class OrchestrationManager:
                 chat_completion_service=AzureChatCompletion(
                     deployment_name=config.AZURE_OPENAI_DEPLOYMENT_NAME,
                     endpoint=config.AZURE_OPENAI_ENDPOINT,
-                    ad_token_provider=get_token,  # Use token provider function
+                    # Cached by the credential broker rather than fetched per call
+                    ad_token_provider=credential_broker.token_provider(
+                        config.AZURE_COGNITIVE_SERVICES
+                    ),
                 ),
                 execution_settings=execution_settings,
             ),
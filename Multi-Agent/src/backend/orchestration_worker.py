@@ -0,0 +1,311 @@
+# orchestration_worker.py
+"""Worker process running the orchestrations queued by the API.
+
+Run one or more next to the API with ``ORCHESTRATION_JOB_TRANSPORT=sqlite``
+and the same ``ORCHESTRATION_QUEUE_PATH``::
+
+    python orchestration_worker.py --concurrency 4
+
+Each worker claims jobs from the queue, builds the user's agent team the way
+``/api/v3/init_team`` does in the API process, and sends its WebSocket
+events, pending approvals and clarifications and job results back through the
+queue. It renews the lease of the jobs it runs, requeues the jobs of workers
+that stopped renewing theirs, and logs its throughput every
+``--report-seconds``.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from common.config.app_config import config
+from common.database.database_factory import DatabaseFactory
+from common.jobs.sqlite_queue import SqliteJobQueue, default_worker_id
+from common.models.messages_kernel import InputTask
+from common.services.team_service import TeamService
+from common.utils.credential_broker import credential_broker
+from config.agent_registry import agent_registry
+from config.settings import (
+    ConnectionConfig,
+    OrchestrationConfig,
+    connection_config,
+    orchestration_config,
+    team_config,
+)
+from magentic_agents.agent_pool import agent_pool
+from magentic_agents.common.agent_index import agent_index
+from orchestration.job_transport import TO_API, TO_WORKERS
+from orchestration.orchestration_manager import OrchestrationManager
+
+JobRunner = Callable[[str, InputTask], Awaitable[None]]
+
+
+class OrchestrationWorker:
+    """Claims queued orchestration jobs and runs up to ``concurrency`` at once."""
+
+    def __init__(
+        self,
+        queue: SqliteJobQueue,
+        concurrency: int = 1,
+        poll_seconds: float = 0.1,
+        report_seconds: float = 60.0,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 2,
+        worker_id: Optional[str] = None,
+        runner: Optional[JobRunner] = None,
+        orchestration: Optional[OrchestrationConfig] = None,
+        connections: Optional[ConnectionConfig] = None,
+    ):
+        self.queue = queue
+        self.orchestration = orchestration or orchestration_config
+        self.connections = connections or connection_config
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self.report_seconds = report_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.worker_id = worker_id or default_worker_id()
+        self.runner = runner or self.run_orchestration
+        self.logger = logging.getLogger(__name__)
+
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self._busy_seconds = 0.0
+        self._started = time.monotonic()
+        self._after = 0
+        self._outbox: Optional[asyncio.Queue] = None
+        # Jobs this worker is running, whose lease it renews
+        self._job_ids: Set[str] = set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Jobs run so far and throughput since the worker started."""
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        finished = self.completed + self.failed
+        return {
+            "worker": self.worker_id,
+            "completed": self.completed,
+            "failed": self.failed,
+            "running": self.running,
+            "jobs_per_minute": round(finished * 60 / elapsed, 2),
+            "utilization": round(self._busy_seconds / (elapsed * self.concurrency), 3),
+        }
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process jobs until ``stop`` is set, then finish the running ones."""
+        await self.queue.initialize()
+        self._after = await self.queue.last_seq(TO_WORKERS)
+        self._outbox = asyncio.Queue()
+        self._started = time.monotonic()
+        self.connections.event_sink = self._forward_event
+        self.orchestration.relay = self._relay
+        helpers = [
+            asyncio.create_task(self._publish()),
+            asyncio.create_task(self._read_replies()),
+            asyncio.create_task(self._report()),
+            asyncio.create_task(self._keep_leases()),
+        ]
+        self.logger.info(
+            "Orchestration worker %s started with %d slots", self.worker_id, self.concurrency
+        )
+        try:
+            await asyncio.gather(*(self._slot(stop) for _ in range(self.concurrency)))
+            # Let results and events of the last jobs reach the API
+            await self._outbox.join()
+        finally:
+            for task in helpers:
+                task.cancel()
+            await asyncio.gather(*helpers, return_exceptions=True)
+            self.connections.event_sink = None
+            self.orchestration.relay = None
+            self.logger.info("Orchestration worker stopped: %s", self.stats())
+
+    async def _slot(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                claimed = await self.queue.claim(self.worker_id)
+            except Exception as e:
+                self.logger.error("Failed to claim a job: %s", e)
+                claimed = None
+            if claimed is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._process(*claimed)
+
+    async def _process(self, job_id: str, payload: Dict[str, Any]) -> None:
+        user_id = payload["user_id"]
+        started = time.monotonic()
+        self.running += 1
+        self._job_ids.add(job_id)
+        status, error = "completed", None
+        try:
+            input_task = InputTask.model_validate(payload["input_task"])
+            await self.runner(user_id, input_task)
+            self.completed += 1
+        except Exception as e:
+            self.logger.exception("Orchestration job %s failed", job_id)
+            status, error = "failed", str(e)
+            self.failed += 1
+        finally:
+            self.running -= 1
+            self._job_ids.discard(job_id)
+            self._busy_seconds += time.monotonic() - started
+        self._post({"kind": "result", "job_id": job_id, "status": status, "error": error})
+        try:
+            await self.queue.finish(job_id)
+        except Exception as e:
+            self.logger.error("Failed to remove finished job %s: %s", job_id, e)
+
+    async def run_orchestration(self, user_id: str, input_task: InputTask) -> None:
+        """Build (or reuse) the user's orchestration for their current team and run it."""
+        memory_store = await DatabaseFactory.get_database(user_id=user_id)
+        current_team = await memory_store.get_current_team(user_id=user_id)
+        if not current_team:
+            raise ValueError(f"User {user_id} has no current team")
+        team = await TeamService(memory_store).get_team_configuration(
+            current_team.team_id, user_id
+        )
+        if team is None:
+            raise ValueError(f"Team configuration '{current_team.team_id}' not found")
+
+        previous = team_config.get_current_team(user_id)
+        team_config.set_current_team(user_id=user_id, team_configuration=team)
+        await OrchestrationManager.get_current_or_new_orchestration(
+            user_id=user_id,
+            team_config=team,
+            team_switched=previous is not None and previous.team_id != team.team_id,
+        )
+        await OrchestrationManager().run_orchestration(user_id, input_task)
+
+    def _post(self, body: Dict[str, Any]) -> None:
+        self._outbox.put_nowait(body)
+
+    async def _forward_event(self, user_id: str, standard_message: Dict[str, Any]) -> None:
+        self._post({"kind": "event", "user_id": user_id, "message": standard_message})
+
+    def _relay(self, kind: str, request_id: str, value: Any = None) -> None:
+        """Tell the API about pending requests; answers come from it."""
+        if kind == "approval_pending":
+            plan = self.orchestration.plans.get(request_id)
+            self._post(
+                {
+                    "kind": kind,
+                    "request_id": request_id,
+                    "plan": plan.model_dump(mode="json") if plan is not None else None,
+                }
+            )
+        elif kind == "clarification_pending":
+            self._post({"kind": kind, "request_id": request_id})
+
+    async def _publish(self) -> None:
+        while True:
+            body = await self._outbox.get()
+            try:
+                await self.queue.publish(TO_API, body)
+            except Exception as e:
+                self.logger.error("Failed to send %s to the API: %s", body.get("kind"), e)
+            finally:
+                self._outbox.task_done()
+
+    async def _read_replies(self) -> None:
+        while True:
+            replies: List = []
+            try:
+                replies = await self.queue.read(TO_WORKERS, self._after)
+                for seq, body in replies:
+                    self._after = seq
+                    self._apply_reply(body)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error("Error reading replies: %s", e)
+            if not replies:
+                await asyncio.sleep(self.poll_seconds)
+
+    def _apply_reply(self, body: Dict[str, Any]) -> None:
+        # Every worker reads every reply; only the one waiting for it acts
+        request_id = body["request_id"]
+        if body["kind"] == "approval" and request_id in self.orchestration.approvals:
+            self.orchestration.set_approval_result(request_id, body["value"])
+        elif body["kind"] == "clarification" and request_id in self.orchestration.clarifications:
+            self.orchestration.set_clarification_result(request_id, body["value"])
+
+    async def _keep_leases(self) -> None:
+        """Renew this worker's leases and requeue jobs whose worker has died."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.queue.heartbeat(self.worker_id, list(self._job_ids))
+                abandoned = await self.queue.reclaim_expired(self.lease_seconds, self.max_attempts)
+            except Exception as e:
+                self.logger.error("Failed to renew job leases: %s", e)
+                continue
+            for job_id in abandoned:
+                self.logger.error(
+                    "Dropping job %s: its worker died on each of %d attempts", job_id, self.max_attempts
+                )
+                self._post(
+                    {
+                        "kind": "result",
+                        "job_id": job_id,
+                        "status": "failed",
+                        "error": "The worker running the job stopped responding",
+                    }
+                )
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_seconds)
+            self.logger.info("Orchestration worker throughput: %s", self.stats())
+
+
+async def main(concurrency: int, queue_path: str, report_seconds: float) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+
+    queue = SqliteJobQueue(queue_path)
+    worker = OrchestrationWorker(
+        queue,
+        concurrency=concurrency,
+        poll_seconds=config.ORCHESTRATION_QUEUE_POLL_SECONDS,
+        report_seconds=report_seconds,
+        lease_seconds=config.ORCHESTRATION_JOB_LEASE_SECONDS,
+        max_attempts=config.ORCHESTRATION_JOB_MAX_ATTEMPTS,
+    )
+    credential_broker.start()
+    agent_index.start()
+    try:
+        await worker.run(stop)
+    finally:
+        await agent_pool.close()
+        await agent_index.close()
+        try:
+            await agent_registry.cleanup_all_agents()
+        except Exception as e:
+            logging.getLogger(__name__).error("Error during agent cleanup: %s", e)
+        await credential_broker.close()
+        await DatabaseFactory.close_all()
+        await queue.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run queued orchestration jobs.")
+    parser.add_argument(
+        "--concurrency", type=int, default=config.ORCHESTRATION_WORKER_CONCURRENCY
+    )
+    parser.add_argument("--queue", default=config.ORCHESTRATION_QUEUE_PATH)
+    parser.add_argument("--report-seconds", type=float, default=60.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.queue, args.report_seconds))
@@ -9,6 +9,8 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+from magentic_agents.common.agent_index import agent_index, index_agents  # noqa: E402
+
 ENDPOINT = os.getenv("AZURE_AI_AGENT_ENDPOINT")
 PROJECT_NAME = os.getenv("AZURE_AI_PROJECT_NAME")
 
@@ -62,6 +64,7 @@ def create_or_update_agent(name, model, instructions, tools=None):
             tools=tools if tools else []
         )
         print(f"   ✅ Created Agent ID: {agent.id}")
+        agent_index.record(name, agent.id)
         return agent
     except Exception as e:
         print(f"   ❌ Error creating agent {name}: {e}")
@@ -93,10 +96,20 @@ def main():
             self.id = id
             self.name = name
 
+    # Agents created by the backend or an earlier run are found by name in the
+    # shared agent index; the project's agents are listed only if it was never built
+    if not agent_index.built:
+        agent_index.replace(index_agents(project_client.agents.list_agents()))
+        agent_index.save()
+        print(f"📋 Indexed {len(agent_index)} existing agents")
+
     def get_or_create(key, name, model, instructions, tools=None):
         if key in existing_ids:
             print(f"⏩ Skipping {name} (already exists: {existing_ids[key]})")
             return AgentRef(existing_ids[key], name)
+        elif agent_index.lookup(name):
+            print(f"⏩ Skipping {name} (found in agent index: {agent_index.lookup(name)})")
+            return AgentRef(agent_index.lookup(name), name)
         else:
             return create_or_update_agent(name, model, instructions, tools)
 
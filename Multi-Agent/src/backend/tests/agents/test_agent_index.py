@@ -0,0 +1,157 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from magentic_agents.common.agent_index import AgentDefinitionIndex  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+from magentic_agents.models.agent_models import SearchConfig  # noqa: E402
+
+ENDPOINT = "https://agents.example.com/"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeAgents:
+    """``client.agents`` of a project holding the given agent definitions."""
+
+    def __init__(self, definitions):
+        self.definitions = {d.id: d for d in definitions}
+        self.list_calls = 0
+
+    async def list_agents(self):
+        self.list_calls += 1
+        for definition in list(self.definitions.values()):
+            await asyncio.sleep(0)
+            yield definition
+
+    async def get_agent(self, agent_id):
+        if agent_id not in self.definitions:
+            raise RuntimeError("(404) ResourceNotFound")
+        return self.definitions[agent_id]
+
+    async def create_agent(self, name, **kwargs):
+        definition = SimpleNamespace(id=f"asst_new_{name}", name=name, tool_resources=None)
+        self.definitions[definition.id] = definition
+        return definition
+
+    async def delete_agent(self, agent_id):
+        self.definitions.pop(agent_id, None)
+
+
+def _client(*names):
+    definitions = [SimpleNamespace(id=f"asst_{name}", name=name, tool_resources=None) for name in names]
+    return SimpleNamespace(agents=FakeAgents(definitions), connections=SimpleNamespace(get=AsyncMock()))
+
+
+def _template(name, index, client):
+    template = FoundryAgentTemplate(
+        agent_name=name,
+        agent_description="",
+        agent_instructions="",
+        model_deployment_name="gpt-4o",
+    )
+    template.client = client
+    return patch("magentic_agents.foundry_agent.agent_index", index), template
+
+
+@pytest.mark.asyncio
+async def test_templates_share_one_scan_and_the_saved_index(tmp_path):
+    path = str(tmp_path / "agent_index.json")
+    index = AgentDefinitionIndex(ENDPOINT, path=path)
+    client = _client("Agent0", "Agent1")
+
+    ids = await asyncio.gather(*(index.get_agent_id(client, f"Agent{i}") for i in range(3)))
+    index.record("Agent2", "asst_Agent2")
+    index.forget("asst_Agent0")
+
+    assert ids == ["asst_Agent0", "asst_Agent1", None]
+    assert client.agents.list_calls == 1
+    # A restarted process (or provision_hr_agents.py) reads the saved index
+    restarted = AgentDefinitionIndex(ENDPOINT, path=path)
+    assert await restarted.get_agent_id(client, "Agent2") == "asst_Agent2"
+    assert restarted.lookup("Agent0") is None
+    assert client.agents.list_calls == 1
+    # An index saved for another project is ignored
+    assert not AgentDefinitionIndex("https://other.example.com/", path=path).built
+
+
+@pytest.mark.asyncio
+async def test_agents_created_elsewhere_are_found_by_a_rate_limited_rescan(tmp_path):
+    path = str(tmp_path / "agent_index.json")
+    clock = FakeClock()
+    index = AgentDefinitionIndex(ENDPOINT, path=path, miss_rescan_seconds=30, clock=clock)
+    client = _client("Agent0")
+    assert await index.get_agent_id(client, "Agent0") == "asst_Agent0"
+
+    # Created by another replica (or provision_hr_agents.py on another host)
+    await client.agents.create_agent("Agent1")
+    assert await index.get_agent_id(client, "Agent1") is None
+    assert client.agents.list_calls == 1
+    clock.now += 30
+    assert await index.get_agent_id(client, "Agent1") == "asst_new_Agent1"
+    assert await index.get_agent_id(client, "Missing") is None
+    assert client.agents.list_calls == 2
+
+    # A saved index older than the rescan interval is rescanned on a miss
+    await client.agents.create_agent("Agent2")
+    clock.now += 30
+    restarted = AgentDefinitionIndex(ENDPOINT, path=path, miss_rescan_seconds=30, clock=clock)
+    assert await restarted.get_agent_id(client, "Agent2") == "asst_new_Agent2"
+    assert client.agents.list_calls == 3
+
+@pytest.mark.asyncio
+async def test_open_uses_the_index_and_keeps_it_current():
+    index = AgentDefinitionIndex(ENDPOINT)
+    client = _client("Agent0")
+    patched, template = _template("Agent0", index, client)
+    with patched:
+        assert (await template._get_azure_ai_agent_definition("Agent0")).id == "asst_Agent0"
+        # Deleted behind the index's back: the stale id is forgotten
+        await client.agents.delete_agent("asst_Agent0")
+        assert await template._get_azure_ai_agent_definition("Agent0") is None
+        assert index.lookup("Agent0") is None
+
+        with patch("magentic_agents.foundry_agent.AzureAIAgent"), patch(
+            "magentic_agents.foundry_agent.agent_registry"
+        ):
+            await template._after_open()
+
+    assert index.lookup("Agent0") == "asst_new_Agent0"
+    assert client.agents.list_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_lookups_are_cached():
+    clock = FakeClock()
+    index = AgentDefinitionIndex(ENDPOINT, refresh_seconds=300, clock=clock)
+    client = _client()
+    client.connections.get.return_value = SimpleNamespace(id="conn-1")
+    patched, template = _template("Agent0", index, client)
+    template.search = SearchConfig(connection_name="search", endpoint="https://s", index_name="docs")
+    with patched:
+        for _ in range(3):
+            await template._make_azure_search_tool()
+        clock.now += 301
+        await template._make_azure_search_tool()
+
+    assert client.connections.get.await_count == 2
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.config.app_config import config  # noqa: E402
+from common.models.messages_kernel import TeamAgent, TeamConfiguration  # noqa: E402
+from magentic_agents.agent_pool import AgentPool, agent_key  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+from magentic_agents.magentic_agent_factory import MagenticAgentFactory  # noqa: E402
+
+
+class FakeTemplate:
+    def __init__(self, name):
+        self.agent_name = name
+        self.close = AsyncMock()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _team(system_message="Help with onboarding."):
+    return TeamConfiguration(
+        id="team-1",
+        team_id="team-1",
+        session_id="team-1",
+        name="HR",
+        status="visible",
+        created="2024-01-01T00:00:00Z",
+        created_by="admin",
+        user_id="admin",
+        agents=[
+            TeamAgent(
+                input_key=f"agent-{i}",
+                type="ai",
+                name=f"Agent{i}",
+                deployment_name="gpt-4o",
+                icon="Person",
+                system_message=system_message,
+                description="Handles part of the process.",
+            )
+            for i in range(3)
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_users_of_a_team_share_one_opened_template():
+    pool = AgentPool(idle_seconds=60)
+    opens = []
+
+    async def open_template():
+        await asyncio.sleep(0.01)
+        opens.append(1)
+        return FakeTemplate("Agent0")
+
+    handles = await asyncio.gather(
+        *(pool.acquire(("team-1", "Agent0", "h"), f"user-{u}", open_template) for u in range(5))
+    )
+
+    assert len(opens) == 1
+    assert (pool.opened, pool.reused) == (1, 4)
+    assert {id(handle._template) for handle in handles} == {id(handles[0]._template)}
+    assert handles[2].agent_name == "Agent0"
+    assert handles[2].user_id == "user-2"
+
+
+@pytest.mark.asyncio
+async def test_idle_template_is_closed_after_its_last_handle():
+    clock = FakeClock()
+    pool = AgentPool(idle_seconds=60, clock=clock)
+    template = FakeTemplate("Agent0")
+    key = ("team-1", "Agent0", "h")
+    first = await pool.acquire(key, "user-1", AsyncMock(return_value=template))
+    second = await pool.acquire(key, "user-2", AsyncMock(return_value=template))
+
+    await first.close()
+    await first.close()
+    clock.now = 120
+    await pool.evict_idle()
+    assert len(pool) == 1
+
+    await second.close()
+    clock.now = 150
+    await pool.evict_idle()
+    assert len(pool) == 1
+    clock.now = 181
+    await pool.evict_idle()
+
+    assert len(pool) == 0
+    template.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_agents_opens_each_agent_once_per_team():
+    pool = AgentPool(idle_seconds=60)
+    open_template = AsyncMock(side_effect=lambda: None)
+    with patch("magentic_agents.magentic_agent_factory.agent_pool", pool), patch.object(
+        FoundryAgentTemplate, "open", open_template
+    ), patch.object(config, "SUPPORTED_MODELS", '["gpt-4o"]'):
+        teams = [await MagenticAgentFactory().get_agents(f"user-{u}", _team()) for u in range(10)]
+        # An edited team does not reuse the templates built from the old configuration
+        edited = await MagenticAgentFactory().get_agents("user-x", _team("Help with payroll."))
+
+    assert open_template.await_count == 6
+    assert [agent.agent_name for agent in teams[9]] == ["Agent0", "Agent1", "Agent2"]
+    assert teams[0][1]._template is teams[9][1]._template
+    assert edited[1]._template is not teams[0][1]._template
+    assert agent_key("team-1", _team().agents[0]) != agent_key("team-1", _team("Other").agents[0])
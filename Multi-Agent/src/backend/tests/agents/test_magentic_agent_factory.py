@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.config.app_config import config  # noqa: E402
+from common.models.messages_kernel import TeamAgent, TeamConfiguration  # noqa: E402
+from magentic_agents.agent_pool import AgentPool  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+from magentic_agents.magentic_agent_factory import MagenticAgentFactory  # noqa: E402
+
+
+def _team(deployments):
+    return TeamConfiguration(
+        id="team-1",
+        team_id="team-1",
+        session_id="team-1",
+        name="HR",
+        status="visible",
+        created="2024-01-01T00:00:00Z",
+        created_by="admin",
+        user_id="admin",
+        agents=[
+            TeamAgent(
+                input_key=f"agent-{i}",
+                type="ai",
+                name=f"Agent{i}",
+                deployment_name=deployment,
+                icon="Person",
+                system_message="Help with onboarding.",
+                description="Handles part of the process.",
+            )
+            for i, deployment in enumerate(deployments)
+        ],
+    )
+
+
+class SlowOpen:
+    """Stands in for FoundryAgentTemplate.open, slower for the first agents."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, template):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            index = int(template.agent_name.removeprefix("Agent"))
+            await asyncio.sleep(0.05 * (6 - index))
+            if template.agent_name == "Agent3":
+                raise RuntimeError("Foundry unavailable")
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_agents_are_built_concurrently_in_team_order():
+    slow_open = SlowOpen()
+    team = _team(["gpt-4o", "gpt-4o", "unsupported", "gpt-4o", "gpt-4o", "gpt-4o"])
+    with patch.object(FoundryAgentTemplate, "open", lambda template: slow_open(template)), patch.object(
+        config, "SUPPORTED_MODELS", '["gpt-4o"]'
+    ), patch.object(config, "AGENT_BUILD_CONCURRENCY", 8), patch(
+        "magentic_agents.magentic_agent_factory.agent_pool", AgentPool()
+    ):
+        factory = MagenticAgentFactory()
+        agents = await factory.get_agents("user-1", team)
+
+    # The unsupported and the failing agent are skipped, the others keep their order
+    assert [agent.agent_name for agent in agents] == ["Agent0", "Agent1", "Agent4", "Agent5"]
+    assert slow_open.peak == 5
+    assert len(factory._agent_list) == 4
+
+
+@pytest.mark.asyncio
+async def test_agent_build_concurrency_is_bounded():
+    slow_open = SlowOpen()
+    with patch.object(FoundryAgentTemplate, "open", lambda template: slow_open(template)), patch.object(
+        config, "SUPPORTED_MODELS", '["gpt-4o"]'
+    ), patch.object(config, "AGENT_BUILD_CONCURRENCY", 2), patch(
+        "magentic_agents.magentic_agent_factory.agent_pool", AgentPool()
+    ):
+        agents = await MagenticAgentFactory().get_agents("user-1", _team(["gpt-4o"] * 3))
+
+    assert slow_open.peak == 2
+    assert len(agents) == 3
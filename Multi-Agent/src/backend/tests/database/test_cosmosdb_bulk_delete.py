@@ -0,0 +1,146 @@
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+import models.messages as messages  # noqa: E402
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    AgentType,
+    DataType,
+    Plan,
+    Step,
+    UserCurrentTeam,
+)
+
+SESSION_ID = "session-1"
+
+
+async def _seed_plan(db: CosmosDBClient, plan_id: str, messages_count: int, steps: int) -> None:
+    await db.add_plan(
+        Plan(id=plan_id, plan_id=plan_id, session_id=SESSION_ID, user_id="user-1", initial_goal="Goal")
+    )
+    for i in range(messages_count):
+        await db.add_agent_message(
+            AgentMessageData(
+                plan_id=plan_id, user_id="user-1", agent="HRHelperAgent", content=f"m{i}", raw_data="{}"
+            )
+        )
+    for i in range(steps):
+        await db.add_step(
+            Step(
+                plan_id=plan_id,
+                session_id=SESSION_ID,
+                user_id="user-1",
+                action=f"Step {i}",
+                agent=AgentType.HR,
+            )
+        )
+
+
+@pytest_asyncio.fixture
+async def db():
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        client = CosmosDBClient("https://stub", None, "db", "container", user_id="user-1")
+        await client.initialize()
+        await _seed_plan(client, "plan-1", messages_count=30, steps=4)
+        await _seed_plan(client, "plan-2", messages_count=3, steps=1)
+        cosmos_stub.stats.reset()
+        yield client
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cascade_deletes_plan_messages_and_steps(db):
+    result = await db.delete_plan_cascade("plan-1")
+
+    assert result.deleted == {
+        DataType.plan.value: 1,
+        DataType.plan_location.value: 1,
+        DataType.m_plan_message.value: 30,
+        DataType.step.value: 4,
+    }
+    assert result.failed == 0
+    assert await db.get_plan_by_plan_id("plan-1") is None
+    assert await db.get_agent_messages("plan-1") == []
+    # Other plans in the same session are untouched
+    assert len(await db.get_agent_messages("plan-2")) == 3
+
+
+@pytest.mark.asyncio
+async def test_cascade_uses_one_batch_per_partition(db):
+    # A message written before messages were co-located with their plan
+    await db.add_item(
+        AgentMessageData(
+            plan_id="plan-1", user_id="user-1", agent="HRHelperAgent", content="old", raw_data="{}"
+        )
+    )
+    cosmos_stub.stats.reset()
+
+    result = await db.delete_plan_cascade("plan-1")
+
+    assert result.total == 37
+    # The session's partition, the old message's and the plan location's
+    assert cosmos_stub.stats.operations["execute_item_batch"] == 3
+    assert "delete_item" not in cosmos_stub.stats.operations
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_falls_back_to_single_deletes(db):
+    real_batch = db.container.execute_item_batch
+
+    async def batch_after_concurrent_delete(batch_operations, partition_key, **kwargs):
+        # Someone else removes a document between the query and the batch
+        await db.container.delete_item(batch_operations[0][1][0], partition_key=partition_key)
+        return await real_batch(batch_operations=batch_operations, partition_key=partition_key)
+
+    with patch.object(db.container, "execute_item_batch", batch_after_concurrent_delete):
+        result = await db.delete_plan_cascade("plan-2")
+
+    assert result.total == 4
+    assert result.failed == 0
+    assert await db.get_agent_messages("plan-2") == []
+
+
+@pytest.mark.asyncio
+async def test_delete_current_team_removes_legacy_documents(db):
+    await db.set_current_team(UserCurrentTeam(user_id="user-1", team_id="team-1"))
+    await db.add_item(UserCurrentTeam(id="legacy", session_id="random", user_id="user-1", team_id="team-0"))
+
+    assert await db.delete_current_team("user-1")
+
+    assert await db.get_current_team("user-1") is None
+
+
+@pytest.mark.asyncio
+async def test_rejecting_a_plan_deletes_it_with_one_call(db):
+    from common.services import plan_service
+
+    plans = {"m-plan-1": messages.MPlan(plan_id="plan-1")}
+    with patch.object(plan_service.orchestration_config, "plans", plans), patch.object(
+        plan_service.DatabaseFactory, "get_database", AsyncMock(return_value=db)
+    ), patch.object(db, "delete_plan_cascade", wraps=db.delete_plan_cascade) as cascade:
+        ok = await plan_service.PlanService.handle_plan_approval(
+            messages.PlanApprovalResponse(m_plan_id="m-plan-1", approved=False, plan_id="plan-1"),
+            "user-1",
+        )
+
+    assert ok
+    cascade.assert_awaited_once_with("plan-1")
+    assert await db.get_plan_by_plan_id("plan-1") is None
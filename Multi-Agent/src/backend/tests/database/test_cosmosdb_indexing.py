@@ -0,0 +1,115 @@
+import logging
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.database.indexing import build_indexing_policy, verify_indexing_policy  # noqa: E402
+from common.models.messages_kernel import Plan, PlanStatus  # noqa: E402
+
+TEAM_ID = "team-1"
+
+
+def _client(**kwargs) -> CosmosDBClient:
+    return CosmosDBClient("https://stub", None, "db", "container", user_id="user-1", **kwargs)
+
+
+@pytest_asyncio.fixture
+async def stub():
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        yield
+
+
+def test_policy_has_composite_indexes_for_filtered_ordered_queries():
+    policy = CosmosDBClient.indexing_policy()
+
+    assert [
+        {"path": "/team_id", "order": "ascending"},
+        {"path": "/data_type", "order": "ascending"},
+        {"path": "/user_id", "order": "ascending"},
+        {"path": "/overall_status", "order": "ascending"},
+        {"path": "/_ts", "order": "descending"},
+    ] in policy["compositeIndexes"]
+    assert [
+        {"path": "/plan_id", "order": "ascending"},
+        {"path": "/data_type", "order": "ascending"},
+        {"path": "/timestamp", "order": "ascending"},
+    ] in policy["compositeIndexes"]
+    assert len(policy["compositeIndexes"]) == 3
+    assert verify_indexing_policy(policy, policy, CosmosDBClient.QUERIES) == []
+
+
+def test_policy_rejects_queries_on_unindexed_fields():
+    with pytest.raises(ValueError, match="content"):
+        build_indexing_policy(
+            {"by_content": "SELECT * FROM c WHERE c.content=@content"}, ["/content/?"]
+        )
+
+
+def test_verify_accepts_reversed_composite_and_reports_excluded_fields():
+    policy = CosmosDBClient.indexing_policy()
+    reversed_policy = {
+        "compositeIndexes": [
+            [
+                {"path": i["path"], "order": "descending" if i["order"] == "ascending" else "ascending"}
+                for i in index
+            ]
+            for index in policy["compositeIndexes"]
+        ],
+        "excludedPaths": [{"path": "/plan_id/?"}],
+    }
+
+    problems = verify_indexing_policy(reversed_policy, policy, CosmosDBClient.QUERIES)
+
+    assert problems
+    assert all("plan_id" in problem for problem in problems)
+
+
+@pytest.mark.asyncio
+async def test_startup_check_warns_until_policy_is_applied(stub, caplog):
+    default = _client(verify_indexing_policy=True)
+    with caplog.at_level(logging.WARNING, logger="common.database.cosmosdb"):
+        await default.initialize()
+    assert "missing composite index" in caplog.text
+    assert len(await default._check_indexing_policy()) == 3
+
+    await default.database.replace_container(
+        default.container, indexing_policy=CosmosDBClient.indexing_policy()
+    )
+
+    assert await default._check_indexing_policy() == []
+    await default.close()
+
+
+@pytest.mark.asyncio
+async def test_query_metrics_are_logged_per_query_name(stub, caplog):
+    db = _client(query_metrics=True)
+    await db.initialize()
+    await db.add_plan(
+        Plan(id="p1", plan_id="p1", user_id="user-1", team_id=TEAM_ID, initial_goal="Goal", overall_status=PlanStatus.completed)
+    )
+
+    with caplog.at_level(logging.INFO, logger="common.database.cosmosdb"):
+        summaries = await db.get_plan_summaries_by_team_id_status("user-1", TEAM_ID, PlanStatus.completed)
+
+    assert [s.id for s in summaries] == ["p1"]
+    assert "Cosmos query plans_by_team_status_newest_first page 1" in caplog.text
+    assert "utilized indexes: /team_id/?, /data_type/?" in caplog.text
+    assert "potential indexes: (/team_id ASC, /data_type ASC" in caplog.text
+    await db.close()
@@ -0,0 +1,162 @@
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    Plan,
+    PlanStatus,
+    PlanSummary,
+    UserCurrentTeam,
+)
+
+TEAM_ID = "team-1"
+
+
+@pytest_asyncio.fixture
+async def db():
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        client = CosmosDBClient("https://stub", None, "db", "container", user_id="user-1")
+        await client.initialize()
+        await client.set_current_team(UserCurrentTeam(user_id="user-1", team_id=TEAM_ID))
+        for i in range(25):
+            await client.add_plan(
+                Plan(
+                    id=f"plan-{i:02d}",
+                    plan_id=f"plan-{i:02d}",
+                    user_id="user-1",
+                    team_id=TEAM_ID,
+                    initial_goal=f"Goal {i}",
+                    overall_status=PlanStatus.completed,
+                )
+            )
+        cosmos_stub.stats.reset()
+        yield client
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_all_plans_once(db):
+    seen = []
+    token = None
+    pages = 0
+    while True:
+        page = await db.get_plans_page_by_team_id_status(
+            "user-1", TEAM_ID, PlanStatus.completed, limit=10, continuation_token=token
+        )
+        pages += 1
+        seen.extend(plan.id for plan in page.items)
+        token = page.continuation_token
+        if token is None:
+            break
+
+    assert pages == 3
+    assert sorted(seen) == [f"plan-{i:02d}" for i in range(25)]
+
+
+@pytest.mark.asyncio
+async def test_stream_fetches_one_page_per_round_trip(db):
+    query, parameters = db._plans_by_team_id_status_query(
+        "user-1", TEAM_ID, PlanStatus.completed
+    )
+
+    plans = [plan async for plan in db.query_items_stream(query, parameters, Plan, page_size=10)]
+
+    assert len(plans) == 25
+    assert cosmos_stub.stats.operations["query_items"] == 3
+
+
+@pytest_asyncio.fixture
+async def api_client(db):
+    from api.router import app_v3
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    with patch("api.router.DatabaseFactory.get_database", AsyncMock(return_value=db)):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+
+
+@pytest.mark.asyncio
+async def test_get_plans_without_paging_returns_array(api_client):
+    response = await api_client.get(
+        "/api/v3/plans", headers={"x-ms-client-principal-id": "user-1"}
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()) == 25
+
+
+@pytest.mark.asyncio
+async def test_get_plans_returns_page_and_cursor(api_client):
+    headers = {"x-ms-client-principal-id": "user-1"}
+    first = (await api_client.get("/api/v3/plans?limit=20", headers=headers)).json()
+    second = (
+        await api_client.get(
+            "/api/v3/plans",
+            params={"limit": 20, "continuation_token": first["continuation_token"]},
+            headers=headers,
+        )
+    ).json()
+
+    assert len(first["plans"]) == 20
+    assert len(second["plans"]) == 5
+    assert second["continuation_token"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_plans_rejects_bad_continuation_token(api_client):
+    response = await api_client.get(
+        "/api/v3/plans?continuation_token=not-a-token",
+        headers={"x-ms-client-principal-id": "user-1"},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_plan_summaries_read_only_projected_fields(db):
+    with patch.object(
+        db.container, "query_items", wraps=db.container.query_items
+    ) as query_items:
+        summaries = await db.get_plan_summaries_by_team_id_status(
+            "user-1", TEAM_ID, PlanStatus.completed
+        )
+
+    query = query_items.call_args.kwargs["query"]
+    assert query.startswith("SELECT c.id, c.plan_id, c.session_id")
+    assert "m_plan" not in query
+    assert len(summaries) == 25
+    assert all(isinstance(s, PlanSummary) for s in summaries)
+
+
+@pytest.mark.asyncio
+async def test_get_plans_lists_summaries(api_client):
+    response = await api_client.get(
+        "/api/v3/plans", headers={"x-ms-client-principal-id": "user-1"}
+    )
+
+    plan = response.json()[0]
+    assert {"id", "session_id", "initial_goal", "overall_status", "timestamp"} <= plan.keys()
+    assert "m_plan" not in plan
+    assert "streaming_message" not in plan
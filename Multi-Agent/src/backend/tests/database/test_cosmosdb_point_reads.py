@@ -0,0 +1,149 @@
+import os
+import sys
+import uuid
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentType,
+    Plan,
+    Step,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+
+
+@pytest_asyncio.fixture
+async def db():
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        client = CosmosDBClient("https://stub", None, "db", "container", user_id="user-1")
+        await client.initialize()
+        yield client
+        await client.close()
+
+
+def _team(team_id: str, session_id: str) -> TeamConfiguration:
+    return TeamConfiguration(
+        id=team_id,
+        team_id=team_id,
+        session_id=session_id,
+        name="Team",
+        status="visible",
+        created="2025-01-01T00:00:00Z",
+        created_by="user-1",
+        user_id="user-1",
+    )
+
+
+def _operations():
+    return dict(cosmos_stub.stats.operations)
+
+
+@pytest.mark.asyncio
+async def test_team_partitioned_on_team_id_is_point_read(db):
+    await db.add_team(_team("team-1", "team-1"))
+    db._partition_keys.clear()
+    cosmos_stub.stats.reset()
+
+    team = await db.get_team_by_id("team-1")
+
+    assert team.team_id == "team-1"
+    assert _operations() == {"read_item": 1}
+
+
+@pytest.mark.asyncio
+async def test_plan_is_point_read_by_a_process_that_never_saw_it(db):
+    session_id = str(uuid.uuid4())
+    await db.add_plan(
+        Plan(id="plan-1", plan_id="plan-1", user_id="user-1", session_id=session_id, initial_goal="Goal")
+    )
+    # As in a fresh replica or an orchestration worker
+    db._partition_keys.clear()
+    cosmos_stub.stats.reset()
+
+    cold = await db.get_plan_by_plan_id("plan-1")
+    cold_operations = _operations()
+    cosmos_stub.stats.reset()
+    warm = await db.get_plan_by_plan_id("plan-1")
+
+    assert cold.id == warm.id == "plan-1"
+    # The plan's location record, then the plan
+    assert cold_operations == {"read_item": 2}
+    assert _operations() == {"read_item": 1}
+
+
+@pytest.mark.asyncio
+async def test_legacy_plan_is_found_by_query_once_then_located(db):
+    session_id = str(uuid.uuid4())
+    # Written before plans had a location record
+    await db.add_item(
+        Plan(id="plan-1", plan_id="plan-1", user_id="user-1", session_id=session_id, initial_goal="Goal")
+    )
+    db._partition_keys.clear()
+    cosmos_stub.stats.reset()
+
+    first = await db.get_plan_by_plan_id("plan-1")
+    first_operations = _operations()
+    db._partition_keys.clear()
+    cosmos_stub.stats.reset()
+    second = await db.get_plan_by_plan_id("plan-1")
+
+    assert first.id == second.id == "plan-1"
+    assert first_operations == {"read_item": 1, "query_items": 1, "upsert_item": 1}
+    assert _operations() == {"read_item": 2}
+
+
+@pytest.mark.asyncio
+async def test_get_step_reads_by_partition_and_checks_type(db):
+    step = Step(plan_id="plan-1", user_id="user-1", action="Act", agent=AgentType.GENERIC)
+    await db.add_step(step)
+    await db.add_team(_team("team-1", step.session_id))
+    cosmos_stub.stats.reset()
+
+    assert (await db.get_step(step.id, step.session_id)).id == step.id
+    assert await db.get_step("team-1", step.session_id) is None
+    assert await db.get_step("missing", step.session_id) is None
+    assert _operations() == {"read_item": 3}
+
+
+@pytest.mark.asyncio
+async def test_legacy_current_team_is_migrated_on_read(db):
+    await db.add_item(
+        UserCurrentTeam(id="legacy-id", session_id="legacy-pk", user_id="user-1", team_id="team-1")
+    )
+
+    migrated = await db.get_current_team("user-1")
+    cosmos_stub.stats.reset()
+    again = await db.get_current_team("user-1")
+
+    assert migrated.id == UserCurrentTeam.document_id("user-1")
+    assert again.team_id == "team-1"
+    assert _operations() == {"read_item": 1}
+    assert await db.get_item_by_id("legacy-id", "legacy-pk", UserCurrentTeam) is None
+
+
+@pytest.mark.asyncio
+async def test_deleted_documents_are_dropped_from_partition_key_map(db):
+    await db.add_team(_team("team-1", "pk-1"))
+    assert db._partition_keys["team-1"] == "pk-1"
+
+    await db.delete_team("team-1")
+
+    assert "team-1" not in db._partition_keys
+    assert await db.get_team("team-1") is None
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.database import cosmosdb  # noqa: E402
+from common.database.database_factory import DatabaseFactory  # noqa: E402
+
+
+@pytest.fixture
+def cosmos_client_cls():
+    """Patch the SDK client and reset the factory singleton around each test."""
+    DatabaseFactory._instance = None
+    DatabaseFactory._init_lock = None
+    client_cls = MagicMock()
+    client_cls.return_value.close = AsyncMock()
+    with patch.object(cosmosdb, "CosmosClient", client_cls), patch(
+        "common.database.database_factory.config.get_azure_credentials",
+        return_value=MagicMock(),
+    ), patch(
+        # No change feed listener polling the mocked container
+        "common.database.database_factory.config.COSMOSDB_CHANGE_FEED_POLL_SECONDS",
+        0,
+    ):
+        yield client_cls
+    DatabaseFactory._instance = None
+
+
+@pytest.mark.asyncio
+async def test_get_database_shares_one_client_across_users(cosmos_client_cls):
+    first = await DatabaseFactory.get_database(user_id="user-a")
+    second = await DatabaseFactory.get_database(user_id="user-b")
+
+    assert cosmos_client_cls.call_count == 1
+    assert first.user_id == "user-a"
+    assert second.user_id == "user-b"
+    assert first.container is second.container
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_calls_create_single_client(cosmos_client_cls):
+    views = await asyncio.gather(
+        *(DatabaseFactory.get_database(user_id=f"user-{i}") for i in range(50))
+    )
+
+    assert cosmos_client_cls.call_count == 1
+    assert [v.user_id for v in views] == [f"user-{i}" for i in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_closing_a_view_keeps_shared_client_open(cosmos_client_cls):
+    view = await DatabaseFactory.get_database(user_id="user-a")
+    await view.close()
+
+    cosmos_client_cls.return_value.close.assert_not_called()
+
+    await DatabaseFactory.close_all()
+    cosmos_client_cls.return_value.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_user_scope_is_applied_to_queries(cosmos_client_cls):
+    view = await DatabaseFactory.get_database(user_id="user-b")
+    await DatabaseFactory.get_database(user_id="user-a")
+
+    with patch.object(view, "query_items", AsyncMock(return_value=[])) as query:
+        await view.get_all_plans()
+
+    parameters = query.call_args.args[1]
+    assert {"name": "@user_id", "value": "user-b"} in parameters
@@ -0,0 +1,204 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.database.database_factory import DatabaseFactory  # noqa: E402
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.database.sqlite_database import SqliteDatabase  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    AgentType,
+    DataType,
+    Plan,
+    PlanStatus,
+    PlanSummary,
+    Step,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+
+TEAM_ID = "team-1"
+
+
+@pytest_asyncio.fixture(params=["memory", "sqlite"])
+async def db(request, tmp_path):
+    if request.param == "memory":
+        database = MemoryDatabase()
+    else:
+        database = SqliteDatabase(str(tmp_path / "macae.sqlite3"))
+    await database.initialize()
+    yield database.for_user("user-1")
+    await database.close()
+
+
+async def _add_plans(db, count: int, status: PlanStatus = PlanStatus.completed) -> None:
+    for i in range(count):
+        await db.add_plan(
+            Plan(
+                id=f"plan-{i:02d}",
+                plan_id=f"plan-{i:02d}",
+                user_id="user-1",
+                team_id=TEAM_ID,
+                initial_goal=f"Goal {i}",
+                overall_status=status,
+                m_plan={"steps": ["a", "b"]},
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_plans_round_trip_and_page_newest_first(db):
+    await _add_plans(db, 25)
+    plan = await db.get_plan_by_plan_id("plan-03")
+    plan.overall_status = PlanStatus.in_progress
+    await db.update_plan(plan)
+
+    seen = []
+    token = None
+    while True:
+        page = await db.get_plans_page_by_team_id_status(
+            "user-1", TEAM_ID, PlanStatus.completed, limit=10, continuation_token=token
+        )
+        seen.extend(p.id for p in page.items)
+        token = page.continuation_token
+        if token is None:
+            break
+
+    assert (await db.get_plan("plan-03")).overall_status == PlanStatus.in_progress
+    assert seen == [f"plan-{i:02d}" for i in reversed(range(25)) if i != 3]
+
+
+@pytest.mark.asyncio
+async def test_plan_summaries_only_carry_summary_fields(db):
+    await _add_plans(db, 3)
+
+    summaries = await db.get_plan_summaries_by_team_id_status(
+        "user-1", TEAM_ID, PlanStatus.completed
+    )
+
+    assert [s.id for s in summaries] == ["plan-02", "plan-01", "plan-00"]
+    assert all(isinstance(s, PlanSummary) for s in summaries)
+
+
+@pytest.mark.asyncio
+async def test_bad_continuation_token_is_rejected(db):
+    with pytest.raises(ValueError):
+        await db.get_plans_page_by_team_id_status(
+            "user-1", TEAM_ID, PlanStatus.completed, limit=10, continuation_token="nope"
+        )
+
+
+@pytest.mark.asyncio
+async def test_plans_are_scoped_to_the_user(db):
+    await _add_plans(db, 2)
+    other = db.for_user("user-2")
+
+    assert len(await db.get_all_plans()) == 2
+    assert await other.get_all_plans() == []
+
+
+@pytest.mark.asyncio
+async def test_cascade_delete_removes_plan_messages_and_steps(db):
+    await _add_plans(db, 2)
+    for i in range(3):
+        await db.add_agent_message(
+            AgentMessageData(
+                plan_id="plan-00", user_id="user-1", agent="HRHelperAgent", content=f"m{i}", raw_data="{}"
+            )
+        )
+    await db.add_step(
+        Step(plan_id="plan-00", user_id="user-1", action="Do it", agent=AgentType.HR)
+    )
+
+    messages = await db.get_agent_messages("plan-00")
+    result = await db.delete_plan_cascade("plan-00")
+
+    assert [m.content for m in messages] == ["m0", "m1", "m2"]
+    assert result.deleted == {
+        DataType.plan.value: 1,
+        DataType.m_plan_message.value: 3,
+        DataType.step.value: 1,
+    }
+    assert await db.get_plan("plan-00") is None
+    assert await db.get_plan("plan-01") is not None
+
+
+@pytest.mark.asyncio
+async def test_current_team_and_teams(db):
+    await db.add_team(
+        TeamConfiguration(
+            id=TEAM_ID,
+            team_id=TEAM_ID,
+            session_id=TEAM_ID,
+            name="HR",
+            status="visible",
+            created="2024-01-01",
+            created_by="user-1",
+            user_id="user-1",
+        )
+    )
+    await db.set_current_team(UserCurrentTeam(user_id="user-1", team_id=TEAM_ID))
+
+    assert (await db.get_current_team("user-1")).team_id == TEAM_ID
+    assert (await db.get_team(TEAM_ID)).name == "HR"
+    assert await db.delete_current_team("user-1")
+    assert await db.get_current_team("user-1") is None
+
+
+@pytest.mark.asyncio
+async def test_query_items_understands_cosmos_queries(db):
+    await _add_plans(db, 3)
+
+    plans = await db.query_items(
+        "SELECT * FROM c WHERE c.data_type=@data_type and c.user_id=@user_id ORDER BY c.initial_goal DESC",
+        [
+            {"name": "@data_type", "value": DataType.plan},
+            {"name": "@user_id", "value": "user-1"},
+        ],
+        Plan,
+    )
+
+    assert [p.initial_goal for p in plans] == ["Goal 2", "Goal 1", "Goal 0"]
+
+
+@pytest.mark.asyncio
+async def test_add_item_rejects_duplicates(db):
+    plan = Plan(id="plan-1", plan_id="plan-1", user_id="user-1", initial_goal="Goal")
+    await db.add_plan(plan)
+
+    with pytest.raises(ValueError):
+        await db.add_plan(plan)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend, cls", [("memory", MemoryDatabase), ("sqlite", SqliteDatabase)])
+async def test_factory_selects_backend_from_config(backend, cls, tmp_path):
+    DatabaseFactory._instance = None
+    DatabaseFactory._init_lock = None
+    with patch.multiple(
+        "common.database.database_factory.config",
+        DATABASE_BACKEND=backend,
+        SQLITE_DATABASE_PATH=str(tmp_path / "factory.sqlite3"),
+    ):
+        first = await DatabaseFactory.get_database(user_id="user-a")
+        await first.add_plan(
+            Plan(id="p", plan_id="p", user_id="user-a", initial_goal="Shared store")
+        )
+        second = await DatabaseFactory.get_database(user_id="user-a")
+
+        assert isinstance(first, cls)
+        assert (await second.get_plan("p")).initial_goal == "Shared store"
+        await DatabaseFactory.close_all()
@@ -0,0 +1,114 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb, serialization  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    Plan,
+    PlanStatus,
+    TeamAgent,
+    TeamConfiguration,
+)
+
+CREATED = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def _plan() -> Plan:
+    return Plan(
+        id="plan-1",
+        plan_id="plan-1",
+        session_id="session-1",
+        user_id="user-1",
+        initial_goal="Onboard",
+        overall_status=PlanStatus.completed,
+        timestamp=CREATED,
+        m_plan={"steps": [{"action": "Create account", "due": CREATED}]},
+    )
+
+
+def test_to_document_converts_nested_datetimes_and_enums():
+    document = serialization.to_document(_plan())
+
+    assert document == _plan().model_dump(mode="json")
+    assert document["timestamp"] == "2024-05-01T12:30:00Z"
+    assert document["m_plan"]["steps"][0]["due"] == "2024-05-01T12:30:00Z"
+    assert document["overall_status"] == "completed"
+    assert document["data_type"] == "plan"
+
+
+def test_from_document_round_trips_nested_models():
+    team = TeamConfiguration(
+        team_id="team-1",
+        session_id="team-1",
+        name="HR",
+        status="visible",
+        created="2024-01-01",
+        created_by="user-1",
+        user_id="user-1",
+        agents=[
+            TeamAgent(input_key="hr", type="ai", name="HRAgent", deployment_name="gpt-4o", icon="Person")
+        ],
+    )
+    document = serialization.to_document(team)
+    document.update({"_rid": "rid", "_etag": "etag", "_ts": 1714566600})
+
+    restored = serialization.from_document(document, TeamConfiguration)
+
+    assert restored == team
+    assert isinstance(restored.agents[0], TeamAgent)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_and_loads_with_and_without_orjson(use_orjson):
+    document = serialization.to_document(_plan())
+    orjson = serialization.orjson if use_orjson else None
+
+    with patch.object(serialization, "orjson", orjson):
+        raw = serialization.dumps(document)
+
+        assert isinstance(raw, str)
+        assert serialization.loads(raw) == document
+
+
+@pytest.mark.asyncio
+async def test_cosmos_writes_nested_datetimes_as_iso_strings():
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        db = CosmosDBClient("https://stub", None, "db", "container", user_id="user-1")
+        await db.initialize()
+        await db.add_plan(_plan())
+
+        stored = await db.container.read_item(item="plan-1", partition_key="session-1")
+        plan = await db.get_plan_by_plan_id("plan-1")
+        await db.close()
+
+    assert stored["m_plan"]["steps"][0]["due"] == "2024-05-01T12:30:00Z"
+    assert plan.timestamp == CREATED
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_to_json_bytes_matches_jsonable_encoder(use_orjson):
+    from fastapi.encoders import jsonable_encoder
+
+    body = {"plan": _plan(), "plans": [_plan()], "streaming_message": "héllo", "team": None}
+    expected = json.dumps(jsonable_encoder(body), ensure_ascii=False, separators=(",", ":")).encode()
+    orjson = serialization.orjson if use_orjson else None
+
+    with patch.object(serialization, "orjson", orjson):
+        assert serialization.to_json_bytes(body) == expected
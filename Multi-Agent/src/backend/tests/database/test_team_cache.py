@@ -0,0 +1,135 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.database.team_cache import TeamCache  # noqa: E402
+from common.models.messages_kernel import TeamConfiguration, UserCurrentTeam  # noqa: E402
+
+TEAM_ID = "team-1"
+
+
+def _team(name: str = "HR") -> TeamConfiguration:
+    return TeamConfiguration(
+        id=TEAM_ID,
+        team_id=TEAM_ID,
+        session_id=TEAM_ID,
+        name=name,
+        status="visible",
+        created="2024-01-01",
+        created_by="user-1",
+        user_id="user-1",
+    )
+
+
+def _client() -> CosmosDBClient:
+    # change_feed_poll_seconds is left at 0: tests poll the listener by hand
+    return CosmosDBClient(
+        "https://stub", None, "db", "container", user_id="user-1", team_cache_ttl_seconds=60
+    )
+
+
+@pytest_asyncio.fixture
+async def db():
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        client = _client()
+        await client.initialize()
+        await client.add_team(_team())
+        cosmos_stub.stats.reset()
+        yield client
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_repeated_team_lookups_read_cosmos_once(db):
+    for _ in range(5):
+        team = await db.get_team_by_id(TEAM_ID)
+
+    assert team.name == "HR"
+    assert cosmos_stub.stats.operations["read_item"] == 1
+    assert db._team_cache.hit_ratio == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_update_team_invalidates_team_and_list(db):
+    assert [t.name for t in await db.get_all_teams()] == ["HR"]
+    await db.get_team(TEAM_ID)
+
+    await db.update_team(_team("Human Resources"))
+
+    assert (await db.get_team(TEAM_ID)).name == "Human Resources"
+    assert [t.name for t in await db.get_all_teams()] == ["Human Resources"]
+
+
+@pytest.mark.asyncio
+async def test_set_current_team_replaces_cached_missing_team(db):
+    assert await db.get_current_team("user-1") is None
+
+    await db.set_current_team(UserCurrentTeam(user_id="user-1", team_id=TEAM_ID))
+
+    assert (await db.get_current_team("user-1")).team_id == TEAM_ID
+
+
+@pytest.mark.asyncio
+async def test_callers_cannot_mutate_cached_teams(db):
+    team = await db.get_team(TEAM_ID)
+    team.name = "changed by caller"
+
+    assert (await db.get_team(TEAM_ID)).name == "HR"
+
+
+@pytest.mark.asyncio
+async def test_change_feed_invalidates_writes_from_other_replicas(db):
+    other_replica = _client()
+    await other_replica.initialize()
+    listener = cosmosdb.TeamChangeFeedListener(db.container, db._team_cache, poll_seconds=1)
+    await listener.poll()
+    await db.get_team(TEAM_ID)
+
+    await other_replica.update_team(_team("Renamed elsewhere"))
+    assert (await db.get_team(TEAM_ID)).name == "HR"
+    changed = await listener.poll()
+
+    assert changed == 1
+    assert (await db.get_team(TEAM_ID)).name == "Renamed elsewhere"
+    await other_replica.close()
+
+
+def test_entries_expire_and_least_recently_used_is_evicted():
+    cache = TeamCache(ttl_seconds=10, max_entries=2)
+    with patch("common.database.team_cache.time.monotonic", return_value=0):
+        cache.put("a", 1, cache.version)
+        cache.put("b", 2, cache.version)
+        cache.get("a")
+        cache.put("c", 3, cache.version)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+    with patch("common.database.team_cache.time.monotonic", return_value=11):
+        assert cache.get("a") == (False, None)
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = TeamCache(ttl_seconds=10)
+    version = cache.version
+
+    cache.invalidate_team(TEAM_ID)
+    cache.put(("team", TEAM_ID), "stale", version)
+
+    assert cache.get(("team", TEAM_ID)) == (False, None)
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from azure.cosmos.exceptions import (  # noqa: E402
+    CosmosHttpResponseError,
+    CosmosResourceExistsError,
+)
+
+from benchmarks import cosmos_stub  # noqa: E402
+from common.database import cosmosdb  # noqa: E402
+from common.database.cosmosdb import CosmosDBClient  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    Plan,
+    PlanStatus,
+)
+
+PLAN_ID = "plan-1"
+
+
+def _message(i: int, plan_id: str = PLAN_ID) -> AgentMessageData:
+    return AgentMessageData(
+        id=f"{plan_id}-message-{i}",
+        plan_id=plan_id,
+        user_id="user-1",
+        agent="HRHelperAgent",
+        content=f"Message {i}",
+        raw_data="{}",
+    )
+
+
+@pytest_asyncio.fixture
+async def db():
+    cosmos_stub.reset_stub()
+    with patch.object(cosmosdb, "CosmosClient", cosmos_stub.CosmosClientStub):
+        client = CosmosDBClient(
+            "https://stub",
+            None,
+            "db",
+            "container",
+            user_id="user-1",
+            # Long enough that only explicit flushes write anything in a test
+            write_behind_window_ms=60_000,
+            write_behind_max_batch=10,
+        )
+        await client.initialize()
+        await client.add_plan(Plan(id=PLAN_ID, plan_id=PLAN_ID, user_id="user-1", initial_goal="Goal"))
+        cosmos_stub.stats.reset()
+        yield client
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_messages_for_a_plan_are_written_in_one_batch(db):
+    for i in range(5):
+        await db.add_agent_message(_message(i))
+
+    assert cosmos_stub.stats.operations == {}
+    messages = await db.get_agent_messages(PLAN_ID)
+
+    assert [m.content for m in messages] == [f"Message {i}" for i in range(5)]
+    assert cosmos_stub.stats.operations["execute_item_batch"] == 1
+    assert "create_item" not in cosmos_stub.stats.operations
+
+
+@pytest.mark.asyncio
+async def test_buffered_plan_update_is_visible_to_next_read(db):
+    plan = await db.get_plan_by_plan_id(PLAN_ID)
+    plan.overall_status = PlanStatus.completed
+    await db.update_plan(plan)
+
+    reread = await db.get_plan_by_plan_id(PLAN_ID)
+
+    assert reread.overall_status == PlanStatus.completed
+
+
+@pytest.mark.asyncio
+async def test_full_partition_is_flushed_without_waiting_for_window(db):
+    for i in range(10):
+        await db.add_agent_message(_message(i))
+
+    assert cosmos_stub.stats.operations["execute_item_batch"] == 1
+    assert db._write_buffer.pending_count == 0
+
+
+@pytest.mark.asyncio
+async def test_close_writes_pending_messages(db):
+    for i in range(3):
+        await db.add_agent_message(_message(i))
+
+    await db.close()
+
+    fresh = CosmosDBClient("https://stub", None, "db", "container", user_id="user-1")
+    await fresh.initialize()
+    assert len(await fresh.get_agent_messages(PLAN_ID)) == 3
+    await fresh.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_individual_writes(db):
+    existing = _message(0)
+    existing.session_id = db._partition_keys[PLAN_ID]
+    await db.add_item(existing)
+    cosmos_stub.stats.reset()
+    for i in range(3):
+        await db.add_agent_message(_message(i))
+
+    # The duplicate create rolls back the batch; the other two still land
+    with pytest.raises(CosmosResourceExistsError):
+        await db._flush_writes(PLAN_ID)
+
+    assert cosmos_stub.stats.operations["create_item"] == 2
+    assert len(await db.get_agent_messages(PLAN_ID)) == 3
+
+
+@pytest.mark.asyncio
+async def test_throttled_batch_is_kept_and_retried(db):
+    for i in range(3):
+        await db.add_agent_message(_message(i))
+    container = db._write_buffer.container
+    original = container.execute_item_batch
+    throttled = CosmosHttpResponseError(status_code=429, message="Request rate is large")
+
+    with patch.object(container, "execute_item_batch", side_effect=throttled):
+        with pytest.raises(CosmosHttpResponseError):
+            await db._flush_writes(PLAN_ID)
+    assert db._write_buffer.pending_count == 3
+
+    # Writes buffered after the failure go out with the requeued ones
+    await db.add_agent_message(_message(3))
+    with patch.object(container, "execute_item_batch", wraps=original):
+        messages = await db.get_agent_messages(PLAN_ID)
+
+    assert [m.content for m in messages] == [f"Message {i}" for i in range(4)]
+    assert db._write_buffer.pending_count == 0
+
+
+@pytest.mark.asyncio
+async def test_background_flush_failure_is_raised_by_the_next_flush(db):
+    buffer = db._write_buffer
+    buffer.window_seconds = 0.01
+    existing = _message(0)
+    existing.session_id = db._partition_keys[PLAN_ID]
+    await db.add_item(existing)
+    await db.add_agent_message(_message(0))
+
+    await asyncio.sleep(0.05)
+
+    assert buffer.pending_count == 0
+    with pytest.raises(CosmosResourceExistsError):
+        await db._flush_writes(PLAN_ID)
+    await db._flush_writes(PLAN_ID)
@@ -0,0 +1,150 @@
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.models.messages_kernel import Plan, PlanStatus  # noqa: E402
+from common.utils.rate_limiter import AdmissionController, MemoryTokenBucketStore, RateLimit  # noqa: E402
+from config.settings import orchestration_config  # noqa: E402
+from models.messages import MPlan  # noqa: E402
+
+HEADERS = {"x-ms-client-principal-id": "user-1"}
+
+
+async def _safe_unless_flagged(text):
+    return "forbidden" not in text
+
+
+@pytest_asyncio.fixture
+async def api():
+    from api.router import app_v3
+    from fastapi import FastAPI
+
+    db = MemoryDatabase().for_user("user-1")
+    await db.add_plan(Plan(id="plan-1", plan_id="plan-1", user_id="user-1", team_id="team-1", initial_goal="Onboard"))
+    orchestration_config.set_clarification_pending("req-1")
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    with patch("api.router.DatabaseFactory.get_database", AsyncMock(return_value=db)), patch(
+        "common.services.batch_service.rai_success", AsyncMock(side_effect=_safe_unless_flagged)
+    ):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test", headers=HEADERS
+        ) as client:
+            yield client, db
+    orchestration_config.cleanup_clarification("req-1")
+
+
+def _agent_message(content, **extra):
+    payload = {"plan_id": "plan-1", "agent": "HRHelperAgent", "content": content, "agent_type": "AI_Agent"}
+    return {"type": "agent_message", "payload": {**payload, **extra}}
+
+
+@pytest.mark.asyncio
+async def test_operations_get_their_own_results_in_order(api):
+    client, db = api
+    operations = [
+        {"type": "user_clarification", "payload": {"request_id": "req-1", "answer": "Yes", "plan_id": "plan-1"}},
+        _agent_message("Working on it"),
+        {"type": "user_clarification", "payload": {"request_id": "req-unknown", "answer": "Yes"}},
+        {"type": "user_clarification", "payload": {"request_id": "req-1", "answer": "forbidden words"}},
+        {"type": "agent_message", "payload": {"plan_id": "plan-1"}},
+        _agent_message("All done", is_final=True, streaming_message="Done"),
+    ]
+    with patch.object(MemoryDatabase, "add_agent_messages", wraps=db.add_agent_messages) as grouped:
+        response = await client.post("/api/v3/batch", json={"operations": operations})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == list(range(len(operations)))
+    assert [r["status_code"] for r in results] == [200, 200, 404, 400, 422, 200]
+    assert results[0]["body"] == {"status": "clarification recorded"}
+    assert results[3]["detail"]["error_type"] == "RAI_VALIDATION_FAILED"
+
+    assert orchestration_config.clarifications["req-1"] == "Yes"
+    # Every message is written in one group
+    grouped.assert_awaited_once()
+    stored = await db.get_agent_messages("plan-1")
+    assert [m.content for m in stored] == ["Yes", "Working on it", "All done"]
+    plan = await db.get_plan("plan-1")
+    assert plan.overall_status == PlanStatus.completed
+    assert plan.streaming_message == "Done"
+
+
+@pytest.mark.asyncio
+async def test_approval_without_pending_plan_is_not_found(api):
+    client, _ = api
+    response = await client.post(
+        "/api/v3/batch",
+        json={"operations": [{"type": "plan_approval", "payload": {"m_plan_id": "m-unknown", "approved": True}}]},
+    )
+
+    assert response.json()["results"] == [
+        {"index": 0, "type": "plan_approval", "status_code": 404, "detail": "No active plan found for approval"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_bounded(api):
+    client, _ = api
+    empty = await client.post("/api/v3/batch", json={"operations": []})
+    too_many = await client.post("/api/v3/batch", json={"operations": [_agent_message("m")] * 101})
+    unknown_type = await client.post("/api/v3/batch", json={"operations": [{"type": "delete_plan", "payload": {}}]})
+
+    assert empty.status_code == 400
+    assert too_many.status_code == 400
+    assert unknown_type.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_rejection_deletes_messages_sent_earlier_in_the_batch(api):
+    client, db = api
+    await db.add_plan(Plan(id="plan-2", plan_id="plan-2", user_id="user-1", team_id="team-1", initial_goal="Offboard"))
+    orchestration_config.set_approval_pending("m-plan-1")
+    orchestration_config.plans["m-plan-1"] = MPlan(plan_id="plan-1")
+    operations = [
+        _agent_message("Planned"),
+        _agent_message("Other plan", plan_id="plan-2"),
+        {"type": "plan_approval", "payload": {"m_plan_id": "m-plan-1", "plan_id": "plan-1", "approved": False}},
+        _agent_message("Still on plan 2", plan_id="plan-2"),
+    ]
+    try:
+        response = await client.post("/api/v3/batch", json={"operations": operations})
+    finally:
+        orchestration_config.cleanup_approval("m-plan-1")
+        orchestration_config.plans.pop("m-plan-1", None)
+
+    assert [r["status_code"] for r in response.json()["results"]] == [200, 200, 200, 200]
+    # As if the operations had been sent one by one: the rejection deleted the
+    # plan and the message written before it
+    assert await db.get_plan("plan-1") is None
+    assert await db.get_agent_messages("plan-1") == []
+    assert [m.content for m in await db.get_agent_messages("plan-2")] == ["Other plan", "Still on plan 2"]
+
+
+@pytest.mark.asyncio
+async def test_more_clarifications_than_the_rate_limit_allows_are_rejected(api):
+    client, _ = api
+    clarification = {"type": "user_clarification", "payload": {"request_id": "req-1", "answer": "Yes"}}
+    controller = AdmissionController(MemoryTokenBucketStore(), {"user_clarification": RateLimit(2, 60)})
+
+    with patch("api.router.admission_controller", controller):
+        response = await client.post("/api/v3/batch", json={"operations": [clarification] * 3})
+
+    assert response.status_code == 400
+    assert "rate limit of 2" in response.json()["detail"]
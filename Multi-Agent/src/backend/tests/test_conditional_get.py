@@ -0,0 +1,139 @@
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from api.response_cache import etag_matches, response_cache  # noqa: E402
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    Plan,
+    PlanStatus,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+
+TEAM_ID = "team-1"
+HEADERS = {"x-ms-client-principal-id": "user-1"}
+
+
+def _team(team_id: str, name: str) -> TeamConfiguration:
+    return TeamConfiguration(
+        id=team_id,
+        team_id=team_id,
+        session_id=team_id,
+        name=name,
+        status="visible",
+        created="2024-01-01",
+        created_by="user-1",
+        user_id="user-1",
+    )
+
+
+def _plan(plan_id: str, goal: str) -> Plan:
+    return Plan(
+        id=plan_id,
+        plan_id=plan_id,
+        user_id="user-1",
+        team_id=TEAM_ID,
+        initial_goal=goal,
+        overall_status=PlanStatus.completed,
+    )
+
+
+@pytest_asyncio.fixture
+async def api():
+    from api.router import app_v3
+    from fastapi import FastAPI
+
+    db = MemoryDatabase().for_user("user-1")
+    await db.add_team(_team(TEAM_ID, "HR"))
+    await db.set_current_team(UserCurrentTeam(user_id="user-1", team_id=TEAM_ID))
+    await db.add_plan(_plan("plan-1", "Onboard Jane"))
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    response_cache.clear()
+    with patch("api.router.DatabaseFactory.get_database", AsyncMock(return_value=db)):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test", headers=HEADERS
+        ) as client:
+            yield client, db
+    response_cache.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v3/team_configs", "/api/v3/plans"])
+async def test_unchanged_list_is_not_modified(api, path):
+    client, _ = api
+
+    first = await client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and first.headers["cache-control"] == "private, no-cache"
+
+    again = await client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    # A client without the body gets the same bytes, served from the cache
+    hits = response_cache.hits
+    cached = await client.get(path)
+    assert cached.content == first.content
+    assert response_cache.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_changed_plans_get_a_new_etag(api):
+    client, db = api
+    first = await client.get("/api/v3/plans")
+    assert [p["id"] for p in first.json()] == ["plan-1"]
+
+    plan = await db.get_plan_by_plan_id("plan-1")
+    plan.initial_goal = "Onboard John"
+    # Written by an orchestration, which does not touch the response cache
+    await db.update_plan(plan)
+
+    changed = await client.get("/api/v3/plans", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert changed.json()[0]["initial_goal"] == "Onboard John"
+
+
+@pytest.mark.asyncio
+async def test_team_writes_change_the_team_configs_etag(api):
+    client, db = api
+    first = await client.get("/api/v3/team_configs")
+
+    await db.add_team(_team("team-2", "IT"))
+    added = await client.get("/api/v3/team_configs", headers={"If-None-Match": first.headers["etag"]})
+    assert added.status_code == 200
+    assert {t["name"] for t in added.json()} == {"HR", "IT"}
+
+    deleted = await client.delete("/api/v3/team_configs/team-2")
+    assert deleted.status_code == 200
+    after_delete = await client.get("/api/v3/team_configs")
+    assert [t["name"] for t in after_delete.json()] == ["HR"]
+    # Back to the same documents, so back to the first version
+    assert after_delete.headers["etag"] == first.headers["etag"]
+
+
+def test_if_none_match_parsing():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
@@ -76,3 +76,12 @@ def test_get_bool_config():
         assert GetBoolConfig("FEATURE_ENABLED") is True
     with patch.dict("os.environ", {"FEATURE_ENABLED": "0"}):
         assert GetBoolConfig("FEATURE_ENABLED") is False
+
+
+def test_get_bool_config_default_applies_only_when_unset():
+    with patch.dict("os.environ", {}, clear=False):
+        os.environ.pop("FEATURE_ENABLED", None)
+        assert app_config._get_bool("FEATURE_ENABLED", default=True) is True
+        assert app_config._get_bool("FEATURE_ENABLED") is False
+    with patch.dict("os.environ", {"FEATURE_ENABLED": "false"}):
+        assert app_config._get_bool("FEATURE_ENABLED", default=True) is False
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from azure.core.credentials import AccessToken
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.utils.credential_broker import CredentialBroker  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+
+SCOPE = "https://cognitiveservices.azure.com/.default"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCredential:
+    """Issues one-hour tokens, slowly, and counts them."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.requests = []
+
+    def get_token(self, *scopes, **kwargs):
+        time.sleep(0.01)
+        self.requests.append((scopes, kwargs))
+        return AccessToken(f"token-{len(self.requests)}", int(self.clock() + 3600))
+
+
+def _broker(clock):
+    credential = FakeCredential(clock)
+    return CredentialBroker(lambda: credential, refresh_margin_seconds=300, clock=clock), credential
+
+
+def test_tokens_are_cached_until_the_refresh_margin():
+    clock = FakeClock()
+    broker, credential = _broker(clock)
+    provider = broker.token_provider(SCOPE)
+
+    threads = [threading.Thread(target=provider) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    clock.now += 3000
+    still_cached = provider()
+    clock.now += 301
+    renewed = provider()
+
+    assert still_cached == "token-1"
+    assert renewed == "token-2"
+    assert broker.acquired == 2
+
+
+@pytest.mark.asyncio
+async def test_sdk_credentials_share_the_cache_except_for_claims():
+    clock = FakeClock()
+    broker, credential = _broker(clock)
+
+    first = await broker.async_credential.get_token(SCOPE)
+    second = broker.credential.get_token(SCOPE)
+    challenged = await broker.async_credential.get_token(SCOPE, claims='{"access_token": {}}')
+
+    assert first.token == second.token == "token-1"
+    assert challenged.token == "token-2"
+    assert broker.acquired == 1
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_renews_tokens_before_callers_need_to():
+    clock = FakeClock()
+    broker, credential = _broker(clock)
+    broker.get_token(SCOPE)
+    broker.get_token("https://management.azure.com/.default")
+
+    # Within twice the margin of expiring
+    clock.now += 3001
+    await broker.refresh_expiring()
+    assert broker.acquired == 4
+
+    # Nothing is due again until the renewed tokens approach their margin
+    await broker.refresh_expiring()
+    clock.now += 301
+    assert broker.get_token(SCOPE).token == "token-3"
+    assert broker.acquired == 4
+
+
+@pytest.mark.asyncio
+async def test_agent_templates_share_the_project_client():
+    broker = CredentialBroker(MagicMock(), refresh_margin_seconds=300)
+    client = MagicMock(close=AsyncMock())
+    templates = [
+        FoundryAgentTemplate(
+            agent_name=f"Agent{i}",
+            agent_description="",
+            agent_instructions="",
+            model_deployment_name="gpt-4o",
+        )
+        for i in range(3)
+    ]
+    with patch("magentic_agents.common.lifecycle.credential_broker", broker), patch(
+        "semantic_kernel.agents.AzureAIAgent.create_client", return_value=client
+    ) as create_client, patch.object(FoundryAgentTemplate, "_after_open", AsyncMock()):
+        await asyncio.gather(*(template.open() for template in templates))
+        assert {id(template.client) for template in templates} == {id(client)}
+        for template in templates:
+            await template.close()
+        client.close.assert_not_awaited()
+        await broker.close()
+
+    create_client.assert_called_once_with(credential=broker.async_credential)
+    client.close.assert_awaited_once()
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.utils.event_stream import HEARTBEAT_FRAME, RETRY_FRAME, EventStream  # noqa: E402
+from models.messages import WebsocketMessageType  # noqa: E402
+
+
+def _message(n):
+    return {"type": WebsocketMessageType.AGENT_MESSAGE, "data": {"n": n}}
+
+
+def _parse(frame: bytes):
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().splitlines())
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+async def _take(frames, count):
+    return [await asyncio.wait_for(frames.__anext__(), 1) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_subscriber_gets_buffered_then_live_events():
+    stream = EventStream(buffer_size=10)
+    stream.publish("user-1", _message(1))
+    frames = stream.subscribe("user-1")
+
+    retry, buffered = await _take(frames, 2)
+    stream.publish("user-1", _message(2))
+    stream.publish("user-2", _message(99))
+    (live,) = await _take(frames, 1)
+
+    assert retry == RETRY_FRAME
+    assert _parse(buffered) == (f"{stream.stream_id}-1", "agent_message", {"type": "agent_message", "data": {"n": 1}})
+    assert _parse(live)[2]["data"] == {"n": 2}
+    assert stream.has_subscribers("user-1")
+    await frames.aclose()
+    assert not stream.has_subscribers("user-1")
+
+
+@pytest.mark.asyncio
+async def test_last_event_id_replays_only_missed_events():
+    stream = EventStream(buffer_size=3)
+    for n in range(1, 6):
+        stream.publish("user-1", _message(n))
+
+    resumed = stream.subscribe("user-1", f"{stream.stream_id}-3")
+    _, *missed = await _take(resumed, 3)
+    # An id from before a restart cannot be trusted: replay what is buffered
+    restarted = stream.subscribe("user-1", "0badcafe-4")
+    _, *replayed = await _take(restarted, 4)
+
+    assert [_parse(frame)[2]["data"]["n"] for frame in missed] == [4, 5]
+    assert [_parse(frame)[2]["data"]["n"] for frame in replayed] == [3, 4, 5]
+    await resumed.aclose()
+    await restarted.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_heartbeats():
+    stream = EventStream(heartbeat_seconds=0.01)
+    frames = stream.subscribe("user-1")
+
+    assert await _take(frames, 3) == [RETRY_FRAME, HEARTBEAT_FRAME, HEARTBEAT_FRAME]
+    await frames.aclose()
+
+
+@pytest.mark.asyncio
+async def test_send_to_user_publishes_without_a_socket():
+    from config.settings import ConnectionConfig, event_stream
+
+    frames = event_stream.subscribe("user-sse")
+    await _take(frames, 1)
+    await ConnectionConfig().send_status_update_async({"step": 1}, "user-sse", WebsocketMessageType.SYSTEM_MESSAGE)
+    (frame,) = await _take(frames, 1)
+
+    assert _parse(frame)[1:] == ("system_message", {"type": "system_message", "data": {"step": 1}})
+    await frames.aclose()
+
+
+@pytest.mark.asyncio
+async def test_events_endpoint_streams_for_the_signed_in_user():
+    from api.router import stream_events
+    from auth.user_context import UserContext
+    from config.settings import event_stream
+    from fastapi import Request
+
+    event_stream.publish("user-endpoint", _message(1))
+    event_stream.publish("user-endpoint", _message(2))
+    request = Request({"type": "http", "headers": [(b"last-event-id", f"{event_stream.stream_id}-1".encode())]})
+    response = await stream_events(request, None, UserContext(user_principal_id="user-endpoint"))
+    frames = response.body_iterator
+    _, missed = await _take(frames, 2)
+
+    assert response.media_type == "text/event-stream"
+    assert response.headers["cache-control"] == "no-cache"
+    assert _parse(missed)[2]["data"] == {"n": 2}
+    await frames.aclose()
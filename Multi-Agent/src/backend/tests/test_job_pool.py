@@ -0,0 +1,323 @@
+import asyncio
+import os
+import sys
+from collections import defaultdict
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.jobs.job_pool import (  # noqa: E402
+    IdempotencyConflictError,
+    JobPool,
+    JobQueueFullError,
+)
+from common.models.messages_kernel import (  # noqa: E402
+    JobStatus,
+    TeamConfiguration,
+    UserCurrentTeam,
+)
+from common.utils.rate_limiter import AdmissionController, MemoryTokenBucketStore  # noqa: E402
+
+TEAM_ID = "team-1"
+USERS = [f"user-{i}" for i in range(20)]
+
+
+class FakeOrchestration:
+    """Stands in for OrchestrationManager, recording how many runs overlap."""
+
+    def __init__(self, duration: float = 0.001):
+        self.duration = duration
+        self.running = 0
+        self.max_running = 0
+        self.running_by_user = defaultdict(int)
+        self.max_running_by_user = 0
+        self.runs = []
+
+    async def run_orchestration(self, user_id, input_task):
+        self.running += 1
+        self.running_by_user[user_id] += 1
+        self.max_running = max(self.max_running, self.running)
+        self.max_running_by_user = max(self.max_running_by_user, self.running_by_user[user_id])
+        try:
+            await asyncio.sleep(self.duration)
+            self.runs.append((user_id, input_task.description))
+        finally:
+            self.running -= 1
+            self.running_by_user[user_id] -= 1
+
+
+async def _wait_until_done(pool: JobPool, timeout: float = 30) -> None:
+    async def drained():
+        while pool.queued or pool.running:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(drained(), timeout)
+
+
+@pytest_asyncio.fixture
+async def database():
+    db = MemoryDatabase()
+    await db.add_team(
+        TeamConfiguration(
+            id=TEAM_ID,
+            team_id=TEAM_ID,
+            session_id=TEAM_ID,
+            name="HR",
+            status="visible",
+            created="2024-01-01",
+            created_by=USERS[0],
+            user_id=USERS[0],
+        )
+    )
+    for user in USERS:
+        await db.set_current_team(UserCurrentTeam(user_id=user, team_id=TEAM_ID))
+    yield db
+    await db.close()
+
+
+def _api_client(db, pool, orchestration):
+    from api.router import app_v3
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    manager = MagicMock(return_value=orchestration)
+    patches = (
+        patch("api.router.DatabaseFactory.get_database", AsyncMock(return_value=db)),
+        patch("api.router.rai_success", AsyncMock(return_value=True)),
+        patch("orchestration.job_transport.OrchestrationManager", manager),
+        patch("api.router.job_pool", pool),
+        # Admission control is covered in test_rate_limiter
+        patch("api.router.admission_controller", AdmissionController(MemoryTokenBucketStore(), {})),
+    )
+    for p in patches:
+        p.start()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    return client, patches
+
+
+@pytest_asyncio.fixture
+async def api(database):
+    """Yields a factory ``(pool, orchestration) -> client`` for the v3 API."""
+    opened = []
+
+    def make(pool, orchestration):
+        client, patches = _api_client(database, pool, orchestration)
+        opened.append((client, patches))
+        return client
+
+    yield make
+    for client, patches in opened:
+        await client.aclose()
+        for p in patches:
+            p.stop()
+
+
+def _post(client, user, description, key=None):
+    body = {"session_id": "", "description": description}
+    if key:
+        body["idempotency_key"] = key
+    return client.post(
+        "/api/v3/process_request", json=body, headers={"x-ms-client-principal-id": user}
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_respects_global_and_per_user_limits():
+    pool = JobPool(max_workers=2, max_jobs_per_user=1, max_queued=10, max_queued_per_user=10)
+    gate = asyncio.Event()
+
+    async def run():
+        await gate.wait()
+
+    jobs = [pool.submit(user, run) for user in ("a", "a", "b", "c")]
+    await asyncio.sleep(0)
+
+    statuses = [pool.get(job.job_id).status for job in jobs]
+    assert statuses == [JobStatus.running, JobStatus.queued, JobStatus.running, JobStatus.queued]
+    assert pool.queue_position(jobs[1].job_id) == 1
+    assert pool.queue_position(jobs[3].job_id) == 2
+
+    gate.set()
+    await _wait_until_done(pool)
+    assert all(pool.get(job.job_id).status == JobStatus.completed for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_pool_records_failures_and_refuses_when_full():
+    pool = JobPool(max_workers=1, max_jobs_per_user=1, max_queued=1, max_queued_per_user=1)
+
+    async def fail():
+        raise RuntimeError("agent unavailable")
+
+    failed = pool.submit("a", fail)
+    await _wait_until_done(pool)
+    assert pool.get(failed.job_id).status == JobStatus.failed
+    assert pool.get(failed.job_id).error == "agent unavailable"
+
+    gate = asyncio.Event()
+    pool.submit("a", gate.wait)
+    pool.submit("b", gate.wait)
+    with pytest.raises(JobQueueFullError) as excinfo:
+        pool.check_capacity("c")
+    assert excinfo.value.retry_after >= 1
+
+    await pool.shutdown(timeout=0.01)
+    assert pool.running == 0 and pool.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_is_claimed_once_per_user():
+    pool = JobPool()
+
+    assert pool.claim("a", "k1") is None
+    with pytest.raises(IdempotencyConflictError):
+        pool.claim("a", "k1")
+    assert pool.claim("b", "k1") is None
+
+    job = pool.submit("a", AsyncMock(), idempotency_key="k1")
+    assert pool.claim("a", "k1").job_id == job.job_id
+
+    pool.release("b", "k1")
+    assert pool.claim("b", "k1") is None
+    await _wait_until_done(pool)
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_and_idle_users_are_forgotten_without_keys():
+    pool = JobPool(max_workers=2, max_queued=100, max_queued_per_user=100, retention_seconds=0)
+
+    for i in range(50):
+        pool.submit(f"user-{i}", AsyncMock())
+    await _wait_until_done(pool)
+    pool.check_capacity("someone-else")
+
+    assert pool._jobs == {}
+    assert not pool._finished
+    assert not pool._queued_by_user
+    assert not pool._running_by_user
+
+
+@pytest.mark.asyncio
+async def test_reserved_slots_count_until_submitted_or_given_up():
+    pool = JobPool(max_workers=1, max_queued=2, max_queued_per_user=1)
+
+    pool.reserve("a")
+    pool.reserve("b")
+    with pytest.raises(JobQueueFullError):
+        pool.reserve("c")
+    with pytest.raises(JobQueueFullError):
+        pool.check_capacity("a")
+    pool.unreserve("b")
+    pool.reserve("c")
+    pool.submit("a", AsyncMock(), reserved=True)
+    await _wait_until_done(pool)
+    pool.submit("c", AsyncMock(), reserved=True)
+    await _wait_until_done(pool)
+
+    assert pool._reserved == 0
+    assert not pool._reserved_by_user
+
+
+async def _slow_rai(description):
+    await asyncio.sleep(0.05)
+    return True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_do_not_overfill_the_queue(api, database):
+    pool = JobPool(max_workers=1, max_jobs_per_user=1, max_queued=2, max_queued_per_user=10)
+    client = api(pool, FakeOrchestration(duration=60))
+
+    # Every request is still in its RAI check when the others arrive
+    with patch("api.router.rai_success", _slow_rai):
+        responses = await asyncio.gather(*(_post(client, user, "task") for user in USERS[:10]))
+
+    accepted = [r for r in responses if r.status_code == 200]
+    assert len(accepted) == 2
+    assert all(r.status_code == 429 for r in responses if r.status_code != 200)
+    assert pool.queued + pool.running == 2
+    plans = [p for user in USERS[:10] for p in await database.get_all_plans_by_team_id_status(user, TEAM_ID, "in_progress")]
+    assert len(plans) == 2
+    await pool.shutdown(timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_refused_submission_is_429_and_removes_the_plan(api, database):
+    pool = JobPool()
+    client = api(pool, FakeOrchestration())
+
+    with patch("api.router.rai_success", _slow_rai):
+        request = asyncio.create_task(_post(client, USERS[0], "task"))
+        await asyncio.sleep(0.01)
+        await pool.shutdown()
+        response = await request
+
+    assert response.status_code == 429
+    assert await database.get_all_plans_by_team_id_status(USERS[0], TEAM_ID, "in_progress") == []
+    assert pool._reserved == 0
+
+
+@pytest.mark.asyncio
+async def test_process_request_returns_429_with_retry_after_when_queue_is_full(api):
+    pool = JobPool(max_workers=1, max_jobs_per_user=1, max_queued=2, max_queued_per_user=2)
+    orchestration = FakeOrchestration(duration=60)
+    client = api(pool, orchestration)
+
+    accepted = [await _post(client, USERS[0], f"task {i}") for i in range(3)]
+    throttled = await _post(client, USERS[0], "task 3")
+
+    assert [r.status_code for r in accepted] == [200, 200, 200]
+    assert [r.json()["job_status"] for r in accepted] == ["running", "queued", "queued"]
+    assert throttled.status_code == 429
+    assert int(throttled.headers["Retry-After"]) >= 1
+
+    job = await client.get(
+        f"/api/v3/jobs/{accepted[2].json()['job_id']}",
+        headers={"x-ms-client-principal-id": USERS[0]},
+    )
+    other_user = await client.get(
+        f"/api/v3/jobs/{accepted[2].json()['job_id']}",
+        headers={"x-ms-client-principal-id": USERS[1]},
+    )
+    assert job.json()["queue_position"] == 2
+    assert other_user.status_code == 404
+    await pool.shutdown(timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_soak_1000_requests_with_retries(api, database):
+    pool = JobPool(max_workers=8, max_jobs_per_user=1, max_queued=1000, max_queued_per_user=50)
+    orchestration = FakeOrchestration()
+    client = api(pool, orchestration)
+
+    requests = [(user, f"{user} task {i}", f"{user}-{i}") for i in range(50) for user in USERS]
+    responses = await asyncio.gather(*(_post(client, *r) for r in requests))
+    # Every client retries its first two requests, as after a dropped connection
+    retries = await asyncio.gather(*(_post(client, *r) for r in requests if r[2].endswith(("-0", "-1"))))
+    await _wait_until_done(pool)
+
+    assert len(requests) == 1000
+    assert all(r.status_code == 200 for r in responses + retries)
+    job_ids = {r.json()["job_id"] for r in responses}
+    assert len(job_ids) == 1000
+    assert {r.json()["job_id"] for r in retries} <= job_ids
+    assert all(pool.get(job_id).status == JobStatus.completed for job_id in job_ids)
+    assert len(orchestration.runs) == 1000
+    assert orchestration.max_running <= 8
+    assert orchestration.max_running_by_user == 1
+    plans = [p for user in USERS for p in await database.get_all_plans_by_team_id_status(user, TEAM_ID, "in_progress")]
+    assert len(plans) == 1000
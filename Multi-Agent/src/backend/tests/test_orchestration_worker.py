@@ -0,0 +1,213 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.jobs.sqlite_queue import SqliteJobQueue  # noqa: E402
+from common.models.messages_kernel import InputTask  # noqa: E402
+from common.utils.event_stream import EventStream  # noqa: E402
+from config.settings import ConnectionConfig, OrchestrationConfig  # noqa: E402
+from models.messages import WebsocketMessageType  # noqa: E402
+from orchestration.job_transport import QueueJobTransport  # noqa: E402
+from orchestration_worker import OrchestrationWorker  # noqa: E402
+
+POLL_SECONDS = 0.01
+
+
+class Side:
+    """The orchestration and connection state of one process."""
+
+    def __init__(self):
+        self.orchestration = OrchestrationConfig()
+        self.connections = ConnectionConfig()
+
+
+@pytest_asyncio.fixture
+async def deployment(tmp_path):
+    """An API transport and a factory of workers, each with its own queue connection and state."""
+    path = str(tmp_path / "queue.sqlite3")
+    api = Side()
+    transport = QueueJobTransport(
+        SqliteJobQueue(path), POLL_SECONDS, api.orchestration, api.connections
+    )
+    await transport.start()
+    stop = asyncio.Event()
+    running = []
+
+    def start_worker(runner, concurrency=1, **options):
+        worker_side = Side()
+        worker = OrchestrationWorker(
+            SqliteJobQueue(path),
+            concurrency=concurrency,
+            poll_seconds=POLL_SECONDS,
+            worker_id=f"worker-{len(running)}",
+            runner=runner,
+            orchestration=worker_side.orchestration,
+            connections=worker_side.connections,
+            **options,
+        )
+        running.append((worker, asyncio.create_task(worker.run(stop))))
+        return worker, worker_side
+
+    yield api, transport, start_worker
+    stop.set()
+    for worker, task in running:
+        await task
+        await worker.queue.close()
+    await transport.close()
+
+
+def _task(description: str) -> InputTask:
+    return InputTask(session_id="session-1", description=description)
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_shared_between_workers(deployment):
+    _, transport, start_worker = deployment
+    runs = []
+
+    async def runner(user_id, input_task):
+        await asyncio.sleep(0.01)
+        runs.append((user_id, input_task.description))
+
+    workers = [start_worker(runner, concurrency=2)[0] for _ in range(2)]
+
+    await asyncio.wait_for(
+        asyncio.gather(*(transport.run(f"user-{i % 3}", _task(f"task {i}")) for i in range(20))),
+        timeout=10,
+    )
+
+    assert sorted(description for _, description in runs) == sorted(f"task {i}" for i in range(20))
+    assert sum(w.completed for w in workers) == 20
+    assert all(w.stats()["jobs_per_minute"] > 0 for w in workers if w.completed)
+    assert await transport.queue.pending_jobs() == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_failure_is_raised_by_the_api_transport(deployment):
+    _, transport, start_worker = deployment
+    worker, _ = start_worker(AsyncMock(side_effect=RuntimeError("no agents for team")))
+
+    with pytest.raises(RuntimeError, match="no agents for team"):
+        await asyncio.wait_for(transport.run("user-1", _task("fails")), timeout=5)
+    assert worker.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_events_and_approvals_cross_processes(deployment):
+    api, transport, start_worker = deployment
+    socket = AsyncMock()
+    api.connections.add_connection("process-1", socket, user_id="user-1")
+    approvals = []
+
+    async def runner(user_id, input_task):
+        await worker_side.connections.send_status_update_async(
+            {"content": "planning"}, user_id, message_type=WebsocketMessageType.AGENT_MESSAGE
+        )
+        worker_side.orchestration.set_approval_pending("m-plan-1")
+        approvals.append(await worker_side.orchestration.wait_for_approval("m-plan-1", timeout=5))
+
+    _, worker_side = start_worker(runner)
+    job = asyncio.create_task(transport.run("user-1", _task("needs approval")))
+
+    async def approval_requested():
+        while "m-plan-1" not in api.orchestration.approvals:
+            await asyncio.sleep(POLL_SECONDS)
+
+    await asyncio.wait_for(approval_requested(), timeout=5)
+    # What /api/v3/plan_approval does in the API process
+    api.orchestration.set_approval_result("m-plan-1", True)
+    await asyncio.wait_for(job, timeout=5)
+
+    assert approvals == [True]
+    sent = socket.send_text.await_args_list[0].args[0]
+    assert '"content": "planning"' in sent
+
+
+@pytest.mark.asyncio
+async def test_events_reach_event_stream_subscribers_without_a_socket(deployment):
+    _, transport, start_worker = deployment
+    stream = EventStream(heartbeat_seconds=5)
+
+    async def runner(user_id, input_task):
+        await worker_side.connections.send_status_update_async(
+            {"content": "planning"}, user_id, message_type=WebsocketMessageType.AGENT_MESSAGE
+        )
+
+    _, worker_side = start_worker(runner)
+    with patch("config.settings.event_stream", stream):
+        frames = stream.subscribe("user-1")
+        assert await frames.__anext__() == b"retry: 3000\n\n"
+        received = asyncio.create_task(frames.__anext__())
+        await asyncio.wait_for(transport.run("user-1", _task("watched over SSE")), timeout=5)
+        frame = await asyncio.wait_for(received, timeout=5)
+        await frames.aclose()
+
+    assert b'"content": "planning"' in frame
+
+
+async def _claim_and_die(transport, description):
+    """Queue a job through the API and claim it by a worker that never reports back."""
+    job = asyncio.create_task(transport.run("user-1", _task(description)))
+    while await transport.queue.claim("dead-worker") is None:
+        await asyncio.sleep(POLL_SECONDS)
+    return job
+
+
+@pytest.mark.asyncio
+async def test_jobs_of_a_dead_worker_are_requeued(deployment):
+    _, transport, start_worker = deployment
+    job = await _claim_and_die(transport, "orphaned")
+    runs = []
+
+    async def runner(user_id, input_task):
+        runs.append(input_task.description)
+
+    start_worker(runner, lease_seconds=0.1, max_attempts=2)
+    await asyncio.wait_for(job, timeout=5)
+
+    assert runs == ["orphaned"]
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_dropped_after_max_attempts(deployment):
+    _, transport, start_worker = deployment
+    job = await _claim_and_die(transport, "poison")
+    runner = AsyncMock()
+
+    start_worker(runner, lease_seconds=0.1, max_attempts=1)
+    with pytest.raises(RuntimeError, match="stopped responding"):
+        await asyncio.wait_for(job, timeout=5)
+
+    runner.assert_not_awaited()
+    assert await transport.queue.pending_jobs() == 0
+
+
+@pytest.mark.asyncio
+async def test_api_gives_up_waiting_and_removes_the_job(deployment):
+    _, transport, _ = deployment
+    transport.timeout_seconds = 0.05
+
+    with pytest.raises(RuntimeError, match="did not finish"):
+        await transport.run("user-1", _task("nobody runs this"))
+    transport.timeout_seconds = 0
+    cancelled = asyncio.create_task(transport.run("user-1", _task("cancelled by the pool")))
+    await asyncio.sleep(0.05)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert await transport.queue.pending_jobs() == 0
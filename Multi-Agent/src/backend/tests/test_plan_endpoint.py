@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.models.messages_kernel import (  # noqa: E402
+    AgentMessageData,
+    Plan,
+    TeamConfiguration,
+)
+
+TEAM_ID = "team-1"
+HEADERS = {"x-ms-client-principal-id": "user-1"}
+# Latency of every plan, team and agent-message read
+DELAY = 0.1
+
+
+class DelayedDatabase(MemoryDatabase):
+    """MemoryDatabase whose plan, team and message reads each take DELAY seconds."""
+
+    async def get_plan_by_plan_id(self, plan_id):
+        await asyncio.sleep(DELAY)
+        return await super().get_plan_by_plan_id(plan_id)
+
+    async def get_team_by_id(self, team_id):
+        await asyncio.sleep(DELAY)
+        return await super().get_team_by_id(team_id)
+
+    async def get_agent_messages(self, plan_id):
+        await asyncio.sleep(DELAY)
+        return await super().get_agent_messages(plan_id)
+
+
+@pytest_asyncio.fixture
+async def api_client():
+    from api.router import app_v3
+    from fastapi import FastAPI
+
+    db = DelayedDatabase().for_user("user-1")
+    await db.add_team(
+        TeamConfiguration(
+            id=TEAM_ID,
+            team_id=TEAM_ID,
+            session_id=TEAM_ID,
+            name="HR",
+            status="visible",
+            created="2024-01-01",
+            created_by="user-1",
+            user_id="user-1",
+        )
+    )
+    await db.add_plan(
+        Plan(
+            id="plan-1",
+            plan_id="plan-1",
+            user_id="user-1",
+            team_id=TEAM_ID,
+            initial_goal="Onboard",
+            m_plan={"steps": []},
+        )
+    )
+    for i in range(3):
+        await db.add_agent_message(
+            AgentMessageData(plan_id="plan-1", user_id="user-1", agent="HRHelperAgent", content=f"m{i}", raw_data="{}")
+        )
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    with patch("api.router.DatabaseFactory.get_database", AsyncMock(return_value=db)):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_team_and_messages_are_read_concurrently(api_client):
+    started = time.perf_counter()
+    response = await api_client.get("/api/v3/plan", params={"plan_id": "plan-1"}, headers=HEADERS)
+    elapsed = time.perf_counter() - started
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["plan"]["id"] == "plan-1"
+    assert body["team"]["team_id"] == TEAM_ID
+    assert [m["content"] for m in body["messages"]] == ["m0", "m1", "m2"]
+    assert body["m_plan"] == {"steps": []}
+    # plan, then max(team, messages) rather than plan + team + messages
+    assert 2 * DELAY <= elapsed < 2.5 * DELAY
+
+
+@pytest.mark.asyncio
+async def test_include_selects_what_is_read(api_client):
+    started = time.perf_counter()
+    response = await api_client.get(
+        "/api/v3/plan", params={"plan_id": "plan-1", "include": "messages"}, headers=HEADERS
+    )
+    elapsed = time.perf_counter() - started
+
+    body = response.json()
+    assert "team" not in body
+    assert len(body["messages"]) == 3
+
+    plan_only = await api_client.get(
+        "/api/v3/plan", params={"plan_id": "plan-1", "include": ""}, headers=HEADERS
+    )
+    assert set(plan_only.json()) == {"plan", "m_plan", "streaming_message"}
+    assert elapsed < 2.5 * DELAY
+
+
+@pytest.mark.asyncio
+async def test_unknown_include_and_missing_plan_are_client_errors(api_client):
+    unknown = await api_client.get(
+        "/api/v3/plan", params={"plan_id": "plan-1", "include": "steps"}, headers=HEADERS
+    )
+    missing = await api_client.get("/api/v3/plan", params={"plan_id": "nope"}, headers=HEADERS)
+
+    assert unknown.status_code == 400
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_messages_stream_as_ndjson(api_client):
+    response = await api_client.get("/api/v3/plan/messages", params={"plan_id": "plan-1"}, headers=HEADERS)
+    missing = await api_client.get("/api/v3/plan/messages", params={"plan_id": "nope"}, headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["content"] for line in lines] == ["m0", "m1", "m2"]
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_team_or_message_read_failures_are_server_errors(api_client):
+    with patch.object(DelayedDatabase, "get_team_by_id", AsyncMock(side_effect=RuntimeError("team read"))):
+        team_failed = await api_client.get("/api/v3/plan", params={"plan_id": "plan-1"}, headers=HEADERS)
+    with patch.object(DelayedDatabase, "get_agent_messages", AsyncMock(side_effect=RuntimeError("page 1"))):
+        messages_failed = await api_client.get("/api/v3/plan", params={"plan_id": "plan-1"}, headers=HEADERS)
+
+    for response in (team_failed, messages_failed):
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error occurred"}
+
+
+@pytest.mark.asyncio
+async def test_failure_after_the_first_page_aborts_the_response(api_client):
+    async def stream_agent_messages(self, plan_id):
+        yield AgentMessageData(plan_id=plan_id, user_id="user-1", agent="HRHelperAgent", content="m0", raw_data="{}")
+        raise RuntimeError("page 2")
+
+    # The 200 has been sent: the body is cut off instead of ending as valid JSON
+    with patch.object(DelayedDatabase, "stream_agent_messages", stream_agent_messages):
+        with pytest.raises(RuntimeError, match="page 2"):
+            await api_client.get("/api/v3/plan", params={"plan_id": "plan-1"}, headers=HEADERS)
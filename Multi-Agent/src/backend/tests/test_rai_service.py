@@ -0,0 +1,84 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.services.rai_service import RAI_INSTRUCTIONS, RAIService  # noqa: E402
+from common.utils.utils_kernel import rai_success  # noqa: E402
+from config.agent_registry import agent_registry  # noqa: E402
+from magentic_agents.foundry_agent import FoundryAgentTemplate  # noqa: E402
+
+
+class FakeChatService:
+    """Answers "True" for texts containing "attack", slowly, and tracks concurrency."""
+
+    def __init__(self, seconds=0.01):
+        self.seconds = seconds
+        self.active = 0
+        self.peak = 0
+        self.histories = []
+        self.client = SimpleNamespace(close=AsyncMock())
+
+    async def get_chat_message_content(self, history, settings):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.histories.append(history)
+        try:
+            await asyncio.sleep(self.seconds)
+        finally:
+            self.active -= 1
+        text = history.messages[-1].content
+        return SimpleNamespace(content=" True\n" if "attack" in text else "False")
+
+
+@pytest.mark.asyncio
+async def test_checks_share_one_client_and_create_no_agents():
+    chat = FakeChatService()
+    factory = lambda: chat  # noqa: E731
+    service = RAIService("gpt-4.1", "https://openai.example.com", max_concurrent=3, chat_service_factory=factory)
+    registered = agent_registry.get_agent_count()
+    open_agent = AsyncMock()
+    texts = [f"Onboard employee {i}" for i in range(20)] + ["Plan an attack on the office"]
+
+    with patch("common.utils.utils_kernel.rai_service", service), patch.object(
+        FoundryAgentTemplate, "open", open_agent
+    ):
+        results = await asyncio.gather(*(rai_success(text) for text in texts))
+
+    assert results == [True] * 20 + [False]
+    assert service.opened == 1
+    assert chat.peak == 3
+    assert chat.histories[0].messages[0].content == RAI_INSTRUCTIONS
+    open_agent.assert_not_awaited()
+    assert agent_registry.get_agent_count() == registered
+
+    await service.close()
+    chat.client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_slow_or_unclear_verdicts_block_the_text():
+    slow = RAIService(
+        "gpt-4.1", "https://openai.example.com", timeout_seconds=0.01, chat_service_factory=lambda: FakeChatService(1)
+    )
+    unclear = FakeChatService()
+    unclear.get_chat_message_content = AsyncMock(return_value=SimpleNamespace(content="Maybe"))
+    vague = RAIService("gpt-4.1", "https://openai.example.com", chat_service_factory=lambda: unclear)
+
+    with patch("common.utils.utils_kernel.rai_service", slow):
+        assert await rai_success("Onboard a new employee") is False
+    with patch("common.utils.utils_kernel.rai_service", vague):
+        assert await rai_success("Onboard a new employee") is False
@@ -0,0 +1,126 @@
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.utils.rate_limiter import (  # noqa: E402
+    AdmissionController,
+    MemoryTokenBucketStore,
+    RateLimit,
+    RateLimitExceededError,
+    SqliteTokenBucketStore,
+    max_concurrent_for_budget,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_a_burst_then_refills():
+    clock = FakeClock()
+    store = MemoryTokenBucketStore(clock=clock)
+    limit = RateLimit.parse("2/60")
+
+    waits = [await store.take("chat:user-1", limit) for _ in range(3)]
+    other_user = await store.take("chat:user-2", limit)
+    clock.now += 30
+    after_refill = await store.take("chat:user-1", limit)
+
+    assert waits[:2] == [0, 0]
+    assert waits[2] == pytest.approx(30)
+    assert other_user == 0
+    assert after_refill == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_buckets_are_shared_between_stores(tmp_path):
+    path = str(tmp_path / "rate_limits.sqlite3")
+    clock = FakeClock()
+    first, second = SqliteTokenBucketStore(path, clock=clock), SqliteTokenBucketStore(path, clock=clock)
+    limit = RateLimit(capacity=3, period_seconds=60)
+
+    assert await first.take("process_request:user-1", limit, cost=2) == 0
+    assert await second.take("process_request:user-1", limit) == 0
+    assert await second.take("process_request:user-1", limit) == pytest.approx(20)
+    await first.close()
+    await second.close()
+
+
+def test_concurrency_follows_the_tpm_budget():
+    # 4,000 tokens every 20s is 12,000 TPM per slot
+    assert max_concurrent_for_budget(120_000, 4000, 20) == 10
+    assert max_concurrent_for_budget(5_000, 4000, 20) == 1
+    assert max_concurrent_for_budget(0, 4000, 20) == 0
+
+
+@pytest.mark.asyncio
+async def test_no_free_slot_refuses_without_spending_tokens():
+    store = MemoryTokenBucketStore()
+    controller = AdmissionController(store, {"hr_chat": RateLimit(1, 60)}, max_concurrent=1, request_seconds=12)
+
+    await controller.acquire("user-1", "process_request")
+    with pytest.raises(RateLimitExceededError) as refused:
+        await controller.acquire("user-2", "hr_chat")
+    controller.release()
+    await controller.acquire("user-2", "hr_chat")
+    controller.release()
+
+    assert refused.value.retry_after == 12
+
+
+@pytest.mark.asyncio
+async def test_over_limit_clarification_is_refused_before_the_rai_check():
+    from api.router import app_v3
+    from fastapi import FastAPI
+
+    controller = AdmissionController(MemoryTokenBucketStore(), {"user_clarification": RateLimit(1, 60)})
+    rai = AsyncMock(return_value=False)
+    app = FastAPI()
+    app.include_router(app_v3)
+    body = {"request_id": "req-unknown", "answer": "Yes"}
+    with patch("api.router.admission_controller", controller), patch("api.router.rai_success", rai):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            headers={"x-ms-client-principal-id": "user-1"},
+        ) as client:
+            admitted = await client.post("/api/v3/user_clarification", json=body)
+            refused = await client.post("/api/v3/user_clarification", json=body)
+
+    assert admitted.status_code == 400
+    assert refused.status_code == 429
+    assert refused.headers["retry-after"] == "60"
+    rai.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_oversized_request_is_rejected_and_does_not_block_small_ones():
+    controller = AdmissionController(MemoryTokenBucketStore(), {"user_clarification": RateLimit(30, 60)})
+
+    with pytest.raises(ValueError):
+        await controller.acquire("user-1", "user_clarification", 40)
+    await controller.acquire("user-1", "user_clarification", 25)
+    with pytest.raises(RateLimitExceededError) as refused:
+        await controller.acquire("user-1", "user_clarification", 10)
+    # 5 tokens left: the refused batch of 10 must not keep out a single request
+    await controller.acquire("user-1", "user_clarification")
+
+    assert refused.value.retry_after == 10
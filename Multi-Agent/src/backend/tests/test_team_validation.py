@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+from common.services.team_service import TeamService  # noqa: E402
+from common.services.team_validation import TeamConfigValidator  # noqa: E402
+
+# Latency of each remote check
+DELAY = 0.1
+
+TEAM_JSON = {
+    "name": "HR",
+    "status": "visible",
+    "agents": [
+        {"input_key": "hr", "type": "rag", "name": "HRHelperAgent", "icon": "icon", "index_name": "hr-docs"},
+        {"input_key": "it", "type": "rag", "name": "ITAgent", "icon": "icon", "index_name": "it-docs"},
+    ],
+    "starting_tasks": [
+        {"id": "t1", "name": "Onboard", "prompt": "Onboard Jane", "created": "2024-01-01", "creator": "admin", "logo": "logo"}
+    ],
+}
+
+
+def _delayed(result, delay=DELAY):
+    async def check(*_args):
+        await asyncio.sleep(delay)
+        return result
+
+    return AsyncMock(side_effect=check)
+
+
+def _team_service(models=(True, []), indexes=(True, [])) -> TeamService:
+    service = TeamService(MemoryDatabase())
+    service.validate_team_models = _delayed(models)
+    service.validate_team_search_indexes = _delayed(indexes)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_remote_checks_run_concurrently():
+    service = _team_service()
+    with patch("common.services.team_validation.rai_validate_team_config", _delayed((True, ""))):
+        started = time.perf_counter()
+        result = await TeamConfigValidator(service).validate(TEAM_JSON, "user-1")
+        elapsed = time.perf_counter() - started
+
+    assert result.failure is None
+    assert result.team_config.name == "HR"
+    assert [(c["check"], c["status"]) for c in result.timings()] == [
+        ("parse", "passed"),
+        ("rai", "passed"),
+        ("models", "passed"),
+        ("search_indexes", "passed"),
+    ]
+    # The slowest check, not the sum of three
+    assert DELAY <= elapsed < 2 * DELAY
+
+
+@pytest.mark.asyncio
+async def test_first_failure_cancels_the_other_checks():
+    service = _team_service()
+    service.validate_team_models = _delayed((False, ["gpt-9"]), delay=0.01)
+    slow_rai = _delayed((True, ""), delay=5)
+    with patch("common.services.team_validation.rai_validate_team_config", slow_rai):
+        started = time.perf_counter()
+        result = await TeamConfigValidator(service).validate(TEAM_JSON, "user-1")
+        elapsed = time.perf_counter() - started
+
+    statuses = {c.name: c.status for c in result.checks}
+    assert statuses == {"parse": "passed", "rai": "skipped", "models": "failed", "search_indexes": "skipped"}
+    assert "gpt-9" in result.failure.error
+    assert result.team_config is None
+    assert elapsed < 1
+
+
+@pytest.mark.asyncio
+async def test_malformed_config_makes_no_remote_calls():
+    service = _team_service()
+    rai = _delayed((True, ""))
+    with patch("common.services.team_validation.rai_validate_team_config", rai):
+        result = await TeamConfigValidator(service).validate({"name": "HR"}, "user-1")
+
+    assert result.failure.name == "parse"
+    assert "status" in result.failure.error
+    rai.assert_not_called()
+    service.validate_team_models.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_indexes_are_checked_concurrently():
+    service = TeamService(MemoryDatabase())
+    service.search_endpoint = "https://search.example.com"
+    service.validate_single_index = _delayed((True, ""))
+
+    with patch("common.services.team_service.SearchIndexClient", MagicMock()):
+        started = time.perf_counter()
+        valid, errors = await service.validate_team_search_indexes(TEAM_JSON)
+        elapsed = time.perf_counter() - started
+
+    assert valid and errors == []
+    assert service.validate_single_index.await_count == 2
+    assert elapsed < 2 * DELAY
+
+
+async def _upload(db, search_result):
+    from api.router import app_v3
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    patches = (
+        patch("api.router.DatabaseFactory.get_database", AsyncMock(return_value=db)),
+        patch("common.services.team_validation.rai_validate_team_config", _delayed((True, ""))),
+        patch.object(TeamService, "validate_team_models", _delayed((True, []))),
+        patch.object(TeamService, "validate_team_search_indexes", _delayed(search_result)),
+    )
+    for p in patches:
+        p.start()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post(
+                "/api/v3/upload_team_config",
+                files={"file": ("team.json", json.dumps(TEAM_JSON), "application/json")},
+                headers={"x-ms-client-principal-id": "user-1"},
+            )
+    finally:
+        for p in patches:
+            p.stop()
+
+
+@pytest.mark.asyncio
+async def test_upload_returns_failing_check_or_timings():
+    db = MemoryDatabase()
+
+    rejected = await _upload(db, (False, ["Search index 'hr-docs' does not exist"]))
+    assert rejected.status_code == 400
+    assert "hr-docs" in rejected.json()["detail"]
+    assert await db.get_all_teams() == []
+
+    accepted = await _upload(db, (True, []))
+    assert accepted.status_code == 200
+    timings = accepted.json()["validation"]
+    assert [t["check"] for t in timings] == ["parse", "rai", "models", "search_indexes"]
+    assert all(t["status"] == "passed" and t["duration_ms"] >= 0 for t in timings)
+    assert len(await db.get_all_teams()) == 1
@@ -0,0 +1,97 @@
+import base64
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+# Make backend modules importable the same way the app does
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("APPLICATIONINSIGHTS_CONNECTION_STRING", "")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "00000000-0000-0000-0000-000000000000")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "rg-test")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "proj-test")
+os.environ.setdefault("AZURE_AI_AGENT_ENDPOINT", "https://agents.example.com/")
+
+from auth import auth_utils  # noqa: E402
+from auth.auth_utils import get_authenticated_user_details, get_tenantid  # noqa: E402
+from auth.user_context import (  # noqa: E402
+    DEVELOPMENT_USER,
+    UserContext,
+    UserContextMiddleware,
+    current_user,
+    get_user_context,
+)
+from common.database.memory_database import MemoryDatabase  # noqa: E402
+
+EASYAUTH_HEADERS = {
+    "x-ms-client-principal-id": "user-1",
+    "x-ms-client-principal-name": "jane@example.com",
+    "x-ms-client-principal-idp": "aad",
+    "x-ms-token-aad-id-token": "token",
+    "x-ms-client-principal": base64.b64encode(json.dumps({"tid": "tenant-1"}).encode()).decode(),
+}
+
+
+def _probe_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(UserContextMiddleware)
+
+    @app.get("/whoami")
+    async def whoami(user: UserContext = Depends(get_user_context)):
+        assert current_user() is user
+        return {"user": user.to_dict(), "tenant_id": user.tenant_id}
+
+    return app
+
+
+async def _get(app: FastAPI, path: str, headers=None) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path, headers=headers or {})
+
+
+@pytest.mark.asyncio
+async def test_middleware_matches_get_authenticated_user_details():
+    response = await _get(_probe_app(), "/whoami", EASYAUTH_HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["user"] == get_authenticated_user_details(EASYAUTH_HEADERS)
+    assert response.json()["tenant_id"] == "tenant-1"
+    # Nothing leaks into the context of the caller
+    assert current_user() is None
+
+
+@pytest.mark.asyncio
+async def test_missing_headers_fall_back_to_the_development_user():
+    response = await _get(_probe_app(), "/whoami")
+
+    assert response.json()["user"] == get_authenticated_user_details({})
+    assert response.json()["user"] == DEVELOPMENT_USER.to_dict()
+
+
+@pytest.mark.asyncio
+async def test_router_without_middleware_reads_the_headers():
+    from api.router import app_v3
+
+    app = FastAPI()
+    app.include_router(app_v3)
+    db = MemoryDatabase()
+    with patch("api.router.DatabaseFactory.get_database", AsyncMock(return_value=db)):
+        response = await _get(app, "/api/v3/plans", {"x-ms-client-principal-id": "user-1"})
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_tenant_id_is_decoded_once_per_principal():
+    principal = EASYAUTH_HEADERS["x-ms-client-principal"]
+    auth_utils._decode_tenant_id.cache_clear()
+
+    assert [get_tenantid(principal) for _ in range(3)] == ["tenant-1"] * 3
+    info = auth_utils._decode_tenant_id.cache_info()
+    assert (info.misses, info.hits) == (1, 2)